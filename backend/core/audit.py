@@ -0,0 +1,242 @@
+"""Buffered asynchronous audit log for sensitive actions.
+
+Login, escrow and dispute handlers call ``AuditSink.record`` on their hot
+path. That only timestamps the event and puts it on a bounded
+``asyncio.Queue``; a background writer drains the queue in batches, encodes
+each batch as JSON lines with msgspec and appends it to the current segment
+as one gzip member (concatenated members form a valid ``.gz`` file). Segments
+rotate by size or age into ``audit-<UTC timestamp>.jsonl.gz``.
+
+Backpressure: when the queue is full ``record`` drops the event and counts
+it in ``metrics.dropped``, so a slow disk never stalls request handling;
+events that must not be lost use ``await record_wait(...)``, which waits for
+queue space instead. ``metrics`` also reports enqueue-to-disk latency.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import gzip
+import os
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Iterator
+
+import msgspec
+
+DEFAULT_DIR = Path("storage/audit")
+CURRENT_SEGMENT = "current.jsonl.gz"
+
+
+class AuditEvent(msgspec.Struct, frozen=True, omit_defaults=True):
+    """One audited action."""
+
+    ts: float
+    action: str
+    actor_id: int | None = None
+    ip: str | None = None
+    detail: dict[str, Any] = {}
+
+
+@dataclass
+class AuditMetrics:
+    """Counters exposed for monitoring (reset only on restart)."""
+
+    enqueued: int = 0
+    written: int = 0
+    dropped: int = 0
+    write_errors: int = 0  # batches lost to write errors
+    unencodable: int = 0  # events dropped because msgspec could not encode them
+    batches: int = 0
+    queue_depth: int = 0
+    latency_total: float = 0.0  # seconds, summed over written events
+    latency_max: float = 0.0
+
+    @property
+    def latency_mean(self) -> float:
+        """Mean seconds from ``record`` to the batch reaching the file."""
+        return self.latency_total / self.written if self.written else 0.0
+
+
+class AuditSink:
+    """Bounded queue + batched, rotating, gzip-compressed JSONL writer.
+
+    Parameters
+    ----------
+    directory : Path
+        Segment directory.
+    queue_size : int
+        Events buffered before ``record`` starts dropping.
+    batch_size : int
+        Maximum events encoded and written per batch.
+    segment_bytes : int
+        Rotate the current segment once it reaches this compressed size.
+    segment_age : float
+        Rotate a non-empty segment after this many seconds.
+    compresslevel : int
+        gzip level for each batch (low levels keep the writer cheap).
+    """
+
+    def __init__(
+        self,
+        directory: Path = DEFAULT_DIR,
+        queue_size: int = 10_000,
+        batch_size: int = 512,
+        segment_bytes: int = 16 * 1024 * 1024,
+        segment_age: float = 3600.0,
+        compresslevel: int = 3,
+    ):
+        self.directory = Path(directory)
+        self.batch_size = batch_size
+        self.segment_bytes = segment_bytes
+        self.segment_age = segment_age
+        self.compresslevel = compresslevel
+        self.metrics = AuditMetrics()
+        self._queue: asyncio.Queue[tuple[float, AuditEvent]] = asyncio.Queue(queue_size)
+        self._encoder = msgspec.json.Encoder()
+        self._writer: asyncio.Task | None = None
+        self._segment_opened = 0.0
+
+    # --------------------------------------------------------------- hot path
+
+    def _event(self, action, actor_id, ip, detail) -> tuple[float, AuditEvent]:
+        return time.monotonic(), AuditEvent(time.time(), action, actor_id, ip, detail)
+
+    def record(
+        self,
+        action: str,
+        actor_id: int | None = None,
+        ip: str | None = None,
+        **detail: Any,
+    ) -> bool:
+        """Queue an event without blocking; returns False if it was dropped."""
+        try:
+            self._queue.put_nowait(self._event(action, actor_id, ip, detail))
+        except asyncio.QueueFull:
+            self.metrics.dropped += 1
+            return False
+        self.metrics.enqueued += 1
+        return True
+
+    async def record_wait(
+        self,
+        action: str,
+        actor_id: int | None = None,
+        ip: str | None = None,
+        **detail: Any,
+    ) -> None:
+        """Queue an event, waiting for space when the buffer is full."""
+        await self._queue.put(self._event(action, actor_id, ip, detail))
+        self.metrics.enqueued += 1
+
+    # ----------------------------------------------------------------- writer
+
+    def start(self) -> None:
+        """Start the background writer on the running loop."""
+        if self._writer is None:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            self._recover_current()
+            self._writer = asyncio.create_task(self._write_loop())
+
+    def _recover_current(self) -> None:
+        # A leftover current segment (unclean shutdown) is rotated as-is
+        if (self.directory / CURRENT_SEGMENT).exists():
+            self._rotate()
+        self._segment_opened = time.monotonic()
+
+    async def _write_loop(self) -> None:
+        queue = self._queue
+        while True:
+            batch = [await queue.get()]
+            while len(batch) < self.batch_size and not queue.empty():
+                batch.append(queue.get_nowait())
+            self.metrics.queue_depth = queue.qsize()
+
+            metrics = self.metrics
+            try:
+                entries, payload = self._encode(batch)
+                if entries:
+                    await asyncio.to_thread(self._append, payload)
+            except Exception:
+                # Never let a bad batch kill the writer (and hang close())
+                metrics.write_errors += 1
+            else:
+                done = time.monotonic()
+                metrics.batches += 1
+                metrics.written += len(entries)
+                for enqueued_at, _ in entries:
+                    latency = done - enqueued_at
+                    metrics.latency_total += latency
+                    if latency > metrics.latency_max:
+                        metrics.latency_max = latency
+            finally:
+                for _ in batch:
+                    queue.task_done()
+
+    def _encode(
+        self, batch: list[tuple[float, AuditEvent]]
+    ) -> tuple[list[tuple[float, AuditEvent]], bytes]:
+        """Encode a batch as JSON lines, dropping events that cannot be encoded."""
+        try:
+            return batch, self._encoder.encode_lines([event for _, event in batch])
+        except (TypeError, msgspec.EncodeError):
+            pass
+        # Some detail value is not JSON-encodable: keep the rest of the batch
+        entries, lines = [], []
+        for entry in batch:
+            try:
+                lines.append(self._encoder.encode_lines([entry[1]]))
+            except (TypeError, msgspec.EncodeError):
+                self.metrics.unencodable += 1
+                continue
+            entries.append(entry)
+        return entries, b"".join(lines)
+
+    def _append(self, payload: bytes) -> None:
+        path = self.directory / CURRENT_SEGMENT
+        member = gzip.compress(payload, compresslevel=self.compresslevel)
+        with open(path, "ab") as f:
+            f.write(member)
+            size = f.tell()
+        age = time.monotonic() - self._segment_opened
+        if size >= self.segment_bytes or age >= self.segment_age:
+            self._rotate()
+
+    def _rotate(self) -> None:
+        current = self.directory / CURRENT_SEGMENT
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%f")
+        target = self.directory / f"audit-{stamp}.jsonl.gz"
+        with open(current, "rb+") as f:
+            os.fsync(f.fileno())  # closed segments are durable
+        os.replace(current, target)
+        self._segment_opened = time.monotonic()
+
+    async def close(self) -> None:
+        """Write everything queued, stop the writer and seal the segment."""
+        if self._writer is None:
+            return
+        await self._queue.join()
+        self._writer.cancel()
+        try:
+            await self._writer
+        except asyncio.CancelledError:
+            pass
+        self._writer = None
+        if (self.directory / CURRENT_SEGMENT).exists():
+            await asyncio.to_thread(self._rotate)
+
+
+def read_events(directory: Path = DEFAULT_DIR) -> Iterator[AuditEvent]:
+    """Yield events from every segment in the directory, oldest first."""
+    directory = Path(directory)
+    decoder = msgspec.json.Decoder(AuditEvent)
+    segments = sorted(directory.glob("audit-*.jsonl.gz"))
+    current = directory / CURRENT_SEGMENT
+    if current.exists():
+        segments.append(current)
+    for segment in segments:
+        with gzip.open(segment, "rb") as f:
+            for line in f:
+                yield decoder.decode(line)
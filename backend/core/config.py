@@ -0,0 +1,173 @@
+"""Runtime configuration for the SCAMBO backend.
+
+Settings are read from environment variables so the same code runs against
+local SQLite during development and PostgreSQL in production.
+"""
+
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass
+
+
+def _env_int(name: str, default: int) -> int:
+    """Read an integer environment variable, falling back to ``default``."""
+    value = os.getenv(name)
+    return int(value) if value else default
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    """Read a boolean environment variable ("1", "true", "yes" are truthy)."""
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in {"1", "true", "yes", "on"}
+
+
+@dataclass(frozen=True)
+class DatabaseSettings:
+    """Connection and pool settings for the async SQLAlchemy engine.
+
+    Attributes
+    ----------
+    url : str
+        SQLAlchemy async URL (``sqlite+aiosqlite://`` or ``postgresql+asyncpg://``).
+    pool_size : int
+        Connections kept open in the pool (ignored by SQLite in-memory pools).
+    max_overflow : int
+        Extra connections allowed above ``pool_size`` under burst load.
+    pool_timeout : float
+        Seconds to wait for a free connection before raising.
+    pool_recycle : int
+        Seconds after which a pooled connection is replaced.
+    pool_pre_ping : bool
+        Whether to test connections with a lightweight ping on checkout.
+    statement_cache_size : int
+        Size of SQLAlchemy's compiled-statement cache and, on asyncpg, of the
+        per-connection prepared statement cache.
+    echo : bool
+        Log every emitted SQL statement.
+    """
+
+    url: str = "sqlite+aiosqlite:///storage/data/scambo.db"
+    pool_size: int = 5
+    max_overflow: int = 10
+    pool_timeout: float = 30.0
+    pool_recycle: int = 1800
+    pool_pre_ping: bool = True
+    statement_cache_size: int = 500
+    echo: bool = False
+
+    @classmethod
+    def from_env(cls) -> "DatabaseSettings":
+        """Build settings from ``SCAMBO_DB_*`` environment variables."""
+        defaults = cls()
+        return cls(
+            url=os.getenv("SCAMBO_DB_URL", defaults.url),
+            pool_size=_env_int("SCAMBO_DB_POOL_SIZE", defaults.pool_size),
+            max_overflow=_env_int("SCAMBO_DB_MAX_OVERFLOW", defaults.max_overflow),
+            pool_timeout=float(
+                os.getenv("SCAMBO_DB_POOL_TIMEOUT", defaults.pool_timeout)
+            ),
+            pool_recycle=_env_int("SCAMBO_DB_POOL_RECYCLE", defaults.pool_recycle),
+            pool_pre_ping=_env_bool("SCAMBO_DB_POOL_PRE_PING", defaults.pool_pre_ping),
+            statement_cache_size=_env_int(
+                "SCAMBO_DB_STATEMENT_CACHE_SIZE", defaults.statement_cache_size
+            ),
+            echo=_env_bool("SCAMBO_DB_ECHO", defaults.echo),
+        )
+
+
+@dataclass(frozen=True)
+class AuthSettings:
+    """Token, hashing and 2FA settings for ``auth_service``.
+
+    Attributes
+    ----------
+    jwt_secret : str
+        HMAC secret (HS*) or PEM private key (RS*/ES*) used to sign tokens.
+    jwt_public_key : str | None
+        PEM public key for asymmetric algorithms; None for HMAC.
+    jwt_algorithm : str
+        JWS algorithm name.
+    access_token_ttl : int
+        Access token lifetime in seconds.
+    refresh_token_ttl : int
+        Refresh token lifetime in seconds.
+    token_cache_ttl : float
+        Upper bound, in seconds, on how long a verified token is trusted
+        from cache without re-checking its signature.
+    token_cache_size : int
+        Maximum number of verified tokens kept in the LRU cache.
+    hash_workers : int | None
+        Processes used for password hashing (None = CPU count).
+    """
+
+    jwt_secret: str = "change-me-in-production"
+    jwt_public_key: str | None = None
+    jwt_algorithm: str = "HS256"
+    access_token_ttl: int = 15 * 60
+    refresh_token_ttl: int = 14 * 24 * 3600
+    token_cache_ttl: float = 30.0
+    token_cache_size: int = 10_000
+    hash_workers: int | None = None
+
+    @classmethod
+    def from_env(cls) -> "AuthSettings":
+        """Build settings from ``SCAMBO_JWT_*``/``SCAMBO_AUTH_*`` variables."""
+        defaults = cls()
+        workers = os.getenv("SCAMBO_AUTH_HASH_WORKERS")
+        return cls(
+            jwt_secret=os.getenv("SCAMBO_JWT_SECRET", defaults.jwt_secret),
+            jwt_public_key=os.getenv("SCAMBO_JWT_PUBLIC_KEY"),
+            jwt_algorithm=os.getenv("SCAMBO_JWT_ALGORITHM", defaults.jwt_algorithm),
+            access_token_ttl=_env_int(
+                "SCAMBO_JWT_ACCESS_TTL", defaults.access_token_ttl
+            ),
+            refresh_token_ttl=_env_int(
+                "SCAMBO_JWT_REFRESH_TTL", defaults.refresh_token_ttl
+            ),
+            token_cache_ttl=float(
+                os.getenv("SCAMBO_AUTH_TOKEN_CACHE_TTL", defaults.token_cache_ttl)
+            ),
+            token_cache_size=_env_int(
+                "SCAMBO_AUTH_TOKEN_CACHE_SIZE", defaults.token_cache_size
+            ),
+            hash_workers=int(workers) if workers else None,
+        )
+
+
+@dataclass(frozen=True)
+class RateLimitSettings:
+    """Global request rate limiting for ``rate_limit.RateLimitMiddleware``.
+
+    Attributes
+    ----------
+    rate : float
+        Sustained requests per second allowed per client key.
+    burst : int
+        Bucket capacity (token bucket) or requests per window (sliding log).
+    strategy : str
+        ``"token_bucket"`` or ``"sliding_window"``.
+    idle_after : float
+        Seconds without requests after which a key's state is evicted
+        (never shorter than the time to refill a full bucket).
+    """
+
+    rate: float = 2.0
+    burst: int = 60
+    strategy: str = "token_bucket"
+    idle_after: float = 300.0
+
+    @classmethod
+    def from_env(cls) -> "RateLimitSettings":
+        """Build settings from ``SCAMBO_RATE_LIMIT_*`` variables."""
+        defaults = cls()
+        return cls(
+            rate=float(os.getenv("SCAMBO_RATE_LIMIT_RATE", defaults.rate)),
+            burst=_env_int("SCAMBO_RATE_LIMIT_BURST", defaults.burst),
+            strategy=os.getenv("SCAMBO_RATE_LIMIT_STRATEGY", defaults.strategy),
+            idle_after=float(
+                os.getenv("SCAMBO_RATE_LIMIT_IDLE_AFTER", defaults.idle_after)
+            ),
+        )
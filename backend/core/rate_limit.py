@@ -0,0 +1,272 @@
+"""Global request rate limiting (ASGI middleware + pluggable stores).
+
+Two in-process algorithms are provided:
+
+- ``TokenBucketStore``: per-key token buckets (``rate`` tokens/s refill, at
+  most ``capacity`` banked). O(1) time and two floats of state per key.
+- ``SlidingWindowLogStore``: exact "``capacity`` requests in any
+  ``capacity / rate`` seconds" using a per-key timestamp log. More precise
+  at window edges, O(capacity) memory per key.
+
+Both are lock-free: every ``acquire`` is a synchronous read-modify-write with
+no ``await`` in between, so on a single event loop no two requests can
+interleave on the same bucket. Keys live in an ``OrderedDict`` ordered by last
+use, which makes idle-key eviction a pop from the front. An evicted key is
+always one whose state has fully recovered, so eviction never changes a
+decision.
+
+``RateLimitStore`` is the seam for a shared backend: a Redis-backed store
+implements the same ``acquire`` with one atomic script call per request, and
+the in-memory stores stand in for it in development and tests.
+"""
+
+from __future__ import annotations
+
+import math
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict, deque
+from typing import Any, Awaitable, Callable, Hashable, NamedTuple
+
+from .config import RateLimitSettings
+
+# Bound on keys evicted per sweep so a mass expiry never stalls one request
+_MAX_EVICTIONS_PER_SWEEP = 1024
+
+
+class Decision(NamedTuple):
+    """Outcome of a rate-limit check."""
+
+    allowed: bool
+    remaining: int
+    retry_after: float  # seconds until the request would be allowed (0 if allowed)
+
+
+class RateLimitStore(ABC):
+    """Interface for rate-limit state backends.
+
+    Parameters
+    ----------
+    rate : float
+        Sustained requests per second per key.
+    capacity : int
+        Burst size (tokens in a full bucket / requests per window).
+    """
+
+    def __init__(self, rate: float, capacity: int):
+        if rate <= 0 or capacity < 1:
+            raise ValueError("rate must be > 0 and capacity >= 1")
+        self.rate = rate
+        self.capacity = capacity
+
+    @abstractmethod
+    async def acquire(self, key: Hashable, cost: int = 1) -> Decision:
+        """Consume ``cost`` units for ``key`` if allowed."""
+
+    async def close(self) -> None:
+        """Release backend resources (connections, timers)."""
+
+
+class _LocalStore(RateLimitStore):
+    """Shared bookkeeping for the in-memory stores: LRU order and eviction.
+
+    Parameters
+    ----------
+    rate, capacity
+        See ``RateLimitStore``.
+    idle_after : float
+        Seconds of inactivity before a key is evicted; raised to at least the
+        full-recovery time (``capacity / rate``) so eviction is lossless.
+    clock : Callable[[], float]
+        Monotonic time source (injectable for tests).
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: int,
+        idle_after: float = 300.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        super().__init__(rate, capacity)
+        self.idle_after = max(idle_after, capacity / rate)
+        self._sweep_interval = max(self.idle_after / 4, 1.0)
+        self._clock = clock
+        self._state: OrderedDict[Hashable, Any] = OrderedDict()
+        self._next_sweep = clock() + self._sweep_interval
+
+    def __len__(self) -> int:
+        return len(self._state)
+
+    @abstractmethod
+    def _last_seen(self, state: Any) -> float:
+        """Return the timestamp of the key's most recent request."""
+
+    @abstractmethod
+    def hit(self, key: Hashable, cost: int, now: float) -> Decision:
+        """Synchronous check-and-consume (the whole critical section)."""
+
+    async def acquire(self, key: Hashable, cost: int = 1) -> Decision:
+        now = self._clock()
+        if now >= self._next_sweep:
+            self.evict_idle(now)
+        return self.hit(key, cost, now)
+
+    def evict_idle(self, now: float | None = None) -> int:
+        """Drop keys idle for longer than ``idle_after``; returns the count.
+
+        Keys are ordered by last use, so this stops at the first active key.
+        At most ``_MAX_EVICTIONS_PER_SWEEP`` keys are dropped per call; if more
+        remain the next sweep is scheduled immediately.
+        """
+        now = self._clock() if now is None else now
+        cutoff = now - self.idle_after
+        state = self._state
+        evicted = 0
+        while state and evicted < _MAX_EVICTIONS_PER_SWEEP:
+            key = next(iter(state))
+            if self._last_seen(state[key]) > cutoff:
+                break
+            del state[key]
+            evicted += 1
+        more = evicted == _MAX_EVICTIONS_PER_SWEEP
+        self._next_sweep = now if more else now + self._sweep_interval
+        return evicted
+
+
+class TokenBucketStore(_LocalStore):
+    """In-memory token buckets; state per key is ``[tokens, last_seen]``."""
+
+    def _last_seen(self, state: list[float]) -> float:
+        return state[1]
+
+    def hit(self, key: Hashable, cost: int, now: float) -> Decision:
+        buckets = self._state
+        bucket = buckets.get(key)
+        if bucket is None:
+            tokens = float(self.capacity)
+            bucket = buckets[key] = [tokens, now]
+        else:
+            buckets.move_to_end(key)
+            tokens = min(self.capacity, bucket[0] + (now - bucket[1]) * self.rate)
+            bucket[1] = now
+        if tokens >= cost:
+            tokens -= cost
+            bucket[0] = tokens
+            return Decision(True, int(tokens), 0.0)
+        bucket[0] = tokens
+        return Decision(False, int(tokens), (cost - tokens) / self.rate)
+
+
+class SlidingWindowLogStore(_LocalStore):
+    """In-memory sliding-window log: at most ``capacity`` hits per window."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.window = self.capacity / self.rate
+
+    def _last_seen(self, log: deque[float]) -> float:
+        return log[-1] if log else -math.inf
+
+    def hit(self, key: Hashable, cost: int, now: float) -> Decision:
+        logs = self._state
+        log = logs.get(key)
+        if log is None:
+            log = logs[key] = deque()
+        else:
+            logs.move_to_end(key)
+            horizon = now - self.window
+            while log and log[0] <= horizon:
+                log.popleft()
+        used = len(log)
+        if used + cost <= self.capacity:
+            log.extend([now] * cost)
+            return Decision(True, self.capacity - used - cost, 0.0)
+        if cost > self.capacity:
+            return Decision(False, self.capacity - used, math.inf)
+        # Wait until enough of the oldest entries slide out of the window
+        oldest_needed = log[used + cost - self.capacity - 1]
+        return Decision(False, self.capacity - used, oldest_needed + self.window - now)
+
+
+def create_store(
+    settings: RateLimitSettings | None = None,
+    clock: Callable[[], float] = time.monotonic,
+) -> RateLimitStore:
+    """Build the in-memory store selected by ``settings.strategy``."""
+    settings = settings or RateLimitSettings.from_env()
+    stores = {
+        "token_bucket": TokenBucketStore,
+        "sliding_window": SlidingWindowLogStore,
+    }
+    try:
+        store_cls = stores[settings.strategy]
+    except KeyError:
+        raise ValueError(f"unknown rate limit strategy: {settings.strategy!r}") from None
+    return store_cls(settings.rate, settings.burst, settings.idle_after, clock)
+
+
+# ============================================================================
+# ASGI MIDDLEWARE
+# ============================================================================
+
+Scope = dict[str, Any]
+ASGIApp = Callable[[Scope, Callable, Callable], Awaitable[None]]
+
+_REJECT_BODY = b'{"detail":"rate limit exceeded"}'
+
+
+def client_key(scope: Scope) -> Hashable:
+    """Default key: the client's address (ASGI ``scope["client"]``)."""
+    client = scope.get("client")
+    return client[0] if client else "anonymous"
+
+
+class RateLimitMiddleware:
+    """ASGI middleware answering ``429 Too Many Requests`` when over the limit.
+
+    Parameters
+    ----------
+    app : ASGIApp
+        Wrapped application (e.g. the FastAPI app).
+    store : RateLimitStore | None
+        State backend; defaults to ``create_store()``.
+    key_func : Callable[[Scope], Hashable]
+        Maps a request scope to its limit key (client IP by default; use the
+        authenticated user id once auth runs before this middleware).
+    exempt_paths : frozenset[str]
+        Paths never limited (health checks).
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        store: RateLimitStore | None = None,
+        key_func: Callable[[Scope], Hashable] = client_key,
+        exempt_paths: frozenset[str] = frozenset({"/health"}),
+    ):
+        self.app = app
+        self.store = create_store() if store is None else store
+        self.key_func = key_func
+        self.exempt_paths = exempt_paths
+
+    async def __call__(self, scope: Scope, receive: Callable, send: Callable) -> None:
+        if scope["type"] != "http" or scope["path"] in self.exempt_paths:
+            await self.app(scope, receive, send)
+            return
+        decision = await self.store.acquire(self.key_func(scope))
+        if decision.allowed:
+            await self.app(scope, receive, send)
+            return
+        retry_after = str(math.ceil(min(decision.retry_after, 86400))).encode()
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 429,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"retry-after", retry_after),
+                ],
+            }
+        )
+        await send({"type": "http.response.body", "body": _REJECT_BODY})
@@ -0,0 +1,12 @@
+"""Database connection and session handling."""
+
+from .base import Base
+from .session import create_engine, create_session_factory, init_models, session_scope
+
+__all__ = [
+    "Base",
+    "create_engine",
+    "create_session_factory",
+    "init_models",
+    "session_scope",
+]
@@ -0,0 +1,67 @@
+"""Alembic environment: runs migrations through the async engine."""
+
+from __future__ import annotations
+
+import asyncio
+from logging.config import fileConfig
+
+from alembic import context
+from sqlalchemy.engine import Connection
+
+from backend import models  # noqa: F401  (register tables on Base.metadata)
+from backend.core.config import DatabaseSettings
+from backend.db.base import Base
+from backend.db.session import create_engine
+
+config = context.config
+if config.config_file_name is not None:
+    # Keep the application's loggers when migrations run in-process
+    fileConfig(config.config_file_name, disable_existing_loggers=False)
+
+target_metadata = Base.metadata
+
+
+def _settings() -> DatabaseSettings:
+    settings = DatabaseSettings.from_env()
+    url = config.get_main_option("sqlalchemy.url")
+    if url:
+        settings = DatabaseSettings(url=url)
+    return settings
+
+
+def run_migrations_offline() -> None:
+    """Emit SQL to stdout without a live connection."""
+    context.configure(
+        url=_settings().url,
+        target_metadata=target_metadata,
+        literal_binds=True,
+        render_as_batch=True,
+        dialect_opts={"paramstyle": "named"},
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def _do_run_migrations(connection: Connection) -> None:
+    # Batch mode lets ALTER-style operations work on SQLite
+    context.configure(
+        connection=connection,
+        target_metadata=target_metadata,
+        render_as_batch=True,
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+async def run_migrations_online() -> None:
+    """Run migrations against the configured database."""
+    engine = create_engine(_settings())
+    async with engine.connect() as connection:
+        await connection.run_sync(_do_run_migrations)
+    await engine.dispose()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    asyncio.run(run_migrations_online())
@@ -0,0 +1,143 @@
+"""Initial schema: users, listings, tags, comments, notifications, trades
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-19
+"""
+
+from __future__ import annotations
+
+from typing import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = '0001'
+down_revision: str | None = None
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table('tags',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=50), nullable=False),
+    sa.PrimaryKeyConstraint('id', name=op.f('pk_tags')),
+    sa.UniqueConstraint('name', name=op.f('uq_tags_name'))
+    )
+    op.create_table('users',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=80), nullable=False),
+    sa.Column('email', sa.String(length=255), nullable=False),
+    sa.Column('avatar_text', sa.String(length=4), nullable=False),
+    sa.Column('avatar_bg', sa.String(length=9), nullable=False),
+    sa.Column('bio', sa.Text(), nullable=False),
+    sa.Column('reputation', sa.Float(), nullable=False),
+    sa.Column('unread_notification_count', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+    sa.PrimaryKeyConstraint('id', name=op.f('pk_users')),
+    sa.UniqueConstraint('email', name=op.f('uq_users_email'))
+    )
+    op.create_table('listings',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('author_id', sa.Integer(), nullable=False),
+    sa.Column('title', sa.String(length=120), nullable=False),
+    sa.Column('description', sa.Text(), nullable=False),
+    sa.Column('image_path', sa.String(length=512), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('comment_count', sa.Integer(), server_default='0', nullable=False),
+    sa.ForeignKeyConstraint(['author_id'], ['users.id'], name=op.f('fk_listings_author_id_users'), ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id', name=op.f('pk_listings'))
+    )
+    with op.batch_alter_table('listings', schema=None) as batch_op:
+        batch_op.create_index('ix_listings_author_id_created_at', ['author_id', 'created_at'], unique=False)
+        batch_op.create_index('ix_listings_created_at', ['created_at'], unique=False)
+
+    op.create_table('notifications',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('sender_id', sa.Integer(), nullable=True),
+    sa.Column('type', sa.String(length=20), nullable=False),
+    sa.Column('message', sa.Text(), nullable=False),
+    sa.Column('read', sa.Boolean(), nullable=False),
+    sa.Column('related_content', sa.Text(), nullable=True),
+    sa.Column('related_image', sa.String(length=512), nullable=True),
+    sa.Column('group_count', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+    sa.ForeignKeyConstraint(['sender_id'], ['users.id'], name=op.f('fk_notifications_sender_id_users'), ondelete='SET NULL'),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], name=op.f('fk_notifications_user_id_users'), ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id', name=op.f('pk_notifications'))
+    )
+    with op.batch_alter_table('notifications', schema=None) as batch_op:
+        batch_op.create_index('ix_notifications_user_id_read_created_at', ['user_id', 'read', 'created_at'], unique=False)
+
+    op.create_table('comments',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('listing_id', sa.Integer(), nullable=False),
+    sa.Column('author_id', sa.Integer(), nullable=False),
+    sa.Column('text', sa.Text(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+    sa.ForeignKeyConstraint(['author_id'], ['users.id'], name=op.f('fk_comments_author_id_users'), ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['listing_id'], ['listings.id'], name=op.f('fk_comments_listing_id_listings'), ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id', name=op.f('pk_comments'))
+    )
+    with op.batch_alter_table('comments', schema=None) as batch_op:
+        batch_op.create_index('ix_comments_listing_id_created_at', ['listing_id', 'created_at'], unique=False)
+
+    op.create_table('listing_tags',
+    sa.Column('listing_id', sa.Integer(), nullable=False),
+    sa.Column('tag_id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+    sa.ForeignKeyConstraint(['listing_id'], ['listings.id'], name=op.f('fk_listing_tags_listing_id_listings'), ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['tag_id'], ['tags.id'], name=op.f('fk_listing_tags_tag_id_tags'), ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('listing_id', 'tag_id', name=op.f('pk_listing_tags'))
+    )
+    with op.batch_alter_table('listing_tags', schema=None) as batch_op:
+        batch_op.create_index('ix_listing_tags_tag_id_created_at', ['tag_id', 'created_at', 'listing_id'], unique=False)
+
+    op.create_table('trades',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('listing_id', sa.Integer(), nullable=False),
+    sa.Column('proposer_id', sa.Integer(), nullable=False),
+    sa.Column('counter_listing_id', sa.Integer(), nullable=True),
+    sa.Column('counter_description', sa.Text(), nullable=True),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
+    sa.ForeignKeyConstraint(['counter_listing_id'], ['listings.id'], name=op.f('fk_trades_counter_listing_id_listings'), ondelete='SET NULL'),
+    sa.ForeignKeyConstraint(['listing_id'], ['listings.id'], name=op.f('fk_trades_listing_id_listings'), ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['proposer_id'], ['users.id'], name=op.f('fk_trades_proposer_id_users'), ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id', name=op.f('pk_trades'))
+    )
+    with op.batch_alter_table('trades', schema=None) as batch_op:
+        batch_op.create_index('ix_trades_listing_id_status', ['listing_id', 'status'], unique=False)
+        batch_op.create_index('ix_trades_proposer_id_created_at', ['proposer_id', 'created_at'], unique=False)
+        batch_op.create_index('ix_trades_status_created_at', ['status', 'created_at'], unique=False)
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('trades', schema=None) as batch_op:
+        batch_op.drop_index('ix_trades_status_created_at')
+        batch_op.drop_index('ix_trades_proposer_id_created_at')
+        batch_op.drop_index('ix_trades_listing_id_status')
+
+    op.drop_table('trades')
+    with op.batch_alter_table('listing_tags', schema=None) as batch_op:
+        batch_op.drop_index('ix_listing_tags_tag_id_created_at')
+
+    op.drop_table('listing_tags')
+    with op.batch_alter_table('comments', schema=None) as batch_op:
+        batch_op.drop_index('ix_comments_listing_id_created_at')
+
+    op.drop_table('comments')
+    with op.batch_alter_table('notifications', schema=None) as batch_op:
+        batch_op.drop_index('ix_notifications_user_id_read_created_at')
+
+    op.drop_table('notifications')
+    with op.batch_alter_table('listings', schema=None) as batch_op:
+        batch_op.drop_index('ix_listings_created_at')
+        batch_op.drop_index('ix_listings_author_id_created_at')
+
+    op.drop_table('listings')
+    op.drop_table('users')
+    op.drop_table('tags')
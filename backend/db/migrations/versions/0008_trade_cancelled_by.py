@@ -0,0 +1,36 @@
+"""Record which participant cancelled a trade
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-19
+"""
+
+from __future__ import annotations
+
+from typing import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = '0008'
+down_revision: str | None = '0007'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('trades', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('cancelled_by', sa.Integer(), nullable=True))
+        batch_op.create_foreign_key(
+            batch_op.f('fk_trades_cancelled_by_users'),
+            'users',
+            ['cancelled_by'],
+            ['id'],
+            ondelete='SET NULL',
+        )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('trades', schema=None) as batch_op:
+        batch_op.drop_constraint(batch_op.f('fk_trades_cancelled_by_users'), type_='foreignkey')
+        batch_op.drop_column('cancelled_by')
@@ -0,0 +1,117 @@
+"""Async engine and session management.
+
+The engine is configured from ``DatabaseSettings``: pool sizing and recycling
+for PostgreSQL, plus SQLAlchemy's compiled-statement cache (and asyncpg's
+prepared statement cache) so hot queries skip SQL compilation entirely.
+SQLite (via aiosqlite) is supported for local development and tests.
+"""
+
+from __future__ import annotations
+
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import AsyncIterator
+
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+
+from ..core.config import DatabaseSettings
+from .base import Base
+
+
+def _is_memory_sqlite(database: str | None) -> bool:
+    return database in (None, "", ":memory:") or "mode=memory" in (database or "")
+
+
+def _enable_sqlite_pragmas(dbapi_connection, _connection_record) -> None:
+    """Apply per-connection SQLite pragmas (WAL, FK enforcement)."""
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA foreign_keys=ON")
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.close()
+
+
+def create_engine(settings: DatabaseSettings | None = None) -> AsyncEngine:
+    """Create an ``AsyncEngine`` tuned according to ``settings``.
+
+    Parameters
+    ----------
+    settings : DatabaseSettings | None
+        Connection settings. Defaults to ``DatabaseSettings.from_env()``.
+
+    Returns
+    -------
+    AsyncEngine
+        Configured engine. SQLite engines get WAL and foreign-key pragmas.
+    """
+    settings = settings or DatabaseSettings.from_env()
+    url = make_url(settings.url)
+    kwargs: dict = {
+        "echo": settings.echo,
+        "query_cache_size": settings.statement_cache_size,
+        "pool_pre_ping": settings.pool_pre_ping,
+    }
+
+    if url.get_backend_name() == "sqlite":
+        if not _is_memory_sqlite(url.database):
+            Path(url.database).parent.mkdir(parents=True, exist_ok=True)
+            kwargs.update(
+                pool_size=settings.pool_size,
+                max_overflow=settings.max_overflow,
+                pool_timeout=settings.pool_timeout,
+                pool_recycle=settings.pool_recycle,
+            )
+    else:
+        if url.get_driver_name() == "asyncpg":
+            url = url.update_query_dict(
+                {"prepared_statement_cache_size": str(settings.statement_cache_size)}
+            )
+        kwargs.update(
+            pool_size=settings.pool_size,
+            max_overflow=settings.max_overflow,
+            pool_timeout=settings.pool_timeout,
+            pool_recycle=settings.pool_recycle,
+        )
+
+    engine = create_async_engine(url, **kwargs)
+    if url.get_backend_name() == "sqlite":
+        event.listen(engine.sync_engine, "connect", _enable_sqlite_pragmas)
+    return engine
+
+
+def create_session_factory(engine: AsyncEngine) -> async_sessionmaker[AsyncSession]:
+    """Return a session factory bound to ``engine``.
+
+    ``expire_on_commit`` is disabled so objects returned by repositories stay
+    readable after the transaction ends without triggering lazy reloads.
+    """
+    return async_sessionmaker(engine, expire_on_commit=False)
+
+
+@asynccontextmanager
+async def session_scope(
+    factory: async_sessionmaker[AsyncSession],
+) -> AsyncIterator[AsyncSession]:
+    """Provide a transactional scope: commit on success, roll back on error."""
+    async with factory() as session:
+        try:
+            yield session
+            await session.commit()
+        except Exception:
+            await session.rollback()
+            raise
+
+
+async def init_models(engine: AsyncEngine) -> None:
+    """Create all tables for registered models (development and tests only)."""
+    from .. import models  # noqa: F401  (register mappers on Base.metadata)
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
@@ -0,0 +1,23 @@
+"""SQLAlchemy ORM models."""
+
+from .comment import Comment
+from .listing import Listing
+from .message import Message
+from .notification import Notification
+from .review import Review, UserReputation
+from .tag import Tag, listing_tags
+from .trade import Trade
+from .user import User
+
+__all__ = [
+    "Comment",
+    "Listing",
+    "Message",
+    "Notification",
+    "Review",
+    "Tag",
+    "Trade",
+    "User",
+    "UserReputation",
+    "listing_tags",
+]
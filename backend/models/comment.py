@@ -0,0 +1,36 @@
+"""Comment model."""
+
+from __future__ import annotations
+
+from datetime import datetime
+from typing import TYPE_CHECKING
+
+from sqlalchemy import DateTime, ForeignKey, Index, Integer, Text
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+from ..db.base import Base, utcnow
+
+if TYPE_CHECKING:
+    from .listing import Listing
+    from .user import User
+
+
+class Comment(Base):
+    """A comment left on a listing."""
+
+    __tablename__ = "comments"
+    __table_args__ = (
+        # Comment previews/threads: WHERE listing_id IN (...) ORDER BY created_at
+        Index("ix_comments_listing_id_created_at", "listing_id", "created_at"),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    listing_id: Mapped[int] = mapped_column(
+        ForeignKey("listings.id", ondelete="CASCADE")
+    )
+    author_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"))
+    text: Mapped[str] = mapped_column(Text)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=utcnow)
+
+    listing: Mapped["Listing"] = relationship(back_populates="comments", lazy="raise")
+    author: Mapped["User"] = relationship(lazy="raise")
@@ -0,0 +1,58 @@
+"""Listing (post) model."""
+
+from __future__ import annotations
+
+from datetime import datetime
+from typing import TYPE_CHECKING
+
+from sqlalchemy import DateTime, Float, ForeignKey, Index, Integer, String, Text
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+from ..db.base import Base, utcnow
+
+if TYPE_CHECKING:
+    from .comment import Comment
+    from .tag import Tag
+    from .user import User
+
+
+class Listing(Base):
+    """A publication offering or requesting an exchange.
+
+    Maps to the post dicts rendered by ``PostCard`` (``post_title``,
+    ``post_description``, ``image_path``...).
+    """
+
+    __tablename__ = "listings"
+    __table_args__ = (
+        # Profile feed: WHERE author_id = ? ORDER BY created_at DESC
+        Index("ix_listings_author_id_created_at", "author_id", "created_at"),
+        # Home feed: ORDER BY created_at DESC, id DESC (id is the rowid)
+        Index("ix_listings_created_at", "created_at"),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    author_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"))
+    title: Mapped[str] = mapped_column(String(120))
+    description: Mapped[str] = mapped_column(Text, default="")
+    image_path: Mapped[str | None] = mapped_column(String(512), nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=utcnow)
+    # WGS84 degrees; location search runs on the in-memory GeoIndex
+    latitude: Mapped[float | None] = mapped_column(Float, nullable=True)
+    longitude: Mapped[float | None] = mapped_column(Float, nullable=True)
+    # Denormalized; maintained by CommentRepository so cards never COUNT(*)
+    comment_count: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+
+    author: Mapped["User"] = relationship(back_populates="listings", lazy="raise")
+    comments: Mapped[list["Comment"]] = relationship(
+        back_populates="listing",
+        lazy="raise",
+        order_by="Comment.created_at",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+    )
+    # Written through ListingRepository.set_tags (the association row carries
+    # a copy of created_at), hence read-only here.
+    tags: Mapped[list["Tag"]] = relationship(
+        secondary="listing_tags", lazy="raise", viewonly=True
+    )
@@ -0,0 +1,36 @@
+"""Trade chat message model."""
+
+from __future__ import annotations
+
+from datetime import datetime
+from typing import TYPE_CHECKING
+
+from sqlalchemy import DateTime, ForeignKey, Index, Integer, Text
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+from ..db.base import Base, utcnow
+
+if TYPE_CHECKING:
+    from .user import User
+
+
+class Message(Base):
+    """A chat message attached to a trade (``POST /messages``).
+
+    Messages are append-only; the autoincrement ``id`` doubles as the
+    per-trade ordering key and history cursor.
+    """
+
+    __tablename__ = "messages"
+    __table_args__ = (
+        # History pages: WHERE trade_id = ? AND id < ? ORDER BY id DESC
+        Index("ix_messages_trade_id_id", "trade_id", "id"),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    trade_id: Mapped[int] = mapped_column(ForeignKey("trades.id", ondelete="CASCADE"))
+    sender_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"))
+    body: Mapped[str] = mapped_column(Text)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=utcnow)
+
+    sender: Mapped["User"] = relationship(lazy="raise")
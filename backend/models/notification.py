@@ -0,0 +1,48 @@
+"""Notification model."""
+
+from __future__ import annotations
+
+from datetime import datetime
+from typing import TYPE_CHECKING
+
+from sqlalchemy import Boolean, DateTime, ForeignKey, Index, Integer, String, Text
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+from ..db.base import Base, utcnow
+
+if TYPE_CHECKING:
+    from .user import User
+
+
+class Notification(Base):
+    """In-app notification delivered to a user.
+
+    ``type`` is one of ``comment``, ``like``, ``new_post`` or ``system``
+    (see ``mock.notifications.get_mock_notifications``).
+    """
+
+    __tablename__ = "notifications"
+    __table_args__ = (
+        # Notification center: WHERE user_id = ? [AND read = ?] ORDER BY created_at
+        Index(
+            "ix_notifications_user_id_read_created_at",
+            "user_id",
+            "read",
+            "created_at",
+        ),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"))
+    sender_id: Mapped[int | None] = mapped_column(
+        ForeignKey("users.id", ondelete="SET NULL"), nullable=True
+    )
+    type: Mapped[str] = mapped_column(String(20))
+    message: Mapped[str] = mapped_column(Text)
+    read: Mapped[bool] = mapped_column(Boolean, default=False)
+    related_content: Mapped[str | None] = mapped_column(Text, nullable=True)
+    related_image: Mapped[str | None] = mapped_column(String(512), nullable=True)
+    group_count: Mapped[int] = mapped_column(Integer, default=1)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=utcnow)
+
+    sender: Mapped["User | None"] = relationship(foreign_keys=[sender_id], lazy="raise")
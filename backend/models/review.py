@@ -0,0 +1,74 @@
+"""Review model and the per-user reputation aggregates."""
+
+from __future__ import annotations
+
+from datetime import datetime
+from typing import TYPE_CHECKING
+
+from sqlalchemy import (
+    CheckConstraint,
+    DateTime,
+    Float,
+    ForeignKey,
+    Index,
+    Integer,
+    SmallInteger,
+    Text,
+    UniqueConstraint,
+)
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+from ..db.base import Base, utcnow
+
+if TYPE_CHECKING:
+    from .user import User
+
+
+class Review(Base):
+    """A rating (1-5) left on a user (``POST /users/:id/review``)."""
+
+    __tablename__ = "reviews"
+    __table_args__ = (
+        # Review list on a profile / compaction scan: WHERE user_id = ?
+        Index("ix_reviews_user_id_created_at", "user_id", "created_at"),
+        # One review per side of a trade
+        UniqueConstraint("trade_id", "reviewer_id"),
+        CheckConstraint("rating BETWEEN 1 AND 5", name="rating_range"),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"))
+    reviewer_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"))
+    trade_id: Mapped[int | None] = mapped_column(
+        ForeignKey("trades.id", ondelete="SET NULL"), nullable=True
+    )
+    rating: Mapped[int] = mapped_column(SmallInteger)
+    comment: Mapped[str] = mapped_column(Text, default="")
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=utcnow)
+
+    reviewer: Mapped["User"] = relationship(foreign_keys=[reviewer_id], lazy="raise")
+
+
+class UserReputation(Base):
+    """Running reputation aggregates of one user.
+
+    Maintained incrementally by ``services.reputation_service`` (each review
+    or completed trade is one additive UPDATE) and recomputed from
+    ``reviews``/``trades`` by its compaction job. ``decayed_*`` use forward
+    decay: a review at time t weighs ``2 ** ((t - epoch) / half_life)``, so
+    older reviews count less without ever rewriting the sums.
+    """
+
+    __tablename__ = "user_reputation"
+
+    user_id: Mapped[int] = mapped_column(
+        ForeignKey("users.id", ondelete="CASCADE"), primary_key=True
+    )
+    review_count: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+    rating_sum: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+    decayed_rating_sum: Mapped[float] = mapped_column(Float, default=0.0, server_default="0")
+    decayed_weight: Mapped[float] = mapped_column(Float, default=0.0, server_default="0")
+    completed_trades: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=utcnow, onupdate=utcnow
+    )
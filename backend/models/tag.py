@@ -0,0 +1,33 @@
+"""Tag model and the listing/tag association table."""
+
+from __future__ import annotations
+
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, String, Table
+from sqlalchemy.orm import Mapped, mapped_column
+
+from ..db.base import Base
+
+# ``created_at`` is copied from the listing so "newest listings with tag X"
+# (the search category filter) is a single ordered range scan on
+# (tag_id, created_at, listing_id) instead of a join followed by a sort.
+listing_tags = Table(
+    "listing_tags",
+    Base.metadata,
+    Column(
+        "listing_id",
+        ForeignKey("listings.id", ondelete="CASCADE"),
+        primary_key=True,
+    ),
+    Column("tag_id", ForeignKey("tags.id", ondelete="CASCADE"), primary_key=True),
+    Column("created_at", DateTime(timezone=True), nullable=False),
+    Index("ix_listing_tags_tag_id_created_at", "tag_id", "created_at", "listing_id"),
+)
+
+
+class Tag(Base):
+    """A category label such as "educação" or "tecnologia"."""
+
+    __tablename__ = "tags"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    name: Mapped[str] = mapped_column(String(50), unique=True)
@@ -0,0 +1,67 @@
+"""Trade proposal model."""
+
+from __future__ import annotations
+
+from datetime import datetime
+from typing import TYPE_CHECKING
+
+from sqlalchemy import DateTime, ForeignKey, Index, Integer, String, Text
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+from ..db.base import Base, utcnow
+
+if TYPE_CHECKING:
+    from .listing import Listing
+    from .user import User
+
+
+class Trade(Base):
+    """An exchange proposal made against a listing.
+
+    Status moves ``pending -> accepted -> completed`` (or ``cancelled`` /
+    ``expired``), as described in the MVP roadmap. ``version`` is bumped by
+    every state change and guards updates optimistically (see
+    ``services.trade_service``); an accepted trade completes once both the
+    proposer and the listing owner have confirmed.
+    """
+
+    __tablename__ = "trades"
+    __table_args__ = (
+        # "My proposals": WHERE proposer_id = ? ORDER BY created_at DESC
+        Index("ix_trades_proposer_id_created_at", "proposer_id", "created_at"),
+        # Offers received on a listing, filtered by state
+        Index("ix_trades_listing_id_status", "listing_id", "status"),
+        # Expiry job: WHERE status = 'pending' AND created_at < ?
+        Index("ix_trades_status_created_at", "status", "created_at"),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    listing_id: Mapped[int] = mapped_column(
+        ForeignKey("listings.id", ondelete="CASCADE")
+    )
+    proposer_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"))
+    counter_listing_id: Mapped[int | None] = mapped_column(
+        ForeignKey("listings.id", ondelete="SET NULL"), nullable=True
+    )
+    counter_description: Mapped[str | None] = mapped_column(Text, nullable=True)
+    status: Mapped[str] = mapped_column(String(20), default="pending")
+    version: Mapped[int] = mapped_column(Integer, default=1, server_default="1")
+    proposer_confirmed_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+    owner_confirmed_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+    # Participant who withdrew the trade; None for system cancels (batch jobs)
+    cancelled_by: Mapped[int | None] = mapped_column(
+        ForeignKey("users.id", ondelete="SET NULL"), nullable=True
+    )
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=utcnow)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=utcnow, onupdate=utcnow
+    )
+
+    listing: Mapped["Listing"] = relationship(
+        foreign_keys=[listing_id], lazy="raise"
+    )
+    proposer: Mapped["User"] = relationship(foreign_keys=[proposer_id], lazy="raise")
@@ -0,0 +1,51 @@
+"""User account model."""
+
+from __future__ import annotations
+
+from datetime import datetime
+from typing import TYPE_CHECKING
+
+from sqlalchemy import DateTime, Float, Integer, String, Text
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+from ..db.base import Base, utcnow
+
+if TYPE_CHECKING:
+    from .listing import Listing
+
+
+class User(Base):
+    """Registered SCAMBO user.
+
+    Mirrors the fields the frontend reads from ``mock.user.get_current_user()``
+    and the ``author_name``/``avatar_*`` keys on posts and comments.
+    """
+
+    __tablename__ = "users"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    name: Mapped[str] = mapped_column(String(80))
+    email: Mapped[str] = mapped_column(String(255), unique=True)
+    phone: Mapped[str | None] = mapped_column(String(32), nullable=True)
+    # Argon2 PHC string; None for accounts created through social login
+    password_hash: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    # Base32 TOTP secret; set once 2FA is enabled
+    totp_secret: Mapped[str | None] = mapped_column(String(64), nullable=True)
+    # Secret being enrolled; becomes totp_secret once a code from it is verified
+    totp_pending_secret: Mapped[str | None] = mapped_column(String(64), nullable=True)
+    # Last accepted TOTP time step (codes at or before it are rejected)
+    totp_last_step: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    avatar_text: Mapped[str] = mapped_column(String(4), default="?")
+    avatar_bg: Mapped[str] = mapped_column(String(9), default="#9E9E9E")
+    bio: Mapped[str] = mapped_column(Text, default="")
+    reputation: Mapped[float] = mapped_column(Float, default=0.0)
+    # Denormalized nav-bar badge; maintained by NotificationRepository
+    unread_notification_count: Mapped[int] = mapped_column(
+        Integer, default=0, server_default="0"
+    )
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=utcnow)
+
+    # lazy="raise": relationships must be eager-loaded explicitly (no hidden N+1)
+    listings: Mapped[list["Listing"]] = relationship(
+        back_populates="author", lazy="raise"
+    )
@@ -0,0 +1,23 @@
+"""Validated request/response schemas (msgspec)."""
+
+from .codec import ResponseEncoder, decode, validate
+from .comment import CommentSchema
+from .message import MessageSchema
+from .notification import NotificationSchema
+from .post import FeedPageSchema, PostSchema
+from .review import ReputationSchema, ReviewSchema
+from .user import UserSchema
+
+__all__ = [
+    "CommentSchema",
+    "FeedPageSchema",
+    "MessageSchema",
+    "NotificationSchema",
+    "PostSchema",
+    "ReputationSchema",
+    "ResponseEncoder",
+    "ReviewSchema",
+    "UserSchema",
+    "decode",
+    "validate",
+]
@@ -0,0 +1,14 @@
+"""Constrained field types shared by the schemas."""
+
+from __future__ import annotations
+
+from typing import Annotated
+
+import msgspec
+
+HexColor = Annotated[str, msgspec.Meta(pattern=r"^#[0-9A-Fa-f]{6}([0-9A-Fa-f]{2})?$")]
+AvatarText = Annotated[str, msgspec.Meta(min_length=1, max_length=4)]
+Name = Annotated[str, msgspec.Meta(min_length=1, max_length=80)]
+Title = Annotated[str, msgspec.Meta(min_length=1, max_length=120)]
+Text = Annotated[str, msgspec.Meta(max_length=5000)]
+Tag = Annotated[str, msgspec.Meta(min_length=1, max_length=50)]
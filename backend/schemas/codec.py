@@ -0,0 +1,71 @@
+"""Validation and JSON encoding helpers for the schemas.
+
+Decoders are built once per type so msgspec can reuse its compiled
+validators; ``ResponseEncoder`` writes list responses into a reusable buffer
+and hands back a ``memoryview`` of it, so encoding a feed page allocates no
+intermediate ``dict``/``str`` objects and no per-response ``bytes``.
+"""
+
+from __future__ import annotations
+
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Any, Iterator, TypeVar
+
+import msgspec
+
+T = TypeVar("T")
+
+
+@lru_cache(maxsize=None)
+def _json_decoder(schema: type) -> msgspec.json.Decoder:
+    return msgspec.json.Decoder(schema)
+
+
+def validate(data: Any, schema: type[T]) -> T:
+    """Validate a Python object (e.g. a mock dict) into ``schema``.
+
+    Raises
+    ------
+    msgspec.ValidationError
+        If a field is missing, has the wrong type or violates a constraint.
+    """
+    return msgspec.convert(data, schema)
+
+
+def decode(payload: bytes | str, schema: type[T]) -> T:
+    """Parse and validate a JSON request body in a single pass."""
+    return _json_decoder(schema).decode(payload)
+
+
+class ResponseEncoder:
+    """JSON encoder that reuses one output buffer across responses.
+
+    ``encoded()`` yields a ``memoryview`` over the shared buffer and releases
+    it on exit (the buffer cannot be resized while a view is alive), so write
+    the view to the transport inside the ``with`` block. Use one instance per
+    worker/connection; it is not thread-safe.
+
+    Parameters
+    ----------
+    initial_size : int
+        Starting buffer capacity in bytes; it grows as needed and is kept.
+    """
+
+    def __init__(self, initial_size: int = 64 * 1024):
+        self._encoder = msgspec.json.Encoder()
+        self._buffer = bytearray(initial_size)
+
+    @contextmanager
+    def encoded(self, obj: Any) -> Iterator[memoryview]:
+        """Encode ``obj`` into the shared buffer and yield a view of it."""
+        self._encoder.encode_into(obj, self._buffer)
+        view = memoryview(self._buffer)
+        try:
+            yield view
+        finally:
+            view.release()
+
+    def encode_bytes(self, obj: Any) -> bytes:
+        """Encode ``obj`` into a fresh ``bytes`` object (safe to keep)."""
+        return self._encoder.encode(obj)
@@ -0,0 +1,16 @@
+"""Comment payload schema."""
+
+from __future__ import annotations
+
+import msgspec
+
+from ._types import AvatarText, HexColor, Name, Text
+
+
+class CommentSchema(msgspec.Struct, frozen=True, omit_defaults=True):
+    """A comment as rendered under a ``PostCard``."""
+
+    author_name: Name
+    avatar_bg: HexColor
+    avatar_text: AvatarText
+    comment_text: Text
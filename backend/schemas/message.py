@@ -0,0 +1,19 @@
+"""Trade chat message schema."""
+
+from __future__ import annotations
+
+from typing import Annotated
+
+import msgspec
+
+MessageBody = Annotated[str, msgspec.Meta(min_length=1, max_length=2000)]
+
+
+class MessageSchema(msgspec.Struct, frozen=True):
+    """A chat message as sent over ``/ws/trades/{id}`` and history reads."""
+
+    id: int
+    trade_id: int
+    sender_id: int
+    body: MessageBody
+    created_at: float  # Unix timestamp
@@ -0,0 +1,27 @@
+"""Notification payload schema."""
+
+from __future__ import annotations
+
+from typing import Annotated, Literal
+
+import msgspec
+
+from ._types import AvatarText, HexColor, Name, Text
+
+NotificationType = Literal["comment", "like", "new_post", "system"]
+
+
+class NotificationSchema(msgspec.Struct, frozen=True, omit_defaults=True):
+    """A notification as listed by ``mock.notifications.get_mock_notifications()``."""
+
+    id: int
+    type: NotificationType
+    message: Text
+    read: bool
+    timestamp: str
+    sender_name: Name | None = None
+    sender_avatar_bg: HexColor | None = None
+    sender_avatar_text: AvatarText | None = None
+    related_content: Text | None = None
+    related_image: str | None = None
+    group_count: Annotated[int, msgspec.Meta(ge=1)] | None = None
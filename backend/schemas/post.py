@@ -0,0 +1,36 @@
+"""Post and feed page payload schemas."""
+
+from __future__ import annotations
+
+from typing import Annotated
+
+import msgspec
+
+from ._types import AvatarText, HexColor, Name, Tag, Text, Title
+
+
+class PostSchema(msgspec.Struct, frozen=True, omit_defaults=True):
+    """A post with the keys ``PostCard`` and the search grid consume."""
+
+    author_name: Name
+    avatar_bg: HexColor
+    avatar_text: AvatarText
+    post_title: Title
+    post_description: Text
+    post_date: str
+    tags: Annotated[list[Tag], msgspec.Meta(max_length=20)] = []
+    image_path: str | None = None
+    latitude: Annotated[float, msgspec.Meta(ge=-90, le=90)] | None = None
+    longitude: Annotated[float, msgspec.Meta(ge=-180, le=180)] | None = None
+    # Only set on location-filtered results
+    distance_km: Annotated[float, msgspec.Meta(ge=0)] | None = None
+
+
+class FeedPageSchema(msgspec.Struct, frozen=True):
+    """One page of posts, shaped like ``mock.posts.get_paginated_posts()``."""
+
+    posts: list[PostSchema]
+    total: Annotated[int, msgspec.Meta(ge=0)]
+    page: Annotated[int, msgspec.Meta(ge=1)]
+    page_size: Annotated[int, msgspec.Meta(ge=1)]
+    has_more: bool
@@ -0,0 +1,37 @@
+"""Review and reputation schemas."""
+
+from __future__ import annotations
+
+from typing import Annotated
+
+import msgspec
+
+from ._types import Text
+
+Rating = Annotated[int, msgspec.Meta(ge=1, le=5)]
+Stars = Annotated[float, msgspec.Meta(ge=0, le=5)]
+
+
+class ReviewSchema(msgspec.Struct, frozen=True, omit_defaults=True):
+    """Body of ``POST /users/:id/review``."""
+
+    rating: Rating
+    comment: Text = ""
+    trade_id: int | None = None
+
+
+class ReputationSchema(msgspec.Struct, frozen=True):
+    """A user's reputation as shown in the profile stats row.
+
+    ``rating`` is the Bayesian-smoothed average (few reviews stay near the
+    prior), ``recent_rating`` the same with older reviews decayed, and
+    ``points`` the +1-per-completed-trade score from the MVP roadmap.
+    """
+
+    user_id: int
+    review_count: int
+    average: Stars
+    rating: Stars
+    recent_rating: Stars
+    completed_trades: int
+    points: int
@@ -0,0 +1,20 @@
+"""User payload schema."""
+
+from __future__ import annotations
+
+from typing import Annotated
+
+import msgspec
+
+from ._types import AvatarText, HexColor, Name, Text
+
+
+class UserSchema(msgspec.Struct, frozen=True, omit_defaults=True):
+    """Public profile as returned by ``mock.user.get_current_user()``."""
+
+    name: Name
+    email: Annotated[str, msgspec.Meta(pattern=r"^[^@\s]+@[^@\s]+$", max_length=255)]
+    avatar_text: AvatarText
+    avatar_bg: HexColor
+    bio: Text = ""
+    reputation: Annotated[float, msgspec.Meta(ge=0, le=5)] = 0.0
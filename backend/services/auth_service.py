@@ -0,0 +1,520 @@
+"""Authentication: password hashing, JWT access/refresh tokens and TOTP 2FA.
+
+Endpoints served (see docs/initial docs/technical_requirements.md):
+``POST /auth/register``, ``/auth/login``, ``/auth/refresh``, ``/auth/logout``,
+``/auth/enable-2fa`` and ``/auth/verify-2fa``.
+
+2FA enrolment takes two steps: ``enable_2fa`` stores a pending secret and
+``verify_2fa`` activates it once the user enters a code from it, so a
+mis-scanned QR code never locks the account. The time step of every
+accepted code is recorded, so a code cannot be replayed within its window.
+
+Performance notes:
+- Argon2 hashing is CPU-bound (tens of ms per call), so it runs in a bounded
+  ``ProcessPoolExecutor``. The event loop never blocks on it and concurrent
+  logins spread across cores. A semaphore caps queued jobs so a login burst
+  waits in the loop instead of piling up unbounded work in the pool.
+- Signing/verification keys are parsed once when ``TokenManager`` is built.
+- Verified access tokens are kept in a short-TTL LRU cache, so repeated
+  requests with the same bearer token skip the signature check. Entries never
+  outlive the token's own ``exp``, and logout evicts them immediately.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import base64
+import hashlib
+import hmac
+import multiprocessing
+import os
+import secrets
+import struct
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any
+from urllib.parse import quote
+
+import jwt
+from argon2 import PasswordHasher
+from argon2.exceptions import InvalidHashError, VerificationError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from ..core.audit import AuditSink
+from ..core.cache import TTLCache
+from ..core.config import AuthSettings
+from ..db.session import session_scope
+from ..models import User
+from .db_service import UserRepository
+
+# ============================================================================
+# ERRORS
+# ============================================================================
+
+
+class AuthError(Exception):
+    """Base class for authentication failures."""
+
+
+class InvalidCredentialsError(AuthError):
+    """Wrong email/password, or wrong/missing 2FA code."""
+
+
+class InvalidTokenError(AuthError):
+    """Token is malformed, expired, revoked or of the wrong type."""
+
+
+class EmailAlreadyRegisteredError(AuthError):
+    """``register`` was called with an email that already has an account."""
+
+
+# ============================================================================
+# PASSWORD HASHING (process pool)
+# ============================================================================
+
+
+@dataclass(frozen=True)
+class HashParams:
+    """Argon2id cost parameters (defaults follow argon2-cffi's RFC 9106 profile)."""
+
+    time_cost: int = 3
+    memory_cost: int = 65536  # KiB
+    parallelism: int = 1  # one lane per hash; concurrency comes from the pool
+
+
+@lru_cache(maxsize=4)
+def _hasher(params: HashParams) -> PasswordHasher:
+    return PasswordHasher(
+        time_cost=params.time_cost,
+        memory_cost=params.memory_cost,
+        parallelism=params.parallelism,
+    )
+
+
+def _hash_password(params: HashParams, password: str) -> str:
+    """Worker-side: return an Argon2 PHC string for ``password``."""
+    return _hasher(params).hash(password)
+
+
+def _verify_password(
+    params: HashParams, password_hash: str, password: str
+) -> tuple[bool, bool]:
+    """Worker-side: return ``(matches, needs_rehash)``."""
+    hasher = _hasher(params)
+    try:
+        hasher.verify(password_hash, password)
+    except (VerificationError, InvalidHashError):
+        return False, False
+    return True, hasher.check_needs_rehash(password_hash)
+
+
+class PasswordHasherPool:
+    """Runs Argon2 hashing in worker processes.
+
+    Parameters
+    ----------
+    max_workers : int | None
+        Worker processes (default: CPU count).
+    params : HashParams
+        Argon2 cost parameters.
+    max_pending : int | None
+        Maximum jobs submitted at once (default: ``2 * max_workers``);
+        further callers wait on a semaphore in the event loop.
+    """
+
+    def __init__(
+        self,
+        max_workers: int | None = None,
+        params: HashParams | None = None,
+        max_pending: int | None = None,
+    ):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.params = params or HashParams()
+        self._max_pending = max_pending or 2 * self.max_workers
+        self._executor: ProcessPoolExecutor | None = None
+        self._slots: asyncio.Semaphore | None = None
+        # Precomputed so unknown-email logins cost the same as wrong passwords
+        self._dummy_hash = _hash_password(self.params, secrets.token_hex(16))
+
+    def _pool(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # "spawn" avoids forking a process that already runs an event loop
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+            self._slots = asyncio.Semaphore(self._max_pending)
+        return self._executor
+
+    async def _run(self, fn, *args):
+        pool = self._pool()
+        async with self._slots:
+            return await asyncio.get_running_loop().run_in_executor(pool, fn, *args)
+
+    async def hash(self, password: str) -> str:
+        """Hash ``password`` off the event loop."""
+        return await self._run(_hash_password, self.params, password)
+
+    async def verify(self, password_hash: str | None, password: str) -> tuple[bool, bool]:
+        """Check ``password``; returns ``(matches, needs_rehash)``.
+
+        A missing hash is checked against a dummy hash so the response time
+        does not reveal whether the account exists.
+        """
+        if password_hash is None:
+            await self._run(_verify_password, self.params, self._dummy_hash, password)
+            return False, False
+        return await self._run(_verify_password, self.params, password_hash, password)
+
+    def shutdown(self) -> None:
+        """Stop the worker processes."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+
+# ============================================================================
+# TOKENS (JWT)
+# ============================================================================
+
+
+@dataclass(frozen=True)
+class TokenPair:
+    """Access/refresh tokens returned by login and refresh."""
+
+    access_token: str
+    refresh_token: str
+    token_type: str = "bearer"
+
+
+class TokenManager:
+    """Signs and verifies JWTs with pre-parsed keys and a verified-token cache.
+
+    Parameters
+    ----------
+    settings : AuthSettings
+        Algorithm, keys, lifetimes and cache bounds.
+    clock : callable
+        Wall-clock source in seconds (injectable for tests).
+    """
+
+    def __init__(self, settings: AuthSettings, clock=time.time):
+        self.settings = settings
+        self._clock = clock
+        algorithm = jwt.get_algorithm_by_name(settings.jwt_algorithm)
+        self._algorithm_name = settings.jwt_algorithm
+        # Parse PEM/HMAC keys once instead of on every encode/decode
+        self._signing_key = algorithm.prepare_key(settings.jwt_secret)
+        self._verifying_key = (
+            algorithm.prepare_key(settings.jwt_public_key)
+            if settings.jwt_public_key
+            else self._signing_key
+        )
+        self._verified: TTLCache[str, dict[str, Any]] = TTLCache(
+            maxsize=settings.token_cache_size, ttl=settings.token_cache_ttl
+        )
+        self._revoked: dict[str, float] = {}  # jti -> exp
+
+    def _encode(self, claims: dict[str, Any]) -> str:
+        return jwt.encode(claims, self._signing_key, algorithm=self._algorithm_name)
+
+    def issue(self, user_id: int, mfa: bool = False) -> TokenPair:
+        """Create a new access/refresh pair for ``user_id``."""
+        now = int(self._clock())
+        base = {"sub": str(user_id), "iat": now, "mfa": mfa}
+        access = dict(
+            base,
+            typ="access",
+            jti=uuid.uuid4().hex,
+            exp=now + self.settings.access_token_ttl,
+        )
+        refresh = dict(
+            base,
+            typ="refresh",
+            jti=uuid.uuid4().hex,
+            exp=now + self.settings.refresh_token_ttl,
+        )
+        return TokenPair(self._encode(access), self._encode(refresh))
+
+    def verify(self, token: str, expected_type: str = "access") -> dict[str, Any]:
+        """Return the claims of a valid token.
+
+        Access tokens are served from the verified-token cache when possible;
+        refresh tokens are always fully verified (they are used rarely).
+
+        Raises
+        ------
+        InvalidTokenError
+            If the signature, expiry, type or revocation check fails.
+        """
+        cacheable = expected_type == "access"
+        if cacheable:
+            claims = self._verified.get(token)
+            if claims is not None:
+                return claims
+
+        try:
+            claims = jwt.decode(
+                token,
+                self._verifying_key,
+                algorithms=[self._algorithm_name],
+                options={"require": ["exp", "sub", "jti"]},
+            )
+        except jwt.PyJWTError as exc:
+            raise InvalidTokenError(str(exc)) from exc
+        if claims.get("typ") != expected_type:
+            raise InvalidTokenError(f"expected a {expected_type} token")
+        if claims["jti"] in self._revoked:
+            raise InvalidTokenError("token has been revoked")
+
+        if cacheable:
+            self._verified.set(token, claims, ttl=claims["exp"] - self._clock())
+        return claims
+
+    def revoke(self, token: str) -> None:
+        """Revoke ``token`` (logout): deny its ``jti`` until it expires."""
+        self._verified.pop(token)
+        try:
+            claims = jwt.decode(
+                token,
+                self._verifying_key,
+                algorithms=[self._algorithm_name],
+                options={"verify_exp": False},
+            )
+        except jwt.PyJWTError:
+            return
+        self._revoked[claims["jti"]] = claims["exp"]
+        self._purge_revoked()
+
+    def _purge_revoked(self) -> None:
+        now = self._clock()
+        expired = [jti for jti, exp in self._revoked.items() if exp < now]
+        for jti in expired:
+            del self._revoked[jti]
+
+
+# ============================================================================
+# TOTP (RFC 6238)
+# ============================================================================
+
+TOTP_DIGITS = 6
+TOTP_PERIOD = 30
+
+
+def generate_totp_secret() -> str:
+    """Return a random base32 secret for a new authenticator enrolment."""
+    return base64.b32encode(secrets.token_bytes(20)).decode("ascii")
+
+
+def totp_code(secret: str, for_time: float | None = None) -> str:
+    """Return the TOTP code for ``secret`` at ``for_time`` (default: now)."""
+    counter = int((time.time() if for_time is None else for_time) // TOTP_PERIOD)
+    key = base64.b32decode(secret, casefold=True)
+    digest = hmac.new(key, struct.pack(">Q", counter), hashlib.sha1).digest()
+    offset = digest[-1] & 0x0F
+    value = struct.unpack(">I", digest[offset : offset + 4])[0] & 0x7FFFFFFF
+    return str(value % 10**TOTP_DIGITS).zfill(TOTP_DIGITS)
+
+
+def match_totp(
+    secret: str, code: str, window: int = 1, for_time: float | None = None
+) -> int | None:
+    """Return the time step ``code`` is valid for, or None.
+
+    Checks the current step and ``window`` steps around it. The step lets
+    callers reject a code that was already accepted (replay protection).
+    """
+    now = time.time() if for_time is None else for_time
+    for offset in range(-window, window + 1):
+        at = now + offset * TOTP_PERIOD
+        if hmac.compare_digest(totp_code(secret, at), code):
+            return int(at // TOTP_PERIOD)
+    return None
+
+
+def verify_totp(secret: str, code: str, window: int = 1) -> bool:
+    """Check ``code`` against the current step and ``window`` steps around it."""
+    return match_totp(secret, code, window) is not None
+
+
+def totp_provisioning_uri(secret: str, email: str, issuer: str = "Scambo") -> str:
+    """Return an ``otpauth://`` URI for authenticator app QR codes."""
+    label = quote(f"{issuer}:{email}")
+    return f"otpauth://totp/{label}?secret={secret}&issuer={quote(issuer)}"
+
+
+# ============================================================================
+# SERVICE
+# ============================================================================
+
+
+@dataclass(frozen=True)
+class LoginResult:
+    """Outcome of ``AuthService.login``.
+
+    ``tokens`` is None when ``mfa_required`` is True: the client must call
+    ``login`` again with the TOTP code.
+    """
+
+    tokens: TokenPair | None
+    mfa_required: bool = False
+
+
+class AuthService:
+    """Registration, login, token refresh/logout and 2FA enrolment.
+
+    Parameters
+    ----------
+    session_factory : async_sessionmaker[AsyncSession]
+        Factory from ``backend.db.create_session_factory``.
+    settings : AuthSettings | None
+        Defaults to ``AuthSettings.from_env()``.
+    hasher : PasswordHasherPool | None
+        Shared hashing pool (created from ``settings`` if omitted).
+    audit : AuditSink | None
+        When given, logins (successful and failed), 2FA changes and logouts
+        are recorded to the audit log.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        settings: AuthSettings | None = None,
+        hasher: PasswordHasherPool | None = None,
+        audit: AuditSink | None = None,
+    ):
+        self.settings = settings or AuthSettings.from_env()
+        self.sessions = session_factory
+        self.hasher = hasher or PasswordHasherPool(self.settings.hash_workers)
+        self.tokens = TokenManager(self.settings)
+        self.audit = audit
+
+    def _audit(self, action: str, actor_id: int | None = None, **detail) -> None:
+        if self.audit is not None:
+            self.audit.record(action, actor_id, **detail)
+
+    async def register(
+        self, email: str, password: str, name: str, phone: str | None = None
+    ) -> User:
+        """Create an account (``POST /auth/register``)."""
+        password_hash = await self.hasher.hash(password)
+        async with session_scope(self.sessions) as session:
+            users = UserRepository(session)
+            if await users.get_by_email(email) is not None:
+                raise EmailAlreadyRegisteredError(email)
+            return await users.add(
+                User(
+                    email=email,
+                    name=name,
+                    phone=phone,
+                    avatar_text=name[:1].upper() or "?",
+                    password_hash=password_hash,
+                )
+            )
+
+    async def login(
+        self, email: str, password: str, totp: str | None = None
+    ) -> LoginResult:
+        """Check credentials (and 2FA when enabled) and issue tokens."""
+        async with self.sessions() as session:
+            user = await UserRepository(session).get_by_email(email)
+        matches, needs_rehash = await self.hasher.verify(
+            user.password_hash if user else None, password
+        )
+        if not matches or user is None:
+            self._audit("auth.login_failed", user.id if user else None, email=email)
+            raise InvalidCredentialsError("invalid email or password")
+
+        if needs_rehash:
+            new_hash = await self.hasher.hash(password)
+            async with session_scope(self.sessions) as session:
+                stored = await UserRepository(session).get(user.id)
+                stored.password_hash = new_hash
+
+        if user.totp_secret:
+            if totp is None:
+                return LoginResult(tokens=None, mfa_required=True)
+            if not await self._consume_totp(user.id, user.totp_secret, totp):
+                self._audit("auth.2fa_failed", user.id)
+                raise InvalidCredentialsError("invalid 2FA code")
+        self._audit("auth.login", user.id, mfa=bool(user.totp_secret))
+        return LoginResult(tokens=self.tokens.issue(user.id, mfa=bool(user.totp_secret)))
+
+    def authenticate(self, access_token: str) -> dict[str, Any]:
+        """Return the claims for a bearer token (hot path, usually cached)."""
+        return self.tokens.verify(access_token, "access")
+
+    def refresh(self, refresh_token: str) -> TokenPair:
+        """Rotate tokens (``POST /auth/refresh``); the old refresh is revoked."""
+        claims = self.tokens.verify(refresh_token, "refresh")
+        self.tokens.revoke(refresh_token)
+        return self.tokens.issue(int(claims["sub"]), mfa=claims.get("mfa", False))
+
+    def logout(self, access_token: str, refresh_token: str | None = None) -> None:
+        """Revoke the session's tokens (``POST /auth/logout``)."""
+        if self.audit is not None:
+            try:
+                user_id = int(self.tokens.verify(access_token, "access")["sub"])
+            except InvalidTokenError:
+                user_id = None
+            self._audit("auth.logout", user_id)
+        self.tokens.revoke(access_token)
+        if refresh_token:
+            self.tokens.revoke(refresh_token)
+
+    async def _consume_totp(self, user_id: int, secret: str, code: str) -> bool:
+        """Accept ``code`` once: its step must be later than the last accepted."""
+        step = match_totp(secret, code)
+        if step is None:
+            return False
+        async with session_scope(self.sessions) as session:
+            return await UserRepository(session).consume_totp_step(user_id, step)
+
+    async def enable_2fa(self, user_id: int, code: str | None = None) -> str:
+        """Start a TOTP enrolment (``POST /auth/enable-2fa``).
+
+        The new secret stays pending, and login keeps using the current one,
+        until ``verify_2fa`` sees a code generated from it. Replacing an
+        active secret requires ``code`` from the current one.
+
+        Returns the new secret's provisioning URI.
+        """
+        secret = generate_totp_secret()
+        async with session_scope(self.sessions) as session:
+            users = UserRepository(session)
+            user = await users.get(user_id)
+            if user is None:
+                raise InvalidCredentialsError("unknown user")
+            if user.totp_secret:
+                step = match_totp(user.totp_secret, code) if code else None
+                if step is None or not await users.consume_totp_step(user_id, step):
+                    self._audit("auth.2fa_failed", user_id)
+                    raise InvalidCredentialsError("current 2FA code required")
+            user.totp_pending_secret = secret
+            email = user.email
+        self._audit("auth.2fa_enrolment_started", user_id)
+        return totp_provisioning_uri(secret, email)
+
+    async def verify_2fa(self, user_id: int, code: str) -> None:
+        """Activate the pending secret once ``code`` proves it was scanned
+        (``POST /auth/verify-2fa``)."""
+        async with session_scope(self.sessions) as session:
+            user = await UserRepository(session).get(user_id)
+            if user is None or not user.totp_pending_secret:
+                raise InvalidCredentialsError("no 2FA enrolment in progress")
+            step = match_totp(user.totp_pending_secret, code)
+            if step is not None:
+                user.totp_secret = user.totp_pending_secret
+                user.totp_pending_secret = None
+                user.totp_last_step = step  # this code cannot be replayed at login
+        if step is None:
+            self._audit("auth.2fa_failed", user_id)
+            raise InvalidCredentialsError("invalid 2FA code")
+        self._audit("auth.2fa_enabled", user_id)
+
+    def close(self) -> None:
+        """Release the hashing worker processes."""
+        self.hasher.shutdown()
@@ -0,0 +1,383 @@
+"""Trade-linked chat: message storage and WebSocket fan-out.
+
+``ChatService.post_message`` (``POST /messages`` and the socket's receive
+path) persists a message through ``MessageRepository`` and hands it to the
+``ChatHub``, which pushes it to every open connection of that trade's two
+participants.
+
+Fan-out is built to survive slow clients:
+- each message is encoded once (msgspec) and the same bytes are queued for
+  every recipient;
+- every connection has a bounded send queue drained by its own writer task,
+  so a publisher never awaits a socket;
+- a connection whose queue is full is a slow consumer: it is disconnected
+  (close code 1013, "try again later") instead of buffering without bound or
+  holding up the other participant. Clients reconnect with ``?after=<id>``
+  to catch up from storage: the backlog is paged in and written straight to
+  the socket (awaiting it) before the live buffer starts draining, so a
+  long catch-up neither overflows the buffer nor arrives out of order.
+
+``ChatWebSocketApp`` exposes the hub as a plain ASGI app on
+``/ws/trades/{trade_id}?token=...``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import re
+from dataclasses import dataclass
+from datetime import timezone
+from typing import Any, Awaitable, Callable
+from urllib.parse import parse_qs
+
+import msgspec
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from ..core.cache import TTLCache
+from ..db.session import session_scope
+from ..models import Message
+from ..schemas import MessageSchema
+from .db_service import MessageRepository
+from .trade_service import TradeService
+
+MAX_MESSAGE_LENGTH = 2000
+CATCH_UP_PAGE = 200  # messages loaded per query on a ?after= reconnect
+
+# WebSocket close codes
+CLOSE_POLICY_VIOLATION = 1008
+CLOSE_TRY_AGAIN_LATER = 1013
+
+
+class ChatError(Exception):
+    """Rejected chat operation (bad message, not a participant)."""
+
+
+def _to_schema(message: Message) -> MessageSchema:
+    created_at = message.created_at
+    if created_at.tzinfo is None:  # SQLite drops the offset
+        created_at = created_at.replace(tzinfo=timezone.utc)
+    return MessageSchema(
+        id=message.id,
+        trade_id=message.trade_id,
+        sender_id=message.sender_id,
+        body=message.body,
+        created_at=created_at.timestamp(),
+    )
+
+
+# ============================================================================
+# CONNECTIONS & HUB
+# ============================================================================
+
+
+class Connection:
+    """One client socket with a bounded outgoing buffer.
+
+    Parameters
+    ----------
+    user_id : int
+        Authenticated participant.
+    send : Callable[[bytes], Awaitable[None]]
+        Writes one frame to the client.
+    close : Callable[[int], Awaitable[None]]
+        Closes the socket with a WebSocket close code.
+    buffer_size : int
+        Frames queued before the client counts as a slow consumer.
+    """
+
+    def __init__(
+        self,
+        user_id: int,
+        send: Callable[[bytes], Awaitable[None]],
+        close: Callable[[int], Awaitable[None]],
+        buffer_size: int = 256,
+    ):
+        self.user_id = user_id
+        self._send = send
+        self._close = close
+        self._queue: asyncio.Queue[bytes] = asyncio.Queue(buffer_size)
+        self._writer: asyncio.Task | None = None
+        self.closed = False
+
+    def start(self) -> None:
+        """Start draining the send buffer on the running loop."""
+        self._writer = asyncio.create_task(self._drain())
+
+    async def _drain(self) -> None:
+        queue = self._queue
+        while True:
+            await self._send(await queue.get())
+
+    def offer(self, frame: bytes) -> bool:
+        """Queue a frame without waiting; False when the buffer is full."""
+        if self.closed:
+            return False
+        try:
+            self._queue.put_nowait(frame)
+        except asyncio.QueueFull:
+            return False
+        return True
+
+    def disconnect(self, code: int = CLOSE_TRY_AGAIN_LATER) -> None:
+        """Stop the writer and close the socket in the background."""
+        if self.closed:
+            return
+        self.closed = True
+        if self._writer is not None:
+            self._writer.cancel()
+        asyncio.get_running_loop().create_task(self._close_quietly(code))
+
+    async def _close_quietly(self, code: int) -> None:
+        try:
+            await asyncio.wait_for(self._close(code), timeout=5)
+        except Exception:  # peer already gone: nothing left to close
+            pass
+
+    async def aclose(self) -> None:
+        """Stop the writer (the peer disconnected)."""
+        self.closed = True
+        if self._writer is not None:
+            self._writer.cancel()
+            try:
+                await self._writer
+            except (asyncio.CancelledError, Exception):  # writer died on a gone peer
+                pass
+
+
+@dataclass
+class HubMetrics:
+    """Fan-out counters."""
+
+    published: int = 0
+    delivered: int = 0
+    slow_disconnects: int = 0
+
+
+class ChatHub:
+    """Routes encoded messages to the open connections of each trade."""
+
+    def __init__(self):
+        self._rooms: dict[int, set[Connection]] = {}
+        self.metrics = HubMetrics()
+
+    def connections(self, trade_id: int) -> int:
+        """Number of open connections on a trade."""
+        return len(self._rooms.get(trade_id, ()))
+
+    def join(self, trade_id: int, connection: Connection) -> None:
+        self._rooms.setdefault(trade_id, set()).add(connection)
+
+    def leave(self, trade_id: int, connection: Connection) -> None:
+        room = self._rooms.get(trade_id)
+        if room is not None:
+            room.discard(connection)
+            if not room:
+                del self._rooms[trade_id]
+
+    def publish(self, trade_id: int, frame: bytes) -> int:
+        """Queue ``frame`` for every connection; returns how many accepted it.
+
+        Never awaits: connections with a full buffer are disconnected.
+        """
+        self.metrics.published += 1
+        room = self._rooms.get(trade_id)
+        if not room:
+            return 0
+        delivered = 0
+        for connection in list(room):
+            if connection.offer(frame):
+                delivered += 1
+            else:
+                room.discard(connection)
+                connection.disconnect(CLOSE_TRY_AGAIN_LATER)
+                self.metrics.slow_disconnects += 1
+        if not room:
+            del self._rooms[trade_id]
+        self.metrics.delivered += delivered
+        return delivered
+
+
+# ============================================================================
+# SERVICE
+# ============================================================================
+
+
+class ChatService:
+    """Persists trade messages and publishes them to the hub.
+
+    Parameters
+    ----------
+    session_factory : async_sessionmaker[AsyncSession]
+        Factory from ``backend.db.create_session_factory``.
+    trades : TradeService
+        Used to check that senders/readers take part in the trade.
+    hub : ChatHub | None
+        Fan-out hub (a new one by default).
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        trades: TradeService,
+        hub: ChatHub | None = None,
+    ):
+        self.sessions = session_factory
+        self.trades = trades
+        self.hub = ChatHub() if hub is None else hub
+        self._encoder = msgspec.json.Encoder()
+        # trade_id -> participant ids; participants never change, so this only
+        # bounds memory (and forgets trades that went quiet)
+        self._participants: TTLCache[int, frozenset[int]] = TTLCache(10_000, 3600)
+
+    async def check_participant(self, trade_id: int, user_id: int) -> None:
+        """Raise ``ChatError`` unless ``user_id`` is part of the trade."""
+        members = self._participants.get(trade_id)
+        if members is None:
+            state = await self.trades.get(trade_id)
+            members = frozenset((state.proposer_id, state.owner_id))
+            self._participants.set(trade_id, members)
+        if user_id not in members:
+            raise ChatError(f"user {user_id} is not part of trade {trade_id}")
+
+    def encode(self, message: MessageSchema) -> bytes:
+        return self._encoder.encode(message)
+
+    async def post_message(self, trade_id: int, sender_id: int, body: str) -> MessageSchema:
+        """Store a message and fan it out to the trade's open connections."""
+        body = body.strip()
+        if not body or len(body) > MAX_MESSAGE_LENGTH:
+            raise ChatError(f"message must be 1-{MAX_MESSAGE_LENGTH} characters")
+        await self.check_participant(trade_id, sender_id)
+        async with session_scope(self.sessions) as session:
+            message = await MessageRepository(session).add(
+                Message(trade_id=trade_id, sender_id=sender_id, body=body)
+            )
+        schema = _to_schema(message)
+        self.hub.publish(trade_id, self.encode(schema))
+        return schema
+
+    async def history(
+        self,
+        trade_id: int,
+        user_id: int,
+        limit: int = 50,
+        before_id: int | None = None,
+    ) -> list[MessageSchema]:
+        """Return a page of history, newest first (cursor: ``before_id``)."""
+        await self.check_participant(trade_id, user_id)
+        async with self.sessions() as session:
+            messages = await MessageRepository(session).history(trade_id, limit, before_id)
+        return [_to_schema(m) for m in messages]
+
+    async def since(
+        self, trade_id: int, after_id: int, limit: int = CATCH_UP_PAGE
+    ) -> list[MessageSchema]:
+        """Up to ``limit`` messages newer than ``after_id`` (oldest first), for reconnects."""
+        async with self.sessions() as session:
+            messages = await MessageRepository(session).since(trade_id, after_id, limit)
+        return [_to_schema(m) for m in messages]
+
+
+# ============================================================================
+# ASGI WEBSOCKET GATEWAY
+# ============================================================================
+
+_PATH = re.compile(r"^/ws/trades/(\d+)/?$")
+
+
+class ChatWebSocketApp:
+    """ASGI WebSocket endpoint: ``/ws/trades/{trade_id}?token=...&after=...``.
+
+    Parameters
+    ----------
+    chat : ChatService
+        Storage and hub.
+    authenticate : Callable[[str], int]
+        Maps a bearer token to a user id, raising on invalid tokens (e.g.
+        ``lambda t: int(auth_service.authenticate(t)["sub"])``).
+    buffer_size : int
+        Per-connection send buffer (frames).
+    """
+
+    def __init__(
+        self,
+        chat: ChatService,
+        authenticate: Callable[[str], int],
+        buffer_size: int = 256,
+    ):
+        self.chat = chat
+        self.authenticate = authenticate
+        self.buffer_size = buffer_size
+
+    async def __call__(self, scope: dict[str, Any], receive, send) -> None:
+        if scope["type"] != "websocket":
+            return
+        if (await receive())["type"] != "websocket.connect":
+            return
+
+        async def close(code: int) -> None:
+            await send({"type": "websocket.close", "code": code})
+
+        match = _PATH.match(scope["path"])
+        query = parse_qs(scope.get("query_string", b"").decode())
+        try:
+            if match is None:
+                raise ChatError("unknown path")
+            trade_id = int(match.group(1))
+            user_id = self.authenticate(query.get("token", [""])[0])
+            await self.chat.check_participant(trade_id, user_id)
+            after = query.get("after")
+            after_id = int(after[0]) if after else None
+            if after_id is not None and after_id < 0:
+                raise ChatError("after must be a message id")
+        except Exception:
+            await close(CLOSE_POLICY_VIOLATION)
+            return
+
+        await send({"type": "websocket.accept"})
+
+        async def send_frame(frame: bytes) -> None:
+            await send({"type": "websocket.send", "text": frame.decode()})
+
+        connection = Connection(user_id, send_frame, close, self.buffer_size)
+        # Join before catching up so nothing published meanwhile is missed
+        # (a message may then arrive twice; clients dedupe by id). Live
+        # frames wait in the buffer until the backlog has been sent.
+        self.chat.hub.join(trade_id, connection)
+        try:
+            if after_id is not None:
+                await self._catch_up(trade_id, after_id, connection, send_frame)
+            if not connection.closed:
+                connection.start()
+            while True:
+                event = await receive()
+                if event["type"] == "websocket.disconnect":
+                    break
+                text = event.get("text")
+                if text is None or connection.closed:
+                    continue
+                try:
+                    await self.chat.post_message(trade_id, user_id, text)
+                except ChatError:
+                    continue  # invalid message: ignore rather than drop the socket
+        finally:
+            self.chat.hub.leave(trade_id, connection)
+            await connection.aclose()
+
+    async def _catch_up(
+        self,
+        trade_id: int,
+        after_id: int,
+        connection: Connection,
+        send_frame: Callable[[bytes], Awaitable[None]],
+    ) -> None:
+        """Send every stored message after ``after_id``, a page at a time."""
+        while not connection.closed:
+            page = await self.chat.since(trade_id, after_id, CATCH_UP_PAGE)
+            for message in page:
+                if connection.closed:  # live traffic overflowed the buffer
+                    return
+                await send_frame(self.chat.encode(message))
+            if len(page) < CATCH_UP_PAGE:
+                return
+            after_id = page[-1].id
@@ -0,0 +1,494 @@
+"""Async repository layer over the SQLAlchemy models.
+
+Each repository wraps an ``AsyncSession`` and exposes the access paths the
+frontend actually uses (feed pages, profile feeds, comment threads,
+notification lists). Relationships are declared ``lazy="raise"`` on the
+models, so every query here states its loading strategy explicitly:
+
+- many-to-one (``author``, ``sender``) -> ``joinedload`` (same round trip)
+- many-to-many (``tags``) -> ``selectinload`` (one ``IN`` query per page)
+- comment previews -> one windowed query for the whole page
+
+A feed page therefore costs three queries regardless of its size. Comment
+and unread-notification totals are denormalized counters kept in step by the
+write paths below, so rendering never issues ``COUNT(*)``.
+
+Replace the ``mock/`` providers with these repositories when wiring the API.
+"""
+
+from __future__ import annotations
+
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Generic, Mapping, Sequence, TypeVar
+
+from sqlalchemy import bindparam, delete, func, insert, select, tuple_, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload, selectinload
+
+from ..db.base import Base
+from ..models import (
+    Comment,
+    Listing,
+    Message,
+    Notification,
+    Tag,
+    User,
+    listing_tags,
+)
+
+ModelT = TypeVar("ModelT", bound=Base)
+
+# Number of comments shown under each PostCard before "Ver mais"
+COMMENT_PREVIEW_SIZE = 3
+
+
+@dataclass
+class FeedItem:
+    """A listing plus the data needed to render its card.
+
+    Attributes
+    ----------
+    listing : Listing
+        The listing, with ``author`` and ``tags`` already loaded.
+    comment_previews : list[Comment]
+        Oldest comments first, each with ``author`` loaded.
+    """
+
+    listing: Listing
+    comment_previews: list[Comment] = field(default_factory=list)
+
+    @property
+    def comment_count(self) -> int:
+        """Total number of comments on the listing (denormalized counter)."""
+        return self.listing.comment_count
+
+
+class _Repository(Generic[ModelT]):
+    """Shared CRUD helpers; subclasses set ``model``."""
+
+    model: type[ModelT]
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def get(self, obj_id: int) -> ModelT | None:
+        """Return the row with primary key ``obj_id`` or None."""
+        return await self.session.get(self.model, obj_id)
+
+    async def add(self, obj: ModelT) -> ModelT:
+        """Stage ``obj`` for insert and flush so its primary key is assigned."""
+        self.session.add(obj)
+        await self.session.flush()
+        return obj
+
+    async def bulk_insert(self, rows: Sequence[Mapping[str, Any]]) -> list[int]:
+        """Insert many rows in one executemany round trip.
+
+        Uses a Core ``INSERT ... RETURNING`` (batched by SQLAlchemy's
+        insertmanyvalues) instead of building ORM objects one by one.
+
+        Parameters
+        ----------
+        rows : Sequence[Mapping[str, Any]]
+            Column/value mappings, all with the same keys.
+
+        Returns
+        -------
+        list[int]
+            Primary keys of the inserted rows, in input order.
+        """
+        if not rows:
+            return []
+        pk = self.model.__mapper__.primary_key[0]
+        result = await self.session.scalars(
+            insert(self.model).returning(pk, sort_by_parameter_order=True),
+            list(rows),
+        )
+        return list(result)
+
+
+class UserRepository(_Repository[User]):
+    """Queries over ``users``."""
+
+    model = User
+
+    async def get_by_email(self, email: str) -> User | None:
+        """Return the user registered with ``email`` or None."""
+        return await self.session.scalar(select(User).where(User.email == email))
+
+    async def consume_totp_step(self, user_id: int, step: int) -> bool:
+        """Record ``step`` as the user's last accepted TOTP step.
+
+        Atomic compare-and-set: returns False if that step (or a later one)
+        was already used, so a code cannot be replayed within its window.
+        """
+        result = await self.session.execute(
+            update(User)
+            .where(
+                User.id == user_id,
+                (User.totp_last_step.is_(None)) | (User.totp_last_step < step),
+            )
+            .values(totp_last_step=step)
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount == 1
+
+
+class TagRepository(_Repository[Tag]):
+    """Queries over ``tags``."""
+
+    model = Tag
+
+    async def get_by_name(self, name: str) -> Tag | None:
+        """Return the tag called ``name`` or None."""
+        return await self.session.scalar(select(Tag).where(Tag.name == name))
+
+    async def ensure(self, names: Sequence[str]) -> dict[str, int]:
+        """Return ``{name: id}`` for ``names``, inserting the missing tags."""
+        wanted = set(names)
+        if not wanted:
+            return {}
+        rows = await self.session.execute(
+            select(Tag.name, Tag.id).where(Tag.name.in_(wanted))
+        )
+        ids = {name: tag_id for name, tag_id in rows}
+        missing = sorted(wanted - ids.keys())
+        if missing:
+            new_ids = await self.bulk_insert([{"name": name} for name in missing])
+            ids.update(zip(missing, new_ids))
+        return ids
+
+
+class ListingRepository(_Repository[Listing]):
+    """Queries over ``listings`` shaped for feed rendering."""
+
+    model = Listing
+
+    async def get_with_author(self, listing_id: int) -> Listing | None:
+        """Return one listing with its author eagerly loaded."""
+        stmt = (
+            select(Listing)
+            .options(joinedload(Listing.author))
+            .where(Listing.id == listing_id)
+        )
+        return await self.session.scalar(stmt)
+
+    async def feed_page(
+        self,
+        limit: int = 20,
+        before: tuple[datetime, int] | None = None,
+        preview_size: int = COMMENT_PREVIEW_SIZE,
+    ) -> list[FeedItem]:
+        """Return the newest listings, keyset-paginated.
+
+        Parameters
+        ----------
+        limit : int
+            Maximum number of listings to return.
+        before : tuple[datetime, int] | None
+            ``(created_at, id)`` of the last item of the previous page.
+        preview_size : int
+            Comments to preload per listing.
+
+        Returns
+        -------
+        list[FeedItem]
+            Newest first; three queries regardless of ``limit``.
+        """
+        stmt = select(Listing)
+        if before is not None:
+            stmt = stmt.where(tuple_(Listing.created_at, Listing.id) < before)
+        return await self._load_page(stmt, limit, preview_size)
+
+    async def list_by_tag(
+        self,
+        tag_id: int,
+        limit: int = 20,
+        before: tuple[datetime, int] | None = None,
+        preview_size: int = COMMENT_PREVIEW_SIZE,
+    ) -> list[FeedItem]:
+        """Return the newest listings carrying ``tag_id`` (category filter).
+
+        Walks ``ix_listing_tags_tag_id_created_at`` directly, so the cost is
+        proportional to ``limit`` rather than to the tag's popularity.
+        """
+        stmt = (
+            select(Listing)
+            .join(listing_tags, listing_tags.c.listing_id == Listing.id)
+            .where(listing_tags.c.tag_id == tag_id)
+        )
+        if before is not None:
+            stmt = stmt.where(
+                tuple_(listing_tags.c.created_at, listing_tags.c.listing_id) < before
+            )
+        order = (listing_tags.c.created_at.desc(), listing_tags.c.listing_id.desc())
+        return await self._load_page(stmt, limit, preview_size, order)
+
+    async def set_tags(self, listing: Listing, names: Sequence[str]) -> None:
+        """Replace a listing's tags, creating unknown tag names on the fly."""
+        tag_ids = await TagRepository(self.session).ensure(names)
+        await self.session.execute(
+            delete(listing_tags).where(listing_tags.c.listing_id == listing.id)
+        )
+        if tag_ids:
+            await self.session.execute(
+                insert(listing_tags),
+                [
+                    {
+                        "listing_id": listing.id,
+                        "tag_id": tag_id,
+                        "created_at": listing.created_at,
+                    }
+                    for tag_id in tag_ids.values()
+                ],
+            )
+
+    async def list_by_author(
+        self,
+        author_id: int,
+        limit: int = 20,
+        before: tuple[datetime, int] | None = None,
+        preview_size: int = COMMENT_PREVIEW_SIZE,
+    ) -> list[FeedItem]:
+        """Return a user's listings (profile feed), newest first."""
+        stmt = select(Listing).where(Listing.author_id == author_id)
+        if before is not None:
+            stmt = stmt.where(tuple_(Listing.created_at, Listing.id) < before)
+        return await self._load_page(stmt, limit, preview_size)
+
+    async def locations(self) -> list[tuple[int, float, float]]:
+        """Return ``(id, latitude, longitude)`` of every located listing.
+
+        Used to (re)build ``GeoIndex`` at startup.
+        """
+        rows = await self.session.execute(
+            select(Listing.id, Listing.latitude, Listing.longitude).where(
+                Listing.latitude.is_not(None), Listing.longitude.is_not(None)
+            )
+        )
+        return [tuple(row) for row in rows]
+
+    async def _load_page(
+        self, stmt, limit: int, preview_size: int, order_by=None
+    ) -> list[FeedItem]:
+        if order_by is None:
+            order_by = (Listing.created_at.desc(), Listing.id.desc())
+        stmt = (
+            stmt.options(joinedload(Listing.author), selectinload(Listing.tags))
+            .order_by(*order_by)
+            .limit(limit)
+        )
+        listings = list(await self.session.scalars(stmt))
+        items = {listing.id: FeedItem(listing) for listing in listings}
+        if items and preview_size > 0:
+            await self._attach_comment_previews(items, preview_size)
+        return list(items.values())
+
+    async def _attach_comment_previews(
+        self, items: dict[int, FeedItem], preview_size: int
+    ) -> None:
+        """Load the first ``preview_size`` comments of every item in one query."""
+        ranked = (
+            select(
+                Comment.id.label("comment_id"),
+                func.row_number()
+                .over(
+                    partition_by=Comment.listing_id,
+                    order_by=(Comment.created_at, Comment.id),
+                )
+                .label("rn"),
+            )
+            .where(Comment.listing_id.in_(items.keys()))
+            .subquery()
+        )
+        stmt = (
+            select(Comment)
+            .join(ranked, Comment.id == ranked.c.comment_id)
+            .where(ranked.c.rn <= preview_size)
+            .options(joinedload(Comment.author))
+            .order_by(Comment.listing_id, ranked.c.rn)
+        )
+        for comment in await self.session.scalars(stmt):
+            items[comment.listing_id].comment_previews.append(comment)
+
+
+class CommentRepository(_Repository[Comment]):
+    """Queries over ``comments``."""
+
+    model = Comment
+
+    async def add(self, obj: Comment) -> Comment:
+        """Insert a comment and bump its listing's ``comment_count``."""
+        await super().add(obj)
+        await _bump_counters(
+            self.session, Listing, "comment_count", Counter([obj.listing_id])
+        )
+        return obj
+
+    async def bulk_insert(self, rows: Sequence[Mapping[str, Any]]) -> list[int]:
+        """Insert comments in bulk, then apply one counter delta per listing."""
+        ids = await super().bulk_insert(rows)
+        await _bump_counters(
+            self.session,
+            Listing,
+            "comment_count",
+            Counter(row["listing_id"] for row in rows),
+        )
+        return ids
+
+    async def list_for_listing(
+        self, listing_id: int, limit: int = 50, offset: int = 0
+    ) -> list[Comment]:
+        """Return a listing's comments (oldest first) with authors loaded."""
+        stmt = (
+            select(Comment)
+            .options(joinedload(Comment.author))
+            .where(Comment.listing_id == listing_id)
+            .order_by(Comment.created_at, Comment.id)
+            .limit(limit)
+            .offset(offset)
+        )
+        return list(await self.session.scalars(stmt))
+
+    async def count_for_listing(self, listing_id: int) -> int:
+        """Return the number of comments on a listing (denormalized counter)."""
+        stmt = select(Listing.comment_count).where(Listing.id == listing_id)
+        return int(await self.session.scalar(stmt) or 0)
+
+
+class MessageRepository(_Repository[Message]):
+    """Queries over trade chat ``messages`` (cursor = message id)."""
+
+    model = Message
+
+    async def history(
+        self, trade_id: int, limit: int = 50, before_id: int | None = None
+    ) -> list[Message]:
+        """Return up to ``limit`` messages older than ``before_id``, newest first.
+
+        Pass the smallest id of the previous page as ``before_id`` to scroll
+        back; served by ``ix_messages_trade_id_id`` without sorting.
+        """
+        stmt = select(Message).where(Message.trade_id == trade_id)
+        if before_id is not None:
+            stmt = stmt.where(Message.id < before_id)
+        stmt = stmt.order_by(Message.id.desc()).limit(limit)
+        return list(await self.session.scalars(stmt))
+
+    async def since(self, trade_id: int, after_id: int, limit: int = 500) -> list[Message]:
+        """Return messages newer than ``after_id``, oldest first (reconnect catch-up)."""
+        stmt = (
+            select(Message)
+            .where(Message.trade_id == trade_id, Message.id > after_id)
+            .order_by(Message.id)
+            .limit(limit)
+        )
+        return list(await self.session.scalars(stmt))
+
+
+class NotificationRepository(_Repository[Notification]):
+    """Queries over ``notifications``."""
+
+    model = Notification
+
+    async def add(self, obj: Notification) -> Notification:
+        """Insert a notification, bumping the unread badge when applicable."""
+        await super().add(obj)
+        if not obj.read:
+            await _bump_counters(
+                self.session, User, "unread_notification_count", Counter([obj.user_id])
+            )
+        return obj
+
+    async def bulk_insert(self, rows: Sequence[Mapping[str, Any]]) -> list[int]:
+        """Insert notifications in bulk, then apply one badge delta per user."""
+        ids = await super().bulk_insert(rows)
+        await _bump_counters(
+            self.session,
+            User,
+            "unread_notification_count",
+            Counter(row["user_id"] for row in rows if not row.get("read", False)),
+        )
+        return ids
+
+    async def list_for_user(
+        self,
+        user_id: int,
+        unread_only: bool = False,
+        limit: int = 50,
+        before: tuple[datetime, int] | None = None,
+    ) -> list[Notification]:
+        """Return a user's notifications, newest first, with senders loaded."""
+        stmt = (
+            select(Notification)
+            .options(joinedload(Notification.sender))
+            .where(Notification.user_id == user_id)
+        )
+        if unread_only:
+            stmt = stmt.where(Notification.read.is_(False))
+        if before is not None:
+            stmt = stmt.where(
+                tuple_(Notification.created_at, Notification.id) < before
+            )
+        stmt = stmt.order_by(
+            Notification.created_at.desc(), Notification.id.desc()
+        ).limit(limit)
+        return list(await self.session.scalars(stmt))
+
+    async def count_unread(self, user_id: int) -> int:
+        """Return the number of unread notifications (nav bar badge)."""
+        stmt = select(User.unread_notification_count).where(User.id == user_id)
+        return int(await self.session.scalar(stmt) or 0)
+
+    async def mark_read(self, notification_id: int) -> bool:
+        """Mark one notification as read.
+
+        Returns False if it was not found or already read; the unread badge
+        is only decremented when the row actually changed.
+        """
+        user_id = await self.session.scalar(
+            update(Notification.__table__)
+            .where(
+                Notification.id == notification_id, Notification.read.is_(False)
+            )
+            .values(read=True)
+            .returning(Notification.user_id)
+        )
+        if user_id is None:
+            return False
+        await _bump_counters(
+            self.session, User, "unread_notification_count", Counter({user_id: -1})
+        )
+        return True
+
+    async def mark_all_read(self, user_id: int) -> int:
+        """Mark every unread notification of a user as read; returns the count."""
+        result = await self.session.execute(
+            update(Notification.__table__)
+            .where(Notification.user_id == user_id, Notification.read.is_(False))
+            .values(read=True)
+        )
+        await self.session.execute(
+            update(User.__table__)
+            .where(User.id == user_id)
+            .values(unread_notification_count=0)
+        )
+        return result.rowcount
+
+
+async def _bump_counters(
+    session: AsyncSession, model: type[Base], column: str, deltas: Counter
+) -> None:
+    """Add ``deltas[pk]`` to ``model.column`` for each key, in one executemany."""
+    deltas = {pk: n for pk, n in deltas.items() if n}
+    if not deltas:
+        return
+    table = model.__table__
+    await session.execute(
+        update(table)
+        .where(table.c.id == bindparam("pk"))
+        .values({column: table.c[column] + bindparam("delta")}),
+        [{"pk": pk, "delta": n} for pk, n in deltas.items()],
+    )
@@ -0,0 +1,489 @@
+"""Escrow wallet ledger: append-only, checksummed log with group commit.
+
+Backs ``POST /escrow/:trade_id/hold``, ``/release`` and ``/refund`` (see
+docs/initial docs/api_flows.md). Every operation is an immutable entry in
+``ledger.log``; balances are an in-memory index derived from the log.
+
+Durability and throughput:
+- Entries are framed as ``[u32 length][u32 crc32][msgspec JSON payload]``.
+  On startup a torn or corrupt frame at the end of the log (a crash
+  mid-write) is detected by its length/checksum and truncated away.
+- Group commit: callers enqueue entries and await an acknowledgement; a
+  single flusher task writes everything queued so far with one ``write`` and
+  one ``fdatasync``. While one sync is in flight the next batch accumulates,
+  so throughput scales with concurrency instead of being one fsync per op.
+- ``snapshot.json`` stores the balance index and the log offset it covers
+  (written atomically, with a checksum); recovery loads it and replays only
+  the log tail. A missing or damaged snapshot falls back to a full replay.
+- Every operation carries an idempotency key. Retrying a key returns the
+  original entry; reusing it for a different request (operation, trade,
+  account, amount or receiver) is an error. Keys are remembered for
+  ``key_retention`` seconds, so the key index (and the snapshot) only grows
+  with recent traffic; a retry after that is a new operation.
+
+Validation and the in-memory update happen synchronously when an operation is
+submitted (so concurrent holds cannot overdraw); the caller's ``await``
+returns only once the entry is durable on disk.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import struct
+import time
+import zlib
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Awaitable, Callable, Literal
+
+import msgspec
+
+from ..core.audit import AuditSink
+
+DEFAULT_DIR = Path("storage/ledger")
+LOG_NAME = "ledger.log"
+SNAPSHOT_NAME = "snapshot.json"
+KEY_RETENTION = 7 * 24 * 3600.0  # seconds a key stays replayable
+
+logger = logging.getLogger(__name__)
+
+_HEADER = struct.Struct("<II")  # payload length, crc32(payload)
+
+Operation = Literal["deposit", "hold", "release", "refund"]
+
+
+# ============================================================================
+# ERRORS
+# ============================================================================
+
+
+class LedgerError(Exception):
+    """Base class for rejected ledger operations."""
+
+
+class InsufficientFundsError(LedgerError):
+    """The account's available balance does not cover the hold."""
+
+
+class HoldNotFoundError(LedgerError):
+    """No open hold exists for the trade."""
+
+
+class IdempotencyConflictError(LedgerError):
+    """The idempotency key was already used for a different request."""
+
+
+# ============================================================================
+# ENTRIES & STATE
+# ============================================================================
+
+
+class LedgerEntry(msgspec.Struct, frozen=True):
+    """One immutable ledger record.
+
+    ``account_id`` is the payer (deposit target, hold owner) and
+    ``counterparty_id`` the receiver of a release.
+    """
+
+    seq: int
+    op: Operation
+    key: str
+    account_id: int
+    amount: int
+    trade_id: int | None = None
+    counterparty_id: int | None = None
+    ts: float = 0.0
+
+
+class Hold(msgspec.Struct):
+    account_id: int
+    amount: int
+
+
+class _State(msgspec.Struct):
+    """The balance index (also the snapshot body)."""
+
+    seq: int = 0
+    offset: int = 0  # log bytes covered by this state
+    available: dict[int, int] = msgspec.field(default_factory=dict)
+    held: dict[int, int] = msgspec.field(default_factory=dict)
+    holds: dict[int, Hold] = msgspec.field(default_factory=dict)  # trade_id -> hold
+    # Recent keys in log order (oldest first), pruned by ``_prune_keys``
+    keys: dict[str, LedgerEntry] = msgspec.field(default_factory=dict)
+
+
+class _Snapshot(msgspec.Struct):
+    crc: int
+    state: bytes  # msgspec-encoded _State
+
+
+@dataclass(frozen=True)
+class Balance:
+    """An account's spendable and escrowed credits."""
+
+    available: int
+    held: int
+
+
+def _apply(state: _State, entry: LedgerEntry) -> None:
+    """Apply a validated entry to the index (shared by live writes and replay)."""
+    available, held = state.available, state.held
+    account = entry.account_id
+    if entry.op == "deposit":
+        available[account] = available.get(account, 0) + entry.amount
+    elif entry.op == "hold":
+        available[account] -= entry.amount
+        held[account] = held.get(account, 0) + entry.amount
+        state.holds[entry.trade_id] = Hold(account, entry.amount)
+    else:  # release / refund close the hold
+        del state.holds[entry.trade_id]
+        held[account] -= entry.amount
+        receiver = entry.counterparty_id if entry.op == "release" else account
+        available[receiver] = available.get(receiver, 0) + entry.amount
+    state.seq = entry.seq
+    state.keys[entry.key] = entry
+
+
+def _prune_keys(state: _State, cutoff: float) -> None:
+    """Forget idempotency keys of entries written before ``cutoff``."""
+    keys = state.keys
+    while keys:
+        key, entry = next(iter(keys.items()))
+        if entry.ts >= cutoff:
+            break
+        del keys[key]
+
+
+def _conflicts(entry: LedgerEntry, op, account_id, amount, trade_id, counterparty_id) -> bool:
+    """True if a retried key asks for something other than what it recorded."""
+    if entry.op != op or entry.trade_id != trade_id:
+        return True
+    asked = (account_id, amount, counterparty_id)
+    recorded = (entry.account_id, entry.amount, entry.counterparty_id)
+    return any(a is not None and a != r for a, r in zip(asked, recorded))
+
+
+# ============================================================================
+# LEDGER
+# ============================================================================
+
+
+@dataclass
+class _Pending:
+    frame: bytes
+    entry: LedgerEntry
+    future: asyncio.Future = field(repr=False)
+
+
+class EscrowLedger:
+    """Durable escrow ledger. Create with ``await EscrowLedger.open(path)``.
+
+    Parameters
+    ----------
+    directory : Path
+        Holds ``ledger.log`` and ``snapshot.json``.
+    snapshot_every : int
+        Write a snapshot after this many entries since the last one.
+    audit : AuditSink | None
+        When given, every durable entry is also recorded to the audit log.
+    key_retention : float
+        Seconds an idempotency key can be retried.
+
+    Attributes
+    ----------
+    on_hold : list[Callable[[LedgerEntry], Awaitable[None]]]
+        Run in the background with every new hold once it is durable (not
+        for retried keys), e.g. ``FraudMonitor.escrow_hook``. A failing hook
+        is logged; it never fails the hold, and ``close`` waits for them.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        snapshot_every: int = 10_000,
+        audit: AuditSink | None = None,
+        key_retention: float = KEY_RETENTION,
+    ):
+        self.directory = Path(directory)
+        self.snapshot_every = snapshot_every
+        self.audit = audit
+        self.key_retention = key_retention
+        self.on_hold: list[Callable[[LedgerEntry], Awaitable[None]]] = []
+        self._hook_tasks: set[asyncio.Task] = set()
+        self._state = _State()
+        self._pending: list[_Pending] = []
+        # Batch currently being written: completion future and its seqs
+        self._inflight: asyncio.Future | None = None
+        self._inflight_seqs: frozenset[int] = frozenset()
+        self._wakeup = asyncio.Event()
+        self._closing = False
+        self._failed: BaseException | None = None
+        self._file = None
+        self._flusher: asyncio.Task | None = None
+        self._since_snapshot = 0
+        self._encoder = msgspec.json.Encoder()
+        self._entry_decoder = msgspec.json.Decoder(LedgerEntry)
+
+    @classmethod
+    async def open(
+        cls,
+        directory: Path = DEFAULT_DIR,
+        snapshot_every: int = 10_000,
+        audit: AuditSink | None = None,
+        key_retention: float = KEY_RETENTION,
+    ) -> "EscrowLedger":
+        """Recover state from disk and start the group-commit flusher."""
+        ledger = cls(directory, snapshot_every, audit, key_retention)
+        await asyncio.to_thread(ledger._recover)
+        ledger._flusher = asyncio.create_task(ledger._flush_loop())
+        return ledger
+
+    # ------------------------------------------------------------- recovery
+
+    def _load_snapshot(self) -> _State:
+        path = self.directory / SNAPSHOT_NAME
+        try:
+            snapshot = msgspec.json.decode(path.read_bytes(), type=_Snapshot)
+        except (OSError, msgspec.DecodeError):
+            return _State()
+        if zlib.crc32(snapshot.state) != snapshot.crc:
+            return _State()
+        return msgspec.json.decode(snapshot.state, type=_State)
+
+    def _recover(self) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        log_path = self.directory / LOG_NAME
+        state = self._load_snapshot()
+        with open(log_path, "a+b") as log:
+            size = log.seek(0, os.SEEK_END)
+            if state.offset > size:  # snapshot newer than the log: distrust it
+                state = _State()
+            log.seek(state.offset)
+            data = log.read()
+            good = state.offset
+            pos = 0
+            while pos + _HEADER.size <= len(data):
+                length, crc = _HEADER.unpack_from(data, pos)
+                payload = data[pos + _HEADER.size : pos + _HEADER.size + length]
+                if len(payload) < length or zlib.crc32(payload) != crc:
+                    break  # torn or corrupt tail
+                entry = self._entry_decoder.decode(payload)
+                _apply(state, entry)
+                pos += _HEADER.size + length
+                good = state.offset + pos
+            if good < size:
+                log.truncate(good)
+                os.fsync(log.fileno())
+        state.offset = good
+        _prune_keys(state, time.time() - self.key_retention)
+        self._state = state
+        self._file = open(log_path, "ab", buffering=0)
+
+    # ----------------------------------------------------------- operations
+
+    def balance(self, account_id: int) -> Balance:
+        """Return the account's balance (including ops awaiting their fsync)."""
+        return Balance(
+            self._state.available.get(account_id, 0),
+            self._state.held.get(account_id, 0),
+        )
+
+    def hold_for(self, trade_id: int) -> Hold | None:
+        """Return the open hold for ``trade_id``, if any."""
+        return self._state.holds.get(trade_id)
+
+    async def deposit(self, account_id: int, amount: int, key: str) -> LedgerEntry:
+        """Credit ``amount`` to the account (e.g. after a wallet top-up)."""
+        return await self._submit("deposit", key, account_id, amount)
+
+    async def hold(
+        self, trade_id: int, account_id: int, amount: int, key: str
+    ) -> LedgerEntry:
+        """Move ``amount`` from available to held as the trade's stake."""
+        return await self._submit("hold", key, account_id, amount, trade_id)
+
+    async def release(self, trade_id: int, to_account_id: int, key: str) -> LedgerEntry:
+        """Pay the trade's held stake to ``to_account_id``."""
+        return await self._submit("release", key, None, None, trade_id, to_account_id)
+
+    async def refund(self, trade_id: int, key: str) -> LedgerEntry:
+        """Return the trade's held stake to its owner."""
+        return await self._submit("refund", key, None, None, trade_id)
+
+    def _validate(self, op, account_id, amount, trade_id, counterparty_id):
+        state = self._state
+        if op in ("release", "refund"):
+            hold = state.holds.get(trade_id)
+            if hold is None:
+                raise HoldNotFoundError(f"no open hold for trade {trade_id}")
+            if op == "release" and counterparty_id is None:
+                raise LedgerError("release needs a receiving account")
+            return hold.account_id, hold.amount
+        if amount is None or amount <= 0:
+            raise LedgerError("amount must be a positive integer")
+        if op == "hold":
+            if trade_id in state.holds:
+                raise LedgerError(f"trade {trade_id} already has a hold")
+            if state.available.get(account_id, 0) < amount:
+                raise InsufficientFundsError(f"account {account_id} cannot cover {amount}")
+        return account_id, amount
+
+    async def _submit(
+        self,
+        op: Operation,
+        key: str,
+        account_id: int | None,
+        amount: int | None,
+        trade_id: int | None = None,
+        counterparty_id: int | None = None,
+    ) -> LedgerEntry:
+        if self._failed is not None:
+            raise LedgerError("ledger is unavailable after a write failure") from self._failed
+        if self._closing:
+            raise LedgerError("ledger is closed")
+
+        now = time.time()
+        _prune_keys(self._state, now - self.key_retention)
+        entry = self._state.keys.get(key)
+        if entry is not None:
+            if _conflicts(entry, op, account_id, amount, trade_id, counterparty_id):
+                raise IdempotencyConflictError(key)
+            await self._wait_durable(entry.seq)
+            return entry
+
+        account_id, amount = self._validate(op, account_id, amount, trade_id, counterparty_id)
+        entry = LedgerEntry(
+            seq=self._state.seq + 1,
+            op=op,
+            key=key,
+            account_id=account_id,
+            amount=amount,
+            trade_id=trade_id,
+            counterparty_id=counterparty_id,
+            ts=now,
+        )
+        payload = self._encoder.encode(entry)
+        frame = _HEADER.pack(len(payload), zlib.crc32(payload)) + payload
+        _apply(self._state, entry)
+
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append(_Pending(frame, entry, future))
+        self._wakeup.set()
+        await future
+        if self.audit is not None:
+            self.audit.record(
+                f"escrow.{op}",
+                account_id,
+                seq=entry.seq,
+                amount=amount,
+                trade_id=trade_id,
+                counterparty_id=counterparty_id,
+            )
+        if op == "hold":
+            for hook in self.on_hold:
+                task = asyncio.create_task(self._run_hook(hook, entry))
+                self._hook_tasks.add(task)
+                task.add_done_callback(self._hook_tasks.discard)
+        return entry
+
+    @staticmethod
+    async def _run_hook(
+        hook: Callable[[LedgerEntry], Awaitable[None]], entry: LedgerEntry
+    ) -> None:
+        try:
+            await hook(entry)
+        except Exception:  # the hold is already durable: report, don't undo
+            logger.exception("escrow %s hook failed for entry %d", entry.op, entry.seq)
+
+    async def _wait_durable(self, seq: int) -> None:
+        """Wait for ``seq`` if it is still in the unflushed batch."""
+        for pending in self._pending:
+            if pending.entry.seq == seq:
+                await asyncio.shield(pending.future)
+                return
+        if self._inflight is not None and seq in self._inflight_seqs:
+            await asyncio.shield(self._inflight)
+
+    # ---------------------------------------------------------- group commit
+
+    def _write_and_sync(self, data: bytes) -> None:
+        self._file.write(data)
+        if hasattr(os, "fdatasync"):
+            os.fdatasync(self._file.fileno())
+        else:
+            os.fsync(self._file.fileno())
+
+    async def _flush_loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+            if not self._pending:
+                if self._closing:
+                    return
+                continue
+            batch, self._pending = self._pending, []
+            data = b"".join(p.frame for p in batch)
+            self._inflight = loop.create_future()
+            self._inflight_seqs = frozenset(p.entry.seq for p in batch)
+            try:
+                await asyncio.to_thread(self._write_and_sync, data)
+            except BaseException as exc:  # disk full, I/O error: stop accepting writes
+                self._failed = exc
+                for p in batch + self._pending:
+                    if not p.future.done():
+                        p.future.set_exception(LedgerError("ledger write failed"))
+                self._inflight.set_exception(exc)
+                self._inflight.exception()  # mark retrieved
+                return
+            self._state.offset += len(data)
+            for p in batch:
+                if not p.future.done():
+                    p.future.set_result(None)
+            self._inflight.set_result(None)
+            self._inflight = None
+            self._inflight_seqs = frozenset()
+
+            self._since_snapshot += len(batch)
+            if self._since_snapshot >= self.snapshot_every and not self._pending:
+                await self.snapshot()
+            if self._closing and not self._pending:
+                return
+
+    async def snapshot(self) -> None:
+        """Persist the balance index (only when no entries are awaiting flush)."""
+        if self._pending or self._inflight is not None:
+            return
+        _prune_keys(self._state, time.time() - self.key_retention)
+        body = msgspec.json.encode(self._state)
+        data = msgspec.json.encode(_Snapshot(crc=zlib.crc32(body), state=body))
+        await asyncio.to_thread(self._write_snapshot, data)
+        self._since_snapshot = 0
+
+    def _write_snapshot(self, data: bytes) -> None:
+        path = self.directory / SNAPSHOT_NAME
+        tmp = path.with_suffix(".tmp")
+        with open(tmp, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+        dir_fd = os.open(self.directory, os.O_RDONLY)
+        try:
+            os.fsync(dir_fd)  # make the rename itself durable
+        finally:
+            os.close(dir_fd)
+
+    async def close(self, snapshot: bool = True) -> None:
+        """Flush queued entries, optionally snapshot, and close the log."""
+        self._closing = True
+        self._wakeup.set()
+        if self._flusher is not None:
+            await self._flusher
+        if self._hook_tasks:
+            await asyncio.gather(*self._hook_tasks)
+        if snapshot and self._failed is None:
+            await self.snapshot()
+        self._file.close()
@@ -0,0 +1,578 @@
+"""Streaming anti-fraud monitor: sliding-window counters and declarative rules.
+
+Implements the MVP roadmap's "initial anti-fraud system" checks on the
+stream of trade events (``proposal``, ``accepted``, ``completed``,
+``cancelled``, ``expired``) and escrow holds (``hold``):
+
+- pattern monitoring: many proposals without completions -> flag;
+- value limits for new users (single hold and 24 h volume).
+
+Trade events come from ``trade_hook`` (``TradeService`` hooks); holds come
+from ``escrow_hook`` (``EscrowLedger.on_hold``), the only place that knows
+the credits at stake, together with the payer's account age.
+
+Per user, every ``Window`` is a ring of ``buckets`` integer slots plus a
+running total, stored in flat ``array('q')`` columns (a few hundred bytes
+per user, no per-event objects). An event advances the ring to its bucket,
+zeroing and subtracting only the slots that expired since the previous
+event, so updates and reads are O(1) amortized. A window therefore covers
+the last ``seconds`` at bucket granularity (up to one bucket less).
+
+Rules are plain data (``Rule``, or dicts through ``load_rules``): the event
+kinds that trigger them and a conjunction of ``(metric, op, threshold)``
+conditions, where a metric is a window name or an event field such as
+``value`` or ``account_age_days``. They are compiled once into tuples of
+indexes and ``operator`` functions, so evaluating one event takes a few
+microseconds. A flag is suppressed while the same rule fired for the same
+user less than ``cooldown`` seconds ago.
+
+Flags go to the ``on_flag`` callbacks; ``FlagNotifier`` batches them into
+``system`` notifications for moderators through ``NotificationRepository``.
+``replay_jsonl`` runs a JSONL event file through a monitor as fast as it
+can decode it (see ``benchmarks.bench_fraud_replay``).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import operator
+import time
+from array import array
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from itertools import accumulate
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Iterable, Mapping, Sequence
+
+import msgspec
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from ..core.cache import TTLCache
+from ..db.session import session_scope
+from ..models import User
+from .db_service import NotificationRepository
+from .escrow_service import LedgerEntry
+from .trade_service import TradeState
+
+HOUR = 3600.0
+DAY = 24 * HOUR
+
+_OPS: dict[str, Callable[[Any, Any], bool]] = {
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+    "==": operator.eq,
+    "!=": operator.ne,
+}
+
+
+# ============================================================================
+# EVENTS, WINDOWS & RULES
+# ============================================================================
+
+
+class FraudEvent(msgspec.Struct, frozen=True, omit_defaults=True):
+    """One trade event (also the JSONL line format of the replay tool).
+
+    ``value`` is the credit amount at stake (escrow hold) and
+    ``account_age_days`` the acting user's account age; conditions on an
+    unknown (None) field never match.
+    """
+
+    ts: float
+    kind: str
+    user_id: int
+    trade_id: int | None = None
+    value: int = 0
+    account_age_days: float | None = None
+
+
+@dataclass(frozen=True)
+class Window:
+    """Sliding per-user counter of one event kind.
+
+    Parameters
+    ----------
+    kind : str
+        Event kind counted.
+    seconds : float
+        Window length.
+    buckets : int
+        Ring slots; resolution is ``seconds / buckets``.
+    field : str | None
+        Sum this event field instead of counting events (e.g. ``value``).
+    """
+
+    kind: str
+    seconds: float
+    buckets: int = 24
+    field: str | None = None
+
+
+@dataclass(frozen=True)
+class Rule:
+    """A flag raised when every condition holds.
+
+    Parameters
+    ----------
+    name : str
+        Rule id (also the cooldown key).
+    on : tuple[str, ...]
+        Event kinds that trigger an evaluation.
+    when : tuple[tuple[str, str, float], ...]
+        ``(metric, op, threshold)`` conditions, all required.
+    severity : str
+        ``low``, ``medium`` or ``high``.
+    message : str
+        Text shown to moderators.
+    cooldown : float
+        Seconds before the rule can flag the same user again.
+    """
+
+    name: str
+    on: tuple[str, ...]
+    when: tuple[tuple[str, str, float], ...]
+    severity: str = "medium"
+    message: str = ""
+    cooldown: float = DAY
+
+
+DEFAULT_WINDOWS: dict[str, Window] = {
+    "proposals_24h": Window("proposal", DAY),
+    "proposals_7d": Window("proposal", 7 * DAY, buckets=28),
+    "completed_30d": Window("completed", 30 * DAY, buckets=30),
+    "cancelled_24h": Window("cancelled", DAY),
+    "hold_value_24h": Window("hold", DAY, field="value"),
+}
+
+DEFAULT_RULES: tuple[Rule, ...] = (
+    Rule(
+        "proposals_without_completion",
+        on=("proposal",),
+        when=(("proposals_7d", ">=", 15), ("completed_30d", "==", 0)),
+        message="Muitas propostas sem nenhuma troca concluída",
+    ),
+    Rule(
+        "proposal_burst",
+        on=("proposal",),
+        when=(("proposals_24h", ">=", 30),),
+        severity="high",
+        message="Rajada de propostas em 24 h",
+        cooldown=HOUR,
+    ),
+    Rule(
+        "new_user_value_limit",
+        on=("hold",),
+        when=(("account_age_days", "<", 30), ("value", ">", 200)),
+        severity="high",
+        message="Conta nova propondo troca acima do limite de valor",
+        cooldown=0.0,
+    ),
+    Rule(
+        "new_user_daily_value",
+        on=("hold",),
+        when=(("account_age_days", "<", 30), ("hold_value_24h", ">", 500)),
+        message="Conta nova acima do volume diário permitido",
+    ),
+    Rule(
+        "cancellation_burst",
+        on=("cancelled",),
+        when=(("cancelled_24h", ">=", 5),),
+        severity="low",
+        message="Muitas trocas canceladas em 24 h",
+    ),
+)
+
+
+def load_rules(specs: Iterable[Mapping[str, Any]]) -> tuple[Rule, ...]:
+    """Build rules from plain dicts (e.g. a JSON config file)."""
+    rules = []
+    for spec in specs:
+        spec = dict(spec)
+        spec["on"] = tuple(spec["on"])
+        spec["when"] = tuple(tuple(condition) for condition in spec["when"])
+        rules.append(Rule(**spec))
+    return tuple(rules)
+
+
+@dataclass(frozen=True)
+class FraudFlag:
+    """A rule that fired for a user."""
+
+    rule: str
+    user_id: int
+    ts: float
+    severity: str
+    message: str
+    trade_id: int | None = None
+
+
+@dataclass
+class MonitorMetrics:
+    """Counters exposed for monitoring."""
+
+    events: int = 0
+    flags: int = 0
+    suppressed: int = 0  # flags swallowed by a rule's cooldown
+    by_rule: Counter = field(default_factory=Counter)
+
+
+# ============================================================================
+# MONITOR
+# ============================================================================
+
+
+class _UserWindows:
+    """Ring buffers of one user: ``counts[offset(series) + bucket % buckets]``."""
+
+    __slots__ = ("counts", "heads", "totals", "flagged", "last_ts")
+
+    def __init__(self, n_slots: int, heads: array):
+        self.counts = array("q", bytes(8 * n_slots))
+        self.heads = heads  # latest bucket number per series
+        self.totals = array("q", bytes(8 * len(heads)))
+        self.flagged: dict[str, float] | None = None  # rule -> last flag ts
+        self.last_ts = 0.0
+
+
+class FraudMonitor:
+    """Evaluates ``rules`` over per-user sliding ``windows`` event by event.
+
+    Parameters
+    ----------
+    windows : Mapping[str, Window]
+        Named counters rules can refer to.
+    rules : Sequence[Rule]
+        Rule set; unknown metrics or operators raise ``ValueError``.
+
+    Attributes
+    ----------
+    on_flag : list[Callable[[FraudFlag], None]]
+        Called synchronously with every emitted flag (keep them cheap, e.g.
+        ``FlagNotifier.submit``).
+    """
+
+    def __init__(
+        self,
+        windows: Mapping[str, Window] = DEFAULT_WINDOWS,
+        rules: Sequence[Rule] = DEFAULT_RULES,
+    ):
+        self.windows = dict(windows)
+        self.rules = tuple(rules)
+        self.on_flag: list[Callable[[FraudFlag], None]] = []
+        self.metrics = MonitorMetrics()
+        self._users: dict[int, _UserWindows] = {}
+
+        names = list(self.windows)
+        self._index = {name: i for i, name in enumerate(names)}
+        specs = [self.windows[name] for name in names]
+        self._buckets = [w.buckets for w in specs]
+        self._widths = [w.seconds / w.buckets for w in specs]
+        self._offsets = list(accumulate([0] + self._buckets[:-1]))
+        self._n_slots = sum(self._buckets)
+        self._series = list(zip(range(len(specs)), self._widths, self._buckets, self._offsets))
+        self._zeros = [array("q", bytes(8 * n)) for n in self._buckets]
+        # kind -> [(series, field, first slot, buckets)] updated by that kind
+        self._updates: dict[str, list[tuple[int, str | None, int, int]]] = {}
+        for i, spec in enumerate(specs):
+            self._updates.setdefault(spec.kind, []).append(
+                (i, spec.field, self._offsets[i], spec.buckets)
+            )
+        # kind -> [(rule, ((series or -1, field, op, threshold), ...))]
+        self._compiled: dict[str, list[tuple[Rule, tuple]]] = {}
+        for rule in self.rules:
+            conditions = []
+            for metric, op, threshold in rule.when:
+                if op not in _OPS:
+                    raise ValueError(f"rule {rule.name}: unknown operator {op!r}")
+                if metric in self._index:
+                    conditions.append((self._index[metric], None, _OPS[op], threshold))
+                elif metric in FraudEvent.__struct_fields__:
+                    conditions.append((-1, metric, _OPS[op], threshold))
+                else:
+                    raise ValueError(f"rule {rule.name}: unknown metric {metric!r}")
+            for kind in rule.on:
+                self._compiled.setdefault(kind, []).append((rule, tuple(conditions)))
+
+    def __len__(self) -> int:
+        return len(self._users)
+
+    # ---------------------------------------------------------------- windows
+
+    def _state(self, user_id: int, ts: float) -> _UserWindows:
+        state = self._users.get(user_id)
+        if state is None:
+            heads = array("q", [int(ts // width) for width in self._widths])
+            state = self._users[user_id] = _UserWindows(self._n_slots, heads)
+        return state
+
+    def _advance(self, state: _UserWindows, ts: float) -> None:
+        """Expire the slots every series left behind since the last event."""
+        counts, heads, totals = state.counts, state.heads, state.totals
+        for series, width, n, offset in self._series:
+            bucket = int(ts // width)
+            head = heads[series]
+            if bucket <= head:  # same bucket (or a slightly late event)
+                continue
+            if bucket - head >= n:
+                counts[offset : offset + n] = self._zeros[series]
+                totals[series] = 0
+            else:
+                for b in range(head + 1, bucket + 1):
+                    slot = offset + b % n
+                    totals[series] -= counts[slot]
+                    counts[slot] = 0
+            heads[series] = bucket
+
+    def count(self, user_id: int, window: str, now: float | None = None) -> int:
+        """Current value of a user's window (0 for unknown users)."""
+        state = self._users.get(user_id)
+        if state is None:
+            return 0
+        self._advance(state, time.time() if now is None else now)
+        return state.totals[self._index[window]]
+
+    # ---------------------------------------------------------------- events
+
+    def observe(self, event: FraudEvent) -> list[FraudFlag]:
+        """Count an event, evaluate the rules it triggers, emit flags."""
+        self.metrics.events += 1
+        ts = event.ts
+        state = self._state(event.user_id, ts)
+        self._advance(state, ts)
+        if ts > state.last_ts:
+            state.last_ts = ts
+        counts, heads, totals = state.counts, state.heads, state.totals
+        for series, field_name, offset, n in self._updates.get(event.kind, ()):
+            amount = 1 if field_name is None else getattr(event, field_name)
+            slot = offset + heads[series] % n
+            counts[slot] += amount
+            totals[series] += amount
+
+        flags = []
+        for rule, conditions in self._compiled.get(event.kind, ()):
+            for series, field_name, op, threshold in conditions:
+                value = totals[series] if series >= 0 else getattr(event, field_name)
+                if value is None or not op(value, threshold):
+                    break
+            else:
+                flag = self._flag(rule, state, event)
+                if flag is not None:
+                    flags.append(flag)
+        return flags
+
+    def _flag(self, rule: Rule, state: _UserWindows, event: FraudEvent) -> FraudFlag | None:
+        if state.flagged is None:
+            state.flagged = {}
+        last = state.flagged.get(rule.name)
+        if last is not None and event.ts - last < rule.cooldown:
+            self.metrics.suppressed += 1
+            return None
+        state.flagged[rule.name] = event.ts
+        flag = FraudFlag(
+            rule.name, event.user_id, event.ts, rule.severity, rule.message, event.trade_id
+        )
+        self.metrics.flags += 1
+        self.metrics.by_rule[rule.name] += 1
+        for callback in self.on_flag:
+            callback(flag)
+        return flag
+
+    def sweep(self, now: float | None = None) -> int:
+        """Forget users idle for longer than every window and cooldown."""
+        now = time.time() if now is None else now
+        horizon = max(
+            [w.seconds for w in self.windows.values()] + [r.cooldown for r in self.rules]
+        )
+        idle = [uid for uid, state in self._users.items() if now - state.last_ts > horizon]
+        for user_id in idle:
+            del self._users[user_id]
+        return len(idle)
+
+    # ------------------------------------------------------- trade service
+
+    def trade_hook(self, kind: str) -> Callable[[TradeState], Any]:
+        """A ``TradeService`` hook feeding ``kind`` events for a trade.
+
+        Proposals count for the proposer and cancellations for the user who
+        cancelled (none for system cancels); other transitions count for
+        both sides. Values are not known here: see ``escrow_hook``.
+        """
+
+        async def hook(state: TradeState) -> None:
+            if kind == "proposal":
+                users = (state.proposer_id,)
+            elif kind == "cancelled":
+                users = () if state.cancelled_by is None else (state.cancelled_by,)
+            else:
+                users = (state.proposer_id, state.owner_id)
+            ts = time.time()
+            for user_id in users:
+                self.observe(FraudEvent(ts, kind, user_id, state.id))
+
+        return hook
+
+    def escrow_hook(
+        self, account_age: Callable[[int], Awaitable[float | None]]
+    ) -> Callable[[LedgerEntry], Awaitable[None]]:
+        """An ``EscrowLedger.on_hold`` hook feeding ``hold`` events.
+
+        ``account_age`` returns the payer's account age in days (or None
+        when unknown), e.g. ``account_age_lookup(session_factory)``.
+        """
+
+        async def hook(entry: LedgerEntry) -> None:
+            age = await account_age(entry.account_id)
+            self.observe(
+                FraudEvent(
+                    entry.ts, "hold", entry.account_id, entry.trade_id, entry.amount, age
+                )
+            )
+
+        return hook
+
+
+def account_age_lookup(
+    session_factory: async_sessionmaker[AsyncSession],
+) -> Callable[[int], Awaitable[float | None]]:
+    """Account age in days by user id, for ``FraudMonitor.escrow_hook``.
+
+    Sign-up times never change, so they are cached (bounded, for an hour).
+    """
+    created: TTLCache[int, datetime] = TTLCache(50_000, HOUR)
+
+    async def account_age(user_id: int) -> float | None:
+        signed_up = created.get(user_id)
+        if signed_up is None:
+            async with session_factory() as session:
+                signed_up = await session.scalar(
+                    select(User.created_at).where(User.id == user_id)
+                )
+            if signed_up is None:
+                return None
+            if signed_up.tzinfo is None:  # SQLite drops the offset
+                signed_up = signed_up.replace(tzinfo=timezone.utc)
+            created.set(user_id, signed_up)
+        return (datetime.now(timezone.utc) - signed_up).total_seconds() / DAY
+
+    return account_age
+
+
+def replay_jsonl(path: Path, monitor: FraudMonitor) -> int:
+    """Run every event of a JSONL file through ``monitor``; returns the count.
+
+    Events are decoded in chunks straight into ``FraudEvent`` structs and
+    applied in file order, with no sleeps: event timestamps drive the windows.
+    """
+    decoder = msgspec.json.Decoder(FraudEvent)
+    observe = monitor.observe
+    count = 0
+    with open(path, "rb") as f:
+        while True:
+            lines = f.readlines(1 << 20)
+            if not lines:
+                return count
+            for line in lines:
+                if line.strip():
+                    observe(decoder.decode(line))
+                    count += 1
+
+
+# ============================================================================
+# NOTIFICATION PIPELINE
+# ============================================================================
+
+
+class FlagNotifier:
+    """Buffers flags and writes them as ``system`` notifications in batches.
+
+    ``submit`` never blocks (it fits ``FraudMonitor.on_flag``); a background
+    writer inserts each batch for every moderator with one
+    ``NotificationRepository.bulk_insert``. When the buffer is full the flag
+    is dropped and counted in ``dropped``.
+
+    Parameters
+    ----------
+    session_factory : async_sessionmaker[AsyncSession]
+        Factory from ``backend.db.create_session_factory``.
+    moderator_ids : Sequence[int]
+        Users who receive the flags.
+    queue_size : int
+        Flags buffered before ``submit`` starts dropping.
+    batch_size : int
+        Maximum flags written per transaction.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        moderator_ids: Sequence[int],
+        queue_size: int = 10_000,
+        batch_size: int = 256,
+    ):
+        self.sessions = session_factory
+        self.moderator_ids = tuple(moderator_ids)
+        self.batch_size = batch_size
+        self.dropped = 0
+        self.written = 0
+        self._queue: asyncio.Queue[FraudFlag] = asyncio.Queue(queue_size)
+        self._writer: asyncio.Task | None = None
+
+    def submit(self, flag: FraudFlag) -> bool:
+        """Queue a flag; returns False if it was dropped."""
+        try:
+            self._queue.put_nowait(flag)
+        except asyncio.QueueFull:
+            self.dropped += 1
+            return False
+        return True
+
+    def start(self) -> None:
+        """Start the background writer on the running loop."""
+        if self._writer is None:
+            self._writer = asyncio.create_task(self._write_loop())
+
+    def _rows(self, flags: list[FraudFlag]) -> list[dict[str, Any]]:
+        return [
+            {
+                "user_id": moderator,
+                "sender_id": flag.user_id,
+                "type": "system",
+                "message": f"[{flag.severity}] {flag.message or flag.rule}",
+                "related_content": f"regra {flag.rule}"
+                + (f", troca #{flag.trade_id}" if flag.trade_id is not None else ""),
+            }
+            for flag in flags
+            for moderator in self.moderator_ids
+        ]
+
+    async def _write_loop(self) -> None:
+        queue = self._queue
+        while True:
+            batch = [await queue.get()]
+            while len(batch) < self.batch_size and not queue.empty():
+                batch.append(queue.get_nowait())
+            try:
+                async with session_scope(self.sessions) as session:
+                    await NotificationRepository(session).bulk_insert(self._rows(batch))
+                self.written += len(batch)
+            except Exception:  # keep the writer alive; the batch is lost
+                self.dropped += len(batch)
+            finally:
+                for _ in batch:
+                    queue.task_done()
+
+    async def close(self) -> None:
+        """Write everything queued and stop the writer."""
+        if self._writer is None:
+            return
+        await self._queue.join()
+        self._writer.cancel()
+        try:
+            await self._writer
+        except asyncio.CancelledError:
+            pass
+        self._writer = None
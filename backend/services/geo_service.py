@@ -0,0 +1,304 @@
+"""Location search: geohash-cell grid index with distance-ordered results.
+
+Implements the "location" filter planned in ``search.py``. Points are
+bucketed into the cells of a geohash of ``precision`` characters (precision
+5 is ~4.9 x 4.9 km at the equator). Cell keys are row-major
+(``lat_cell << lon_bits | lon_cell``), so the cells of one grid row that
+overlap a query box are a single contiguous key range: a radius or bounding
+box query costs one ``searchsorted`` pair per row instead of one lookup per
+cell, then a vectorized haversine over the candidates.
+
+Results are ordered by distance and cut to ``limit`` with a bounded heap:
+each candidate batch contributes its ``limit`` nearest (``argpartition``)
+to a max-heap of size ``limit``, so matches are never fully sorted. The
+total number of matches is still reported for pagination. Text and tag
+filters are applied first and passed in as ``allowed`` ids.
+
+Like ``HammingIndex``, the sorted arrays are rebuilt in bulk; single
+``add`` calls land in a small linear-scanned tail until it is merged.
+Moving or removing a point marks its old row dead in place instead of
+rebuilding: an ``item_id -> row`` map (rebuilt by each merge) and an
+id-keyed tail make that O(1). Dead rows are skipped by queries and dropped
+at the next merge.
+"""
+
+from __future__ import annotations
+
+import heapq
+import math
+import threading
+from dataclasses import dataclass
+
+import numpy as np
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE_LAT = math.pi * EARTH_RADIUS_KM / 180
+_BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+
+
+def encode_geohash(latitude: float, longitude: float, precision: int = 9) -> str:
+    """Return the geohash of a point (``precision`` base32 characters)."""
+    lat_range, lon_range = [-90.0, 90.0], [-180.0, 180.0]
+    chars, bits, value, even = [], 0, 0, True
+    while len(chars) < precision:
+        rng, coord = (lon_range, longitude) if even else (lat_range, latitude)
+        mid = (rng[0] + rng[1]) / 2
+        value <<= 1
+        if coord >= mid:
+            value |= 1
+            rng[0] = mid
+        else:
+            rng[1] = mid
+        even = not even
+        bits += 1
+        if bits == 5:
+            chars.append(_BASE32[value])
+            bits, value = 0, 0
+    return "".join(chars)
+
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    """Great-circle distance in km; works on scalars and NumPy arrays."""
+    lat1, lon1, lat2, lon2 = map(np.radians, (lat1, lon1, lat2, lon2))
+    a = (
+        np.sin((lat2 - lat1) / 2) ** 2
+        + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+
+@dataclass(frozen=True)
+class GeoHit:
+    """An indexed item and its distance from the query origin."""
+
+    item_id: int
+    distance_km: float
+
+
+@dataclass(frozen=True)
+class GeoResult:
+    """Nearest ``hits`` (at most ``limit``) and the total number of matches."""
+
+    hits: list[GeoHit]
+    total: int
+
+
+class GeoIndex:
+    """Grid index over (latitude, longitude) points.
+
+    Parameters
+    ----------
+    precision : int
+        Geohash length whose cells form the grid.
+    tail_fraction : float
+        Merge the unindexed tail once it exceeds this fraction of the
+        indexed size (at least 4096 entries).
+    """
+
+    def __init__(self, precision: int = 5, tail_fraction: float = 0.05):
+        self.precision = precision
+        self.tail_fraction = tail_fraction
+        bits = 5 * precision
+        self.lon_bits = (bits + 1) // 2
+        self.lat_bits = bits // 2
+        self._keys = np.empty(0, dtype=np.int64)
+        self._lats = np.empty(0, dtype=np.float64)
+        self._lons = np.empty(0, dtype=np.float64)
+        self._ids = np.empty(0, dtype=np.int64)
+        self._dead = np.empty(0, dtype=bool)  # rows of moved/removed points
+        self._dead_count = 0
+        self._rows: dict[int, int] = {}  # item_id -> live row in the sorted arrays
+        self._tail: dict[int, tuple[float, float]] = {}  # item_id -> (lat, lon)
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._rows) + len(self._tail)
+
+    # ------------------------------------------------------------------ cells
+
+    def _lat_cell(self, lat):
+        n = 1 << self.lat_bits
+        return np.clip(np.floor((np.asarray(lat) + 90.0) / 180.0 * n), 0, n - 1).astype(np.int64)
+
+    def _lon_cell(self, lon):
+        n = 1 << self.lon_bits
+        return np.clip(np.floor((np.asarray(lon) + 180.0) / 360.0 * n), 0, n - 1).astype(np.int64)
+
+    def _cell_keys(self, lats: np.ndarray, lons: np.ndarray) -> np.ndarray:
+        return (self._lat_cell(lats) << self.lon_bits) | self._lon_cell(lons)
+
+    def _key_ranges(self, south: float, west: float, north: float, east: float):
+        """Contiguous [lo, hi] key ranges covering the box (west may exceed east
+        when the box crosses the antimeridian)."""
+        rows = range(int(self._lat_cell(south)), int(self._lat_cell(north)) + 1)
+        if west <= east:
+            spans = [(int(self._lon_cell(west)), int(self._lon_cell(east)))]
+        else:
+            spans = [
+                (int(self._lon_cell(west)), (1 << self.lon_bits) - 1),
+                (0, int(self._lon_cell(east))),
+            ]
+        return [
+            ((row << self.lon_bits) | lo, (row << self.lon_bits) | hi)
+            for row in rows
+            for lo, hi in spans
+        ]
+
+    # ---------------------------------------------------------------- updates
+
+    def add_many(self, ids, latitudes, longitudes) -> None:
+        """Bulk-add points and rebuild the sorted arrays (initial loads)."""
+        with self._lock:
+            self._merge(
+                np.asarray(ids, dtype=np.int64),
+                np.asarray(latitudes, dtype=np.float64),
+                np.asarray(longitudes, dtype=np.float64),
+            )
+
+    def add(self, item_id: int, latitude: float, longitude: float) -> None:
+        """Add (or move) one point; it is searchable immediately."""
+        with self._lock:
+            self._drop(item_id)
+            self._tail[item_id] = (latitude, longitude)
+            limit = max(4096, int(len(self._ids) * self.tail_fraction))
+            if len(self._tail) > limit or self._dead_count > limit:
+                self._merge()
+
+    def remove(self, item_id: int) -> None:
+        """Remove a point (listing closed or its location cleared)."""
+        with self._lock:
+            self._drop(item_id)
+
+    def _drop(self, item_id: int) -> None:
+        """Forget the point's current position in O(1) (caller holds the lock)."""
+        row = self._rows.pop(item_id, None)
+        if row is not None:
+            self._dead[row] = True
+            self._dead_count += 1
+        self._tail.pop(item_id, None)
+
+    def _tail_arrays(self) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        ids = np.fromiter(self._tail, dtype=np.int64, count=len(self._tail))
+        coords = np.array(list(self._tail.values()), dtype=np.float64).reshape(-1, 2)
+        return ids, coords[:, 0], coords[:, 1]
+
+    def _merge(self, ids=None, lats=None, lons=None) -> None:
+        alive = ~self._dead
+        parts = [(self._ids[alive], self._lats[alive], self._lons[alive])]
+        if self._tail:
+            parts.append(self._tail_arrays())
+        if ids is not None:
+            # Within the batch, the last position of a repeated id wins
+            _, last = np.unique(ids[::-1], return_index=True)
+            if len(last) < len(ids):
+                keep = np.sort(len(ids) - 1 - last)
+                ids, lats, lons = ids[keep], lats[keep], lons[keep]
+            # Bulk-added ids replace any position they already had
+            kept = []
+            for p_ids, p_lats, p_lons in parts:
+                keep = ~np.isin(p_ids, ids)
+                kept.append((p_ids[keep], p_lats[keep], p_lons[keep]))
+            parts = kept
+            parts.append((ids, lats, lons))
+        all_ids, all_lats, all_lons = (np.concatenate(column) for column in zip(*parts))
+        keys = self._cell_keys(all_lats, all_lons)
+        order = np.argsort(keys, kind="stable")
+        self._keys = keys[order]
+        self._ids, self._lats, self._lons = all_ids[order], all_lats[order], all_lons[order]
+        self._dead = np.zeros(len(self._ids), dtype=bool)
+        self._dead_count = 0
+        self._rows = dict(zip(self._ids.tolist(), range(len(self._ids))))
+        self._tail = {}
+
+    # ---------------------------------------------------------------- queries
+
+    def within_radius(
+        self,
+        latitude: float,
+        longitude: float,
+        radius_km: float,
+        limit: int = 20,
+        allowed: np.ndarray | None = None,
+    ) -> GeoResult:
+        """Points within ``radius_km`` of a point, nearest first."""
+        dlat = radius_km / KM_PER_DEGREE_LAT
+        south, north = max(-90.0, latitude - dlat), min(90.0, latitude + dlat)
+        widest = max(abs(south), abs(north))
+        if widest >= 89.9 or radius_km >= math.pi * EARTH_RADIUS_KM / 2:
+            west, east = -180.0, 180.0
+        else:
+            dlon = dlat / math.cos(math.radians(widest))
+            west, east = longitude - dlon, longitude + dlon
+            if dlon >= 180:
+                west, east = -180.0, 180.0
+            else:
+                west = west + 360 if west < -180 else west
+                east = east - 360 if east > 180 else east
+        return self._search(
+            (south, west, north, east), (latitude, longitude), radius_km, limit, allowed
+        )
+
+    def within_bbox(
+        self,
+        south: float,
+        west: float,
+        north: float,
+        east: float,
+        limit: int = 20,
+        origin: tuple[float, float] | None = None,
+        allowed: np.ndarray | None = None,
+    ) -> GeoResult:
+        """Points inside a bounding box, nearest to ``origin`` (default: box
+        center) first."""
+        if origin is None:
+            mid_lon = (west + east) / 2 if west <= east else (west + east + 360) / 2
+            origin = ((south + north) / 2, (mid_lon + 180) % 360 - 180)
+        return self._search((south, west, north, east), origin, None, limit, allowed)
+
+    def _search(self, box, origin, radius_km, limit, allowed) -> GeoResult:
+        south, west, north, east = box
+        with self._lock:
+            batches = []
+            if len(self._keys):
+                ranges = np.array(self._key_ranges(*box), dtype=np.int64)
+                starts = np.searchsorted(self._keys, ranges[:, 0], side="left")
+                ends = np.searchsorted(self._keys, ranges[:, 1], side="right")
+                positions = [np.arange(s, e) for s, e in zip(starts, ends) if e > s]
+                if positions:
+                    pos = np.concatenate(positions)
+                    if self._dead_count:
+                        pos = pos[~self._dead[pos]]
+                    batches.append((self._ids[pos], self._lats[pos], self._lons[pos]))
+            if self._tail:
+                batches.append(self._tail_arrays())
+
+        heap: list[tuple[float, int]] = []  # (-distance, -id): max-heap of the nearest
+        total = 0
+        for ids, lats, lons in batches:
+            distances = haversine_km(origin[0], origin[1], lats, lons)
+            if radius_km is not None:
+                mask = distances <= radius_km
+            else:
+                if west <= east:
+                    in_lon = (lons >= west) & (lons <= east)
+                else:  # box crosses the antimeridian
+                    in_lon = (lons >= west) | (lons <= east)
+                mask = (lats >= south) & (lats <= north) & in_lon
+            if allowed is not None:
+                mask &= np.isin(ids, allowed)
+            ids, distances = ids[mask], distances[mask]
+            total += len(ids)
+            if limit <= 0:
+                continue
+            if len(ids) > limit:
+                nearest = np.argpartition(distances, limit - 1)[:limit]
+                ids, distances = ids[nearest], distances[nearest]
+            for item_id, distance in zip(ids.tolist(), distances.tolist()):
+                entry = (-distance, -item_id)
+                if len(heap) < limit:
+                    heapq.heappush(heap, entry)
+                elif entry > heap[0]:
+                    heapq.heapreplace(heap, entry)
+        hits = [GeoHit(-neg_id, -neg_d) for neg_d, neg_id in heap]
+        hits.sort(key=lambda hit: (hit.distance_km, hit.item_id))
+        return GeoResult(hits, total)
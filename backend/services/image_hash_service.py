@@ -0,0 +1,311 @@
+"""Perceptual image hashes and a Hamming-distance index for duplicate uploads.
+
+Implements the roadmap's "image hashing (pHash) to avoid duplicates" item:
+
+- ``phash``/``dhash`` compute 64-bit perceptual hashes with NumPy. The DCT for
+  pHash is a precomputed matrix product, so a whole batch of images is hashed
+  with two ``matmul`` calls (``phash_batch``).
+- ``HammingIndex`` answers "which stored hashes are within distance r of this
+  one" with multi-index hashing: each 64-bit hash is split into ``m`` 16-bit
+  chunks. By pigeonhole, a hash within distance ``r`` matches the query on at
+  least one chunk up to ``r // m`` bit flips, so a query probes a few exact
+  chunk buckets and checks only those candidates with a vectorized popcount
+  instead of scanning (or walking a BK-tree over) every stored hash.
+
+Chunk buckets are stored CSR-style (sorted ids + offsets) in NumPy arrays.
+New hashes go to a small unindexed tail that is scanned linearly and merged
+into the buckets once it grows past a fraction of the index.
+"""
+
+from __future__ import annotations
+
+import itertools
+import os
+import threading
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Sequence
+
+import numpy as np
+
+HASH_BITS = 64
+CHUNK_BITS = 16
+DEFAULT_MAX_DISTANCE = 6
+
+
+# ============================================================================
+# HASHING
+# ============================================================================
+
+
+def load_gray(path: str | os.PathLike, size: int) -> np.ndarray:
+    """Decode ``path`` to a ``size`` x ``size`` float32 grayscale array."""
+    from PIL import Image
+
+    with Image.open(path) as image:
+        image.draft("L", (size * 4, size * 4))  # cheap JPEG downscale on decode
+        gray = image.convert("L").resize((size, size), Image.Resampling.LANCZOS)
+        return np.asarray(gray, dtype=np.float32)
+
+
+@lru_cache(maxsize=4)
+def _dct_matrix(n: int) -> np.ndarray:
+    """Orthonormal DCT-II matrix, so ``D @ X @ D.T`` is the 2-D DCT of ``X``."""
+    k = np.arange(n)[:, None]
+    i = np.arange(n)[None, :]
+    matrix = np.cos(np.pi * (2 * i + 1) * k / (2 * n)) * np.sqrt(2 / n)
+    matrix[0] /= np.sqrt(2)
+    return matrix.astype(np.float32)
+
+
+def _pack(bits: np.ndarray) -> np.ndarray:
+    """Pack ``(N, 64)`` booleans into ``(N,)`` uint64 (first bit = MSB)."""
+    return np.packbits(bits, axis=1).view(">u8").ravel().astype(np.uint64)
+
+
+def phash_batch(pixels: np.ndarray, hash_size: int = 8) -> np.ndarray:
+    """pHash a stack of square grayscale images.
+
+    Parameters
+    ----------
+    pixels : np.ndarray
+        ``(N, S, S)`` grayscale arrays (S = 4 * ``hash_size`` is typical).
+    hash_size : int
+        Side of the low-frequency DCT block kept (8 -> 64-bit hashes).
+
+    Returns
+    -------
+    np.ndarray
+        ``(N,)`` uint64 hashes: bit set where the coefficient exceeds the
+        block median (the DC term is excluded from the median).
+    """
+    dct = _dct_matrix(pixels.shape[-1])
+    coeffs = (dct @ pixels @ dct.T)[:, :hash_size, :hash_size]
+    flat = coeffs.reshape(len(coeffs), -1)
+    median = np.median(flat[:, 1:], axis=1, keepdims=True)
+    return _pack(flat > median)
+
+
+def dhash_batch(pixels: np.ndarray) -> np.ndarray:
+    """dHash a stack of ``(N, 8, 9)`` grayscale arrays (row gradient signs)."""
+    return _pack((pixels[:, :, 1:] > pixels[:, :, :-1]).reshape(len(pixels), -1))
+
+
+def phash(path: str | os.PathLike) -> int:
+    """Return the 64-bit pHash of an image file."""
+    return int(phash_batch(load_gray(path, 32)[None])[0])
+
+
+def dhash(path: str | os.PathLike) -> int:
+    """Return the 64-bit dHash of an image file."""
+    from PIL import Image
+
+    with Image.open(path) as image:
+        gray = image.convert("L").resize((9, 8), Image.Resampling.LANCZOS)
+        pixels = np.asarray(gray, dtype=np.int16)
+    return int(dhash_batch(pixels[None])[0])
+
+
+def hamming(a: int, b: int) -> int:
+    """Hamming distance between two hashes."""
+    return (a ^ b).bit_count()
+
+
+# ============================================================================
+# INDEX
+# ============================================================================
+
+
+@dataclass(frozen=True)
+class HashMatch:
+    """A stored hash within the query radius."""
+
+    item_id: int
+    distance: int
+
+
+class HammingIndex:
+    """Multi-index hashing over 64-bit hashes.
+
+    Parameters
+    ----------
+    max_distance : int
+        Largest query radius the probe plan is built for.
+    tail_fraction : float
+        Merge the unindexed tail into the buckets once it exceeds this
+        fraction of the indexed size (at least 4096 entries).
+    """
+
+    def __init__(
+        self, max_distance: int = DEFAULT_MAX_DISTANCE, tail_fraction: float = 0.05
+    ):
+        self.max_distance = max_distance
+        self.tail_fraction = tail_fraction
+        self.n_chunks = HASH_BITS // CHUNK_BITS
+        flips = max_distance // self.n_chunks
+        # XOR masks with <= ``flips`` bits set inside one chunk
+        self._probes = np.array(
+            [
+                sum(1 << b for b in bits)
+                for k in range(flips + 1)
+                for bits in itertools.combinations(range(CHUNK_BITS), k)
+            ],
+            dtype=np.int64,
+        )
+        self._hashes = np.empty(0, dtype=np.uint64)
+        self._ids = np.empty(0, dtype=np.int64)
+        self._order: list[np.ndarray] = []  # per chunk: positions sorted by chunk
+        self._offsets: list[np.ndarray] = []  # per chunk: bucket start offsets
+        self._tail_hashes: list[int] = []
+        self._tail_ids: list[int] = []
+        self._lock = threading.Lock()
+        self._build()
+
+    def __len__(self) -> int:
+        return len(self._hashes) + len(self._tail_hashes)
+
+    def _chunk(self, hashes: np.ndarray, j: int) -> np.ndarray:
+        shift = np.uint64(j * CHUNK_BITS)
+        return ((hashes >> shift) & np.uint64(0xFFFF)).astype(np.int64)
+
+    def _build(self) -> None:
+        self._order, self._offsets = [], []
+        for j in range(self.n_chunks):
+            keys = self._chunk(self._hashes, j)
+            order = np.argsort(keys, kind="stable")
+            counts = np.bincount(keys, minlength=1 << CHUNK_BITS)
+            offsets = np.zeros((1 << CHUNK_BITS) + 1, dtype=np.int64)
+            np.cumsum(counts, out=offsets[1:])
+            self._order.append(order)
+            self._offsets.append(offsets)
+
+    def add_many(self, hashes, ids) -> None:
+        """Bulk-add hashes and rebuild the buckets (use for initial loads)."""
+        with self._lock:
+            self._merge(np.asarray(hashes, dtype=np.uint64), np.asarray(ids, dtype=np.int64))
+
+    def add(self, hash_value: int, item_id: int) -> None:
+        """Add one hash; it is searchable immediately via the tail."""
+        with self._lock:
+            self._tail_hashes.append(hash_value)
+            self._tail_ids.append(item_id)
+            limit = max(4096, int(len(self._hashes) * self.tail_fraction))
+            if len(self._tail_hashes) > limit:
+                self._merge(np.empty(0, dtype=np.uint64), np.empty(0, dtype=np.int64))
+
+    def _merge(self, hashes: np.ndarray, ids: np.ndarray) -> None:
+        self._hashes = np.concatenate(
+            [self._hashes, np.array(self._tail_hashes, dtype=np.uint64), hashes]
+        )
+        self._ids = np.concatenate(
+            [self._ids, np.array(self._tail_ids, dtype=np.int64), ids]
+        )
+        self._tail_hashes, self._tail_ids = [], []
+        self._build()
+
+    def query(self, hash_value: int, max_distance: int | None = None) -> list[HashMatch]:
+        """Return stored items within ``max_distance``, nearest first."""
+        radius = self.max_distance if max_distance is None else max_distance
+        if radius > self.max_distance:
+            raise ValueError(f"index built for max_distance={self.max_distance}")
+        query = np.uint64(hash_value)
+        with self._lock:
+            return self._query(hash_value, query, radius)
+
+    def _query(self, hash_value: int, query: np.uint64, radius: int) -> list[HashMatch]:
+        # Candidate positions: exact bucket hits for each chunk +/- probe flips
+        slices = []
+        for j in range(self.n_chunks):
+            keys = ((hash_value >> (j * CHUNK_BITS)) & 0xFFFF) ^ self._probes
+            offsets = self._offsets[j]
+            starts, ends = offsets[keys], offsets[keys + 1]
+            order = self._order[j]
+            slices.extend(order[s:e] for s, e in zip(starts, ends) if e > s)
+
+        matches = []
+        if slices:
+            positions = np.unique(np.concatenate(slices))
+            distances = np.bitwise_count(self._hashes[positions] ^ query)
+            keep = distances <= radius
+            matches.extend(
+                HashMatch(int(i), int(d))
+                for i, d in zip(self._ids[positions[keep]], distances[keep])
+            )
+        if self._tail_hashes:
+            tail = np.array(self._tail_hashes, dtype=np.uint64)
+            distances = np.bitwise_count(tail ^ query)
+            matches.extend(
+                HashMatch(self._tail_ids[i], int(distances[i]))
+                for i in np.flatnonzero(distances <= radius)
+            )
+        matches.sort(key=lambda m: (m.distance, m.item_id))
+        return matches
+
+
+# ============================================================================
+# DUPLICATE DETECTION
+# ============================================================================
+
+
+class DuplicateImageDetector:
+    """Checks uploads against previously registered images.
+
+    Parameters
+    ----------
+    index : HammingIndex | None
+        Backing index (a new empty one by default).
+    max_distance : int
+        pHash distance at or below which two images count as duplicates.
+    """
+
+    def __init__(
+        self,
+        index: HammingIndex | None = None,
+        max_distance: int = DEFAULT_MAX_DISTANCE,
+    ):
+        self.index = HammingIndex(max_distance) if index is None else index
+        self.max_distance = max_distance
+
+    def find_duplicates(self, path: str | os.PathLike) -> list[HashMatch]:
+        """Return registered images within ``max_distance`` of ``path``."""
+        return self.index.query(phash(path), self.max_distance)
+
+    def register(self, path: str | os.PathLike, item_id: int) -> int:
+        """Hash ``path``, add it under ``item_id`` and return the hash."""
+        value = phash(path)
+        self.index.add(value, item_id)
+        return value
+
+    def register_post(
+        self, paths: Sequence[str | os.PathLike], item_id: int
+    ) -> list[str | os.PathLike]:
+        """Register the photos of one post under ``item_id``, all or nothing.
+
+        Every photo is hashed once and compared with the registered images
+        and with the post's other photos. Returns the photos that are
+        near-duplicates (nothing is registered then), or an empty list.
+        Unreadable files raise ``OSError`` (``PIL.UnidentifiedImageError``
+        for non-images) before anything is registered.
+        """
+        hashes = [phash(path) for path in paths]
+        duplicates = [
+            path
+            for i, (path, value) in enumerate(zip(paths, hashes))
+            if self.index.query(value, self.max_distance)
+            or any(hamming(value, other) <= self.max_distance for other in hashes[:i])
+        ]
+        if not duplicates:
+            for value in hashes:
+                self.index.add(value, item_id)
+        return duplicates
+
+
+_detector: DuplicateImageDetector | None = None
+
+
+def get_duplicate_detector() -> DuplicateImageDetector:
+    """Return the process-wide detector used by the post submission flow."""
+    global _detector
+    if _detector is None:
+        _detector = DuplicateImageDetector()
+    return _detector
@@ -0,0 +1,333 @@
+"""Barter matching: complementary "Troco X por Y" offers.
+
+Post texts follow a few fixed shapes ("Troco notebook... por bicicleta",
+"Ofereço aulas... em troca de cabo HDMI, suporte ou teclado"). The text
+before "por"/"em troca de" is what the author *has*; the options after it are
+what they *want*. ``extract_terms`` reduces each option to its head noun
+(Portuguese noun phrases are head-first: "suporte de notebook" -> suporte)
+plus a head+modifier bigram ("suporte notebook"), accent-stripped and
+singularized, so both sides of a trade meet on the same vocabulary.
+
+``BarterIndex`` keeps two inverted indexes, have-term -> docs and want-term
+-> docs, with postings as compact ``array('I')`` lists. A query gathers the
+postings of a post's terms and counts hits with NumPy:
+
+- direct matches: docs that want one of my haves *and* have one of my wants;
+- 3-way cycles: I give to C (C wants what I have), C gives to B, B gives to
+  me (B has what I want). The best ``fanout`` candidates of each side are
+  joined on C's haves vs B's wants, so the work is bounded by ``fanout``,
+  not by the number of listings.
+
+Updates are incremental: ``add`` appends to the postings, ``remove`` only
+clears an alive flag, and a re-added post gets a fresh internal doc id.
+"""
+
+from __future__ import annotations
+
+import re
+import threading
+import unicodedata
+from array import array
+from dataclasses import dataclass
+
+import numpy as np
+
+# Connectors, verbs and condition words that never name a tradeable thing
+STOPWORDS = frozenset(
+    """
+    a o e as os um uma uns umas de da do das dos em no na nos nas ao aos para pra
+    com sem por ou que se meu minha meus minhas seu sua ate sobre entre ja bem
+    troco troca trocar ofereco oferecer faco dou vendo tenho quero busco procuro
+    aceito reviso ajudo otimizo preciso estou
+    bom boa otimo otima estado novo nova usado usada funcionando conservado
+    """.split()
+)
+
+_PARENS = re.compile(r"\([^)]*\)")
+_SENTENCE = re.compile(r"[.!?](?:\s|$)")
+_SEPARATOR = re.compile(r"\b(?:em troca de|em troca|por)\b")
+_WANT_ONLY = re.compile(r"^\s*(?:busco|procuro|preciso de|quero)\b")
+_OPTIONS = re.compile(r"[,;:/]|\bou\b|\be\b")
+_TOKEN = re.compile(r"[a-z0-9]+")
+
+
+def normalize(text: str) -> str:
+    """Lowercase and strip accents ("Ofereço" -> "ofereco")."""
+    decomposed = unicodedata.normalize("NFKD", text.lower())
+    return "".join(c for c in decomposed if not unicodedata.combining(c))
+
+
+def _singular(word: str) -> str:
+    if len(word) > 4 and word.endswith("oes"):
+        return word[:-3] + "ao"
+    if len(word) > 4 and word.endswith(("res", "zes")):
+        return word[:-2]
+    if len(word) > 5 and word.endswith(("ais", "eis")):
+        return word[:-2] + "l"  # musicais -> musical, papeis -> papel
+    if len(word) > 3 and word.endswith("s"):
+        return word[:-1]
+    return word
+
+
+def _phrase_terms(phrase: str) -> list[str]:
+    """Head noun and head+modifier bigram of each option in ``phrase``."""
+    terms = []
+    for option in _OPTIONS.split(phrase):
+        words = [
+            _singular(w)
+            for w in _TOKEN.findall(option)
+            if w not in STOPWORDS and not w.isdigit()
+        ]
+        if words:
+            terms.append(words[0])
+            if len(words) > 1:
+                terms.append(f"{words[0]} {words[1]}")
+    return terms
+
+
+def _split_clause(text: str) -> tuple[str, str]:
+    """Split the first sentence with a separator into (have, want) text."""
+    text = _PARENS.sub(" ", normalize(text))
+    if _WANT_ONLY.match(text):
+        return "", _SENTENCE.split(text, 1)[0]
+    for sentence in _SENTENCE.split(text):
+        match = _SEPARATOR.search(sentence)
+        if match:
+            return sentence[: match.start()], sentence[match.end() :]
+    return _SENTENCE.split(text, 1)[0], ""
+
+
+@dataclass(frozen=True)
+class BarterTerms:
+    """Normalized terms a post offers (``have``) and asks for (``want``)."""
+
+    have: frozenset[str]
+    want: frozenset[str]
+
+
+def extract_terms(title: str, description: str = "") -> BarterTerms:
+    """Extract have/want terms from a post title and description.
+
+    Examples
+    --------
+    >>> t = extract_terms("Busco bicicleta urbana",
+    ...                   "Troco notebook Lenovo antigo por bicicleta urbana.")
+    >>> sorted(t.have), sorted(t.want)
+    (['notebook', 'notebook lenovo'], ['bicicleta', 'bicicleta urbana'])
+    """
+    have: list[str] = []
+    want: list[str] = []
+    for text in (title, description):
+        if text:
+            has_text, wants_text = _split_clause(text)
+            have += _phrase_terms(has_text)
+            want += _phrase_terms(wants_text)
+    return BarterTerms(frozenset(have), frozenset(want))
+
+
+# ============================================================================
+# INDEX
+# ============================================================================
+
+
+@dataclass(frozen=True)
+class BarterMatch:
+    """A post that wants something I have and has something I want.
+
+    ``score`` counts shared terms over both directions.
+    """
+
+    post_id: int
+    author_id: int
+    score: int
+
+
+@dataclass(frozen=True)
+class BarterCycle:
+    """Three-way trade: me -> ``receiver`` -> ``provider`` -> me.
+
+    I give to the receiver (who wants what I have), the receiver gives to
+    the provider, and the provider gives me what I want.
+    """
+
+    receiver_id: int
+    provider_id: int
+    score: int
+
+
+class _Postings:
+    """Term vocabulary with one ``array('I')`` doc list per term."""
+
+    def __init__(self):
+        self.docs: list[array] = []
+
+    def add(self, term_id: int, doc: int) -> None:
+        while term_id >= len(self.docs):
+            self.docs.append(array("I"))
+        self.docs[term_id].append(doc)
+
+    def hits(self, term_ids) -> tuple[np.ndarray, np.ndarray]:
+        """Distinct docs posted under any of ``term_ids`` and their hit counts."""
+        lists = [self.docs[t] for t in term_ids if t < len(self.docs) and self.docs[t]]
+        if not lists:
+            empty = np.empty(0, dtype=np.uint32)
+            return empty, empty
+        if len(lists) == 1:
+            return np.array(lists[0], dtype=np.uint32), np.ones(len(lists[0]), np.uint32)
+        docs = np.concatenate([np.array(p, dtype=np.uint32) for p in lists])
+        return np.unique(docs, return_counts=True)
+
+
+class BarterIndex:
+    """Inverted have/want indexes over listings.
+
+    Parameters
+    ----------
+    fanout : int
+        Candidates per side considered when looking for 3-way cycles.
+    """
+
+    def __init__(self, fanout: int = 256):
+        self.fanout = fanout
+        self._lock = threading.Lock()
+        self._vocab: dict[str, int] = {}
+        self._terms: list[str] = []
+        self._have = _Postings()
+        self._want = _Postings()
+        # Per-doc columns, grown by doubling; doc ids are dense and never reused
+        self._post_ids = np.empty(1024, dtype=np.int64)
+        self._authors = np.empty(1024, dtype=np.int64)
+        self._alive = np.zeros(1024, dtype=bool)
+        self._doc_terms: list[tuple[tuple[int, ...], tuple[int, ...]]] = []
+        self._doc_of: dict[int, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._doc_of)
+
+    def _term_ids(self, terms) -> tuple[int, ...]:
+        ids = []
+        for term in terms:
+            term_id = self._vocab.get(term)
+            if term_id is None:
+                term_id = self._vocab[term] = len(self._terms)
+                self._terms.append(term)
+            ids.append(term_id)
+        return tuple(ids)
+
+    # ------------------------------------------------------------- updates
+
+    def add(self, post_id: int, author_id: int, terms: BarterTerms) -> None:
+        """Index (or re-index) a post's terms."""
+        with self._lock:
+            self._remove(post_id)
+            doc = len(self._doc_terms)
+            if doc == len(self._post_ids):
+                size = 2 * doc
+                self._post_ids = np.resize(self._post_ids, size)
+                self._authors = np.resize(self._authors, size)
+                self._alive = np.concatenate([self._alive, np.zeros(doc, dtype=bool)])
+            have, want = self._term_ids(sorted(terms.have)), self._term_ids(sorted(terms.want))
+            for term_id in have:
+                self._have.add(term_id, doc)
+            for term_id in want:
+                self._want.add(term_id, doc)
+            self._post_ids[doc] = post_id
+            self._authors[doc] = author_id
+            self._alive[doc] = True
+            self._doc_terms.append((have, want))
+            self._doc_of[post_id] = doc
+
+    def add_post(self, post_id: int, author_id: int, title: str, description: str) -> BarterTerms:
+        """Extract terms from a post's text and index them."""
+        terms = extract_terms(title, description)
+        self.add(post_id, author_id, terms)
+        return terms
+
+    def remove(self, post_id: int) -> None:
+        """Drop a post (closed, traded or deleted)."""
+        with self._lock:
+            self._remove(post_id)
+
+    def _remove(self, post_id: int) -> None:
+        doc = self._doc_of.pop(post_id, None)
+        if doc is not None:
+            self._alive[doc] = False
+
+    def terms(self, post_id: int) -> BarterTerms:
+        """Terms indexed for a post."""
+        have, want = self._doc_terms[self._doc_of[post_id]]
+        return BarterTerms(
+            frozenset(self._terms[t] for t in have),
+            frozenset(self._terms[t] for t in want),
+        )
+
+    # ------------------------------------------------------------- queries
+
+    def _sides(self, doc: int):
+        """(receivers, their hits), (providers, their hits) for ``doc``.
+
+        Receivers want one of my haves; providers have one of my wants. Dead
+        docs and the author's own posts are filtered out.
+        """
+        have, want = self._doc_terms[doc]
+        author = self._authors[doc]
+        sides = []
+        for postings, terms in ((self._want, have), (self._have, want)):
+            docs, counts = postings.hits(terms)
+            keep = self._alive[docs] & (self._authors[docs] != author)
+            sides.append((docs[keep], counts[keep]))
+        return sides
+
+    def _top(self, docs: np.ndarray, scores: np.ndarray, k: int):
+        if len(docs) > k:
+            best = np.argpartition(-scores.astype(np.int64), k - 1)[:k]
+            docs, scores = docs[best], scores[best]
+        order = np.lexsort((docs, -scores.astype(np.int64)))
+        return docs[order], scores[order]
+
+    def matches(self, post_id: int, limit: int = 10) -> list[BarterMatch]:
+        """Posts that want what ``post_id`` has and have what it wants."""
+        with self._lock:
+            doc = self._doc_of.get(post_id)
+            if doc is None:
+                return []
+            (receivers, gets), (providers, gives) = self._sides(doc)
+            both, r_idx, p_idx = np.intersect1d(
+                receivers, providers, assume_unique=True, return_indices=True
+            )
+            docs, scores = self._top(both, gets[r_idx] + gives[p_idx], limit)
+            return [
+                BarterMatch(int(self._post_ids[d]), int(self._authors[d]), int(s))
+                for d, s in zip(docs, scores)
+            ]
+
+    def cycles(self, post_id: int, limit: int = 10) -> list[BarterCycle]:
+        """Three-way trades closing a loop through ``post_id``."""
+        with self._lock:
+            doc = self._doc_of.get(post_id)
+            if doc is None:
+                return []
+            (receivers, gets), (providers, gives) = self._sides(doc)
+            receivers, gets = self._top(receivers, gets, self.fanout)
+            providers, gives = self._top(providers, gives, self.fanout)
+
+            # have-term of a receiver -> [(receiver doc, its score)]
+            offered: dict[int, list[tuple[int, int]]] = {}
+            for receiver, score in zip(receivers.tolist(), gets.tolist()):
+                for term_id in self._doc_terms[receiver][0]:
+                    offered.setdefault(term_id, []).append((receiver, score))
+
+            authors = self._authors
+            found: dict[tuple[int, int], int] = {}
+            for provider, score in zip(providers.tolist(), gives.tolist()):
+                for term_id in self._doc_terms[provider][1]:
+                    for receiver, receiver_score in offered.get(term_id, ()):
+                        if authors[receiver] == authors[provider]:
+                            continue
+                        key = (receiver, provider)
+                        found[key] = found.get(key, score + receiver_score) + 1
+            best = sorted(found.items(), key=lambda item: (-item[1], item[0]))[:limit]
+            return [
+                BarterCycle(int(self._post_ids[r]), int(self._post_ids[p]), score)
+                for (r, p), score in best
+            ]
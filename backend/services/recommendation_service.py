@@ -0,0 +1,292 @@
+"""Similar-post recommendations from TF-IDF cosine similarity.
+
+Each post becomes a sparse TF-IDF vector over its title, description and
+tags (tags are separate ``#tag`` features, titles count double). Vectors
+are L2-normalized, so cosine similarity is a plain dot product and a
+batch of rows against the whole corpus is one sparse matrix product
+(``X[rows] @ X.T``).
+
+Neighbor lists are precomputed and cached per post (``k`` ids + scores in
+two dense arrays), so the detail dialog's "Publicações parecidas" is an
+O(k) read. ``rebuild`` recomputes IDF and every list in batches; between
+rebuilds ``add`` scores a new post against the corpus with one
+sparse matrix-vector product, gives it a neighbor list, and inserts it into
+the lists of existing posts it now beats. New posts use the IDF snapshot
+of the last rebuild (terms unseen at that point get their IDF from the
+current document frequencies), so a periodic ``rebuild`` corrects the drift.
+"""
+
+from __future__ import annotations
+
+import re
+import threading
+from collections import Counter
+from dataclasses import dataclass
+from typing import Iterable
+
+import numpy as np
+from scipy import sparse
+
+from .matching_service import STOPWORDS, normalize
+
+_TOKEN = re.compile(r"[a-z0-9]{3,}")
+TITLE_WEIGHT = 2.0
+TAG_WEIGHT = 2.0
+
+
+def post_features(title: str, description: str = "", tags: Iterable[str] = ()) -> Counter:
+    """Weighted term counts of a post (title x2, ``#tag`` features x2)."""
+    counts: Counter = Counter()
+    for text, weight in ((title, TITLE_WEIGHT), (description, 1.0)):
+        for token in _TOKEN.findall(normalize(text)):
+            if token not in STOPWORDS:
+                counts[token] += weight
+    for tag in tags:
+        counts["#" + normalize(tag)] += TAG_WEIGHT
+    return counts
+
+
+@dataclass(frozen=True)
+class SimilarPost:
+    """A recommended post and its cosine similarity (0-1]."""
+
+    post_id: int
+    score: float
+
+
+class SimilarPostsIndex:
+    """TF-IDF vectors plus cached top-``k`` neighbor lists.
+
+    Parameters
+    ----------
+    k : int
+        Neighbors cached per post.
+    batch_size : int
+        Rows per sparse matrix product in ``rebuild``.
+    tail_size : int
+        Posts added since the last merge that are kept as loose vectors
+        before being stacked into the main matrix.
+    """
+
+    def __init__(self, k: int = 10, batch_size: int = 1024, tail_size: int = 1024):
+        self.k = k
+        self.batch_size = batch_size
+        self.tail_size = tail_size
+        self._lock = threading.Lock()
+        self._vocab: dict[str, int] = {}
+        self._df = np.zeros(1024, dtype=np.int64)
+        self._idf = np.empty(0, dtype=np.float64)  # snapshot at last rebuild
+        self._features: list[dict[int, float]] = []  # raw weighted tf per doc
+        self._post_ids: list[int] = []
+        self._doc_of: dict[int, int] = {}
+        self._alive = np.zeros(1024, dtype=bool)
+        self._main = sparse.csr_matrix((0, 0))
+        self._by_term = sparse.csr_matrix((0, 0))  # main.T: term -> docs postings
+        self._tail: list[tuple[np.ndarray, np.ndarray]] = []
+        self._nbr_ids = np.full((1024, k), -1, dtype=np.int64)
+        self._nbr_scores = np.zeros((1024, k), dtype=np.float32)
+
+    def __len__(self) -> int:
+        return len(self._doc_of)
+
+    # ------------------------------------------------------------ vectors
+
+    def _term_ids(self, counts: Counter) -> dict[int, float]:
+        features = {}
+        for term, count in counts.items():
+            term_id = self._vocab.get(term)
+            if term_id is None:
+                term_id = self._vocab[term] = len(self._vocab)
+                if term_id == len(self._df):
+                    self._df = np.concatenate([self._df, np.zeros_like(self._df)])
+            features[term_id] = count
+        return features
+
+    def _idf_of(self, term_ids: np.ndarray) -> np.ndarray:
+        n_docs = len(self._features)
+        idf = np.empty(len(term_ids))
+        known = term_ids < len(self._idf)
+        idf[known] = self._idf[term_ids[known]]
+        fresh = self._df[term_ids[~known]]
+        idf[~known] = np.log((1 + n_docs) / (1 + fresh)) + 1
+        return idf
+
+    def _vector(self, features: dict[int, float]) -> tuple[np.ndarray, np.ndarray]:
+        """Sorted term ids and L2-normalized sublinear TF-IDF weights."""
+        ids = np.fromiter(sorted(features), dtype=np.int64, count=len(features))
+        tf = 1 + np.log([features[t] for t in ids.tolist()])  # counts are >= 1
+        weights = tf * self._idf_of(ids)
+        norm = np.linalg.norm(weights)
+        return ids, (weights / norm if norm else weights)
+
+    def _grow(self, size: int) -> None:
+        if size <= len(self._alive):
+            return
+        extra = len(self._alive)
+        self._alive = np.concatenate([self._alive, np.zeros(extra, dtype=bool)])
+        self._nbr_ids = np.vstack([self._nbr_ids, np.full((extra, self.k), -1, np.int64)])
+        self._nbr_scores = np.vstack([self._nbr_scores, np.zeros((extra, self.k), np.float32)])
+
+    # ------------------------------------------------------------ updates
+
+    def add(self, post_id: int, title: str, description: str = "", tags: Iterable[str] = ()) -> None:
+        """Index a post and splice it into the cached neighbor lists."""
+        with self._lock:
+            doc = self._append(post_id, title, description, tags)
+            ids, weights = self._vector(self._features[doc])
+            self._tail.append((ids, weights))
+            scores = self._scores(ids, weights, doc + 1)
+            scores[doc] = 0.0
+            self._set_neighbors(doc, scores)
+            self._splice(doc, scores)
+            if len(self._tail) > self.tail_size:
+                self._merge_tail()
+
+    def add_many(self, posts: Iterable[tuple[int, str, str, Iterable[str]]]) -> None:
+        """Bulk-load ``(post_id, title, description, tags)`` and rebuild."""
+        with self._lock:
+            for post_id, title, description, tags in posts:
+                self._append(post_id, title, description, tags)
+            self._rebuild()
+
+    def _append(self, post_id: int, title: str, description: str, tags) -> int:
+        """Register a new doc (re-adding a post retires its old doc)."""
+        self._remove(post_id)
+        features = self._term_ids(post_features(title, description, tags))
+        doc = len(self._features)
+        self._grow(doc + 1)
+        self._features.append(features)
+        self._post_ids.append(post_id)
+        self._doc_of[post_id] = doc
+        self._alive[doc] = True
+        for term_id in features:
+            self._df[term_id] += 1
+        return doc
+
+    def remove(self, post_id: int) -> None:
+        """Stop recommending a post (deleted or traded)."""
+        with self._lock:
+            self._remove(post_id)
+
+    def _remove(self, post_id: int) -> None:
+        doc = self._doc_of.pop(post_id, None)
+        if doc is not None:
+            self._alive[doc] = False
+
+    def rebuild(self) -> None:
+        """Drop removed posts and recompute IDF, vectors and neighbor lists.
+
+        Meant for a periodic job; ``add`` keeps lists usable in between.
+        """
+        with self._lock:
+            self._rebuild()
+
+    def _rebuild(self) -> None:
+        # Compact: drop removed docs and renumber the survivors densely
+        keep = np.flatnonzero(self._alive[: len(self._features)]).tolist()
+        self._features = [self._features[d] for d in keep]
+        self._post_ids = [self._post_ids[d] for d in keep]
+        self._doc_of = {post_id: doc for doc, post_id in enumerate(self._post_ids)}
+        n_docs, n_terms = len(self._features), len(self._vocab)
+        self._alive[:] = False
+        self._alive[:n_docs] = True
+        self._df[:] = 0
+        for features in self._features:
+            self._df[list(features)] += 1
+        df = self._df[:n_terms]
+        self._idf = np.log((1 + n_docs) / (1 + df)) + 1
+        rows = [self._vector(f) for f in self._features]
+        self._main = self._stack(rows, n_terms)
+        self._tail = []
+        self._nbr_ids[:] = -1
+        self._nbr_scores[:] = 0.0
+        self._by_term = self._main.T.tocsr()
+        for start in range(0, n_docs, self.batch_size):
+            block = (self._main[start : start + self.batch_size] @ self._by_term).tocsr()
+            for offset in range(block.shape[0]):
+                doc = start + offset
+                lo, hi = block.indptr[offset], block.indptr[offset + 1]
+                self._set_neighbors_sparse(doc, block.indices[lo:hi], block.data[lo:hi])
+
+    @staticmethod
+    def _stack(rows: list[tuple[np.ndarray, np.ndarray]], n_terms: int) -> sparse.csr_matrix:
+        indptr = np.zeros(len(rows) + 1, dtype=np.int64)
+        np.cumsum([len(ids) for ids, _ in rows], out=indptr[1:])
+        indices = np.concatenate([ids for ids, _ in rows]) if rows else np.empty(0, np.int64)
+        data = np.concatenate([w for _, w in rows]) if rows else np.empty(0)
+        return sparse.csr_matrix((data, indices, indptr), shape=(len(rows), n_terms))
+
+    def _merge_tail(self) -> None:
+        n_terms = len(self._vocab)
+        main = self._main
+        main = sparse.csr_matrix(
+            (main.data, main.indices, main.indptr), shape=(main.shape[0], n_terms)
+        )
+        self._main = sparse.vstack([main, self._stack(self._tail, n_terms)], format="csr")
+        self._by_term = self._main.T.tocsr()
+        self._tail = []
+
+    # ------------------------------------------------------------ scoring
+
+    def _scores(self, ids: np.ndarray, weights: np.ndarray, n_docs: int) -> np.ndarray:
+        """Cosine similarity of a vector against every doc (dense, length n_docs).
+
+        ``query @ by_term`` only touches the postings of the query's terms.
+        """
+        scores = np.zeros(n_docs)
+        by_term = self._by_term
+        if by_term.shape[1]:
+            usable = ids < by_term.shape[0]
+            query = sparse.csr_matrix(
+                (weights[usable], ids[usable], [0, int(usable.sum())]),
+                shape=(1, by_term.shape[0]),
+            )
+            scores[: by_term.shape[1]] = (query @ by_term).toarray().ravel()
+        if self._tail:
+            tail = self._stack(self._tail, len(self._vocab))
+            query = sparse.csr_matrix(
+                (weights, ids, [0, len(ids)]), shape=(1, len(self._vocab))
+            )
+            start = n_docs - len(self._tail)
+            scores[start:] = (tail @ query.T).toarray().ravel()
+        return scores
+
+    def _set_neighbors_sparse(self, doc: int, docs: np.ndarray, scores: np.ndarray) -> None:
+        keep = (docs != doc) & (scores > 0)
+        docs, scores = docs[keep], scores[keep]
+        if len(docs) > self.k:
+            best = np.argpartition(-scores, self.k - 1)[: self.k]
+            docs, scores = docs[best], scores[best]
+        order = np.lexsort((docs, -scores))
+        self._nbr_ids[doc, : len(order)] = docs[order]
+        self._nbr_scores[doc, : len(order)] = scores[order]
+
+    def _set_neighbors(self, doc: int, scores: np.ndarray) -> None:
+        candidates = np.flatnonzero(scores > 0)
+        self._set_neighbors_sparse(doc, candidates, scores[candidates])
+
+    def _splice(self, doc: int, scores: np.ndarray) -> None:
+        """Insert ``doc`` into the lists of docs for which it beats the k-th."""
+        n_docs = len(scores)
+        weakest = self._nbr_scores[:n_docs, -1]
+        for other in np.flatnonzero(scores > weakest).tolist():
+            row_ids, row_scores = self._nbr_ids[other], self._nbr_scores[other]
+            slot = int(np.searchsorted(-row_scores, -scores[other], side="right"))
+            row_ids[slot + 1 :] = row_ids[slot:-1].copy()
+            row_scores[slot + 1 :] = row_scores[slot:-1].copy()
+            row_ids[slot], row_scores[slot] = doc, scores[other]
+
+    # ------------------------------------------------------------ queries
+
+    def similar(self, post_id: int, limit: int = 5) -> list[SimilarPost]:
+        """Cached neighbors of a post, most similar first."""
+        doc = self._doc_of.get(post_id)
+        if doc is None:
+            return []
+        results = []
+        for other, score in zip(self._nbr_ids[doc].tolist(), self._nbr_scores[doc].tolist()):
+            if other < 0 or len(results) == limit:
+                break
+            if self._alive[other]:
+                results.append(SimilarPost(self._post_ids[other], round(score, 4)))
+        return results
@@ -0,0 +1,344 @@
+"""User reputation: reviews plus running per-user aggregates.
+
+Backs ``POST /users/:id/review`` and the profile stats row. Nothing is
+computed by scanning reviews on read: ``user_reputation`` keeps, per user,
+
+- ``review_count`` and ``rating_sum`` (plain and Bayesian average);
+- ``decayed_rating_sum`` / ``decayed_weight`` (recency-weighted average);
+- ``completed_trades`` (+1 point per completed trade, MVP roadmap).
+
+Recency uses *forward decay*: a review written at ``t`` gets the weight
+``2 ** ((t - DECAY_EPOCH) / half_life)``, which grows with time instead of
+old weights shrinking. Both decayed sums are therefore plain additions, so
+a review is one additive ``UPDATE`` (O(1), no read-modify-write and no lost
+updates between concurrent writers); the ratio is rescaled to "now" only at
+read time. ``compact`` recounts everything from ``reviews`` and ``trades``
+in batches, repairing deleted reviews or drift, and is meant for a periodic
+job.
+
+``users.reputation`` mirrors the Bayesian rating so existing readers of
+``UserSchema`` stay current.
+"""
+
+from __future__ import annotations
+
+import math
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Iterable, Sequence
+
+from sqlalchemy import bindparam, delete, func, insert, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from ..db.base import utcnow
+from ..db.session import session_scope
+from ..models import Listing, Review, Trade, User, UserReputation
+from ..schemas import ReputationSchema
+from .trade_service import TradeService, TradeState
+
+DECAY_EPOCH = datetime(2025, 1, 1, tzinfo=timezone.utc)
+MAX_COMMENT_LENGTH = 5000
+
+# Aggregate columns, in ``ReputationAggregate`` field order
+_FIELDS = (
+    "review_count",
+    "rating_sum",
+    "decayed_rating_sum",
+    "decayed_weight",
+    "completed_trades",
+)
+_COLUMNS = tuple(UserReputation.__table__.c[name] for name in _FIELDS)
+
+
+class ReputationError(Exception):
+    """Rejected review (bad rating, self-review, not a finished trade...)."""
+
+
+# ============================================================================
+# AGGREGATES
+# ============================================================================
+
+
+@dataclass
+class ReputationAggregate:
+    """In-memory mirror of a ``user_reputation`` row."""
+
+    review_count: int = 0
+    rating_sum: int = 0
+    decayed_rating_sum: float = 0.0
+    decayed_weight: float = 0.0
+    completed_trades: int = 0
+
+
+@dataclass(frozen=True)
+class ReputationPolicy:
+    """Smoothing and decay parameters.
+
+    Parameters
+    ----------
+    prior_mean : float
+        Rating assumed for users without reviews.
+    prior_weight : float
+        How many reviews the prior is worth; with 5, a single 1-star review
+        moves a new user from 4.0 to 3.5 rather than to 1.0.
+    half_life_days : float
+        Age at which a review counts half in ``recent_rating``.
+    """
+
+    prior_mean: float = 4.0
+    prior_weight: float = 5.0
+    half_life_days: float = 180.0
+
+    def weight(self, at: datetime) -> float:
+        """Forward-decay weight of an event at ``at``."""
+        days = (at - DECAY_EPOCH).total_seconds() / 86400
+        return math.exp2(days / self.half_life_days)
+
+    def add_review(self, aggregate: ReputationAggregate, rating: int, at: datetime) -> None:
+        """Fold one review into ``aggregate`` (what the SQL update does)."""
+        weight = self.weight(at)
+        aggregate.review_count += 1
+        aggregate.rating_sum += rating
+        aggregate.decayed_rating_sum += rating * weight
+        aggregate.decayed_weight += weight
+
+    def summarize(
+        self, user_id: int, aggregate: ReputationAggregate, now: datetime | None = None
+    ) -> ReputationSchema:
+        """Averages of an aggregate as of ``now``."""
+        m, c = self.prior_mean, self.prior_weight
+        count, total = aggregate.review_count, aggregate.rating_sum
+        scale = self.weight(utcnow() if now is None else now)
+        recent_sum = aggregate.decayed_rating_sum / scale
+        recent_count = aggregate.decayed_weight / scale
+        return ReputationSchema(
+            user_id=user_id,
+            review_count=count,
+            average=round(total / count, 2) if count else 0.0,
+            rating=round((c * m + total) / (c + count), 2),
+            recent_rating=round((c * m + recent_sum) / (c + recent_count), 2),
+            completed_trades=aggregate.completed_trades,
+            points=aggregate.completed_trades,
+        )
+
+
+def _aggregate(row: UserReputation | None) -> ReputationAggregate:
+    if row is None:
+        return ReputationAggregate()
+    return ReputationAggregate(
+        row.review_count,
+        row.rating_sum,
+        row.decayed_rating_sum,
+        row.decayed_weight,
+        row.completed_trades,
+    )
+
+
+# ============================================================================
+# SERVICE
+# ============================================================================
+
+
+class ReputationService:
+    """Records reviews and completed trades; serves aggregates.
+
+    Parameters
+    ----------
+    session_factory : async_sessionmaker[AsyncSession]
+        Factory from ``backend.db.create_session_factory``.
+    trades : TradeService
+        Checks trade-linked reviews; completed trades are counted through
+        its ``on_completed`` hook, which this service subscribes to.
+    policy : ReputationPolicy | None
+        Smoothing/decay parameters (defaults by default).
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        trades: TradeService,
+        policy: ReputationPolicy | None = None,
+    ):
+        self.sessions = session_factory
+        self.trades = trades
+        self.policy = ReputationPolicy() if policy is None else policy
+        trades.on_completed.append(self.record_completed_trade)
+
+    # ------------------------------------------------------------ writes
+
+    async def add_review(
+        self,
+        user_id: int,
+        reviewer_id: int,
+        rating: int,
+        comment: str = "",
+        trade_id: int | None = None,
+    ) -> ReputationSchema:
+        """Store a review and fold it into ``user_id``'s aggregates.
+
+        Reviews tied to a trade require a completed trade between the two
+        users, and each side may review a trade once.
+        """
+        if not 1 <= rating <= 5:
+            raise ReputationError("rating must be between 1 and 5")
+        if user_id == reviewer_id:
+            raise ReputationError("users cannot review themselves")
+        if len(comment) > MAX_COMMENT_LENGTH:
+            raise ReputationError(f"comment must be at most {MAX_COMMENT_LENGTH} characters")
+        if trade_id is not None:
+            state = await self.trades.get(trade_id)
+            if {user_id, reviewer_id} != {state.proposer_id, state.owner_id}:
+                raise ReputationError(f"trade {trade_id} is not between these users")
+            if state.status != "completed":
+                raise ReputationError(f"trade {trade_id} is not completed yet")
+
+        now = utcnow()
+        weight = self.policy.weight(now)
+        try:
+            async with session_scope(self.sessions) as session:
+                session.add(
+                    Review(
+                        user_id=user_id,
+                        reviewer_id=reviewer_id,
+                        trade_id=trade_id,
+                        rating=rating,
+                        comment=comment,
+                        created_at=now,
+                    )
+                )
+                await session.flush()
+                aggregate = await self._bump(
+                    session,
+                    user_id,
+                    review_count=1,
+                    rating_sum=rating,
+                    decayed_rating_sum=rating * weight,
+                    decayed_weight=weight,
+                )
+                summary = self.policy.summarize(user_id, aggregate, now)
+                await session.execute(
+                    update(User).where(User.id == user_id).values(reputation=summary.rating)
+                )
+        except IntegrityError as exc:
+            raise ReputationError(f"trade {trade_id} was already reviewed") from exc
+        return summary
+
+    async def record_completed_trade(self, state: TradeState) -> None:
+        """+1 completed trade for both participants (``on_completed`` hook)."""
+        async with session_scope(self.sessions) as session:
+            for user_id in (state.proposer_id, state.owner_id):
+                await self._bump(session, user_id, completed_trades=1)
+
+    async def _bump(self, session: AsyncSession, user_id: int, **deltas) -> ReputationAggregate:
+        """Add ``deltas`` to a user's row (creating it) and return the new totals."""
+        table = UserReputation.__table__
+        stmt = (
+            update(table)
+            .where(table.c.user_id == user_id)
+            .values({name: table.c[name] + delta for name, delta in deltas.items()})
+            .values(updated_at=utcnow())
+            .returning(*_COLUMNS)
+        )
+        row = (await session.execute(stmt)).one_or_none()
+        if row is None:
+            try:
+                async with session.begin_nested():
+                    await session.execute(insert(table).values(user_id=user_id, **deltas))
+                return ReputationAggregate(**{n: deltas.get(n, 0) for n in _FIELDS})
+            except IntegrityError:  # created concurrently: add to that row
+                row = (await session.execute(stmt)).one()
+        return ReputationAggregate(*row)
+
+    # ------------------------------------------------------------ reads
+
+    async def get(self, user_id: int) -> ReputationSchema:
+        """Reputation of one user (prior only when there is no row yet)."""
+        async with self.sessions() as session:
+            row = await session.get(UserReputation, user_id)
+        return self.policy.summarize(user_id, _aggregate(row))
+
+    async def get_many(self, user_ids: Iterable[int]) -> dict[int, ReputationSchema]:
+        """Reputation of several users (e.g. the authors on a feed page)."""
+        ids = list(set(user_ids))
+        async with self.sessions() as session:
+            rows = await session.scalars(
+                select(UserReputation).where(UserReputation.user_id.in_(ids))
+            )
+            found = {row.user_id: row for row in rows}
+        now = utcnow()
+        return {
+            user_id: self.policy.summarize(user_id, _aggregate(found.get(user_id)), now)
+            for user_id in ids
+        }
+
+    # ------------------------------------------------------------ compaction
+
+    async def compact(self, batch_size: int = 500) -> int:
+        """Recount every user's aggregates from ``reviews`` and ``trades``.
+
+        Works on ``batch_size`` users per transaction; returns the number of
+        users rewritten.
+        """
+        async with self.sessions() as session:
+            user_ids = sorted(
+                set(await session.scalars(select(UserReputation.user_id)))
+                | set(await session.scalars(select(Review.user_id).distinct()))
+            )
+        for start in range(0, len(user_ids), batch_size):
+            await self._compact_batch(user_ids[start : start + batch_size])
+        return len(user_ids)
+
+    async def _compact_batch(self, user_ids: Sequence[int]) -> None:
+        aggregates: dict[int, ReputationAggregate] = defaultdict(ReputationAggregate)
+        async with session_scope(self.sessions) as session:
+            reviews = await session.execute(
+                select(Review.user_id, Review.rating, Review.created_at).where(
+                    Review.user_id.in_(user_ids)
+                )
+            )
+            for user_id, rating, created_at in reviews:
+                if created_at.tzinfo is None:  # SQLite drops the offset
+                    created_at = created_at.replace(tzinfo=timezone.utc)
+                self.policy.add_review(aggregates[user_id], rating, created_at)
+            # +1 per completed trade, on each side (proposer and listing owner)
+            completed = Trade.status == "completed"
+            as_owner = select(Listing.author_id, func.count()).join(
+                Trade, Trade.listing_id == Listing.id
+            )
+            for column, source in (
+                (Trade.proposer_id, select(Trade.proposer_id, func.count())),
+                (Listing.author_id, as_owner),
+            ):
+                counts = await session.execute(
+                    source.where(completed, column.in_(user_ids)).group_by(column)
+                )
+                for user_id, count in counts:
+                    aggregates[user_id].completed_trades += count
+
+            await session.execute(
+                delete(UserReputation).where(UserReputation.user_id.in_(user_ids))
+            )
+            now = utcnow()
+            rows = [
+                {"user_id": user_id, "updated_at": now, **vars(aggregate)}
+                for user_id, aggregate in aggregates.items()
+            ]
+            if rows:
+                await session.execute(insert(UserReputation), rows)
+            table = User.__table__
+            await session.execute(
+                update(table)
+                .where(table.c.id == bindparam("pk"))
+                .values(reputation=bindparam("rating")),
+                [
+                    {
+                        "pk": user_id,
+                        "rating": self.policy.summarize(
+                            user_id, aggregates.get(user_id, ReputationAggregate()), now
+                        ).rating,
+                    }
+                    for user_id in user_ids
+                ],
+            )
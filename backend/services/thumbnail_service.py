@@ -0,0 +1,389 @@
+"""Thumbnail generation: content-addressed image variants on a process pool.
+
+Every listing image is rendered once into a fixed set of variants sized for
+the places the UI draws it (search grid tile, feed card, detail dialog), in
+WebP and a JPEG fallback. Outputs are stored under the SHA-256 of the source
+bytes, so re-uploads of the same photo are skipped and variants can be cached
+forever.
+
+Jobs go through a small on-disk spool (``pending/`` -> ``processing/``) so
+queued work survives restarts: enqueueing writes and fsyncs a job file, a
+worker claims it with an atomic rename, and jobs found in ``processing/`` at
+startup (a crash mid-render) are put back in ``pending/``. Decoding and
+resizing are CPU-bound, so they run in a ``ProcessPoolExecutor``.
+
+The app runs one pipeline (``get_thumbnail_pipeline``) whose background
+thread hashes newly scheduled sources (uploads, existing listing photos at
+startup) and renders them. ``resolve_variant`` runs while UI cards are
+built, so it never reads image bytes: it looks the source's digest up by
+path, mtime and size among the sources the pipeline has seen.
+
+Layout under ``root`` (default ``storage/thumbnails``)::
+
+    jobs/pending/<digest>.json
+    jobs/processing/<digest>.json
+    jobs/failed/<digest>.json
+    variants/<digest[:2]>/<digest>/<variant>.<webp|jpg>
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import math
+import multiprocessing
+import os
+import queue
+import threading
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable
+
+DEFAULT_ROOT = Path("storage/thumbnails")
+FORMATS = ("webp", "jpg")
+# Render at 2x the logical size so variants stay sharp on HiDPI screens
+DEVICE_SCALE = 2
+
+
+@dataclass(frozen=True)
+class Variant:
+    """A target render box in logical pixels (images cover it, never upscaled)."""
+
+    name: str
+    width: int
+    height: int
+
+
+# Sizes follow AppTheme: 150px grid tiles, 450px x POST_IMAGE_HEIGHT cards and
+# up-to-800px x DIALOG_IMAGE_HEIGHT detail dialogs.
+VARIANTS: tuple[Variant, ...] = (
+    Variant("grid", 150, 150),
+    Variant("card", 450, 200),
+    Variant("detail", 800, 300),
+)
+
+
+def file_digest(path: str | os.PathLike) -> str:
+    """Return the SHA-256 hex digest of a file's bytes."""
+    with open(path, "rb") as f:
+        return hashlib.file_digest(f, "sha256").hexdigest()
+
+
+# (absolute path, mtime_ns, size) -> digest of every source hashed by a
+# pipeline; mtime/size are part of the key so an edited file is not matched
+_known_digests: dict[tuple[str, int, int], str] = {}
+
+
+def _stat_key(path: str | os.PathLike) -> tuple[str, int, int] | None:
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return os.path.abspath(path), stat.st_mtime_ns, stat.st_size
+
+
+def variant_path(root: Path, digest: str, variant: str, fmt: str) -> Path:
+    """Return where ``variant`` of the image with ``digest`` is stored."""
+    return root / "variants" / digest[:2] / digest / f"{variant}.{fmt}"
+
+
+def select_variant(width: float | None, height: float | None = None) -> str | None:
+    """Return the smallest variant covering a ``width`` x ``height`` render box.
+
+    Returns None when the box is larger than every variant (use the original).
+    """
+    for variant in VARIANTS:
+        if (width or 0) <= variant.width and (height or 0) <= variant.height:
+            return variant.name
+    return None
+
+
+def resolve_variant(
+    source: str | os.PathLike,
+    width: float | None,
+    height: float | None = None,
+    fmt: str = "webp",
+    root: Path = DEFAULT_ROOT,
+) -> str:
+    """Return the best image path for a render box, falling back to ``source``.
+
+    Used by ``ft.Image`` callers: when the source has not been through the
+    pipeline, its variant has not been generated yet, or the source is not a
+    local file, the original is used. Costs a ``stat``, never a file read.
+    """
+    name = select_variant(width, height)
+    if name is None:
+        return str(source)
+    key = _stat_key(source)
+    digest = _known_digests.get(key) if key is not None else None
+    if digest is None:
+        return str(source)
+    path = variant_path(root, digest, name, fmt)
+    return str(path) if path.exists() else str(source)
+
+
+# ============================================================================
+# WORKER (runs in child processes)
+# ============================================================================
+
+
+def _cover_size(size: tuple[int, int], box: tuple[int, int]) -> tuple[int, int]:
+    """Scale ``size`` to cover ``box`` keeping aspect ratio, never upscaling."""
+    width, height = size
+    scale = min(1.0, max(box[0] / width, box[1] / height))
+    return max(1, math.ceil(width * scale)), max(1, math.ceil(height * scale))
+
+
+def _atomic_save(image, path: Path, **params) -> None:
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    image.save(tmp, **params)
+    os.replace(tmp, path)
+
+
+def render_variants(source: str, out_dir: str, variants: tuple[Variant, ...]) -> int:
+    """Decode ``source`` once and write every variant; returns files written."""
+    from PIL import Image, ImageOps
+
+    out = Path(out_dir)
+    out.mkdir(parents=True, exist_ok=True)
+    largest = max(variants, key=lambda v: v.width * v.height)
+    with Image.open(source) as image:
+        # JPEG: let the decoder downscale by 1/2..1/8 while decoding
+        image.draft(
+            "RGB", (largest.width * DEVICE_SCALE, largest.height * DEVICE_SCALE)
+        )
+        image = ImageOps.exif_transpose(image)
+        if image.mode not in ("RGB", "RGBA"):
+            image = image.convert("RGBA" if "A" in image.getbands() else "RGB")
+
+        written = 0
+        # Largest first, so each smaller variant resamples an already-reduced image
+        for variant in sorted(variants, key=lambda v: -v.width * v.height):
+            box = (variant.width * DEVICE_SCALE, variant.height * DEVICE_SCALE)
+            image = image.resize(
+                _cover_size(image.size, box), Image.Resampling.LANCZOS, reducing_gap=3.0
+            )
+            _atomic_save(
+                image, out / f"{variant.name}.webp", format="WEBP", quality=80, method=4
+            )
+            rgb = image.convert("RGB") if image.mode != "RGB" else image
+            _atomic_save(
+                rgb,
+                out / f"{variant.name}.jpg",
+                format="JPEG",
+                quality=82,
+                optimize=True,
+                progressive=True,
+            )
+            written += 2
+    return written
+
+
+# ============================================================================
+# PIPELINE
+# ============================================================================
+
+
+class ThumbnailPipeline:
+    """Durable thumbnail job queue processed on a process pool.
+
+    Parameters
+    ----------
+    root : Path
+        Storage root for jobs and variants.
+    max_workers : int | None
+        Worker processes (default: CPU count).
+    variants : tuple[Variant, ...]
+        Variants generated for each image.
+    """
+
+    def __init__(
+        self,
+        root: Path = DEFAULT_ROOT,
+        max_workers: int | None = None,
+        variants: tuple[Variant, ...] = VARIANTS,
+    ):
+        self.root = Path(root)
+        self.variants = variants
+        self.max_workers = max_workers
+        self._executor: ProcessPoolExecutor | None = None
+        self._lock = threading.Lock()  # serializes claims within this process
+        self._incoming: queue.SimpleQueue[str] = queue.SimpleQueue()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._worker: threading.Thread | None = None
+        self._jobs = self.root / "jobs"
+        for state in ("pending", "processing", "failed"):
+            (self._jobs / state).mkdir(parents=True, exist_ok=True)
+        self._recover()
+
+    # ----------------------------------------------------------------- queue
+
+    def _recover(self) -> None:
+        """Requeue jobs left in ``processing/`` by a crash."""
+        for job in (self._jobs / "processing").glob("*.json"):
+            os.replace(job, self._jobs / "pending" / job.name)
+
+    def is_complete(self, digest: str) -> bool:
+        """True when every variant of ``digest`` exists in every format."""
+        return all(
+            variant_path(self.root, digest, v.name, fmt).exists()
+            for v in self.variants
+            for fmt in FORMATS
+        )
+
+    def enqueue(self, source: str | os.PathLike) -> str:
+        """Queue ``source`` for rendering and return its content digest.
+
+        Already-rendered content and duplicates of a queued job are skipped.
+        """
+        source = os.path.abspath(source)
+        key = _stat_key(source)
+        digest = file_digest(source)
+        if key is not None:
+            _known_digests[key] = digest
+        job = self._jobs / "pending" / f"{digest}.json"
+        if self.is_complete(digest) or job.exists():
+            return digest
+        tmp = job.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"digest": digest, "source": source}, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, job)
+        self._wake.set()
+        return digest
+
+    def schedule(self, sources: Iterable[str | os.PathLike]) -> None:
+        """Queue ``sources`` for the background worker to hash and enqueue.
+
+        Returns at once: hashing happens on the worker thread (``start``).
+        """
+        for source in sources:
+            self._incoming.put(os.fspath(source))
+        self._wake.set()
+
+    def pending(self) -> list[str]:
+        """Digests of jobs waiting to be processed."""
+        return sorted(p.stem for p in (self._jobs / "pending").glob("*.json"))
+
+    def _claim_all(self) -> list[Path]:
+        claimed = []
+        with self._lock:
+            for job in sorted((self._jobs / "pending").glob("*.json")):
+                target = self._jobs / "processing" / job.name
+                try:
+                    os.replace(job, target)
+                except FileNotFoundError:  # claimed by another process
+                    continue
+                claimed.append(target)
+        return claimed
+
+    # ------------------------------------------------------------ processing
+
+    def _pool(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self._executor
+
+    def process_pending(self) -> list[str]:
+        """Render every pending job in parallel; returns the completed digests.
+
+        Failed jobs are moved to ``jobs/failed/`` with the error recorded.
+        """
+        claimed = self._claim_all()
+        if not claimed:
+            return []
+        pool = self._pool()
+        futures = {}
+        for job_path in claimed:
+            job = json.loads(job_path.read_text(encoding="utf-8"))
+            out_dir = variant_path(self.root, job["digest"], "_", "_").parent
+            future = pool.submit(render_variants, job["source"], str(out_dir), self.variants)
+            futures[future] = (job_path, job)
+
+        done = []
+        for future in as_completed(futures):
+            job_path, job = futures[future]
+            try:
+                future.result()
+            except Exception as exc:  # bad image, missing file, worker crash
+                job["error"] = repr(exc)
+                failed = self._jobs / "failed" / job_path.name
+                failed.write_text(json.dumps(job), encoding="utf-8")
+                job_path.unlink()
+                continue
+            job_path.unlink()
+            done.append(job["digest"])
+        return done
+
+    # ---------------------------------------------------------- background
+
+    def start(self, sources: Iterable[str | os.PathLike] = (), interval: float = 30.0) -> None:
+        """Process jobs on a background thread (no-op if already running).
+
+        ``sources`` (e.g. the existing listing photos) are scheduled first.
+        The thread wakes on ``enqueue``/``schedule`` and every ``interval``
+        seconds (jobs enqueued by other processes).
+        """
+        if self._worker is not None:
+            return
+        self.schedule(sources)
+        self._stop.clear()
+        self._worker = threading.Thread(
+            target=self._run, args=(interval,), name="thumbnails", daemon=True
+        )
+        self._worker.start()
+
+    def _run(self, interval: float) -> None:
+        while not self._stop.is_set():
+            self._wake.clear()
+            while True:
+                try:
+                    source = self._incoming.get_nowait()
+                except queue.Empty:
+                    break
+                try:
+                    self.enqueue(source)
+                except OSError:  # missing or unreadable: keep the original
+                    continue
+            try:
+                self.process_pending()
+            except Exception:
+                # Broken pool (a worker died): start a fresh one next round
+                if self._executor is not None:
+                    self._executor.shutdown(wait=False, cancel_futures=True)
+                    self._executor = None
+            self._wake.wait(interval)
+
+    def close(self) -> None:
+        """Stop the background thread and shut down the worker processes."""
+        if self._worker is not None:
+            self._stop.set()
+            self._wake.set()
+            self._worker.join()
+            self._worker = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def __enter__(self) -> "ThumbnailPipeline":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+_pipeline: ThumbnailPipeline | None = None
+
+
+def get_thumbnail_pipeline() -> ThumbnailPipeline:
+    """Return the process-wide pipeline used by the app (not started)."""
+    global _pipeline
+    if _pipeline is None:
+        _pipeline = ThumbnailPipeline()
+    return _pipeline
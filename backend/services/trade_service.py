@@ -0,0 +1,388 @@
+"""Trade proposals: state machine with optimistic concurrency.
+
+States follow the MVP roadmap::
+
+    pending --accept--> accepted --confirm x2--> completed
+       |                   |
+       +--cancel/expire    +--cancel
+
+Instead of row locks, every trade carries a ``version``. A transition reads
+the trade, decides the new values in Python, and applies them with a single
+conditional ``UPDATE ... WHERE id = ? AND version = ?``; when another writer
+got there first no row matches, so the trade is re-read and the decision is
+retried. Reads and the conditional write run in separate short transactions,
+so no transaction ever holds a lock while the application thinks.
+
+``confirm`` (``POST /trades/:id/confirm``) is idempotent: confirming twice,
+or after the trade completed, returns the current state without changes.
+Hooks run once per actual change: ``on_proposed`` for new proposals,
+``on_cancelled`` for the cancel that cancels, ``on_completed`` for the
+confirm that completes and ``on_expired`` for expiries (e.g.
+``ReputationService.record_completed_trade``, ``FraudMonitor.trade_hook``).
+They run after the transition committed, so a failing hook is logged and
+never reported as a failed transition.
+Background jobs move many trades at once with ``transition_many`` and
+``expire_stale``, which update whole batches with one statement each and
+then run the hooks for every trade that moved. Batches can only cancel or
+expire: completing needs both confirmations and goes through ``confirm``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Awaitable, Callable, Iterable
+
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from ..db.base import utcnow
+from ..db.session import session_scope
+from ..models import Listing, Trade
+
+logger = logging.getLogger(__name__)
+
+# Allowed transitions: current status -> reachable statuses
+TRANSITIONS: dict[str, frozenset[str]] = {
+    "pending": frozenset({"accepted", "cancelled", "expired"}),
+    "accepted": frozenset({"completed", "cancelled"}),
+    "completed": frozenset(),
+    "cancelled": frozenset(),
+    "expired": frozenset(),
+}
+# Targets background jobs may apply in bulk (no per-trade preconditions)
+BATCH_TARGETS = frozenset({"cancelled", "expired"})
+
+
+# ============================================================================
+# ERRORS
+# ============================================================================
+
+
+class TradeError(Exception):
+    """Base class for rejected trade operations."""
+
+
+class TradeNotFoundError(TradeError):
+    """No trade (or listing) with the given id."""
+
+
+class InvalidTransitionError(TradeError):
+    """The trade's current status does not allow the operation."""
+
+
+class NotAParticipantError(TradeError):
+    """The user is neither the proposer nor the listing owner."""
+
+
+class ConcurrencyConflictError(TradeError):
+    """The trade kept changing underneath us; retries were exhausted."""
+
+
+# ============================================================================
+# STATE
+# ============================================================================
+
+
+@dataclass(frozen=True)
+class TradeState:
+    """Snapshot of a trade row plus the listing owner's id."""
+
+    id: int
+    listing_id: int
+    proposer_id: int
+    owner_id: int
+    status: str
+    version: int
+    proposer_confirmed_at: datetime | None
+    owner_confirmed_at: datetime | None
+    cancelled_by: int | None = None  # None for batch (system) cancels
+
+    def side(self, user_id: int) -> str:
+        """Return ``"proposer"`` or ``"owner"`` for a participant."""
+        if user_id == self.proposer_id:
+            return "proposer"
+        if user_id == self.owner_id:
+            return "owner"
+        raise NotAParticipantError(f"user {user_id} is not part of trade {self.id}")
+
+
+_STATE_COLUMNS = (
+    Trade.id,
+    Trade.listing_id,
+    Trade.proposer_id,
+    Listing.author_id,
+    Trade.status,
+    Trade.version,
+    Trade.proposer_confirmed_at,
+    Trade.owner_confirmed_at,
+    Trade.cancelled_by,
+)
+
+# Decides the column values for a transition; None means "nothing to do"
+Decision = Callable[[TradeState], dict | None]
+TradeHook = Callable[[TradeState], Awaitable[None]]
+
+
+def _check_transition(state: TradeState, target: str) -> None:
+    if target not in TRANSITIONS[state.status]:
+        raise InvalidTransitionError(
+            f"trade {state.id} is {state.status}; cannot become {target}"
+        )
+
+
+# ============================================================================
+# SERVICE
+# ============================================================================
+
+
+class TradeService:
+    """Trade lifecycle operations.
+
+    Parameters
+    ----------
+    session_factory : async_sessionmaker[AsyncSession]
+        Factory from ``backend.db.create_session_factory``.
+    max_retries : int
+        Conditional-update attempts before ``ConcurrencyConflictError``.
+
+    Attributes
+    ----------
+    on_proposed, on_cancelled, on_completed, on_expired : list[TradeHook]
+        Awaited with the new state after a proposal, a cancellation, the
+        confirm that completes a trade, or an expiry.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        max_retries: int = 50,
+    ):
+        self.sessions = session_factory
+        self.max_retries = max_retries
+        self.on_proposed: list[TradeHook] = []
+        self.on_cancelled: list[TradeHook] = []
+        self.on_completed: list[TradeHook] = []
+        self.on_expired: list[TradeHook] = []
+
+    async def propose(
+        self,
+        listing_id: int,
+        proposer_id: int,
+        counter_listing_id: int | None = None,
+        counter_description: str | None = None,
+    ) -> TradeState:
+        """Create a ``pending`` trade on someone else's listing."""
+        async with session_scope(self.sessions) as session:
+            owner_id = await session.scalar(
+                select(Listing.author_id).where(Listing.id == listing_id)
+            )
+            if owner_id is None:
+                raise TradeNotFoundError(f"listing {listing_id} does not exist")
+            if owner_id == proposer_id:
+                raise TradeError("cannot propose a trade on your own listing")
+            trade = Trade(
+                listing_id=listing_id,
+                proposer_id=proposer_id,
+                counter_listing_id=counter_listing_id,
+                counter_description=counter_description,
+            )
+            session.add(trade)
+            await session.flush()
+            trade_id = trade.id
+        state = await self.get(trade_id)
+        await self._notify(self.on_proposed, state)
+        return state
+
+    async def get(self, trade_id: int) -> TradeState:
+        """Return the current state of a trade."""
+        async with self.sessions() as session:
+            row = (
+                await session.execute(
+                    select(*_STATE_COLUMNS)
+                    .join(Listing, Listing.id == Trade.listing_id)
+                    .where(Trade.id == trade_id)
+                )
+            ).one_or_none()
+        if row is None:
+            raise TradeNotFoundError(f"trade {trade_id} does not exist")
+        return TradeState(*row)
+
+    async def _states(self, trade_ids: list[int]) -> list[TradeState]:
+        """Current states of several trades (one query), in id order."""
+        if not trade_ids:
+            return []
+        async with self.sessions() as session:
+            rows = await session.execute(
+                select(*_STATE_COLUMNS)
+                .join(Listing, Listing.id == Trade.listing_id)
+                .where(Trade.id.in_(trade_ids))
+                .order_by(Trade.id)
+            )
+            return [TradeState(*row) for row in rows]
+
+    async def _mutate(self, trade_id: int, decide: Decision) -> TradeState:
+        """Read-decide-write loop guarded by the trade's version."""
+        for _ in range(self.max_retries):
+            state = await self.get(trade_id)
+            values = decide(state)
+            if values is None:
+                return state
+            async with session_scope(self.sessions) as session:
+                updated = await session.scalar(
+                    update(Trade)
+                    .where(Trade.id == trade_id, Trade.version == state.version)
+                    .values(version=Trade.version + 1, **values)
+                    .returning(Trade.version)
+                    .execution_options(synchronize_session=False)
+                )
+            if updated is not None:
+                return await self.get(trade_id)
+            await asyncio.sleep(0)  # lost the race: let the winner finish
+        raise ConcurrencyConflictError(f"trade {trade_id} is under heavy contention")
+
+    async def accept(self, trade_id: int, user_id: int) -> TradeState:
+        """Listing owner accepts a pending proposal (idempotent)."""
+
+        def decide(state: TradeState) -> dict | None:
+            if state.side(user_id) != "owner":
+                raise NotAParticipantError("only the listing owner can accept")
+            if state.status == "accepted":
+                return None
+            _check_transition(state, "accepted")
+            return {"status": "accepted"}
+
+        return await self._mutate(trade_id, decide)
+
+    async def cancel(self, trade_id: int, user_id: int) -> TradeState:
+        """Either participant withdraws a pending or accepted trade."""
+
+        cancels = False
+
+        def decide(state: TradeState) -> dict | None:
+            nonlocal cancels
+            cancels = False
+            state.side(user_id)
+            if state.status == "cancelled":
+                return None
+            _check_transition(state, "cancelled")
+            cancels = True
+            return {"status": "cancelled", "cancelled_by": user_id}
+
+        state = await self._mutate(trade_id, decide)
+        if cancels:
+            await self._notify(self.on_cancelled, state)
+        return state
+
+    async def confirm(self, trade_id: int, user_id: int) -> TradeState:
+        """Record one side's confirmation; completes when both confirmed.
+
+        Idempotent: repeated confirms from the same side, and confirms on an
+        already completed trade, return the current state unchanged.
+        """
+        now = utcnow()
+        completes = False  # set by the decision that got written last
+
+        def decide(state: TradeState) -> dict | None:
+            nonlocal completes
+            completes = False
+            side = state.side(user_id)
+            if state.status == "completed":
+                return None
+            if state.status != "accepted":
+                raise InvalidTransitionError(
+                    f"trade {state.id} is {state.status}; only accepted trades can be confirmed"
+                )
+            mine, other = (
+                ("proposer_confirmed_at", "owner_confirmed_at")
+                if side == "proposer"
+                else ("owner_confirmed_at", "proposer_confirmed_at")
+            )
+            if getattr(state, mine) is not None:
+                return None
+            values = {mine: now}
+            if getattr(state, other) is not None:
+                values["status"] = "completed"
+                completes = True
+            return values
+
+        state = await self._mutate(trade_id, decide)
+        if completes:
+            await self._notify(self.on_completed, state)
+        return state
+
+    @staticmethod
+    async def _notify(hooks: list[TradeHook], state: TradeState) -> None:
+        for hook in hooks:
+            try:
+                await hook(state)
+            except Exception:  # the transition is committed: report, don't fail it
+                logger.exception("trade hook %r failed for trade %d", hook, state.id)
+
+    # ------------------------------------------------------------- batching
+
+    async def transition_many(self, trade_ids: Iterable[int], target: str) -> list[int]:
+        """Move every listed trade that allows it to ``target`` in one UPDATE.
+
+        ``target`` must be in ``BATCH_TARGETS``. Trades whose current status
+        does not allow the transition are left untouched; the ``on_cancelled``
+        or ``on_expired`` hooks run for each trade that moved. Returns the
+        ids that moved.
+        """
+        if target not in BATCH_TARGETS:
+            raise InvalidTransitionError(f"trades cannot become {target} in a batch")
+        sources = [status for status, targets in TRANSITIONS.items() if target in targets]
+        ids = list(trade_ids)
+        if not ids:
+            return []
+        async with session_scope(self.sessions) as session:
+            moved = list(
+                await session.scalars(
+                    update(Trade)
+                    .where(Trade.id.in_(ids), Trade.status.in_(sources))
+                    .values(status=target, version=Trade.version + 1)
+                    .returning(Trade.id)
+                    .execution_options(synchronize_session=False)
+                )
+            )
+        await self._notify_batch(target, moved)
+        return moved
+
+    async def expire_stale(self, older_than: datetime, batch_size: int = 500) -> int:
+        """Expire pending proposals created before ``older_than``.
+
+        Works in batches of ``batch_size`` (one short transaction each) using
+        ``ix_trades_status_created_at``; ``on_expired`` runs for each expired
+        trade. Returns the number expired.
+        """
+        total = 0
+        while True:
+            stale = (
+                select(Trade.id)
+                .where(Trade.status == "pending", Trade.created_at < older_than)
+                .order_by(Trade.created_at)
+                .limit(batch_size)
+                .scalar_subquery()
+            )
+            async with session_scope(self.sessions) as session:
+                moved = (
+                    await session.scalars(
+                        update(Trade)
+                        .where(Trade.id.in_(stale), Trade.status == "pending")
+                        .values(status="expired", version=Trade.version + 1)
+                        .returning(Trade.id)
+                        .execution_options(synchronize_session=False)
+                    )
+                ).all()
+            await self._notify_batch("expired", list(moved))
+            total += len(moved)
+            if len(moved) < batch_size:
+                return total
+
+    async def _notify_batch(self, target: str, trade_ids: list[int]) -> None:
+        hooks = self.on_cancelled if target == "cancelled" else self.on_expired
+        if hooks:
+            for state in await self._states(trade_ids):
+                await self._notify(hooks, state)
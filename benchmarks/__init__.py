@@ -0,0 +1,2 @@
+# Micro-benchmarks for SCAMBO backend and frontend hot paths.
+# Run a module directly, e.g.: python -m benchmarks.bench_feed_encoding
@@ -0,0 +1,83 @@
+"""Benchmark: direct and 3-way barter matches over 1M listings.
+
+Indexes ``--listings`` synthetic posts whose have/want terms are drawn from a
+Zipf-like vocabulary (a few items such as "livro" are very common, most are
+rare), then times ``matches`` and ``cycles`` for random posts. Term
+extraction is timed separately on the mock posts' real texts.
+
+Usage:
+    python -m benchmarks.bench_barter_matching [--listings 1000000] [--queries 500]
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+
+import numpy as np
+
+from backend.services.matching_service import BarterIndex, BarterTerms, extract_terms
+from mock.posts import get_mock_posts
+
+
+def synthetic_terms(rng: np.random.Generator, n: int, vocab: int) -> list[BarterTerms]:
+    weights = 1.0 / np.arange(1, vocab + 1) ** 0.9
+    weights /= weights.sum()
+    heads = rng.choice(vocab, size=(n, 4), p=weights)
+    modifiers = rng.integers(0, 20, size=(n, 4))
+    sizes = rng.integers(1, 3, size=(n, 2))
+    posts = []
+    for i in range(n):
+        sides = []
+        for side, offset in ((0, 0), (1, 2)):
+            terms = set()
+            for j in range(offset, offset + sizes[i, side]):
+                terms.add(f"t{heads[i, j]}")
+                terms.add(f"t{heads[i, j]} m{modifiers[i, j]}")
+            sides.append(frozenset(terms))
+        posts.append(BarterTerms(*sides))
+    return posts
+
+
+def timed(call, post_ids) -> tuple[np.ndarray, int]:
+    latencies, found = [], 0
+    for post_id in post_ids:
+        start = time.perf_counter()
+        found += bool(call(post_id))
+        latencies.append(time.perf_counter() - start)
+    return np.array(latencies) * 1e3, found
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--listings", type=int, default=1_000_000)
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--vocab", type=int, default=20_000)
+    args = parser.parse_args()
+
+    texts = [(p["post_title"], p["post_description"]) for p in get_mock_posts()] * 50
+    start = time.perf_counter()
+    for title, description in texts:
+        extract_terms(title, description)
+    print(f"extract_terms: {(time.perf_counter() - start) / len(texts) * 1e6:.1f} µs/post")
+
+    rng = np.random.default_rng(42)
+    posts = synthetic_terms(rng, args.listings, args.vocab)
+    authors = rng.integers(0, args.listings // 3, size=args.listings)
+    index = BarterIndex()
+    start = time.perf_counter()
+    for post_id, (terms, author) in enumerate(zip(posts, authors.tolist())):
+        index.add(post_id, author, terms)
+    print(f"index {args.listings:,} listings: {time.perf_counter() - start:.1f} s")
+
+    queries = rng.integers(0, args.listings, size=args.queries).tolist()
+    for name, call in (("matches", index.matches), ("cycles", index.cycles)):
+        ms, found = timed(call, queries)
+        print(
+            f"{name:<8} mean {ms.mean():6.2f} ms  p50 {np.percentile(ms, 50):6.2f} ms  "
+            f"p99 {np.percentile(ms, 99):6.2f} ms  ({found}/{len(queries)} non-empty)"
+        )
+
+
+if __name__ == "__main__":
+    main()
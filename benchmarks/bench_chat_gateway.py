@@ -0,0 +1,187 @@
+"""Benchmark: trade chat fan-out over thousands of concurrent connections.
+
+Opens ``--connections`` in-process ASGI WebSocket sessions on
+``ChatWebSocketApp`` (two per trade, one for each participant), then
+measures delivery to the other participant in two passes:
+
+- hub fan-out: ``--messages`` pre-encoded frames published straight to the
+  hub, i.e. the gateway cost alone;
+- stored + fan-out: ``--stored`` messages sent through the sockets by
+  ``--senders`` concurrent clients, each persisted before it is published.
+
+``--slow`` of the connections stop reading, to show they are cut off
+(close 1013) without delaying everyone else.
+
+Usage:
+    python -m benchmarks.bench_chat_gateway [--connections 5000] [--messages 50000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import statistics
+import tempfile
+import time
+
+import msgspec
+from sqlalchemy import insert
+
+from backend.core.config import DatabaseSettings
+from backend.db import create_engine, create_session_factory, init_models, session_scope
+from backend.models import Trade
+from backend.services.chat_service import ChatService, ChatWebSocketApp
+from backend.services.db_service import ListingRepository, UserRepository
+from backend.services.trade_service import TradeService
+
+
+class Client:
+    """One fake WebSocket peer; ``stalled`` clients never read their frames."""
+
+    def __init__(self, app, trade_id: int, user_id: int, stalled: bool = False):
+        self.incoming: asyncio.Queue = asyncio.Queue()
+        self.stalled = stalled
+        self.received = 0
+        self.closed_with: int | None = None
+        self.waiting: dict[str, asyncio.Future] = {}  # body -> receipt
+        self._never = asyncio.Event()
+        self.incoming.put_nowait({"type": "websocket.connect"})
+        scope = {
+            "type": "websocket",
+            "path": f"/ws/trades/{trade_id}",
+            "query_string": f"token={user_id}".encode(),
+        }
+        self.task = asyncio.create_task(app(scope, self.incoming.get, self._send))
+
+    async def _send(self, message: dict) -> None:
+        if message["type"] == "websocket.close":
+            self.closed_with = message["code"]
+        elif message["type"] == "websocket.send":
+            if self.stalled:
+                await self._never.wait()
+            self.received += 1
+            if self.waiting:
+                body = msgspec.json.decode(message["text"])["body"]
+                receipt = self.waiting.pop(body, None)
+                if receipt is not None:
+                    receipt.set_result(time.perf_counter())
+
+    def say(self, text: str) -> None:
+        self.incoming.put_nowait({"type": "websocket.receive", "text": text})
+
+
+def _report(label: str, count: int, elapsed: float, latencies: list[float]) -> None:
+    latencies.sort()
+    pct = lambda q: latencies[min(len(latencies) - 1, int(q * len(latencies)))] * 1e3
+    print(
+        f"{label:<22} {count / elapsed:>10,.0f} msg/s   "
+        f"p50 {pct(0.5):7.2f} ms   p99 {pct(0.99):7.2f} ms   "
+        f"mean {statistics.fmean(latencies) * 1e3:7.2f} ms"
+    )
+
+
+async def setup(directory: str, trades: int) -> tuple:
+    engine = create_engine(DatabaseSettings(url=f"sqlite+aiosqlite:///{directory}/chat.db"))
+    await init_models(engine)
+    factory = create_session_factory(engine)
+    async with session_scope(factory) as session:
+        users = await UserRepository(session).bulk_insert(
+            [{"name": f"U{i}", "email": f"u{i}@x.com"} for i in range(2 * trades)]
+        )
+        listings = await ListingRepository(session).bulk_insert(
+            [{"author_id": users[2 * i], "title": f"L{i}"} for i in range(trades)]
+        )
+        trade_ids = list(
+            await session.scalars(
+                insert(Trade).returning(Trade.id),
+                [{"listing_id": listings[i], "proposer_id": users[2 * i + 1]} for i in range(trades)],
+            )
+        )
+    pairs = [(trade_ids[i], users[2 * i], users[2 * i + 1]) for i in range(trades)]
+    return engine, factory, pairs
+
+
+async def bench(args: argparse.Namespace) -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        engine, factory, pairs = await setup(directory, args.connections // 2)
+        chat = ChatService(factory, TradeService(factory))
+        hub = chat.hub
+        app = ChatWebSocketApp(chat, authenticate=int, buffer_size=args.buffer)
+
+        rng = random.Random(42)
+        slow = set(rng.sample(range(len(pairs)), args.slow))
+        clients: list[tuple[Client, Client]] = []
+        for i, (trade_id, owner, proposer) in enumerate(pairs):
+            clients.append(
+                (Client(app, trade_id, owner), Client(app, trade_id, proposer, i in slow))
+            )
+        while sum(hub.connections(t) for t, _, _ in pairs) < 2 * len(pairs):
+            await asyncio.sleep(0.05)  # accept + participant check + join
+        print(f"{2 * len(pairs):,} open connections, {args.slow} of them not reading")
+
+        # 1) Gateway only: fan pre-encoded frames out through the hub
+        healthy = [i for i in range(len(pairs)) if i not in slow]
+        latencies = []
+        start = time.perf_counter()
+        for n in range(args.messages):
+            i = rng.randrange(len(pairs))
+            text = f"oferta {n}"
+            frame = msgspec.json.encode({"body": text})
+            if i not in slow:
+                receipt = asyncio.get_running_loop().create_future()
+                clients[i][1].waiting[text] = receipt
+                sent = time.perf_counter()
+                receipt.add_done_callback(lambda f, t=sent: latencies.append(f.result() - t))
+            hub.publish(pairs[i][0], frame)
+            if n % 100 == 99:
+                await asyncio.sleep(0)  # let writers drain, as a server would
+        while any(b.waiting for _, b in clients):
+            await asyncio.sleep(0.001)
+        _report("hub fan-out", args.messages, time.perf_counter() - start, latencies)
+        await asyncio.sleep(0.1)
+        cut = sum(1 for _, b in clients if b.closed_with == 1013)
+        print(
+            f"{'':<22} {hub.metrics.delivered:,} frames queued; "
+            f"slow consumers cut: {cut}/{args.slow}"
+        )
+
+        # 2) End to end: socket receive -> store -> fan-out, concurrent senders
+        latencies = []
+        counter = iter(range(args.stored))
+
+        async def sender() -> None:
+            for n in counter:
+                a, b = clients[rng.choice(healthy)]
+                text = f"proposta {n}"
+                receipt = asyncio.get_running_loop().create_future()
+                b.waiting[text] = receipt
+                sent = time.perf_counter()
+                a.say(text)
+                latencies.append(await receipt - sent)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(sender() for _ in range(args.senders)))
+        _report("stored + fan-out", args.stored, time.perf_counter() - start, latencies)
+
+        for a, b in clients:
+            for client in (a, b):
+                client.incoming.put_nowait({"type": "websocket.disconnect"})
+        await asyncio.gather(*(c.task for pair in clients for c in pair), return_exceptions=True)
+        await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--connections", type=int, default=5000)
+    parser.add_argument("--messages", type=int, default=50_000)
+    parser.add_argument("--slow", type=int, default=50)
+    parser.add_argument("--buffer", type=int, default=16)
+    parser.add_argument("--stored", type=int, default=2000)
+    parser.add_argument("--senders", type=int, default=32)
+    args = parser.parse_args()
+    asyncio.run(bench(args))
+
+
+if __name__ == "__main__":
+    main()
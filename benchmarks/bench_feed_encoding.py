@@ -0,0 +1,77 @@
+"""Benchmark: encode a 1,000-post feed page.
+
+Compares the current approach (``json.dumps`` of the mock dicts, then
+``.encode()`` to bytes for the transport) with msgspec encoding of
+``FeedPageSchema``, both into fresh bytes and into a reused buffer.
+
+Usage:
+    python -m benchmarks.bench_feed_encoding [--posts 1000] [--repeat 200]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from itertools import cycle, islice
+
+from backend.schemas import FeedPageSchema, ResponseEncoder, validate
+from mock.posts import get_mock_posts
+
+
+def build_page(n_posts: int) -> dict:
+    posts = [dict(p) for p in islice(cycle(get_mock_posts()), n_posts)]
+    return {
+        "posts": posts,
+        "total": n_posts,
+        "page": 1,
+        "page_size": n_posts,
+        "has_more": False,
+    }
+
+
+def best_of(fn, repeat: int) -> float:
+    """Return the fastest of ``repeat`` runs, in microseconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--posts", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    page_dict = build_page(args.posts)
+    page = validate(page_dict, FeedPageSchema)
+    encoder = ResponseEncoder()
+
+    def encode_reused():
+        with encoder.encoded(page) as view:
+            return len(view)
+
+    results = {
+        "json.dumps(dicts).encode()": best_of(
+            lambda: json.dumps(page_dict, ensure_ascii=False).encode(), args.repeat
+        ),
+        "msgspec encode -> bytes": best_of(
+            lambda: encoder.encode_bytes(page), args.repeat
+        ),
+        "msgspec encode_into reused buffer": best_of(encode_reused, args.repeat),
+        "validate dicts -> FeedPageSchema": best_of(
+            lambda: validate(page_dict, FeedPageSchema), args.repeat
+        ),
+    }
+
+    baseline = results["json.dumps(dicts).encode()"]
+    print(f"Feed page with {args.posts} posts (best of {args.repeat} runs)")
+    for label, micros in results.items():
+        print(f"  {label:<36} {micros:10.1f} µs  ({baseline / micros:5.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""Benchmark: radius and bounding-box search over 1M located listings.
+
+Builds a ``GeoIndex`` over ``--points`` listings clustered around Brazilian
+cities (plus uniform noise), then times nearest-first radius queries at a
+few radii and a city-sized bounding box, against a vectorized brute-force
+haversine scan.
+
+Usage:
+    python -m benchmarks.bench_geo_index [--points 1000000] [--queries 500]
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+
+import numpy as np
+
+from backend.services.geo_service import GeoIndex, haversine_km
+
+CITIES = [
+    (-23.55, -46.63),  # São Paulo
+    (-22.91, -43.17),  # Rio de Janeiro
+    (-19.92, -43.94),  # Belo Horizonte
+    (-25.43, -49.27),  # Curitiba
+    (-30.03, -51.23),  # Porto Alegre
+    (-12.97, -38.50),  # Salvador
+    (-3.73, -38.52),  # Fortaleza
+    (-15.79, -47.88),  # Brasília
+]
+
+
+def synthetic_points(rng: np.random.Generator, n: int) -> tuple[np.ndarray, np.ndarray]:
+    city = rng.integers(0, len(CITIES), n)
+    centers = np.array(CITIES)[city]
+    lats = centers[:, 0] + rng.normal(0, 0.25, n)
+    lons = centers[:, 1] + rng.normal(0, 0.25, n)
+    noise = rng.random(n) < 0.2
+    lats[noise] = rng.uniform(-33, 5, noise.sum())
+    lons[noise] = rng.uniform(-73, -35, noise.sum())
+    return lats, lons
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--points", type=int, default=1_000_000)
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--limit", type=int, default=20)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(42)
+    lats, lons = synthetic_points(rng, args.points)
+    start = time.perf_counter()
+    index = GeoIndex()
+    index.add_many(np.arange(args.points), lats, lons)
+    print(f"build {args.points:,} points: {time.perf_counter() - start:.2f} s")
+
+    origins = [
+        (lat + rng.normal(0, 0.1), lon + rng.normal(0, 0.1))
+        for lat, lon in (CITIES[i] for i in rng.integers(0, len(CITIES), args.queries))
+    ]
+    for radius in (2.0, 10.0, 50.0):
+        latencies, totals = [], 0
+        for lat, lon in origins:
+            start = time.perf_counter()
+            totals += index.within_radius(lat, lon, radius, limit=args.limit).total
+            latencies.append(time.perf_counter() - start)
+        ms = np.array(latencies) * 1e3
+        print(
+            f"radius {radius:4.0f} km: mean {ms.mean():.3f} ms, p99 {np.percentile(ms, 99):.3f} ms "
+            f"({totals / len(origins):,.0f} matches avg)"
+        )
+
+    latencies = []
+    for lat, lon in origins:
+        start = time.perf_counter()
+        index.within_bbox(lat - 0.1, lon - 0.1, lat + 0.1, lon + 0.1, limit=args.limit)
+        latencies.append(time.perf_counter() - start)
+    ms = np.array(latencies) * 1e3
+    print(f"bbox 0.2°:      mean {ms.mean():.3f} ms, p99 {np.percentile(ms, 99):.3f} ms")
+
+    start = time.perf_counter()
+    for lat, lon in origins[:20]:
+        distances = haversine_km(lat, lon, lats, lons)
+        inside = np.flatnonzero(distances <= 10.0)
+        inside[np.argsort(distances[inside])[: args.limit]]
+    brute = (time.perf_counter() - start) / 20 * 1e3
+    print(f"brute-force scan (10 km): {brute:.3f} ms/query")
+
+
+if __name__ == "__main__":
+    main()
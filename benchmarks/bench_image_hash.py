@@ -0,0 +1,71 @@
+"""Benchmark: near-duplicate lookup over 1M perceptual hashes.
+
+Builds a ``HammingIndex`` over ``--hashes`` random 64-bit hashes and measures
+"is this upload within distance 6 of any stored image" queries, against a
+vectorized brute-force scan. Half of the queries are planted near-duplicates.
+Also times batched pHash computation.
+
+Usage:
+    python -m benchmarks.bench_image_hash [--hashes 1000000] [--queries 1000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+
+import numpy as np
+
+from backend.services.image_hash_service import HammingIndex, phash_batch
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--hashes", type=int, default=1_000_000)
+    parser.add_argument("--queries", type=int, default=1000)
+    parser.add_argument("--distance", type=int, default=6)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(42)
+    hashes = rng.integers(0, 2**64, size=args.hashes, dtype=np.uint64, endpoint=False)
+
+    start = time.perf_counter()
+    index = HammingIndex(max_distance=args.distance)
+    index.add_many(hashes, np.arange(args.hashes))
+    print(f"build {args.hashes:,} hashes: {time.perf_counter() - start:.2f} s")
+
+    queries = []
+    for i in range(args.queries):
+        if i % 2:
+            queries.append(int(rng.integers(0, 2**64, dtype=np.uint64, endpoint=False)))
+        else:
+            flips = rng.choice(64, size=int(rng.integers(1, args.distance + 1)), replace=False)
+            target = int(hashes[rng.integers(args.hashes)])
+            queries.append(target ^ sum(1 << int(b) for b in flips))
+
+    latencies = []
+    hits = 0
+    for query in queries:
+        start = time.perf_counter()
+        hits += bool(index.query(query))
+        latencies.append(time.perf_counter() - start)
+    ms = np.array(latencies) * 1e3
+    print(
+        f"index query: mean {ms.mean():.3f} ms, p99 {np.percentile(ms, 99):.3f} ms "
+        f"({hits}/{len(queries)} with matches)"
+    )
+
+    start = time.perf_counter()
+    for query in queries[:50]:
+        np.flatnonzero(np.bitwise_count(hashes ^ np.uint64(query)) <= args.distance)
+    brute = (time.perf_counter() - start) / 50 * 1e3
+    print(f"brute-force scan: {brute:.3f} ms/query")
+
+    pixels = rng.uniform(0, 255, size=(1000, 32, 32)).astype(np.float32)
+    start = time.perf_counter()
+    phash_batch(pixels)
+    print(f"phash_batch: {(time.perf_counter() - start) * 1e3:.2f} ms per 1,000 images")
+
+
+if __name__ == "__main__":
+    main()
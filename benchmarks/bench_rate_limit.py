@@ -0,0 +1,74 @@
+"""Benchmark: rate-limit overhead per request at 50k active keys.
+
+Drives ``RateLimitMiddleware`` with a no-op ASGI app and requests spread
+uniformly over ``--keys`` client addresses, for each store strategy. The
+target is under 20 µs added per request.
+
+Usage:
+    python -m benchmarks.bench_rate_limit [--keys 50000] [--requests 500000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import time
+
+from backend.core.rate_limit import (
+    RateLimitMiddleware,
+    SlidingWindowLogStore,
+    TokenBucketStore,
+)
+
+
+async def noop_app(scope, receive, send):
+    return None
+
+
+async def noop_send(message):
+    return None
+
+
+async def run(middleware: RateLimitMiddleware, scopes: list[dict]) -> float:
+    """Return mean microseconds per request over ``scopes``."""
+    start = time.perf_counter()
+    for scope in scopes:
+        await middleware(scope, None, noop_send)
+    return (time.perf_counter() - start) / len(scopes) * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--keys", type=int, default=50_000)
+    parser.add_argument("--requests", type=int, default=500_000)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    clients = [(f"10.{i >> 16 & 255}.{i >> 8 & 255}.{i & 255}", 443) for i in range(args.keys)]
+    scopes = [
+        {"type": "http", "path": "/posts", "client": rng.choice(clients)}
+        for _ in range(args.requests)
+    ]
+    warmup = [{"type": "http", "path": "/posts", "client": c} for c in clients]
+
+    async def bare() -> float:
+        start = time.perf_counter()
+        for scope in scopes:
+            await noop_app(scope, None, noop_send)
+        return (time.perf_counter() - start) / len(scopes) * 1e6
+
+    baseline = asyncio.run(bare())
+    print(f"{'no middleware':<24} {baseline:8.2f} µs/request")
+    for store_cls in (TokenBucketStore, SlidingWindowLogStore):
+        middleware = RateLimitMiddleware(noop_app, store_cls(rate=2.0, capacity=60))
+        asyncio.run(run(middleware, warmup))
+        per_request = asyncio.run(run(middleware, scopes))
+        print(
+            f"{store_cls.__name__:<24} {per_request:8.2f} µs/request "
+            f"(+{per_request - baseline:.2f} µs, {len(middleware.store):,} keys)"
+        )
+
+
+if __name__ == "__main__":
+    main()
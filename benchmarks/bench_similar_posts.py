@@ -0,0 +1,64 @@
+"""Benchmark: TF-IDF similar-posts index build, incremental add and lookup.
+
+Generates ``--posts`` synthetic posts (titles/descriptions drawn from a
+Zipf-like vocabulary, a few tags each), bulk-loads them with batched sparse
+products, then times ``add`` (score + splice into cached lists) and the
+cached ``similar`` read used by the post detail dialog.
+
+Usage:
+    python -m benchmarks.bench_similar_posts [--posts 20000] [--adds 500]
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+
+import numpy as np
+
+from backend.services.recommendation_service import SimilarPostsIndex
+
+
+def synthetic_posts(rng: np.random.Generator, n: int, vocab: int, start: int = 0):
+    weights = 1.0 / np.arange(1, vocab + 1)
+    weights /= weights.sum()
+    words = [f"termo{i}" for i in range(vocab)]
+    tags = [f"tag{i}" for i in range(200)]
+    for post_id in range(start, start + n):
+        title = " ".join(words[i] for i in rng.choice(vocab, 4, p=weights))
+        description = " ".join(words[i] for i in rng.choice(vocab, 20, p=weights))
+        yield post_id, title, description, [tags[i] for i in rng.integers(0, 200, 3)]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--posts", type=int, default=20_000)
+    parser.add_argument("--adds", type=int, default=500)
+    parser.add_argument("--vocab", type=int, default=30_000)
+    parser.add_argument("--batch-size", type=int, default=256)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(42)
+    posts = list(synthetic_posts(rng, args.posts, args.vocab))
+    index = SimilarPostsIndex(k=10, batch_size=args.batch_size)
+    start = time.perf_counter()
+    index.add_many(posts)
+    print(f"bulk load + rebuild {args.posts:,} posts: {time.perf_counter() - start:.1f} s")
+
+    latencies = []
+    for post in synthetic_posts(rng, args.adds, args.vocab, start=args.posts):
+        start = time.perf_counter()
+        index.add(*post)
+        latencies.append(time.perf_counter() - start)
+    ms = np.array(latencies) * 1e3
+    print(f"add: mean {ms.mean():.2f} ms, p99 {np.percentile(ms, 99):.2f} ms")
+
+    ids = rng.integers(0, args.posts, 10_000).tolist()
+    start = time.perf_counter()
+    for post_id in ids:
+        index.similar(post_id, 3)
+    print(f"similar (cached): {(time.perf_counter() - start) / len(ids) * 1e6:.1f} µs")
+
+
+if __name__ == "__main__":
+    main()
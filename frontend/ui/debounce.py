@@ -0,0 +1,68 @@
+"""Event-loop debouncer for search-as-you-type.
+
+Every ``schedule()`` starts a new *generation*: the pending or in-flight
+run of the previous generation is cancelled, and the new one waits
+``delay`` seconds before calling ``action(generation)``. A burst of
+keystrokes therefore results in a single run, started ``delay`` after the
+last one, and a query that changes mid-search stops the old search instead
+of letting it finish and overwrite fresher results.
+
+Cancellation only interrupts ``await`` points, so work that cannot be
+cancelled (a request in a worker thread) may still return after a newer
+query started. Actions check ``is_current(generation)`` before applying
+their results and drop them otherwise.
+
+Use from page-level modules (on Flet's event loop, e.g. in async handlers):
+
+    searches = Debouncer(run_search, delay=0.3)
+
+    async def on_change(e):
+        searches.schedule()
+"""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Awaitable, Callable
+
+
+class Debouncer:
+    """Run the latest of a burst of requests, cancelling the older ones.
+
+    Parameters
+    ----------
+    action : Callable[[int], Awaitable[object]]
+        Coroutine function called with the generation it runs for.
+    delay : float
+        Quiet period in seconds before a scheduled run starts.
+    """
+
+    def __init__(self, action: Callable[[int], Awaitable[object]], delay: float = 0.3):
+        self.action = action
+        self.delay = delay
+        self.generation = 0
+        self._task: asyncio.Task | None = None
+
+    def is_current(self, generation: int) -> bool:
+        """Whether results of ``generation`` are still wanted."""
+        return generation == self.generation
+
+    def schedule(self, delay: float | None = None) -> asyncio.Task:
+        """Start a new generation (``delay=0`` runs it right away)."""
+        self.cancel()
+        self._task = asyncio.get_running_loop().create_task(
+            self._run(self.generation, self.delay if delay is None else delay)
+        )
+        return self._task
+
+    def cancel(self) -> None:
+        """Drop the pending or in-flight run, if any."""
+        self.generation += 1
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+        self._task = None
+
+    async def _run(self, generation: int, delay: float) -> None:
+        if delay > 0:
+            await asyncio.sleep(delay)
+        await self.action(generation)
@@ -7,6 +7,7 @@ Future-ready for additional configuration options.
 import flet as ft
 from ..widgets.nav_bar import create_nav_bar
 from ..theme import AppTheme, get_light_theme, get_dark_theme
+from ..view_cache import get_view_cache, show_view
 
 
 def configurations(page: ft.Page, is_dark_mode: bool = False):
@@ -40,9 +41,15 @@ def configurations(page: ft.Page, is_dark_mode: bool = False):
         )
         page.update()
 
-        # Reload the configurations page with new theme
-        page.clean()
-        configurations(page, new_dark_mode)
+        # Reload the configurations page with new theme (other tabs are
+        # rebuilt in the new theme when visited). Views cached for the old
+        # theme would be restored stale after toggling back: drop them.
+        show_view(
+            page,
+            ("configurations", new_dark_mode),
+            lambda: configurations(page, new_dark_mode),
+        )
+        get_view_cache(page).invalidate(lambda key: key[1] == is_dark_mode)
 
     # Page title
     title = ft.Text(
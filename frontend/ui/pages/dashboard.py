@@ -1,8 +1,10 @@
 import flet as ft
 from ..widgets.post_card import PostCard
 from ..widgets.nav_bar import create_nav_bar
+from ..widgets.virtual_feed import PagedFeed
+from ..view_cache import on_view_restored
 from ..theme import AppTheme
-from mock.posts import get_mock_posts
+from mock.posts import get_paginated_posts
 from mock.comments import get_mock_comments
 
 
@@ -25,11 +27,7 @@ def dashboard(page: ft.Page, is_dark_mode: bool = False):
     page.horizontal_alignment = ft.CrossAxisAlignment.STRETCH
     page.padding = 0
 
-    # Get sample feed data from mock module (easy to swap for real API later)
-    mock_posts = get_mock_posts()
-
-    feed_cards = []
-    for idx, mp in enumerate(mock_posts):
+    def build_card(mp: dict, idx: int) -> ft.Control:
         avatar = ft.CircleAvatar(
             bgcolor=mp["avatar_bg"],
             content=ft.Text(mp["avatar_text"], color=AppTheme.TEXT_ON_COLORED_BG),
@@ -37,31 +35,32 @@ def dashboard(page: ft.Page, is_dark_mode: bool = False):
         # Get comments for this post (using index as post_id)
         post_comments = get_mock_comments(idx)
 
-        feed_cards.append(
-            ft.Container(
-                alignment=ft.Alignment.CENTER,
-                content=PostCard(
-                    author_name=mp["author_name"],
-                    author_avatar=avatar,
-                    post_title=mp["post_title"],
-                    post_description=mp["post_description"],
-                    post_date=mp["post_date"],
-                    image_path=mp.get("image_path"),
-                    tags=mp.get("tags"),
-                    comments=post_comments,
-                    is_dark_mode=is_dark_mode,
-                ),
-            )
+        return ft.Container(
+            alignment=ft.Alignment.CENTER,
+            content=PostCard(
+                author_name=mp["author_name"],
+                author_avatar=avatar,
+                post_title=mp["post_title"],
+                post_description=mp["post_description"],
+                post_date=mp["post_date"],
+                image_path=mp.get("image_path"),
+                tags=mp.get("tags"),
+                comments=post_comments,
+                is_dark_mode=is_dark_mode,
+            ),
         )
 
-    # Build a full-screen feed; list will take remaining space and scroll
-    feed_list = ft.ListView(
-        controls=feed_cards,
-        expand=1,
-        spacing=AppTheme.SPACING_MD,
-        padding=AppTheme.SPACING_MD,
-        auto_scroll=False,
-    )
+    # Full-screen feed, one page at a time (easy to swap for real API later);
+    # the next page is fetched and built in the background while scrolling
+    feed = PagedFeed(lambda n: get_paginated_posts(page=n, page_size=10), build_card)
+    feed_list = feed.view
+    # Kept alive by the view cache: return to the same scroll offset, then
+    # check for new posts in the background
+    async def on_restored():
+        await feed.restore_scroll()
+        await feed.revalidate()
+
+    on_view_restored(page, on_restored)
 
     # Get reusable navigation bar
     nav = create_nav_bar(page, selected_index=0, is_dark_mode=is_dark_mode)
@@ -2,6 +2,7 @@ import flet as ft
 from .dashboard import dashboard
 from .create_account import create_account
 from ..theme import AppTheme
+from ..view_cache import show_view
 
 
 def main(page: ft.Page, is_dark_mode: bool = False):
@@ -52,9 +53,9 @@ def main(page: ft.Page, is_dark_mode: bool = False):
 
     # Login button
     def login_click(e):
-        # Here you can validate and redirect to the dashboard
-        page.clean()
-        dashboard(page, is_dark_mode)
+        # Here you can validate and redirect to the dashboard (through the
+        # view cache, so the first tab switch restores it instead of rebuilding)
+        show_view(page, ("dashboard", is_dark_mode), lambda: dashboard(page, is_dark_mode))
 
     login_btn = AppTheme.get_elevated_button(
         text="Entrar",
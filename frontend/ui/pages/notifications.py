@@ -11,11 +11,14 @@ Displays notifications grouped by read/unread status with:
 All styling uses theme.py constants for consistency.
 """
 
+import asyncio
+
 import flet as ft
 from ..widgets.nav_bar import create_nav_bar
 from ..widgets.notification_card import NotificationCard
 from ..widgets.notification_detail_dialog import open_notification_detail_dialog
 from ..theme import AppTheme
+from ..view_cache import on_view_restored
 from mock.notifications import (
     get_mock_notifications,
     mark_notification_as_read,
@@ -51,6 +54,14 @@ def notifications(page: ft.Page, is_dark_mode: bool = False):
         build_notification_list()
         page.update()
 
+    async def revalidate():
+        """Refetch in the background when the tab is restored from the cache."""
+        nonlocal notifications_data
+        fresh = await asyncio.to_thread(get_mock_notifications)
+        if fresh != notifications_data:
+            notifications_data = fresh
+            build_notification_list()
+
     def on_notification_click(e):
         """Handle notification card click - open detail modal."""
         notification_id = e.control.data
@@ -298,8 +309,9 @@ def notifications(page: ft.Page, is_dark_mode: bool = False):
         auto_scroll=False,
     )
 
-    # Initial list build
+    # Initial list build; rebuilt if the data changed when the tab is shown again
     build_notification_list()
+    on_view_restored(page, revalidate)
 
     # Content container with centered, constrained width (matches other pages)
     content_container = ft.Container(
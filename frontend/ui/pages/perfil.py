@@ -3,13 +3,16 @@
 # Add JWT token handling in core/ for authenticated requests
 # Define a UserSchema in schemas/user.py for validation
 
+import asyncio
+
 import flet as ft
 from ..widgets.new_post_dialog import open_new_post_dialog
 from ..widgets.nav_bar import create_nav_bar
 from ..widgets.post_card import PostCard
 from ..theme import AppTheme
-from mock.user import get_current_user
-from mock.posts import count_user_posts, get_mock_posts
+from ..view_cache import on_view_restored
+from mock.user import get_current_user, get_user_reputation
+from mock.posts import count_user_posts, get_barter_suggestions, get_mock_posts
 from mock.comments import get_mock_comments
 
 
@@ -35,6 +38,7 @@ def perfil(page: ft.Page, is_dark_mode: bool = False):
     # Get current user data from mock module (easy to swap for real API later)
     user = get_current_user()
     user_posts_count = count_user_posts(user["name"])
+    reputation = get_user_reputation(user["name"])
 
     # Profile header with avatar and user info
     profile_header = ft.Column(
@@ -88,98 +92,87 @@ def perfil(page: ft.Page, is_dark_mode: bool = False):
         spacing=AppTheme.SPACING_SM,
     )
 
-    # Stats section with counters
+    # Stats section with counters (reputation comes from running aggregates);
+    # value/label texts are kept to patch them when the tab is revalidated
+    stat_texts: dict[str, tuple[ft.Text, ft.Text]] = {}
+
+    def stat_tile(
+        key: str, icon: str, icon_color: str, value: str, label: str
+    ) -> ft.Container:
+        value_text = ft.Text(
+            value,
+            size=AppTheme.FONT_SIZE_TITLE,
+            weight=AppTheme.FONT_WEIGHT_BOLD,
+            color=(
+                AppTheme.DARK_TEXT_PRIMARY
+                if is_dark_mode
+                else AppTheme.LIGHT_TEXT_PRIMARY
+            ),
+        )
+        label_text = ft.Text(
+            label,
+            size=AppTheme.FONT_SIZE_CAPTION,
+            color=(
+                AppTheme.DARK_TEXT_TERTIARY
+                if is_dark_mode
+                else AppTheme.LIGHT_TEXT_TERTIARY
+            ),
+            text_align=ft.TextAlign.CENTER,
+        )
+        stat_texts[key] = (value_text, label_text)
+        return ft.Container(
+            content=ft.Column(
+                [
+                    ft.Row(
+                        [
+                            ft.Icon(
+                                icon,
+                                color=icon_color,
+                                size=AppTheme.ICON_SIZE_LG,  # 24px
+                            ),
+                            value_text,
+                        ],
+                        alignment=ft.MainAxisAlignment.CENTER,
+                        spacing=AppTheme.SPACING_SM,
+                    ),
+                    label_text,
+                ],
+                horizontal_alignment=ft.CrossAxisAlignment.CENTER,
+                spacing=AppTheme.SPACING_XS,  # 4px
+            ),
+            padding=AppTheme.SPACING_MD,
+            border_radius=AppTheme.CARD_BORDER_RADIUS,
+            bgcolor=(
+                AppTheme.DARK_SURFACE if is_dark_mode else AppTheme.LIGHT_SURFACE
+            ),
+            expand=True,
+        )
+
+    def reputation_label(reviews: int) -> str:
+        return f"Reputação ({reviews} {'avaliação' if reviews == 1 else 'avaliações'})"
+
     stats_row = ft.Row(
         [
-            # Publications counter
-            ft.Container(
-                content=ft.Column(
-                    [
-                        ft.Row(
-                            [
-                                ft.Icon(
-                                    ft.Icons.ARTICLE_OUTLINED,
-                                    color=AppTheme.PRIMARY_GREEN,
-                                    size=AppTheme.ICON_SIZE_LG,  # 24px
-                                ),
-                                ft.Text(
-                                    str(user_posts_count),
-                                    size=AppTheme.FONT_SIZE_TITLE,
-                                    weight=AppTheme.FONT_WEIGHT_BOLD,
-                                    color=(
-                                        AppTheme.DARK_TEXT_PRIMARY
-                                        if is_dark_mode
-                                        else AppTheme.LIGHT_TEXT_PRIMARY
-                                    ),
-                                ),
-                            ],
-                            alignment=ft.MainAxisAlignment.CENTER,
-                            spacing=AppTheme.SPACING_SM,
-                        ),
-                        ft.Text(
-                            "Publicações",
-                            size=AppTheme.FONT_SIZE_CAPTION,
-                            color=(
-                                AppTheme.DARK_TEXT_TERTIARY
-                                if is_dark_mode
-                                else AppTheme.LIGHT_TEXT_TERTIARY
-                            ),
-                        ),
-                    ],
-                    horizontal_alignment=ft.CrossAxisAlignment.CENTER,
-                    spacing=AppTheme.SPACING_XS,  # 4px
-                ),
-                padding=AppTheme.SPACING_MD,
-                border_radius=AppTheme.CARD_BORDER_RADIUS,
-                bgcolor=(
-                    AppTheme.DARK_SURFACE if is_dark_mode else AppTheme.LIGHT_SURFACE
-                ),
-                expand=True,
+            stat_tile(
+                "posts",
+                ft.Icons.ARTICLE_OUTLINED,
+                AppTheme.PRIMARY_GREEN,
+                str(user_posts_count),
+                "Publicações",
             ),
-            # Reputation counter
-            ft.Container(
-                content=ft.Column(
-                    [
-                        ft.Row(
-                            [
-                                ft.Icon(
-                                    ft.Icons.STAR,
-                                    color=AppTheme.WARNING,
-                                    size=AppTheme.ICON_SIZE_LG,  # 24px
-                                ),
-                                ft.Text(
-                                    f"{user['reputation']:.1f}",
-                                    size=AppTheme.FONT_SIZE_TITLE,
-                                    weight=AppTheme.FONT_WEIGHT_BOLD,
-                                    color=(
-                                        AppTheme.DARK_TEXT_PRIMARY
-                                        if is_dark_mode
-                                        else AppTheme.LIGHT_TEXT_PRIMARY
-                                    ),
-                                ),
-                            ],
-                            alignment=ft.MainAxisAlignment.CENTER,
-                            spacing=AppTheme.SPACING_SM,
-                        ),
-                        ft.Text(
-                            "Reputação",
-                            size=AppTheme.FONT_SIZE_CAPTION,
-                            color=(
-                                AppTheme.DARK_TEXT_TERTIARY
-                                if is_dark_mode
-                                else AppTheme.LIGHT_TEXT_TERTIARY
-                            ),
-                        ),
-                    ],
-                    horizontal_alignment=ft.CrossAxisAlignment.CENTER,
-                    spacing=AppTheme.SPACING_XS,  # 4px
-                ),
-                padding=AppTheme.SPACING_MD,
-                border_radius=AppTheme.CARD_BORDER_RADIUS,
-                bgcolor=(
-                    AppTheme.DARK_SURFACE if is_dark_mode else AppTheme.LIGHT_SURFACE
-                ),
-                expand=True,
+            stat_tile(
+                "rating",
+                ft.Icons.STAR,
+                AppTheme.WARNING,
+                f"{reputation['rating']:.1f}",
+                reputation_label(reputation["review_count"]),
+            ),
+            stat_tile(
+                "points",
+                ft.Icons.HANDSHAKE_OUTLINED,
+                AppTheme.PRIMARY_GREEN,
+                str(reputation["points"]),
+                "Trocas concluídas",
             ),
         ],
         spacing=AppTheme.SPACING_MD,
@@ -195,32 +188,119 @@ def perfil(page: ft.Page, is_dark_mode: bool = False):
     )
 
     # Build user-specific posts (filter by author_name == current user name)
-    user_posts = [p for p in get_mock_posts() if p.get("author_name") == user["name"]]
+    def load_user_posts() -> list[dict]:
+        return [p for p in get_mock_posts() if p.get("author_name") == user["name"]]
 
-    user_post_cards: list[ft.Control] = []
-    for idx, mp in enumerate(user_posts):
-        avatar = ft.CircleAvatar(
-            bgcolor=mp["avatar_bg"],
-            content=ft.Text(mp["avatar_text"], color=AppTheme.TEXT_ON_COLORED_BG),
-        )
-        post_comments = get_mock_comments(idx)  # Reuse mock comments (index as id)
-        user_post_cards.append(
-            ft.Container(
-                alignment=ft.Alignment.CENTER,
-                content=PostCard(
-                    author_name=mp["author_name"],
-                    author_avatar=avatar,
-                    post_title=mp["post_title"],
-                    post_description=mp["post_description"],
-                    post_date=mp["post_date"],
-                    image_path=mp.get("image_path"),
-                    tags=mp.get("tags"),
-                    comments=post_comments,
-                    is_dark_mode=is_dark_mode,
-                ),
+    def build_post_cards(posts: list[dict]) -> list[ft.Control]:
+        cards: list[ft.Control] = []
+        for idx, mp in enumerate(posts):
+            avatar = ft.CircleAvatar(
+                bgcolor=mp["avatar_bg"],
+                content=ft.Text(mp["avatar_text"], color=AppTheme.TEXT_ON_COLORED_BG),
             )
+            post_comments = get_mock_comments(idx)  # Reuse mock comments (index as id)
+            cards.append(
+                ft.Container(
+                    alignment=ft.Alignment.CENTER,
+                    content=PostCard(
+                        author_name=mp["author_name"],
+                        author_avatar=avatar,
+                        post_title=mp["post_title"],
+                        post_description=mp["post_description"],
+                        post_date=mp["post_date"],
+                        image_path=mp.get("image_path"),
+                        tags=mp.get("tags"),
+                        comments=post_comments,
+                        is_dark_mode=is_dark_mode,
+                    ),
+                )
+            )
+        return cards
+
+    user_posts = load_user_posts()
+    user_post_cards = build_post_cards(user_posts)
+
+    # Complementary offers for the user's posts ("Troco X por Y" matching)
+    text_primary = (
+        AppTheme.DARK_TEXT_PRIMARY if is_dark_mode else AppTheme.LIGHT_TEXT_PRIMARY
+    )
+    text_secondary = (
+        AppTheme.DARK_TEXT_SECONDARY if is_dark_mode else AppTheme.LIGHT_TEXT_SECONDARY
+    )
+
+    def suggestion_tile(icon, title: str, subtitle: str) -> ft.Control:
+        return ft.ListTile(
+            leading=ft.Icon(icon, color=AppTheme.PRIMARY_GREEN, size=AppTheme.ICON_SIZE_LG),
+            title=ft.Text(title, size=AppTheme.FONT_SIZE_BODY, color=text_primary),
+            subtitle=ft.Text(
+                subtitle, size=AppTheme.FONT_SIZE_CAPTION, color=text_secondary
+            ),
+            dense=True,
         )
 
+    barter_tiles: list[ft.Control] = []
+    for suggestion in get_barter_suggestions(user["name"]):
+        mine = suggestion["post"]["post_title"]
+        for match in suggestion["matches"]:
+            barter_tiles.append(
+                suggestion_tile(
+                    ft.Icons.SWAP_HORIZ,
+                    f"{match['author_name']}: {match['post_title']}",
+                    f"Troca direta por “{mine}”",
+                )
+            )
+        for receiver, provider in suggestion["cycles"]:
+            barter_tiles.append(
+                suggestion_tile(
+                    ft.Icons.SYNC,
+                    f"{provider['author_name']}: {provider['post_title']}",
+                    f"Troca a três: “{mine}” vai para {receiver['author_name']}, "
+                    f"que troca com {provider['author_name']}",
+                )
+            )
+
+    barter_card = ft.Card(
+        elevation=AppTheme.CARD_ELEVATION,
+        content=ft.Container(
+            content=ft.Column(
+                [
+                    ft.Text(
+                        "Trocas compatíveis",
+                        size=AppTheme.FONT_SIZE_SUBTITLE,
+                        weight=AppTheme.FONT_WEIGHT_MEDIUM,
+                        color=text_primary,
+                    ),
+                    *barter_tiles,
+                ],
+                spacing=AppTheme.SPACING_XS,
+            ),
+            padding=AppTheme.SPACING_MD,
+            width=AppTheme.CARD_WIDTH_PROFILE,
+            bgcolor=AppTheme.DARK_SURFACE if is_dark_mode else AppTheme.LIGHT_SURFACE,
+            border_radius=ft.border_radius.all(AppTheme.CARD_BORDER_RADIUS),
+        ),
+    )
+
+    # Posts section header only shown if user has posts
+    posts_header = ft.Column(
+        [
+            AppTheme.get_divider(is_dark_mode),
+            ft.Text(
+                "Minhas publicações",
+                size=AppTheme.FONT_SIZE_SUBTITLE,
+                weight=AppTheme.FONT_WEIGHT_MEDIUM,
+                color=(
+                    AppTheme.DARK_TEXT_PRIMARY
+                    if is_dark_mode
+                    else AppTheme.LIGHT_TEXT_PRIMARY
+                ),
+            ),
+        ],
+        horizontal_alignment=ft.CrossAxisAlignment.CENTER,
+        spacing=AppTheme.SPACING_LG,
+        visible=bool(user_posts),
+    )
+
     # Main profile summary card (top section)
     profile_summary_card = ft.Card(
         elevation=AppTheme.CARD_ELEVATION,
@@ -231,24 +311,7 @@ def perfil(page: ft.Page, is_dark_mode: bool = False):
                     AppTheme.get_divider(is_dark_mode),
                     stats_row,
                     novo_button,
-                    # Posts section header only shown if user has posts
-                    *(
-                        [
-                            AppTheme.get_divider(is_dark_mode),
-                            ft.Text(
-                                "Minhas publicações",
-                                size=AppTheme.FONT_SIZE_SUBTITLE,
-                                weight=AppTheme.FONT_WEIGHT_MEDIUM,
-                                color=(
-                                    AppTheme.DARK_TEXT_PRIMARY
-                                    if is_dark_mode
-                                    else AppTheme.LIGHT_TEXT_PRIMARY
-                                ),
-                            ),
-                        ]
-                        if user_posts
-                        else []
-                    ),
+                    posts_header,
                 ],
                 alignment=ft.MainAxisAlignment.CENTER,
                 horizontal_alignment=ft.CrossAxisAlignment.CENTER,
@@ -264,8 +327,10 @@ def perfil(page: ft.Page, is_dark_mode: bool = False):
     # Build a constrained, centered vertical layout (same sizing pattern as original profile page)
     # We use a Column with scroll inside a fixed-width Container to prevent full-window stretching.
     profile_content_controls: list[ft.Control] = [profile_summary_card]
-    if user_post_cards:
-        profile_content_controls.extend(user_post_cards)
+    if barter_tiles:
+        profile_content_controls.append(barter_card)
+    fixed_controls = len(profile_content_controls)
+    profile_content_controls.extend(user_post_cards)
 
     profile_scroll_column = ft.Column(
         controls=profile_content_controls,
@@ -282,6 +347,32 @@ def perfil(page: ft.Page, is_dark_mode: bool = False):
         alignment=ft.Alignment.CENTER,
     )
 
+    async def revalidate():
+        """Refetch stats and posts in the background when the tab is restored."""
+        nonlocal user_posts
+
+        def load():
+            name = user["name"]
+            return count_user_posts(name), get_user_reputation(name), load_user_posts()
+
+        count, fresh_reputation, posts = await asyncio.to_thread(load)
+        stat_texts["posts"][0].value = str(count)
+        stat_texts["rating"][0].value = f"{fresh_reputation['rating']:.1f}"
+        stat_texts["rating"][1].value = reputation_label(fresh_reputation["review_count"])
+        stat_texts["points"][0].value = str(fresh_reputation["points"])
+        changed = [stats_row]
+        if posts != user_posts:
+            user_posts = posts
+            posts_header.visible = bool(posts)
+            profile_scroll_column.controls[fixed_controls:] = build_post_cards(posts)
+            changed = [stats_row, posts_header, profile_scroll_column]
+        try:
+            page.update(*changed)
+        except RuntimeError:  # page switched again meanwhile
+            pass
+
+    on_view_restored(page, revalidate)
+
     # Get reusable navigation bar
     nav = create_nav_bar(
         page, selected_index=2, is_dark_mode=is_dark_mode
@@ -11,7 +11,8 @@ Displays a search bar at the top and a grid of post images below:
 
 Backend migration:
 - Replace get_mock_posts() with API call: GET /search/posts?q={query}
-- Implement filters: category, location, date range
+- Implement filters: category, date range (location: "Perto de mim" chip,
+  backed by backend.services.geo_service.GeoIndex)
 - Add infinite scroll with pagination
 """
 
@@ -19,8 +20,19 @@ import asyncio
 import flet as ft
 from ..widgets.nav_bar import create_nav_bar
 from ..widgets.post_detail_dialog import open_post_detail_dialog
+from ..widgets.photo_grid import PhotoGrid
+from ..widgets.filter_chips import FilterChipBar
+from ..debounce import Debouncer
+from ..responsive import get_responsive_layout
+from ..view_cache import on_view_restored
+from ..search_cache import SearchResults, get_search_cache
 from ..theme import AppTheme
 from mock.posts import get_mock_posts, get_unique_categories, get_paginated_posts
+from mock.user import get_current_user
+
+
+NEAR_ME_RADIUS_KM = 25.0
+SIMULATED_LATENCY = 0.8  # Seconds of fake API delay (remove in production)
 
 
 def search(page: ft.Page, is_dark_mode: bool = False):
@@ -51,85 +63,114 @@ def search(page: ft.Page, is_dark_mode: bool = False):
         []
     )  # Posts after filtering by search query (cumulative with pagination)
     is_loading = False  # Loading state for async operations
-    photo_grid = None  # Will be initialized after calculating columns
+    photo_grid = None  # PhotoGrid, built once and updated in place
     content_container = None  # Will be initialized after creation
     search_field = None  # Will be initialized after creation
     search_btn = None  # Left action button
     clear_btn = None  # Right clear button
-    debounce_timer = None  # Timer for debouncing search input
     selected_photo_index = (
         -1
     )  # Current focused photo index for keyboard navigation (-1 = none)
-    photo_containers = []  # List of photo container references for keyboard navigation
 
     # Filter and pagination state
     category_filter = None  # Currently selected category (None = "Todos")
+    near_me = False  # Restrict results to NEAR_ME_RADIUS_KM around the user
+    user = get_current_user()
+    user_location = (user["latitude"], user["longitude"])
     current_page = 1  # Current page number
     page_size = 6  # Posts per page
     has_more = True  # Whether there are more posts to load
     total_posts = 0  # Total number of posts matching current filters
-    is_loading_more = False  # Loading state for pagination
+    load_more_calls = 0  # Identifies the latest load-more (owner of the footer state)
 
-    def get_window_width() -> int:
-        """Safely get current window width as int with fallback."""
-        try:
-            w = page.window.width or page.width or 800
-            return int(w)
-        except Exception:
-            return 800
+    # Breakpoints (grid columns, container width) from the shared layout service
+    layout = get_responsive_layout(page)
 
-    def get_responsive_columns(window_width: int | None = None):
-        """
-        Calculate grid columns based on window width.
-        - Small screens (<600px): 2 columns
-        - Tablets (600-900px): 3 columns
-        - Desktop (>900px): 4 columns
-        """
-        ww = window_width if window_width is not None else get_window_width()
-        if ww < 600:
-            return 2
-        elif ww < 900:
-            return 3
-        else:
-            return 4
+    def search_key():
+        """Cache key of the current query and filters."""
+        return (search_query.strip(), category_filter, near_me)
 
-    async def execute_search():
-        """Execute the search action with current query and filters asynchronously."""
-        nonlocal search_query, filtered_posts, is_loading, photo_grid, current_page, has_more, total_posts, photo_containers, selected_photo_index
+    async def fetch_posts(page_number: int, size: int):
+        """Fetch one page of results for the current query and filters."""
+        return await asyncio.to_thread(
+            get_paginated_posts,
+            page=page_number,
+            page_size=size,
+            search_query=search_query.strip() if search_query.strip() else None,
+            category_filter=category_filter,
+            near=user_location if near_me else None,
+            radius_km=NEAR_ME_RADIUS_KM,
+        )
+
+    async def run_search(generation: int):
+        """Run the search with current query and filters (one debouncer generation).
+
+        Cached results of the same search are shown at once and revalidated
+        in the background (only changed tiles are patched). Cancelled by
+        ``searches`` when a newer search starts; results of an outdated
+        generation are dropped.
+        """
+        nonlocal search_query, filtered_posts, is_loading, current_page, has_more, total_posts, selected_photo_index
 
         # Reset pagination when search/filter changes
-        current_page = 1
-        filtered_posts = []
-        photo_containers = []
+        key = search_key()
+        version = search_cache.version
+        cached = search_cache.get(key)
+        current_page = cached.pages if cached else 1
         selected_photo_index = -1
 
-        # Set loading state
-        is_loading = True
-        if photo_grid:
-            photo_grid = build_photo_grid()
-            update_grid_in_content()
+        if cached:
+            # Stale-while-revalidate: show cached results right away
+            is_loading = False
+            has_more, total_posts = cached.has_more, cached.total
+            photo_grid.focus(-1)
+            photo_grid.patch(cached.posts, has_more)  # no-op if already shown
+            filtered_posts = photo_grid.posts
+        else:
+            # Set loading state
+            filtered_posts = []
+            is_loading = True
+            photo_grid.show_loading()
 
         # Simulate API call delay (remove in production)
-        await asyncio.sleep(0.8)
+        await asyncio.sleep(SIMULATED_LATENCY)
 
         # Get paginated posts with search query and category filter
-        result = get_paginated_posts(
-            page=current_page,
-            page_size=page_size,
-            search_query=search_query.strip() if search_query.strip() else None,
-            category_filter=category_filter,
-        )
+        # (every page already shown, in one request)
+        result = await fetch_posts(1, page_size * current_page)
+        if not searches.is_current(generation):
+            return  # a newer search started while this one was running
 
         # Update state from pagination result
-        filtered_posts = result["posts"]
         has_more = result["has_more"]
         total_posts = result["total"]
+        search_cache.put(
+            key,
+            SearchResults(result["posts"], has_more, total_posts, current_page),
+            version,
+        )
 
-        # Clear loading state
+        # Clear loading state and show the results
         is_loading = False
-        if photo_grid:
-            photo_grid = build_photo_grid()
-            update_grid_in_content()
+        if cached:
+            photo_grid.patch(result["posts"], has_more)  # keeps the focused tile styled
+            selected_photo_index = photo_grid.focused
+        else:
+            photo_grid.set_posts(result["posts"], has_more)
+        filtered_posts = photo_grid.posts
+        add_new_tags(result["posts"])
+
+    def add_new_tags(posts):
+        """Add chips for tags that appeared since the chip bar was built."""
+        filter_chips.add_categories(tag for post in posts for tag in post.get("tags", []))
+
+    # Debounced searches: a new query cancels the pending/in-flight one
+    search_cache = get_search_cache(page)
+    searches = Debouncer(run_search, delay=0.3)
+
+    async def execute_search():
+        """Search right away (Enter, search button, filter changes)."""
+        searches.schedule(delay=0)
 
     # on_search_change and on_clear_click are defined later (after buttons are created)
 
@@ -154,7 +195,7 @@ def search(page: ft.Page, is_dark_mode: bool = False):
                 return
         else:
             # Grid navigation (when a photo is focused)
-            columns = get_responsive_columns()
+            columns = layout.current.columns
             total_photos = len(filtered_posts)
 
             if e.key == "Arrow Right":
@@ -196,9 +237,9 @@ def search(page: ft.Page, is_dark_mode: bool = False):
     # External clear button will be created later and its disabled state updated dynamically
 
     # Define handlers before field/button creation so they can be referenced
-    def on_search_change(search_e):
+    async def on_search_change(search_e):
         """Handle search input changes with debouncing and clear button state."""
-        nonlocal search_query, debounce_timer, search_field, clear_btn
+        nonlocal search_query, search_field, clear_btn
         search_query = search_e.control.value.lower()
 
         # Enable or disable clear button based on current text
@@ -206,19 +247,8 @@ def search(page: ft.Page, is_dark_mode: bool = False):
             clear_btn.disabled = not bool(search_query)
             clear_btn.update()
 
-        # Cancel previous timer if exists
-        if debounce_timer:
-            debounce_timer.cancel()
-
-        # Set new timer for debounced search (300ms delay)
-        import threading
-
-        def trigger_search():
-            """Schedule async search task on Flet's event loop."""
-            page.run_task(execute_search)
-
-        debounce_timer = threading.Timer(0.3, trigger_search)
-        debounce_timer.start()
+        # Restart the 300ms quiet period (cancels a pending or running search)
+        searches.schedule()
 
     def on_clear_click(_e):
         """Clear the search field and disable clear button."""
@@ -275,36 +305,8 @@ def search(page: ft.Page, is_dark_mode: bool = False):
         container.update()
 
     def update_photo_focus():
-        """Update visual focus indicator for keyboard navigation."""
-        nonlocal photo_containers, selected_photo_index
-
-        # Reset all containers to default state
-        for i, container in enumerate(photo_containers):
-            if i == selected_photo_index:
-                # Apply focus style (same as hover but with green border)
-                container.scale = AppTheme.PHOTO_HOVER_SCALE
-                container.shadow = ft.BoxShadow(
-                    spread_radius=AppTheme.PHOTO_HOVER_SHADOW_SPREAD + 1,
-                    blur_radius=AppTheme.PHOTO_HOVER_SHADOW_BLUR + 2,
-                    color=AppTheme.PRIMARY_GREEN + "60",  # Green with 60% opacity
-                    offset=ft.Offset(0, AppTheme.PHOTO_HOVER_SHADOW_OFFSET_Y),
-                )
-                container.border = ft.border.all(
-                    AppTheme.BORDER_WIDTH_STANDARD, AppTheme.PRIMARY_GREEN
-                )
-            else:
-                # Reset to default
-                container.scale = 1.0
-                container.shadow = ft.BoxShadow(
-                    spread_radius=0,
-                    blur_radius=0,
-                    color=AppTheme.PHOTO_DEFAULT_SHADOW_COLOR,
-                    offset=ft.Offset(0, 0),
-                )
-                container.border = None
-            container.update()
-
-        page.update()
+        """Move the keyboard focus indicator (restyles only the two tiles involved)."""
+        photo_grid.focus(selected_photo_index)
 
     # Search field with floating label (consistent with login page inputs)
     # Layout: [Search Button] [TextField (expand)] [Clear Button]
@@ -350,7 +352,7 @@ def search(page: ft.Page, is_dark_mode: bool = False):
         category : str | None
             Category to filter by. None means "Todos" (all categories).
         """
-        nonlocal category_filter, current_page, filtered_posts, photo_containers, selected_photo_index
+        nonlocal category_filter, current_page, filtered_posts, selected_photo_index
 
         # Update selected filter
         category_filter = category
@@ -358,408 +360,85 @@ def search(page: ft.Page, is_dark_mode: bool = False):
         # Reset pagination
         current_page = 1
         filtered_posts = []
-        photo_containers = []
         selected_photo_index = -1
 
-        # Rebuild filter chips to update visual state
-        filter_chips_row.controls = build_filter_chips()
-        filter_chips_row.update()
+        # Restyle the previously and newly selected chips
+        filter_chips.select(category)
 
         # Execute search with new filter
         page.run_task(execute_search)
 
-    def build_filter_chips():
-        """Build filter chips UI with "Todos" + category chips.
-
-        Returns
-        -------
-        list[ft.Control]
-            List of chip controls.
-        """
-        categories = get_unique_categories()
-        chips = []
-
-        # "Todos" chip (always first)
-        is_selected = category_filter is None
-        chips.append(
-            ft.Container(
-                content=ft.Text(
-                    "Todos",
-                    size=AppTheme.FONT_SIZE_SMALL,
-                    weight=ft.FontWeight.W_500 if is_selected else ft.FontWeight.W_400,
-                    color=(
-                        "#FFFFFF"
-                        if is_selected
-                        else (
-                            AppTheme.DARK_TEXT_PRIMARY
-                            if is_dark_mode
-                            else AppTheme.LIGHT_TEXT_PRIMARY
-                        )
-                    ),
-                ),
-                padding=ft.padding.symmetric(
-                    horizontal=AppTheme.TAG_PADDING_HORIZONTAL,
-                    vertical=AppTheme.TAG_PADDING_VERTICAL,
-                ),
-                border_radius=ft.border_radius.all(100),
-                bgcolor=(
-                    AppTheme.PRIMARY_GREEN
-                    if is_selected
-                    else (
-                        AppTheme.DARK_SURFACE_VARIANT
-                        if is_dark_mode
-                        else AppTheme.LIGHT_SURFACE_VARIANT
-                    )
-                ),
-                border=ft.border.all(
-                    2,
-                    AppTheme.PRIMARY_GREEN if is_selected else "transparent",
-                ),
-                on_click=lambda e: on_filter_click(None),
-                ink=True,
-            )
-        )
-
-        # Category chips
-        for category in categories:
-            is_selected = category_filter == category
-            chips.append(
-                ft.Container(
-                    ft.Text(
-                        category.capitalize(),
-                        size=AppTheme.FONT_SIZE_SMALL,
-                        weight=(
-                            ft.FontWeight.W_500 if is_selected else ft.FontWeight.W_400
-                        ),
-                        color=(
-                            "#FFFFFF"
-                            if is_selected
-                            else (
-                                AppTheme.DARK_TEXT_PRIMARY
-                                if is_dark_mode
-                                else AppTheme.LIGHT_TEXT_PRIMARY
-                            )
-                        ),
-                    ),
-                    padding=ft.padding.symmetric(
-                        horizontal=AppTheme.TAG_PADDING_HORIZONTAL,
-                        vertical=AppTheme.TAG_PADDING_VERTICAL,
-                    ),
-                    border_radius=ft.border_radius.all(100),
-                    bgcolor=(
-                        AppTheme.PRIMARY_GREEN
-                        if is_selected
-                        else (
-                            AppTheme.DARK_SURFACE_VARIANT
-                            if is_dark_mode
-                            else AppTheme.LIGHT_SURFACE_VARIANT
-                        )
-                    ),
-                    border=ft.border.all(
-                        2,
-                        AppTheme.PRIMARY_GREEN if is_selected else "transparent",
-                    ),
-                    on_click=lambda e, cat=category: on_filter_click(cat),
-                    ink=True,
-                )
-            )
-
-        return chips
+    def on_near_me_click():
+        """Toggle the location filter and re-run the search (nearest first)."""
+        nonlocal near_me, current_page, filtered_posts, selected_photo_index
+        near_me = not near_me
+        current_page = 1
+        filtered_posts = []
+        selected_photo_index = -1
+        filter_chips.set_near(near_me)
+        page.run_task(execute_search)
 
-    # Initialize filter chips row (will be populated after content_container creation)
-    filter_chips_row = ft.Row(
-        controls=[],
-        spacing=AppTheme.SPACING_SM,
-        scroll=ft.ScrollMode.AUTO,  # Horizontal scroll if categories overflow
-        alignment=ft.MainAxisAlignment.START,
+    # Filter chips, built once from the category index
+    filter_chips = FilterChipBar(
+        get_unique_categories(),
+        on_select=on_filter_click,
+        on_toggle_near=on_near_me_click,
+        near_label=f"Até {NEAR_ME_RADIUS_KM:.0f} km",
+        is_dark_mode=is_dark_mode,
     )
 
     # Load more handler for pagination
     async def load_more_posts():
         """Load next page of posts and append to current results."""
-        nonlocal current_page, filtered_posts, has_more, is_loading_more, photo_grid, total_posts
+        nonlocal current_page, has_more, total_posts, load_more_calls
 
-        if is_loading_more or not has_more:
+        if photo_grid.is_loading_more or not has_more:
             return
 
-        # Set loading state
-        is_loading_more = True
-        photo_grid = build_photo_grid()
-        update_grid_in_content()
-
-        # Simulate API delay
-        await asyncio.sleep(0.8)
-
-        # Load next page
-        current_page += 1
-        result = get_paginated_posts(
-            page=current_page,
-            page_size=page_size,
-            search_query=search_query.strip() if search_query.strip() else None,
-            category_filter=category_filter,
-        )
-
-        # Append new posts to existing results
-        filtered_posts.extend(result["posts"])
-        has_more = result["has_more"]
-        total_posts = result["total"]
-
-        is_loading_more = False
-        photo_grid = build_photo_grid()
-        update_grid_in_content()
-
-    # (Handlers defined above)
-
-    def build_photo_grid():
-        """Build photo grid with responsive columns, loading, and empty states."""
-        nonlocal photo_grid
-
-        # Loading state: show centered spinner
-        if is_loading:
-            return ft.Container(
-                content=ft.Column(
-                    [
-                        ft.ProgressRing(
-                            width=AppTheme.ICON_SIZE_XL * 2,
-                            height=AppTheme.ICON_SIZE_XL * 2,
-                            stroke_width=4,
-                            color=AppTheme.PRIMARY_GREEN,
-                        ),
-                        ft.Container(height=AppTheme.SPACING_MD),
-                        ft.Text(
-                            "Buscando publicações...",
-                            size=AppTheme.FONT_SIZE_BODY,
-                            color=(
-                                AppTheme.DARK_TEXT_SECONDARY
-                                if is_dark_mode
-                                else AppTheme.LIGHT_TEXT_SECONDARY
-                            ),
-                        ),
-                    ],
-                    horizontal_alignment=ft.CrossAxisAlignment.CENTER,
-                    alignment=ft.MainAxisAlignment.CENTER,
-                ),
-                expand=True,
-                alignment=ft.Alignment.CENTER,
-            )
-
-        # Empty state: no results found
-        if not filtered_posts:
-            return ft.Container(
-                content=ft.Column(
-                    [
-                        ft.Icon(
-                            ft.Icons.IMAGE_SEARCH,
-                            size=AppTheme.ICON_SIZE_XL * 2,
-                            color=(
-                                AppTheme.DARK_TEXT_TERTIARY
-                                if is_dark_mode
-                                else AppTheme.LIGHT_TEXT_TERTIARY
-                            ),
-                        ),
-                        ft.Container(height=AppTheme.SPACING_MD),
-                        ft.Text(
-                            "Nenhuma publicação encontrada",
-                            size=AppTheme.FONT_SIZE_SUBTITLE,
-                            weight=AppTheme.FONT_WEIGHT_MEDIUM,
-                            color=(
-                                AppTheme.DARK_TEXT_PRIMARY
-                                if is_dark_mode
-                                else AppTheme.LIGHT_TEXT_PRIMARY
-                            ),
-                        ),
-                        ft.Container(height=AppTheme.SPACING_XS),
-                        ft.Text(
-                            "Tente outra busca ou explore sem filtros",
-                            size=AppTheme.FONT_SIZE_BODY,
-                            color=(
-                                AppTheme.DARK_TEXT_SECONDARY
-                                if is_dark_mode
-                                else AppTheme.LIGHT_TEXT_SECONDARY
-                            ),
-                            text_align=ft.TextAlign.CENTER,
-                        ),
-                    ],
-                    horizontal_alignment=ft.CrossAxisAlignment.CENTER,
-                    alignment=ft.MainAxisAlignment.CENTER,
-                ),
-                expand=True,
-                alignment=ft.Alignment.CENTER,
-            )
-
-        # Content state: build grid with filtered posts
-        photo_items = []
-        photo_containers.clear()  # Reset containers list for keyboard navigation
-
-        for idx, post in enumerate(filtered_posts):
-            if post.get("image_path"):
-                # Create accessible description for screen readers
-                post_title = post.get("post_title", "Publicação")
-                author_name = post.get("author_name", "Usuário")
-                alt_text = f"{post_title} por {author_name}"
-
-                # Create image container with tap handler
-                # Lazy loading: Images load when GridView renders them (Flet's default behavior)
-                # Caching: Set gapless_playback=True for smooth re-rendering
-                container = ft.Container(
-                    content=ft.Image(
-                        src=post["image_path"],
-                        fit=ft.BoxFit.COVER,
-                        border_radius=ft.border_radius.all(AppTheme.SPACING_XS),
-                        gapless_playback=True,  # Enable image caching
-                        tooltip=alt_text,  # Hover tooltip for accessibility
-                        semantics_label=alt_text,  # Screen reader description
-                        error_content=ft.Icon(
-                            ft.Icons.BROKEN_IMAGE,
-                            size=AppTheme.ICON_SIZE_XL,
-                            color=(
-                                AppTheme.DARK_TEXT_TERTIARY
-                                if is_dark_mode
-                                else AppTheme.LIGHT_TEXT_TERTIARY
-                            ),
-                        ),
-                    ),
-                    bgcolor=(
-                        AppTheme.DARK_SURFACE_VARIANT
-                        if is_dark_mode
-                        else AppTheme.LIGHT_SURFACE_VARIANT
-                    ),
-                    border_radius=ft.border_radius.all(AppTheme.SPACING_XS),
-                    ink=True,
-                    on_click=on_photo_click,
-                    on_hover=on_photo_hover,  # Enable hover effects
-                    data=idx,  # Store post index for click and navigation
-                    aspect_ratio=1.0,  # Maintain square aspect ratio
-                    animate_scale=ft.Animation(
-                        AppTheme.ANIMATION_DURATION_FAST,
-                        ft.AnimationCurve.EASE_OUT,
-                    ),
-                    shadow=ft.BoxShadow(
-                        spread_radius=0,
-                        blur_radius=0,
-                        color=AppTheme.PHOTO_DEFAULT_SHADOW_COLOR,
-                        offset=ft.Offset(0, 0),
-                    ),
-                )
-
-                photo_items.append(container)
-                photo_containers.append(
-                    container
-                )  # Store reference for keyboard navigation
-
-        # Grid view for photos with responsive columns
-        columns = get_responsive_columns()
-        grid_view = ft.GridView(
-            controls=photo_items,
-            runs_count=columns,  # Dynamic column count
-            max_extent=150,  # Max width of each grid item
-            spacing=AppTheme.SPACING_SM,
-            run_spacing=AppTheme.SPACING_SM,
-            expand=True,
-            padding=0,
-            child_aspect_ratio=1.0,  # Keep items square
-        )
-
-        # Build Load More button (only if there are more posts)
-        load_more_controls = []
-        if has_more and filtered_posts:
-            load_more_btn = ft.Container(
-                content=ft.Row(
-                    [
-                        ft.ProgressRing(
-                            width=AppTheme.ICON_SIZE_MD,
-                            height=AppTheme.ICON_SIZE_MD,
-                            stroke_width=2,
-                            color=AppTheme.PRIMARY_GREEN,
-                            visible=is_loading_more,
-                        ),
-                        ft.Text(
-                            "Carregando..." if is_loading_more else "Carregar mais",
-                            size=AppTheme.FONT_SIZE_BODY,
-                            weight=AppTheme.FONT_WEIGHT_MEDIUM,
-                            color=(
-                                AppTheme.PRIMARY_GREEN
-                                if not is_loading_more
-                                else (
-                                    AppTheme.DARK_TEXT_SECONDARY
-                                    if is_dark_mode
-                                    else AppTheme.LIGHT_TEXT_SECONDARY
-                                )
-                            ),
-                        ),
-                    ],
-                    alignment=ft.MainAxisAlignment.CENTER,
-                    spacing=AppTheme.SPACING_SM,
-                ),
-                padding=AppTheme.SPACING_MD,
-                border_radius=ft.border_radius.all(AppTheme.CARD_BORDER_RADIUS),
-                border=ft.border.all(1, AppTheme.PRIMARY_GREEN),
-                bgcolor="transparent",
-                ink=True,
-                on_click=lambda _e: (page.run_task(load_more_posts) if not is_loading_more else None),  # type: ignore
+        # Set loading state (restyles the footer only)
+        load_more_calls += 1
+        call = load_more_calls
+        generation = searches.generation
+        photo_grid.set_loading_more(True)
+        try:
+            # Simulate API delay
+            await asyncio.sleep(SIMULATED_LATENCY)
+
+            # Load next page
+            version = search_cache.version
+            result = await fetch_posts(current_page + 1, page_size)
+
+            if not searches.is_current(generation):
+                return  # the search changed: this page belongs to the old results
+
+            # Append only the new page's tiles to the existing grid
+            current_page += 1
+            has_more = result["has_more"]
+            total_posts = result["total"]
+            photo_grid.append(result["posts"], has_more)
+            add_new_tags(result["posts"])
+            search_cache.put(
+                search_key(),
+                SearchResults(list(photo_grid.posts), has_more, total_posts, current_page),
+                version,
             )
-            load_more_controls = [
-                ft.Container(height=AppTheme.SPACING_MD),
-                ft.Container(
-                    content=load_more_btn,
-                    alignment=ft.Alignment.CENTER,
-                ),
-                ft.Container(height=AppTheme.SPACING_MD),
-            ]
-
-        # Wrap grid + load more button in a column
-        all_controls: list[ft.Control] = [grid_view] + load_more_controls  # type: ignore
-        photo_grid = ft.Column(
-            controls=all_controls,
-            spacing=0,
-            expand=True,
-        )
-        return photo_grid
-
-    def update_grid_in_content():
-        """Update the photo grid in the content container."""
-        nonlocal content_container, photo_grid
-        if content_container and content_container.content and photo_grid:
-            # Find the grid in the column and replace it
-            column = content_container.content
-            if isinstance(column, ft.Column) and len(column.controls) > 0:
-                # Grid is the last item in the column
-                column.controls[-1] = photo_grid
-                page.update()
-
-    def on_page_resize(_e):
-        """Handle window resize to update grid columns."""
-        nonlocal photo_grid, content_container
-        changed = False
-        # photo_grid is now a Column containing GridView + Load More button
-        if photo_grid and isinstance(photo_grid, ft.Column):
-            # Get the GridView (first child)
-            if len(photo_grid.controls) > 0 and isinstance(
-                photo_grid.controls[0], ft.GridView
-            ):
-                grid_view = photo_grid.controls[0]
-                ww = get_window_width()
-                new_columns = get_responsive_columns(ww)
-                if grid_view.runs_count != new_columns:
-                    grid_view.runs_count = new_columns
-                    changed = True
-        if content_container:
-            ww = get_window_width()
-            new_width = AppTheme.get_responsive_container_width(ww)
-            if content_container.width != new_width:
-                content_container.width = new_width
-                changed = True
-        if changed:
-            page.update()
-
-    # Register resize handler
-    page.on_resize = on_page_resize
+        finally:
+            # Dropped, failed or cancelled: the footer must not stay on
+            # "Carregando..." (unless a newer load-more owns it)
+            if call == load_more_calls and photo_grid.is_loading_more:
+                photo_grid.set_loading_more(False)
 
     # Register keyboard handler for shortcuts (Esc to clear)
     page.on_keyboard_event = on_key_press
 
-    # Build initial grid
-    photo_grid = build_photo_grid()
+    # Build the grid once; searches and "load more" update it in place
+    photo_grid = PhotoGrid(
+        on_click=on_photo_click,
+        on_hover=on_photo_hover,
+        on_load_more=lambda: page.run_task(load_more_posts),
+        columns=layout.current.columns,
+        is_dark_mode=is_dark_mode,
+    )
 
     # Content container with discrete responsive width (breakpoints)
     # Uses padding for consistent spacing; remains centered by parent container
@@ -794,20 +473,25 @@ def search(page: ft.Page, is_dark_mode: bool = False):
                 AppTheme.get_divider(is_dark_mode),
                 ft.Container(height=AppTheme.SPACING_MD),
                 # Filter chips row
-                filter_chips_row,
+                filter_chips.view,
                 ft.Container(height=AppTheme.SPACING_SM),
                 # Photo grid
-                photo_grid,
+                photo_grid.view,
             ],
             spacing=0,
         ),
-        width=AppTheme.get_responsive_container_width(get_window_width()),
+        width=layout.current.container_width,
         padding=ft.padding.symmetric(horizontal=AppTheme.SPACING_MD),
         expand=True,
     )
 
-    # Populate filter chips after content_container creation
-    filter_chips_row.controls = build_filter_chips()
+    # Resizes are coalesced by the layout service; these run only when the
+    # breakpoint changes what they depend on
+    def set_content_width(width: int):
+        content_container.width = width
+
+    layout.listen("search.columns", lambda bp: bp.columns, photo_grid.set_columns)
+    layout.listen("search.width", lambda bp: bp.container_width, set_content_width)
 
     # Get navigation bar
     nav = create_nav_bar(page, selected_index=3, is_dark_mode=is_dark_mode)
@@ -828,8 +512,16 @@ def search(page: ft.Page, is_dark_mode: bool = False):
         )
     )
 
-    # Load initial data
+    async def on_restored():
+        """Catch up with resizes made on other tabs, then revalidate."""
+        if page.width:
+            layout.handle_resize(page.width)
+        await execute_search()
+
+    # Load initial data; when the tab is shown again from the view cache,
+    # revalidate the results shown (served from the search cache first)
     page.run_task(execute_search)
+    on_view_restored(page, on_restored)
 
 
 if __name__ == "__main__":
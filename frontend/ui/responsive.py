@@ -0,0 +1,152 @@
+"""Shared responsive-layout service: coalesced resize events and breakpoints.
+
+Dragging a window edge fires dozens of ``page.on_resize`` events per
+second. ``ResponsiveLayout`` owns the handler: an event only records the
+latest width, and the first event of a burst schedules a single flush
+``interval`` seconds later, so a continuous drag is handled at most once per
+interval, always with the most recent width. The flush computes the
+breakpoint once (with ``AppTheme.get_responsive_container_width`` and
+``get_responsive_dialog_size``); if it changed, it calls only the listeners
+whose selected value (columns, container width...) changed, then sends one
+``page.update()``.
+
+There is one layout per session (in the Flet session store). Listeners are
+registered under a key, so a page that is rebuilt on a tab switch replaces
+its listeners instead of piling up new ones.
+
+Use from page-level modules:
+
+    layout = get_responsive_layout(page)
+    columns = layout.listen("search.columns", lambda bp: bp.columns, grid.set_columns)
+"""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+from typing import Any, Callable
+
+import flet as ft
+
+from .theme import AppTheme
+
+SESSION_KEY = "scambo.responsive_layout"
+DEFAULT_WIDTH = 800  # Used until the page reports its size
+
+
+@dataclass(frozen=True)
+class Breakpoint:
+    """Layout values shared by every component at one window-size tier."""
+
+    name: str  # "small" (< 600px), "medium" (600-900px) or "large"
+    columns: int  # photo grid columns
+    container_width: int
+    dialog_size: tuple[int, int]
+
+
+def breakpoint_for(width: float | None) -> Breakpoint:
+    """Breakpoint of a window width (``DEFAULT_WIDTH`` if unknown)."""
+    w = int(DEFAULT_WIDTH if not width else width)
+    if w < 600:
+        name, columns = "small", 2
+    elif w < 900:
+        name, columns = "medium", 3
+    else:
+        name, columns = "large", 4
+    return Breakpoint(
+        name=name,
+        columns=columns,
+        container_width=AppTheme.get_responsive_container_width(w),
+        dialog_size=AppTheme.get_responsive_dialog_size(w),
+    )
+
+
+class ResponsiveLayout:
+    """Throttled resize handling with per-listener change detection.
+
+    Parameters
+    ----------
+    width : float | None
+        Initial window width.
+    interval : float
+        Seconds between flushes while resize events keep coming.
+    """
+
+    def __init__(self, width: float | None = None, interval: float = 0.15):
+        self.interval = interval
+        self.current = breakpoint_for(width)
+        self.page: ft.Page | None = None
+        self._width = width
+        self._flush_handle: asyncio.TimerHandle | None = None
+        # key -> (select, callback, last selected value)
+        self._listeners: dict[str, tuple[Callable[[Breakpoint], Any], Callable[[Any], Any], Any]] = {}
+
+    def attach(self, page: ft.Page) -> None:
+        """Handle ``page``'s resize events."""
+        self.page = page
+        page.on_resize = self._on_resize
+
+    def listen(
+        self,
+        key: str,
+        select: Callable[[Breakpoint], Any],
+        callback: Callable[[Any], Any],
+    ) -> Any:
+        """Call ``callback(value)`` when ``select(breakpoint)`` changes.
+
+        Replaces any listener registered under ``key``; returns the current
+        value so the caller can build with it.
+        """
+        value = select(self.current)
+        self._listeners[key] = (select, callback, value)
+        return value
+
+    def unlisten(self, key: str) -> None:
+        self._listeners.pop(key, None)
+
+    async def _on_resize(self, e: ft.PageResizeEvent) -> None:
+        self.handle_resize(e.width)
+
+    def handle_resize(self, width: float) -> None:
+        """Record a resize; the first one of a burst schedules the flush."""
+        self._width = width
+        if self._flush_handle is None:
+            self._flush_handle = asyncio.get_running_loop().call_later(
+                self.interval, self.flush
+            )
+
+    def flush(self) -> list[str]:
+        """Apply the latest width; returns the keys of the listeners called."""
+        self._flush_handle = None
+        breakpoint = breakpoint_for(self._width)
+        if breakpoint == self.current:
+            return []
+        self.current = breakpoint
+        notified = []
+        for key, (select, callback, last) in list(self._listeners.items()):
+            value = select(breakpoint)
+            if value != last:
+                self._listeners[key] = (select, callback, value)
+                callback(value)
+                notified.append(key)
+        if notified and self.page is not None:
+            try:
+                self.page.update()
+            except RuntimeError:  # session closed mid-resize
+                pass
+        return notified
+
+
+def get_responsive_layout(page: ft.Page) -> ResponsiveLayout:
+    """The session's layout service, handling ``page``'s resize events."""
+    store = page.session.store
+    layout = store.get(SESSION_KEY)
+    if layout is None:
+        try:
+            width = page.window.width or page.width
+        except Exception:
+            width = None
+        layout = ResponsiveLayout(width)
+        store.set(SESSION_KEY, layout)
+    layout.attach(page)
+    return layout
@@ -0,0 +1,91 @@
+"""Per-session stale-while-revalidate cache of Explorar search results.
+
+Entries are keyed by the normalized search (query, category, location
+filter) and hold every post loaded for it so far. The Explorar page shows a
+cached entry immediately, revalidates it in the background, and patches
+only the tiles whose post changed. The cache lives in the Flet session
+store, so it survives tab switches (which rebuild the page) and is dropped
+with the session.
+
+- ``max_entries`` bounds the cache (least recently used searches go first).
+- ``invalidate()`` drops everything; it is called when the user creates a
+  post, since a new post can appear in any result list. Refreshes that were
+  already running when the cache was invalidated do not write back.
+
+Use from page-level modules:
+
+    cache = get_search_cache(page)
+    cached = cache.get(key)
+    ...
+    cache.put(key, SearchResults(posts, has_more, total, pages), version)
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Hashable
+
+import flet as ft
+
+SESSION_KEY = "scambo.search_cache"
+
+
+@dataclass(frozen=True)
+class SearchResults:
+    """Posts loaded for one search (``pages`` pages of the page size)."""
+
+    posts: list[dict[str, Any]]
+    has_more: bool
+    total: int
+    pages: int = 1
+
+
+class SearchCache:
+    """LRU map of search key -> ``SearchResults``.
+
+    Parameters
+    ----------
+    max_entries : int
+        Searches kept; the least recently used one is dropped beyond it.
+    """
+
+    def __init__(self, max_entries: int = 20):
+        self.max_entries = max_entries
+        self.version = 0  # bumped by invalidate()
+        self._entries: OrderedDict[Hashable, SearchResults] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> SearchResults | None:
+        """Cached results of a search (marking it recently used)."""
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    def put(self, key: Hashable, results: SearchResults, version: int | None = None) -> bool:
+        """Store results fetched at cache ``version``; False if they are outdated."""
+        if version is not None and version != self.version:
+            return False
+        self._entries[key] = results
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return True
+
+    def invalidate(self) -> None:
+        """Drop every entry (e.g. after the user creates a post)."""
+        self._entries.clear()
+        self.version += 1
+
+
+def get_search_cache(page: ft.Page) -> SearchCache:
+    """The session's search cache (created on first use)."""
+    store = page.session.store
+    cache = store.get(SESSION_KEY)
+    if cache is None:
+        cache = SearchCache()
+        store.set(SESSION_KEY, cache)
+    return cache
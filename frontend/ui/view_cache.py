@@ -0,0 +1,211 @@
+"""Keep-alive cache of built pages for the bottom-navigation tabs.
+
+Switching tabs used to ``page.clean()`` and rebuild the destination from
+scratch, losing its results and scroll position. ``show_view`` keeps the
+built control tree of recently visited tabs instead, together with the
+page-level settings the page function set (title, background, keyboard
+and resize handlers). Switching back puts the same controls back on the
+page in a single ``page.update()`` and then runs the hooks the page (and
+its widgets) registered with ``on_view_restored`` (e.g. revalidate search
+results or the profile's stats, restore the feed's scroll offset, refresh
+the notifications badge) in the background.
+
+The cache is per session and bounded twice: at most ``max_views`` pages,
+and at most ``max_controls`` controls across them (a proxy for memory; a
+feed with hundreds of loaded tiles weighs more than a settings form). The
+least recently shown pages are dropped first; the page on screen is never
+dropped. Views built for another theme are dropped with ``invalidate`` when
+the theme changes.
+
+Use from navigation code:
+
+    show_view(page, ("search", is_dark_mode), lambda: search(page, is_dark_mode))
+"""
+
+from __future__ import annotations
+
+import asyncio
+import dataclasses
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Callable, Hashable
+
+import flet as ft
+
+SESSION_KEY = "scambo.view_cache"
+RESTORE_HOOK_KEY = "scambo.view_cache.restore_hook"
+
+# Page attributes set by page functions, saved and restored with the view,
+# and their Flet defaults (set before a page is built, so a page never
+# inherits the previous page's handlers)
+PAGE_SETTINGS = {
+    "title": None,
+    "bgcolor": None,
+    "vertical_alignment": ft.MainAxisAlignment.START,
+    "horizontal_alignment": ft.CrossAxisAlignment.START,
+    "padding": 10,
+    "on_keyboard_event": None,
+    "on_resize": None,
+}
+
+
+def count_controls(controls: list[ft.Control]) -> int:
+    """Number of controls in the trees rooted at ``controls``."""
+    count, stack, seen = 0, list(controls), set()
+    while stack:
+        control = stack.pop()
+        if id(control) in seen:
+            continue
+        seen.add(id(control))
+        count += 1
+        for f in dataclasses.fields(control):
+            if f.name.startswith("_"):
+                continue
+            value = getattr(control, f.name, None)
+            if isinstance(value, ft.Control):
+                stack.append(value)
+            elif isinstance(value, list):
+                stack.extend(v for v in value if isinstance(v, ft.Control))
+    return count
+
+
+@dataclass
+class CachedView:
+    """A page's root controls and the page settings it was built with."""
+
+    controls: list[ft.Control]
+    settings: dict[str, Any]
+    on_restore: list[Callable[[], Any]] = field(default_factory=list)
+    size: int = field(default=0)
+
+
+class ViewCache:
+    """LRU of ``CachedView`` bounded by count and by total controls.
+
+    Parameters
+    ----------
+    max_views : int
+        Pages kept alive.
+    max_controls : int
+        Total controls kept across cached pages.
+    """
+
+    def __init__(self, max_views: int = 4, max_controls: int = 20_000):
+        self.max_views = max_views
+        self.max_controls = max_controls
+        self.current: Hashable | None = None
+        self._views: OrderedDict[Hashable, CachedView] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._views)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._views
+
+    @property
+    def total_controls(self) -> int:
+        return sum(view.size for view in self._views.values())
+
+    def get(self, key: Hashable) -> CachedView | None:
+        view = self._views.get(key)
+        if view is not None:
+            self._views.move_to_end(key)
+        return view
+
+    def put(self, key: Hashable, view: CachedView) -> None:
+        self._views[key] = view
+        self._views.move_to_end(key)
+        self._evict()
+
+    def resize(self, key: Hashable, controls: list[ft.Control]) -> None:
+        """Re-measure a cached view (it grows while on screen)."""
+        view = self._views.get(key)
+        if view is not None:
+            view.size = count_controls(controls)
+            self._evict()
+
+    def _evict(self) -> None:
+        while len(self._views) > self.max_views or self.total_controls > self.max_controls:
+            # Least recently shown first; never the page on screen
+            victim = next((key for key in self._views if key != self.current), None)
+            if victim is None:
+                break
+            del self._views[victim]
+
+    def invalidate(self, match: Callable[[Hashable], bool]) -> int:
+        """Drop every cached view whose key matches; returns how many."""
+        stale = [key for key in self._views if match(key)]
+        for key in stale:
+            del self._views[key]
+        return len(stale)
+
+    def clear(self) -> None:
+        self._views.clear()
+
+
+def get_view_cache(page: ft.Page) -> ViewCache:
+    """The session's view cache (created on first use)."""
+    store = page.session.store
+    cache = store.get(SESSION_KEY)
+    if cache is None:
+        cache = ViewCache()
+        store.set(SESSION_KEY, cache)
+    return cache
+
+
+def on_view_restored(page: ft.Page, callback: Callable[[], Any]) -> None:
+    """Register something to run when the page being built is shown again.
+
+    Call from a page function (or a widget it builds); every registered
+    ``callback`` runs, in order. It may be a coroutine function (run as a
+    background task) or a plain function.
+    """
+    hooks = page.session.store.get(RESTORE_HOOK_KEY)
+    if hooks is None:  # built outside show_view: never restored
+        return
+    hooks.append(callback)
+
+
+def show_view(page: ft.Page, key: Hashable, build: Callable[[], Any]) -> bool:
+    """Show the cached view ``key``, or build and cache it.
+
+    Returns True if a cached view was restored.
+    """
+    cache = get_view_cache(page)
+    store = page.session.store
+    if cache.current is not None:  # it may have grown since it was cached
+        cache.resize(cache.current, page.controls)
+
+    view = cache.get(key)
+    cache.current = key
+    if view is not None:
+        page.controls = list(view.controls)
+        for name, value in view.settings.items():
+            setattr(page, name, value)
+        page.update()
+        for hook in view.on_restore:
+            if asyncio.iscoroutinefunction(hook):
+                page.run_task(hook)
+            else:
+                hook()
+        return True
+
+    page.clean()
+    for name, default in PAGE_SETTINGS.items():
+        setattr(page, name, default)
+    hooks: list[Callable[[], Any]] = []
+    store.set(RESTORE_HOOK_KEY, hooks)
+    try:
+        build()
+    finally:
+        store.set(RESTORE_HOOK_KEY, None)
+    cache.put(
+        key,
+        CachedView(
+            controls=list(page.controls),
+            settings={name: getattr(page, name) for name in PAGE_SETTINGS},
+            on_restore=hooks,
+            size=count_controls(page.controls),
+        ),
+    )
+    return False
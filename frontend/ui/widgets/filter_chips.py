@@ -0,0 +1,182 @@
+"""Filter chip bar for the Explorar page ("Perto de mim", "Todos", categories).
+
+Chips are built once, from the category index, and kept by category.
+Changing the selection restyles only the previously and the newly selected
+chips (one batched update), and ``add_categories`` inserts chips for tags
+not seen before at their sorted position instead of rebuilding the row.
+
+The chips live in a horizontal ``ft.ListView``, which lays out only the
+chips near the visible strip, so hundreds of categories scroll as cheaply
+as a handful.
+
+Use from page-level modules:
+
+    chips = FilterChipBar(get_unique_categories(), on_select, on_toggle_near)
+    chips.select("eletrônicos")
+    chips.add_categories(post["tags"])
+"""
+
+from __future__ import annotations
+
+import bisect
+from typing import Callable, Iterable
+
+import flet as ft
+
+from ..theme import AppTheme
+
+# Tallest chip (icon + vertical padding + border) plus a little air
+CHIP_BAR_HEIGHT = 32
+
+
+class FilterChipBar:
+    """Horizontally scrolling row of selectable chips.
+
+    Parameters
+    ----------
+    categories : Iterable[str]
+        Initial categories (one chip each, sorted).
+    on_select : Callable[[str | None], None]
+        Called with the clicked category (None for "Todos").
+    on_toggle_near : Callable[[], None]
+        Called when the location chip is clicked.
+    near_label : str
+        Label of the location chip.
+    is_dark_mode : bool
+        Whether to apply dark theme styling.
+    """
+
+    def __init__(
+        self,
+        categories: Iterable[str],
+        on_select: Callable[[str | None], None],
+        on_toggle_near: Callable[[], None],
+        near_label: str = "Perto de mim",
+        is_dark_mode: bool = False,
+    ):
+        self.on_select = on_select
+        self.on_toggle_near = on_toggle_near
+        self.is_dark_mode = is_dark_mode
+        self.selected: str | None = None
+        self.near = False
+        self._categories: list[str] = []  # sorted, parallel to the category chips
+        self._chips: dict[str | None, ft.Container] = {}  # category -> chip
+
+        # Location chip (toggle, combines with the category chips)
+        self._near_icon = ft.Icon(ft.Icons.PLACE, size=AppTheme.ICON_SIZE_SM)
+        self._near_text = ft.Text(near_label, size=AppTheme.FONT_SIZE_SMALL)
+        self._near_chip = self._chip(
+            ft.Row([self._near_icon, self._near_text], spacing=AppTheme.SPACING_XS, tight=True),
+            on_click=lambda _e: self.on_toggle_near(),
+            tooltip="Perto de mim",
+        )
+        self._style_near()
+
+        # "Todos" chip (always first after the location chip)
+        self._chips[None] = self._category_chip(None, "Todos")
+        self.view = ft.ListView(
+            controls=[self._near_chip, self._chips[None]],
+            horizontal=True,
+            height=CHIP_BAR_HEIGHT,
+            spacing=AppTheme.SPACING_SM,
+        )
+        self._fixed = len(self.view.controls)
+        self.add_categories(categories)
+
+    # ------------------------------------------------------------ chips
+
+    def _chip(self, content: ft.Control, on_click, tooltip: str | None = None) -> ft.Container:
+        return ft.Container(
+            content=content,
+            padding=ft.padding.symmetric(
+                horizontal=AppTheme.TAG_PADDING_HORIZONTAL,
+                vertical=AppTheme.TAG_PADDING_VERTICAL,
+            ),
+            border_radius=ft.border_radius.all(100),
+            tooltip=tooltip,
+            on_click=on_click,
+            ink=True,
+        )
+
+    def _category_chip(self, category: str | None, label: str) -> ft.Container:
+        chip = self._chip(
+            ft.Text(label, size=AppTheme.FONT_SIZE_SMALL),
+            on_click=lambda _e: self.on_select(category),
+        )
+        self._style(chip, chip.content, selected=category == self.selected)
+        return chip
+
+    def _style(self, chip: ft.Container, text: ft.Text, selected: bool) -> None:
+        text.weight = ft.FontWeight.W_500 if selected else ft.FontWeight.W_400
+        text.color = (
+            "#FFFFFF"
+            if selected
+            else (
+                AppTheme.DARK_TEXT_PRIMARY
+                if self.is_dark_mode
+                else AppTheme.LIGHT_TEXT_PRIMARY
+            )
+        )
+        chip.bgcolor = (
+            AppTheme.PRIMARY_GREEN
+            if selected
+            else (
+                AppTheme.DARK_SURFACE_VARIANT
+                if self.is_dark_mode
+                else AppTheme.LIGHT_SURFACE_VARIANT
+            )
+        )
+        chip.border = ft.border.all(2, AppTheme.PRIMARY_GREEN if selected else "transparent")
+
+    def _style_near(self) -> None:
+        self._style(self._near_chip, self._near_text, self.near)
+        self._near_icon.color = "#FFFFFF" if self.near else AppTheme.PRIMARY_GREEN
+
+    def chip(self, category: str | None) -> ft.Container | None:
+        """Chip of a category (None for "Todos")."""
+        return self._chips.get(category)
+
+    @property
+    def categories(self) -> list[str]:
+        return list(self._categories)
+
+    # ------------------------------------------------------------ updates
+
+    def _send(self, *controls: ft.Control) -> None:
+        try:
+            self.view.page.update(*controls)
+        except RuntimeError:  # not mounted: sent with the page
+            pass
+
+    def select(self, category: str | None) -> None:
+        """Mark ``category`` as selected (restyles the old and new chip only)."""
+        previous, self.selected = self.selected, category
+        if previous == category:
+            return
+        changed = []
+        for key, selected in ((previous, False), (category, True)):
+            chip = self._chips.get(key)
+            if chip is not None:
+                self._style(chip, chip.content, selected)
+                changed.append(chip)
+        if changed:
+            self._send(*changed)
+
+    def set_near(self, active: bool) -> None:
+        """Show the location filter as on or off."""
+        if self.near != active:
+            self.near = active
+            self._style_near()
+            self._send(self._near_chip)
+
+    def add_categories(self, categories: Iterable[str]) -> int:
+        """Insert chips for categories not shown yet; returns how many."""
+        new = sorted(set(categories).difference(self._chips))
+        for category in new:
+            at = bisect.bisect_left(self._categories, category)
+            self._categories.insert(at, category)
+            self._chips[category] = chip = self._category_chip(category, category.capitalize())
+            self.view.controls.insert(self._fixed + at, chip)
+        if new:
+            self._send(self.view)
+        return len(new)
@@ -3,8 +3,11 @@
 Provides consistent bottom navigation across dashboard and profile pages.
 """
 
+import asyncio
+
 import flet as ft
 from .new_post_dialog import open_new_post_dialog
+from ..view_cache import on_view_restored, show_view
 from mock.notifications import get_mock_notifications_count
 from ..theme import AppTheme
 
@@ -31,43 +34,91 @@ def create_nav_bar(
     """
 
     def on_nav_change(e):
-        """Handle navigation between pages."""
+        """Handle navigation between pages.
+
+        Visited tabs are kept alive by the view cache: switching back
+        restores the built page (results, scroll position) instead of
+        rebuilding it.
+        """
         selected = e.control.selected_index
+        # This bar stays with its (cached) page: keep it on that page's tab
+        e.control.selected_index = selected_index
+        e.control.update()
 
         if selected == 0:  # Início
             from ..pages.dashboard import dashboard
 
-            page.clean()
-            dashboard(page, is_dark_mode)
+            show_view(page, ("dashboard", is_dark_mode), lambda: dashboard(page, is_dark_mode))
         elif selected == 1:  # Novo
             # Open new post dialog directly without navigation
             open_new_post_dialog(page, is_dark_mode)
         elif selected == 2:  # Perfil
             from ..pages.perfil import perfil
 
-            page.clean()
-            perfil(page, is_dark_mode)
+            show_view(page, ("perfil", is_dark_mode), lambda: perfil(page, is_dark_mode))
         elif selected == 3:  # Buscar
             from ..pages.search import search
 
-            page.clean()
-            search(page, is_dark_mode)
+            show_view(page, ("search", is_dark_mode), lambda: search(page, is_dark_mode))
         elif selected == 4:  # Notificações
             from ..pages.notifications import notifications
 
-            page.clean()
-            notifications(page, is_dark_mode)
+            show_view(
+                page,
+                ("notifications", is_dark_mode),
+                lambda: notifications(page, is_dark_mode),
+            )
         elif selected == 5:  # Configurações
             from ..pages.configurations import configurations
 
-            page.clean()
-            configurations(page, is_dark_mode)
+            show_view(
+                page,
+                ("configurations", is_dark_mode),
+                lambda: configurations(page, is_dark_mode),
+            )
 
     # Get notifications count for badge
     notifications_count = get_mock_notifications_count()
+    nav_bar = ft.NavigationBar(
+        selected_index=selected_index,
+        on_change=on_nav_change,
+        destinations=[
+            ft.NavigationBarDestination(icon=ft.Icons.HOME, label="Início"),
+            ft.NavigationBarDestination(icon=ft.Icons.ADD_BOX, label="Novo"),
+            ft.NavigationBarDestination(icon=ft.Icons.PERSON, label="Perfil"),
+            ft.NavigationBarDestination(icon=ft.Icons.SEARCH, label="Buscar"),
+            ft.NavigationBarDestination(
+                icon=_notifications_icon(notifications_count), label="Notificações"
+            ),
+            ft.NavigationBarDestination(
+                icon=ft.Icons.SETTINGS_OUTLINED, label="Configurações"
+            ),
+        ],
+        bgcolor=AppTheme.DARK_SURFACE if is_dark_mode else AppTheme.LIGHT_SURFACE,
+        indicator_color=AppTheme.PRIMARY_GREEN,
+        label_behavior=ft.NavigationBarLabelBehavior.ALWAYS_SHOW,
+    )
 
-    # Create notifications icon with badge using Stack
-    NOTIFICATIONS_ICON = ft.Stack(
+    async def refresh_badge():
+        """Re-read the unread count when the page is restored from the cache."""
+        nonlocal notifications_count
+        count = await asyncio.to_thread(get_mock_notifications_count)
+        if count == notifications_count:
+            return
+        notifications_count = count
+        nav_bar.destinations[4].icon = _notifications_icon(count)
+        try:
+            nav_bar.update()
+        except RuntimeError:  # page switched again meanwhile
+            pass
+
+    on_view_restored(page, refresh_badge)
+    return nav_bar
+
+
+def _notifications_icon(notifications_count: int) -> ft.Control:
+    """Notifications icon with the unread-count badge."""
+    return ft.Stack(
         [
             ft.Icon(ft.Icons.NOTIFICATIONS_OUTLINED),
             (
@@ -95,21 +146,3 @@ def create_nav_bar(
         width=AppTheme.BADGE_SIZE,
         height=AppTheme.BADGE_SIZE,
     )
-
-    return ft.NavigationBar(
-        selected_index=selected_index,
-        on_change=on_nav_change,
-        destinations=[
-            ft.NavigationBarDestination(icon=ft.Icons.HOME, label="Início"),
-            ft.NavigationBarDestination(icon=ft.Icons.ADD_BOX, label="Novo"),
-            ft.NavigationBarDestination(icon=ft.Icons.PERSON, label="Perfil"),
-            ft.NavigationBarDestination(icon=ft.Icons.SEARCH, label="Buscar"),
-            ft.NavigationBarDestination(icon=NOTIFICATIONS_ICON, label="Notificações"),
-            ft.NavigationBarDestination(
-                icon=ft.Icons.SETTINGS_OUTLINED, label="Configurações"
-            ),
-        ],
-        bgcolor=AppTheme.DARK_SURFACE if is_dark_mode else AppTheme.LIGHT_SURFACE,
-        indicator_color=AppTheme.PRIMARY_GREEN,
-        label_behavior=ft.NavigationBarLabelBehavior.ALWAYS_SHOW,
-    )
@@ -5,6 +5,9 @@ Used by both dashboard and profile pages when clicking "Novo" button.
 
 import flet as ft
 from ..theme import AppTheme
+from ..search_cache import get_search_cache
+from backend.services.image_hash_service import get_duplicate_detector
+from backend.services.thumbnail_service import get_thumbnail_pipeline
 
 
 def open_new_post_dialog(page: ft.Page, is_dark_mode: bool = False):
@@ -43,9 +46,24 @@ def open_new_post_dialog(page: ft.Page, is_dark_mode: bool = False):
         except Exception:
             pass
 
-    def add_photos_placeholder(_):
-        # Placeholder for future photo upload functionality
-        photo_status.value = "📸 Função de adicionar fotos em breve..."
+    # Local paths of the photos chosen for this post
+    selected_photos: list[str] = []
+
+    async def add_photos(_):
+        picker = ft.FilePicker()
+        page.services.append(picker)
+        try:
+            files = await picker.pick_files(
+                file_type=ft.FilePickerFileType.IMAGE, allow_multiple=True
+            )
+        finally:
+            page.services.remove(picker)
+        selected_photos[:] = [f.path for f in files or [] if f.path]
+        photo_status.value = (
+            f"📸 {len(selected_photos)} foto(s) selecionada(s)"
+            if selected_photos
+            else ""
+        )
         photo_status.color = (
             AppTheme.DARK_TEXT_SECONDARY
             if is_dark_mode
@@ -54,8 +72,28 @@ def open_new_post_dialog(page: ft.Page, is_dark_mode: bool = False):
         page.update()
 
     def submit_post(_):
-        # Placeholder for post creation logic
+        # Anti-fraud: reject photos that are near-duplicates (pHash distance
+        # <= 6) of images already published or of each other
+        detector = get_duplicate_detector()
+        try:
+            # Until posts are persisted, the index size stands in for the listing id
+            duplicates = detector.register_post(selected_photos, item_id=len(detector.index))
+        except OSError:  # missing file, or not an image (UnidentifiedImageError)
+            status_text.value = "Não foi possível ler uma das fotos selecionadas."
+            status_text.color = AppTheme.ERROR
+            page.update()
+            return
+        if duplicates:
+            status_text.value = "Foto repetida ou já publicada anteriormente."
+            status_text.color = AppTheme.WARNING
+            page.update()
+            return
+        # Grid/card/detail variants are rendered in the background
+        get_thumbnail_pipeline().schedule(selected_photos)
+
         # Future: Send to backend API
+        # The new post can show up in any search: drop cached results
+        get_search_cache(page).invalidate()
         status_text.value = "Post criado com sucesso! ✓"
         status_text.color = AppTheme.SUCCESS
         page.update()
@@ -87,7 +125,7 @@ def open_new_post_dialog(page: ft.Page, is_dark_mode: bool = False):
         max_lines=5,
     )
 
-    # Photo upload placeholder
+    # Photo picker status (number of photos selected)
     photo_status = ft.Text("", size=AppTheme.FONT_SIZE_CAPTION, italic=True)
 
     add_photos_button = ft.Container(
@@ -109,7 +147,7 @@ def open_new_post_dialog(page: ft.Page, is_dark_mode: bool = False):
             horizontal_alignment=ft.CrossAxisAlignment.CENTER,
             spacing=AppTheme.SPACING_SM,
         ),
-        on_click=add_photos_placeholder,
+        on_click=add_photos,
         border=ft.border.all(AppTheme.BORDER_WIDTH_STANDARD, AppTheme.PRIMARY_GREEN),
         border_radius=AppTheme.CARD_BORDER_RADIUS,
         padding=AppTheme.DIALOG_INSET_PADDING,  # Use standardized dialog padding
@@ -13,6 +13,7 @@ Follows the same pattern as new_post_dialog.py for consistency.
 import flet as ft
 from typing import Callable
 from ..theme import AppTheme
+from backend.services.thumbnail_service import resolve_variant
 
 
 def open_notification_detail_dialog(
@@ -233,7 +234,11 @@ def open_notification_detail_dialog(
             related_widgets.append(
                 ft.Container(
                     content=ft.Image(
-                        src=related_image,
+                        src=resolve_variant(
+                            related_image,
+                            responsive_image_width,
+                            AppTheme.DIALOG_RELATED_IMAGE_HEIGHT,
+                        ),
                         width=responsive_image_width,
                         height=AppTheme.DIALOG_RELATED_IMAGE_HEIGHT,
                         fit=ft.BoxFit.COVER,
@@ -0,0 +1,376 @@
+"""Persistent photo grid for the Explorar page.
+
+The grid, its status panel (loading / empty) and the "Carregar mais" footer
+are built once and then mutated in place: a new search replaces the tiles,
+"load more" appends only the new page's tiles, a background refresh
+(``patch``) rebuilds only the tiles whose post changed, and toggling the
+loading state restyles the footer alone. Flet sends each ``update()`` as a
+diff of the control tree, so loading page 20 sends ``page_size`` tiles, not
+all the tiles accumulated so far.
+
+Keyboard focus is kept as a post index rather than a tile position: moving
+it restyles only the previous and the new tile, in one batched update, and
+tiles built later (appended or patched in) pick the focus style up.
+
+Use from page-level modules:
+
+    grid = PhotoGrid(on_click, on_hover, on_load_more, columns=3)
+    grid.set_posts(result["posts"], result["has_more"])
+    grid.append(next_page["posts"], next_page["has_more"])
+"""
+
+from __future__ import annotations
+
+from typing import Any, Callable
+
+import flet as ft
+
+from ..theme import AppTheme
+from backend.services.thumbnail_service import resolve_variant
+
+# Grid tiles are at most 150px: load the "grid" variant
+TILE_EXTENT = 150
+
+
+def _focus_style(tile: ft.Container) -> None:
+    """Keyboard focus: hover scale plus a green border and glow."""
+    tile.scale = AppTheme.PHOTO_HOVER_SCALE
+    tile.shadow = ft.BoxShadow(
+        spread_radius=AppTheme.PHOTO_HOVER_SHADOW_SPREAD + 1,
+        blur_radius=AppTheme.PHOTO_HOVER_SHADOW_BLUR + 2,
+        color=AppTheme.PRIMARY_GREEN + "60",  # Green with 60% opacity
+        offset=ft.Offset(0, AppTheme.PHOTO_HOVER_SHADOW_OFFSET_Y),
+    )
+    tile.border = ft.border.all(AppTheme.BORDER_WIDTH_STANDARD, AppTheme.PRIMARY_GREEN)
+
+
+def _default_style(tile: ft.Container) -> None:
+    tile.scale = 1.0
+    tile.shadow = ft.BoxShadow(
+        spread_radius=0,
+        blur_radius=0,
+        color=AppTheme.PHOTO_DEFAULT_SHADOW_COLOR,
+        offset=ft.Offset(0, 0),
+    )
+    tile.border = None
+
+
+def _refresh(*controls: ft.Control) -> None:
+    """Update mounted controls (before ``page.add`` they are sent whole)."""
+    for control in controls:
+        try:
+            control.update()
+        except RuntimeError:
+            pass
+
+
+class PhotoGrid:
+    """``ft.GridView`` of post photos with a status panel and a footer.
+
+    Parameters
+    ----------
+    on_click, on_hover : Callable
+        Tile handlers; ``e.control.data`` is the post index.
+    on_load_more : Callable
+        Called by the footer button (not while a page is loading).
+    columns : int
+        Initial number of columns.
+    is_dark_mode : bool
+        Whether to apply dark theme styling.
+    """
+
+    def __init__(
+        self,
+        on_click: Callable,
+        on_hover: Callable,
+        on_load_more: Callable[[], Any],
+        columns: int = 3,
+        is_dark_mode: bool = False,
+    ):
+        self.on_click = on_click
+        self.on_hover = on_hover
+        self.on_load_more = on_load_more
+        self.is_dark_mode = is_dark_mode
+        self.posts: list[dict[str, Any]] = []
+        self.tiles: list[ft.Container] = []  # photo tiles, in grid order
+        self._tile_at: dict[int, ft.Container] = {}  # post index -> tile
+        self.focused = -1  # post index with keyboard focus (-1 = none)
+        self.has_more = False
+        self.is_loading_more = False
+
+        secondary = AppTheme.DARK_TEXT_SECONDARY if is_dark_mode else AppTheme.LIGHT_TEXT_SECONDARY
+        tertiary = AppTheme.DARK_TEXT_TERTIARY if is_dark_mode else AppTheme.LIGHT_TEXT_TERTIARY
+        primary = AppTheme.DARK_TEXT_PRIMARY if is_dark_mode else AppTheme.LIGHT_TEXT_PRIMARY
+
+        # Loading state: centered spinner
+        self._loading = ft.Column(
+            [
+                ft.ProgressRing(
+                    width=AppTheme.ICON_SIZE_XL * 2,
+                    height=AppTheme.ICON_SIZE_XL * 2,
+                    stroke_width=4,
+                    color=AppTheme.PRIMARY_GREEN,
+                ),
+                ft.Container(height=AppTheme.SPACING_MD),
+                ft.Text(
+                    "Buscando publicações...",
+                    size=AppTheme.FONT_SIZE_BODY,
+                    color=secondary,
+                ),
+            ],
+            horizontal_alignment=ft.CrossAxisAlignment.CENTER,
+            alignment=ft.MainAxisAlignment.CENTER,
+        )
+        # Empty state: no results found
+        self._empty = ft.Column(
+            [
+                ft.Icon(ft.Icons.IMAGE_SEARCH, size=AppTheme.ICON_SIZE_XL * 2, color=tertiary),
+                ft.Container(height=AppTheme.SPACING_MD),
+                ft.Text(
+                    "Nenhuma publicação encontrada",
+                    size=AppTheme.FONT_SIZE_SUBTITLE,
+                    weight=AppTheme.FONT_WEIGHT_MEDIUM,
+                    color=primary,
+                ),
+                ft.Container(height=AppTheme.SPACING_XS),
+                ft.Text(
+                    "Tente outra busca ou explore sem filtros",
+                    size=AppTheme.FONT_SIZE_BODY,
+                    color=secondary,
+                    text_align=ft.TextAlign.CENTER,
+                ),
+            ],
+            horizontal_alignment=ft.CrossAxisAlignment.CENTER,
+            alignment=ft.MainAxisAlignment.CENTER,
+        )
+        self.status = ft.Container(
+            content=self._empty,
+            expand=True,
+            alignment=ft.Alignment.CENTER,
+        )
+
+        self.grid = ft.GridView(
+            controls=[],
+            runs_count=columns,
+            max_extent=TILE_EXTENT,
+            spacing=AppTheme.SPACING_SM,
+            run_spacing=AppTheme.SPACING_SM,
+            expand=True,
+            padding=0,
+            child_aspect_ratio=1.0,  # Keep items square
+            visible=False,
+        )
+
+        # Load More footer: spinner + label restyled in place
+        self._footer_ring = ft.ProgressRing(
+            width=AppTheme.ICON_SIZE_MD,
+            height=AppTheme.ICON_SIZE_MD,
+            stroke_width=2,
+            color=AppTheme.PRIMARY_GREEN,
+            visible=False,
+        )
+        self._footer_text = ft.Text(
+            "Carregar mais",
+            size=AppTheme.FONT_SIZE_BODY,
+            weight=AppTheme.FONT_WEIGHT_MEDIUM,
+            color=AppTheme.PRIMARY_GREEN,
+        )
+        self._secondary = secondary
+        self.footer = ft.Container(
+            content=ft.Container(
+                content=ft.Row(
+                    [self._footer_ring, self._footer_text],
+                    alignment=ft.MainAxisAlignment.CENTER,
+                    spacing=AppTheme.SPACING_SM,
+                ),
+                padding=AppTheme.SPACING_MD,
+                border_radius=ft.border_radius.all(AppTheme.CARD_BORDER_RADIUS),
+                border=ft.border.all(1, AppTheme.PRIMARY_GREEN),
+                bgcolor="transparent",
+                ink=True,
+                on_click=self._on_footer_click,
+            ),
+            alignment=ft.Alignment.CENTER,
+            padding=ft.padding.symmetric(vertical=AppTheme.SPACING_MD),
+            visible=False,
+        )
+
+        self.view = ft.Column(
+            controls=[self.status, self.grid, self.footer],
+            spacing=0,
+            expand=True,
+        )
+
+    # ------------------------------------------------------------ tiles
+
+    def _build_tile(self, post: dict[str, Any], index: int) -> ft.Container:
+        # Create accessible description for screen readers
+        alt_text = f"{post.get('post_title', 'Publicação')} por {post.get('author_name', 'Usuário')}"
+        tile = ft.Container(
+            content=ft.Image(
+                src=resolve_variant(post["image_path"], TILE_EXTENT, TILE_EXTENT),
+                fit=ft.BoxFit.COVER,
+                border_radius=ft.border_radius.all(AppTheme.SPACING_XS),
+                gapless_playback=True,  # Enable image caching
+                tooltip=alt_text,  # Hover tooltip for accessibility
+                semantics_label=alt_text,  # Screen reader description
+                error_content=ft.Icon(
+                    ft.Icons.BROKEN_IMAGE,
+                    size=AppTheme.ICON_SIZE_XL,
+                    color=(
+                        AppTheme.DARK_TEXT_TERTIARY
+                        if self.is_dark_mode
+                        else AppTheme.LIGHT_TEXT_TERTIARY
+                    ),
+                ),
+            ),
+            bgcolor=(
+                AppTheme.DARK_SURFACE_VARIANT
+                if self.is_dark_mode
+                else AppTheme.LIGHT_SURFACE_VARIANT
+            ),
+            border_radius=ft.border_radius.all(AppTheme.SPACING_XS),
+            ink=True,
+            on_click=self.on_click,
+            on_hover=self.on_hover,
+            data=index,  # Post index for click and navigation
+            aspect_ratio=1.0,
+            animate_scale=ft.Animation(
+                AppTheme.ANIMATION_DURATION_FAST,
+                ft.AnimationCurve.EASE_OUT,
+            ),
+        )
+        (_focus_style if index == self.focused else _default_style)(tile)
+        self._tile_at[index] = tile
+        return tile
+
+    def _add_tiles(self, posts: list[dict[str, Any]]) -> None:
+        start = len(self.posts)
+        self.posts.extend(posts)
+        new = [
+            self._build_tile(post, start + i)
+            for i, post in enumerate(posts)
+            if post.get("image_path")
+        ]
+        self.tiles.extend(new)
+        self.grid.controls.extend(new)
+
+    # ------------------------------------------------------------ states
+
+    def _show(self) -> None:
+        has_tiles = bool(self.posts)
+        self.status.content = self._empty
+        self.status.visible = not has_tiles
+        self.grid.visible = has_tiles
+        self.footer.visible = has_tiles and self.has_more
+
+    def show_loading(self) -> None:
+        """Replace the grid with the centered spinner (a new search started)."""
+        self.status.content = self._loading
+        self.status.visible = True
+        self.grid.visible = False
+        self.footer.visible = False
+        _refresh(self.view)
+
+    def set_posts(self, posts: list[dict[str, Any]], has_more: bool) -> None:
+        """Show the first page of a new search."""
+        self.posts = []
+        self.tiles = []
+        self._tile_at = {}
+        self.focused = -1
+        self.grid.controls = []
+        self.has_more = has_more
+        self.is_loading_more = False
+        self._add_tiles(posts)
+        self._style_footer()
+        self._show()
+        _refresh(self.view)
+
+    def append(self, posts: list[dict[str, Any]], has_more: bool) -> None:
+        """Add the next page's tiles after the current ones."""
+        self.has_more = has_more
+        self.is_loading_more = False
+        self._add_tiles(posts)
+        self._style_footer()
+        self._show()
+        _refresh(self.view)
+
+    def patch(self, posts: list[dict[str, Any]], has_more: bool) -> int:
+        """Replace the shown posts, rebuilding only tiles whose post changed.
+
+        Returns the number of tiles built.
+        """
+        old_posts = self.posts
+        old_tiles, self._tile_at = self._tile_at, {}
+        tiles, built = [], 0
+        for index, post in enumerate(posts):
+            if not post.get("image_path"):
+                continue
+            tile = old_tiles.get(index)
+            if tile is None or index >= len(old_posts) or old_posts[index] != post:
+                tile = self._build_tile(post, index)
+                built += 1
+            self._tile_at[index] = tile
+            tiles.append(tile)
+        self.posts = list(posts)
+        self.tiles = tiles
+        if self.focused >= len(posts):
+            self.focused = -1
+        if built or len(self.grid.controls) != len(tiles):
+            self.grid.controls = list(tiles)
+        self.has_more = has_more
+        self.is_loading_more = False
+        self._style_footer()
+        self._show()
+        _refresh(self.view)
+        return built
+
+    def tile(self, index: int) -> ft.Container | None:
+        """Tile of the post at ``index`` (None for posts without a photo)."""
+        return self._tile_at.get(index)
+
+    def focus(self, index: int) -> None:
+        """Move keyboard focus to the post at ``index`` (-1 clears it).
+
+        Only the previously and the newly focused tiles are restyled, and
+        both go out in a single update.
+        """
+        changed = []
+        previous, self.focused = self.focused, index
+        if previous != index:
+            tile = self._tile_at.get(previous)
+            if tile is not None:
+                _default_style(tile)
+                changed.append(tile)
+        tile = self._tile_at.get(index)
+        if tile is not None:
+            _focus_style(tile)
+            changed.append(tile)
+        if changed:
+            try:
+                self.view.page.update(*changed)
+            except RuntimeError:  # not mounted: styles go out with the page
+                pass
+
+    def set_loading_more(self, loading: bool) -> None:
+        """Toggle the footer's "Carregando..." state."""
+        self.is_loading_more = loading
+        self._style_footer()
+        _refresh(self.footer)
+
+    def set_columns(self, columns: int) -> bool:
+        """Change the column count; True if it changed."""
+        if self.grid.runs_count == columns:
+            return False
+        self.grid.runs_count = columns
+        return True
+
+    def _style_footer(self) -> None:
+        loading = self.is_loading_more
+        self._footer_ring.visible = loading
+        self._footer_text.value = "Carregando..." if loading else "Carregar mais"
+        self._footer_text.color = self._secondary if loading else AppTheme.PRIMARY_GREEN
+
+    def _on_footer_click(self, _e) -> None:
+        if not self.is_loading_more:
+            self.on_load_more()
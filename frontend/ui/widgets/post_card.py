@@ -8,6 +8,7 @@ from __future__ import annotations
 import flet as ft
 from typing import List
 from ..theme import AppTheme
+from backend.services.thumbnail_service import resolve_variant
 
 def PostCard(
     author_name: str,
@@ -87,7 +88,9 @@ def PostCard(
     if image_path:
         image_container = ft.Container(
             content=ft.Image(
-                src=image_path,
+                src=resolve_variant(
+                    image_path, card_width - 30, AppTheme.POST_IMAGE_HEIGHT
+                ),
                 width=card_width - 30,  # Account for card padding
                 height=AppTheme.POST_IMAGE_HEIGHT,
                 fit=ft.BoxFit.COVER,
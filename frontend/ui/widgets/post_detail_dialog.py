@@ -6,6 +6,7 @@ Displays full post information in a modal dialog:
 - Full description
 - Tags
 - Post date
+- "Publicações parecidas" (TF-IDF neighbors, opens the chosen post)
 - Close button
 
 Follows the same pattern as notification_detail_dialog.py for consistency.
@@ -14,6 +15,8 @@ Designed for use in search page and other post discovery flows.
 
 import flet as ft
 from ..theme import AppTheme
+from backend.services.thumbnail_service import resolve_variant
+from mock.posts import get_similar_posts
 
 
 def open_post_detail_dialog(
@@ -157,7 +160,9 @@ def open_post_detail_dialog(
 
         image_section = ft.Container(
             content=ft.Image(
-                src=image_path,
+                src=resolve_variant(
+                    image_path, responsive_image_width, AppTheme.DIALOG_IMAGE_HEIGHT
+                ),
                 width=responsive_image_width,
                 fit=ft.BoxFit.COVER,
                 border_radius=ft.border_radius.all(AppTheme.CARD_BORDER_RADIUS),
@@ -230,6 +235,65 @@ def open_post_detail_dialog(
             padding=ft.padding.only(bottom=AppTheme.DIALOG_CONTENT_PADDING),
         )
 
+    # Similar posts section (precomputed neighbor lists: constant-time lookup)
+    similar_section = None
+    similar_posts = get_similar_posts(post_data)
+    if similar_posts:
+
+        def open_similar(similar_post: dict):
+            close_dialog(None)
+            open_post_detail_dialog(page, similar_post, is_dark_mode)
+
+        similar_section = ft.Column(
+            controls=[
+                AppTheme.get_divider(is_dark_mode),
+                ft.Text(
+                    "Publicações parecidas",
+                    size=AppTheme.FONT_SIZE_CAPTION,
+                    weight=AppTheme.FONT_WEIGHT_MEDIUM,
+                    color=(
+                        AppTheme.DARK_TEXT_SECONDARY
+                        if is_dark_mode
+                        else AppTheme.LIGHT_TEXT_SECONDARY
+                    ),
+                ),
+                *[
+                    ft.ListTile(
+                        leading=ft.CircleAvatar(
+                            bgcolor=similar.get("avatar_bg", AppTheme.DEFAULT_AVATAR_BG),
+                            content=ft.Text(
+                                similar.get("avatar_text", "?"),
+                                color=AppTheme.TEXT_ON_COLORED_BG,
+                            ),
+                            radius=AppTheme.AVATAR_RADIUS_SMALL,
+                        ),
+                        title=ft.Text(
+                            similar.get("post_title", ""),
+                            size=AppTheme.FONT_SIZE_BODY,
+                            color=(
+                                AppTheme.DARK_TEXT_PRIMARY
+                                if is_dark_mode
+                                else AppTheme.LIGHT_TEXT_PRIMARY
+                            ),
+                        ),
+                        subtitle=ft.Text(
+                            similar.get("author_name", ""),
+                            size=AppTheme.FONT_SIZE_CAPTION,
+                            color=(
+                                AppTheme.DARK_TEXT_TERTIARY
+                                if is_dark_mode
+                                else AppTheme.LIGHT_TEXT_TERTIARY
+                            ),
+                        ),
+                        dense=True,
+                        on_click=lambda _e, sp=similar: open_similar(sp),
+                    )
+                    for similar in similar_posts
+                ],
+            ],
+            spacing=AppTheme.SPACING_XS,
+        )
+
     # Build dialog content widgets
     dialog_content_widgets = [
         author_section,
@@ -244,6 +308,9 @@ def open_post_detail_dialog(
     if tags_section:
         dialog_content_widgets.append(tags_section)
 
+    if similar_section:
+        dialog_content_widgets.append(similar_section)
+
     # Build action buttons - use list of Controls (matches notification dialog pattern)
     action_buttons: list[ft.Control] = [
         AppTheme.get_text_button("Fechar", close_dialog, is_dark_mode),
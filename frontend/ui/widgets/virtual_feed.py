@@ -0,0 +1,374 @@
+"""Virtualized feeds: ListViews that only keep cards near the viewport.
+
+``VirtualFeed`` builds items in chunks of ``chunk_size`` through a
+``build_item(index)`` callback. At most ``max_chunks`` chunks exist as
+controls at any time; the rest of the list is two plain spacers (above and
+below) whose heights stand in for the released cards, so the scrollbar and
+scroll position stay put.
+
+Chunk heights are measured, not guessed: a chunk is first built at the end
+of the list, and the growth of the content height (``max_scroll_extent +
+viewport_dimension``) reported by the next scroll event is its exact height
+(including ``spacing``). Only measured chunks are ever released, and a
+released chunk is replaced by a spacer of exactly that height, so releasing
+or re-building cards never makes the content jump.
+
+``PagedFeed`` makes each chunk one page of a paginated source. Once the
+user comes within ``prefetch_distance`` of either end of the built content,
+the next page is fetched and its cards built in a worker thread, so when the
+scroll reaches it the cards are ready and only have to be spliced in. Only
+``max_pages`` pages of data stay in memory; pages that fall out of that
+window are fetched again if the user scrolls back to them. ``revalidate``
+(e.g. when a cached tab is shown again) refetches the first page; if it
+changed, pages not on screen are forgotten so they are fetched fresh, and a
+feed still at the top is rebuilt from the new data. Cards already on screen
+further down are left alone, so the scroll position never jumps.
+
+Use from page-level modules:
+
+    feed = PagedFeed(lambda n: get_paginated_posts(page=n), build_card)
+    page.add(ft.Column([feed.view, nav], expand=True))
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections import OrderedDict
+from typing import Any, Callable
+
+import flet as ft
+
+from ..theme import AppTheme
+
+
+class VirtualFeed:
+    """Chunked, windowed ``ft.ListView``.
+
+    Parameters
+    ----------
+    item_count : int
+        Number of items in the feed.
+    build_item : Callable[[int], ft.Control]
+        Builds the control of one item (called again if it is re-shown).
+    chunk_size : int
+        Items built or released together.
+    max_chunks : int
+        Chunks kept as live controls.
+    threshold : float
+        Distance in pixels from the end of the built content at which the
+        next chunk (up or down) is built.
+    footer : ft.Control | None
+        Fixed-height control kept after the last item (e.g. a spinner).
+    """
+
+    def __init__(
+        self,
+        item_count: int,
+        build_item: Callable[[int], ft.Control],
+        chunk_size: int = 10,
+        max_chunks: int = 4,
+        threshold: float = 1200,
+        spacing: float = AppTheme.SPACING_MD,
+        padding: float = AppTheme.SPACING_MD,
+        footer: ft.Control | None = None,
+    ):
+        self.item_count = item_count
+        self.build_item = build_item
+        self.chunk_size = chunk_size
+        self.max_chunks = max(2, max_chunks)
+        self.threshold = threshold
+
+        self._top = ft.Container(height=0)
+        self._bottom = ft.Container(height=0)
+        self._tail = [self._bottom] if footer is None else [self._bottom, footer]
+        self._lo = 0  # built chunks are [lo, hi)
+        self._hi = 0
+        self._sizes: dict[int, int] = {}  # chunk -> number of controls built
+        self._heights: dict[int, float] = {}  # chunk -> measured height (px)
+        self._pending: tuple[int, float] | None = None  # (chunk, content before)
+        self._last = (0.0, 0.0, 0.0)  # last (pixels, max_extent, viewport)
+
+        fixed = [self._top, *self._tail]
+        # Content height: padding, the fixed controls and the gaps between them
+        self._content = (
+            2 * padding
+            + spacing * (len(fixed) - 1)
+            + sum(control.height or 0 for control in fixed)
+        )
+        self._empty_content = self._content
+        self.view = ft.ListView(
+            controls=fixed,
+            expand=1,
+            spacing=spacing,
+            padding=padding,
+            auto_scroll=False,
+            scroll_interval=50,
+            on_scroll=self._on_scroll,
+        )
+        if self._has_chunk(0):
+            self._append_chunk(self._chunk_controls(0))
+
+    # ------------------------------------------------------------ state
+
+    @property
+    def chunk_count(self) -> int:
+        return -(-self.item_count // self.chunk_size)
+
+    @property
+    def built_range(self) -> range:
+        """Indexes of the items that currently exist as controls."""
+        start = self._lo * self.chunk_size
+        return range(start, start + sum(self._sizes.values()))
+
+    def _has_chunk(self, chunk: int) -> bool:
+        return 0 <= chunk < self.chunk_count
+
+    def _chunk_controls(self, chunk: int) -> list[ft.Control] | None:
+        """Controls of a chunk, or None while they are not available yet."""
+        start = chunk * self.chunk_size
+        stop = min(start + self.chunk_size, self.item_count)
+        return [self.build_item(i) for i in range(start, stop)]
+
+    def _append_chunk(self, built: list[ft.Control]) -> None:
+        chunk = self._hi
+        at = len(self.view.controls) - len(self._tail)
+        self.view.controls[at:at] = built  # before the bottom spacer
+        self._sizes[chunk] = len(built)
+        self._hi += 1
+        if chunk in self._heights:  # re-shown: its height leaves the spacer
+            self._bottom.height -= self._heights[chunk]
+        else:
+            self._pending = (chunk, self._content)
+
+    def _prepend_chunk(self, built: list[ft.Control]) -> None:
+        self._lo -= 1
+        self._top.height -= self._heights[self._lo]
+        self.view.controls[1:1] = built
+        self._sizes[self._lo] = len(built)
+
+    def _release_first(self) -> None:
+        size = self._sizes.pop(self._lo)
+        del self.view.controls[1 : 1 + size]
+        self._top.height += self._heights[self._lo]
+        self._lo += 1
+
+    def _release_last(self) -> None:
+        self._hi -= 1
+        size = self._sizes.pop(self._hi)
+        end = len(self.view.controls) - len(self._tail)
+        del self.view.controls[end - size : end]
+        self._bottom.height += self._heights[self._hi]
+
+    # ------------------------------------------------------------ scrolling
+
+    async def _on_scroll(self, e: ft.OnScrollEvent) -> None:
+        if self.handle_scroll(e.pixels, e.max_scroll_extent, e.viewport_dimension):
+            self._refresh()
+
+    async def restore_scroll(self) -> None:
+        """Scroll back to the last reported offset (after the view is re-shown)."""
+        if self._last[0] > 0:
+            await self.view.scroll_to(offset=self._last[0])
+
+    def _refresh(self) -> None:
+        try:
+            self.view.update()
+        except RuntimeError:  # not mounted yet: page.add sends it whole
+            pass
+
+    def handle_scroll(self, pixels: float, max_extent: float, viewport: float) -> bool:
+        """Build/release chunks for a scroll position; True if controls changed."""
+        self._last = (pixels, max_extent, viewport)
+        if max_extent > 0:  # content overflows: its height is measurable
+            content = max_extent + viewport
+            if self._pending is not None and content > self._pending[1]:
+                chunk, before = self._pending
+                self._heights[chunk] = content - before
+                self._pending = None
+            self._content = content
+
+        if pixels >= max_extent - self.threshold:
+            if not self._has_chunk(self._hi) or self._pending is not None:
+                return False  # end of the feed, or last chunk not measured yet
+            built = self._chunk_controls(self._hi)
+            if built is None:
+                return False
+            self._append_chunk(built)
+            while self._hi - self._lo > self.max_chunks and self._lo in self._heights:
+                self._release_first()
+            return True
+
+        if self._lo > 0 and pixels <= self._top.height + self.threshold:
+            built = self._chunk_controls(self._lo - 1)
+            if built is None:
+                return False
+            self._prepend_chunk(built)
+            while self._hi - self._lo > self.max_chunks and self._pending is None:
+                self._release_last()
+            return True
+        return False
+
+
+class PagedFeed(VirtualFeed):
+    """``VirtualFeed`` over a paginated source, prefetching in the background.
+
+    Parameters
+    ----------
+    fetch_page : Callable[[int], dict[str, Any]]
+        Returns one page (1-indexed) as ``{"posts": [...], "has_more": bool}``,
+        the ``get_paginated_posts`` shape. Runs in a worker thread.
+    build_item : Callable[[dict[str, Any], int], ft.Control]
+        Builds the card of a post given the post and its index in the feed.
+    page_size : int
+        Posts per page; each page is one chunk.
+    max_pages : int
+        Pages of post data kept in memory (at least ``max_chunks``).
+    prefetch_distance : float
+        Distance in pixels from either end of the built content at which
+        the following page is loaded in the background.
+    """
+
+    def __init__(
+        self,
+        fetch_page: Callable[[int], dict[str, Any]],
+        build_item: Callable[[dict[str, Any], int], ft.Control],
+        page_size: int = 10,
+        max_chunks: int = 4,
+        max_pages: int = 6,
+        threshold: float = 1200,
+        prefetch_distance: float = 3000,
+        **kwargs: Any,
+    ):
+        self.fetch_page = fetch_page
+        self.build_post = build_item
+        self.max_pages = max(max_pages, max_chunks)
+        self.prefetch_distance = max(prefetch_distance, threshold)
+        self._pages: OrderedDict[int, list[dict[str, Any]]] = OrderedDict()
+        self._prepared: dict[int, list[ft.Control]] = {}  # built off the UI path
+        self._loading: set[int] = set()
+        self._tasks: set[asyncio.Task] = set()
+        self._known = 0  # pages seen so far
+        self._has_more = True
+        self._spinner = ft.ProgressRing(width=24, height=24, visible=False)
+        footer = ft.Container(content=self._spinner, height=48, alignment=ft.Alignment.CENTER)
+
+        self._lo = self._hi = 0
+        self._store(0, fetch_page(1))  # the first paint needs it anyway
+        super().__init__(
+            item_count=0,
+            build_item=lambda index: self.build_post(self._post(index), index),
+            chunk_size=page_size,
+            max_chunks=max_chunks,
+            threshold=threshold,
+            footer=footer,
+            **kwargs,
+        )
+
+    @property
+    def loaded_pages(self) -> list[int]:
+        """Pages (1-indexed) whose post data is in memory."""
+        return sorted(chunk + 1 for chunk in self._pages)
+
+    # ------------------------------------------------------------ pages
+
+    def _post(self, index: int) -> dict[str, Any]:
+        chunk, offset = divmod(index, self.chunk_size)
+        return self._pages[chunk][offset]
+
+    def _store(self, chunk: int, result: dict[str, Any]) -> None:
+        posts = result.get("posts", [])
+        self._pages[chunk] = posts
+        self._pages.move_to_end(chunk)
+        if chunk >= self._known:
+            self._known = chunk + 1
+            self._has_more = bool(result.get("has_more")) and bool(posts)
+        # Forget the least recently loaded pages that are not on screen
+        for old in list(self._pages):
+            if len(self._pages) <= self.max_pages:
+                break
+            if old != chunk and not self._lo <= old < self._hi:
+                del self._pages[old]
+
+    def _has_chunk(self, chunk: int) -> bool:
+        return 0 <= chunk < self._known or (chunk == self._known and self._has_more)
+
+    def _chunk_controls(self, chunk: int) -> list[ft.Control] | None:
+        built = self._prepared.pop(chunk, None)
+        if built is not None:
+            return built
+        posts = self._pages.get(chunk)
+        if posts is None:
+            self._request(chunk)
+            return None
+        start = chunk * self.chunk_size
+        return [self.build_post(post, start + i) for i, post in enumerate(posts)]
+
+    def _request(self, chunk: int) -> None:
+        if chunk in self._loading or chunk in self._prepared or not self._has_chunk(chunk):
+            return
+        self._loading.add(chunk)
+        if chunk >= self._hi:
+            self._spinner.visible = True
+        task = asyncio.get_running_loop().create_task(self._load(chunk))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    def _fetch_and_build(self, chunk: int) -> tuple[dict[str, Any], list[ft.Control]]:
+        result = self.fetch_page(chunk + 1)
+        start = chunk * self.chunk_size
+        posts = result.get("posts", [])
+        return result, [self.build_post(post, start + i) for i, post in enumerate(posts)]
+
+    async def _load(self, chunk: int) -> None:
+        try:
+            result, built = await asyncio.to_thread(self._fetch_and_build, chunk)
+        finally:
+            self._loading.discard(chunk)
+            self._spinner.visible = any(c >= self._hi for c in self._loading)
+        self._store(chunk, result)
+        if built:
+            self._prepared[chunk] = built
+        # The user may already be waiting at that edge: splice it in now
+        self.handle_scroll(*self._last)
+        self._refresh()
+
+    async def revalidate(self) -> bool:
+        """Refetch the first page; True if the feed had changed."""
+        result = await asyncio.to_thread(self.fetch_page, 1)
+        if result.get("posts", []) == self._pages.get(0):
+            return False
+        for chunk in [c for c in self._pages if not self._lo <= c < self._hi]:
+            del self._pages[chunk]
+        self._prepared.clear()
+        if self._lo == 0 and self._last[0] <= 0:  # at the top: show the new posts
+            self._reset(result)
+            self._refresh()
+        return True
+
+    def _reset(self, first_page: dict[str, Any]) -> None:
+        """Start over from ``first_page`` (the feed is scrolled to the top)."""
+        del self.view.controls[1 : len(self.view.controls) - len(self._tail)]
+        self._top.height = self._bottom.height = 0
+        self._lo = self._hi = 0
+        self._sizes.clear()
+        self._heights.clear()
+        self._pending = None
+        self._content = self._empty_content
+        self._pages.clear()
+        self._known = 0
+        self._store(0, first_page)
+        if self._has_chunk(0):
+            self._append_chunk(self._chunk_controls(0))
+
+    # ------------------------------------------------------------ scrolling
+
+    def handle_scroll(self, pixels: float, max_extent: float, viewport: float) -> bool:
+        changed = super().handle_scroll(pixels, max_extent, viewport)
+        if pixels >= max_extent - self.prefetch_distance and self._hi not in self._pages:
+            self._request(self._hi)
+        if self._lo > 0 and pixels <= self._top.height + self.prefetch_distance:
+            if self._lo - 1 not in self._pages:
+                self._request(self._lo - 1)
+        for chunk in [c for c in self._prepared if c not in (self._lo - 1, self._hi)]:
+            del self._prepared[chunk]  # scrolled away before it was needed
+        return changed
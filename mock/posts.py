@@ -4,14 +4,23 @@ Replace usages of these functions with real API calls when backend is ready.
 """
 
 from __future__ import annotations
+from functools import lru_cache
 from typing import List, Dict, Any
 
+import numpy as np
+
+from backend.services.geo_service import GeoIndex
+from backend.services.matching_service import BarterIndex
+from backend.services.recommendation_service import SimilarPostsIndex
+
+DEFAULT_RADIUS_KM = 25.0
+
 
 def get_mock_posts() -> List[Dict[str, Any]]:
     """Return a list of mock post dictionaries.
 
     Each dict contains keys: author_name, avatar_bg, avatar_text, post_title,
-    post_description, post_date, tags, image_path.
+    post_description, post_date, tags, image_path, latitude, longitude.
     """
     return [
         {
@@ -23,6 +32,8 @@ def get_mock_posts() -> List[Dict[str, Any]]:
             "post_date": "Hoje",
             "tags": ["educação", "música", "tecnologia"],
             "image_path": "frontend/assets/img_placeholder.png",
+            "latitude": -23.5614,
+            "longitude": -46.6559,
         },
         {
             "author_name": "Bruna",
@@ -33,6 +44,8 @@ def get_mock_posts() -> List[Dict[str, Any]]:
             "post_date": "Ontem",
             "tags": ["tecnologia", "transporte", "troca"],
             "image_path": "frontend/assets/img_placeholder.png",
+            "latitude": -23.5329,
+            "longitude": -46.6395,
         },
         {
             "author_name": "Neto",
@@ -43,6 +56,8 @@ def get_mock_posts() -> List[Dict[str, Any]]:
             "post_date": "2 dias atrás",
             "tags": ["serviços", "tecnologia", "educação"],
             "image_path": "frontend/assets/img_placeholder.png",
+            "latitude": -23.5874,
+            "longitude": -46.6576,
         },
         {
             "author_name": "Lia",
@@ -53,6 +68,8 @@ def get_mock_posts() -> List[Dict[str, Any]]:
             "post_date": "3 dias atrás",
             "tags": ["educação", "arte", "digital"],
             "image_path": "frontend/assets/img_placeholder.png",
+            "latitude": -22.9056,
+            "longitude": -47.0608,
         },
         {
             "author_name": "Rafael",
@@ -63,6 +80,8 @@ def get_mock_posts() -> List[Dict[str, Any]]:
             "post_date": "4 dias atrás",
             "tags": ["tecnologia", "escritório", "troca"],
             "image_path": "frontend/assets/img_placeholder.png",
+            "latitude": -23.6236,
+            "longitude": -46.701,
         },
         {
             "author_name": "Sofia",
@@ -73,6 +92,8 @@ def get_mock_posts() -> List[Dict[str, Any]]:
             "post_date": "5 dias atrás",
             "tags": ["serviços", "carreira", "consultoria"],
             "image_path": "frontend/assets/img_placeholder.png",
+            "latitude": -22.9068,
+            "longitude": -43.1729,
         },
         {
             "author_name": "Téo",
@@ -83,6 +104,8 @@ def get_mock_posts() -> List[Dict[str, Any]]:
             "post_date": "1 semana atrás",
             "tags": ["serviços", "tecnologia", "impressão-3d"],
             "image_path": "frontend/assets/img_placeholder.png",
+            "latitude": -23.5505,
+            "longitude": -46.6333,
         },
         {
             "author_name": "Vivi",
@@ -93,6 +116,8 @@ def get_mock_posts() -> List[Dict[str, Any]]:
             "post_date": "1 semana atrás",
             "tags": ["entretenimento", "troca", "colecionáveis"],
             "image_path": "frontend/assets/img_placeholder.png",
+            "latitude": -23.5431,
+            "longitude": -46.727,
         },
         {
             "author_name": "Gui",
@@ -103,6 +128,8 @@ def get_mock_posts() -> List[Dict[str, Any]]:
             "post_date": "2 semanas atrás",
             "tags": ["educação", "programação", "python"],
             "image_path": "frontend/assets/img_placeholder.png",
+            "latitude": -25.4284,
+            "longitude": -49.2733,
         },
         {
             "author_name": "Cami",
@@ -113,6 +140,8 @@ def get_mock_posts() -> List[Dict[str, Any]]:
             "post_date": "2 semanas atrás",
             "tags": ["serviços", "escritório", "organização"],
             "image_path": "frontend/assets/img_placeholder.png",
+            "latitude": -23.6509,
+            "longitude": -46.5303,
         },
         # Additional Diego post (profile feed demonstration)
         {
@@ -124,6 +153,8 @@ def get_mock_posts() -> List[Dict[str, Any]]:
             "post_date": "3 semanas atrás",
             "tags": ["educação", "programação", "troca"],
             "image_path": "frontend/assets/img_placeholder.png",
+            "latitude": -23.5614,
+            "longitude": -46.6559,
         },
         {
             "author_name": "Ana",
@@ -134,6 +165,8 @@ def get_mock_posts() -> List[Dict[str, Any]]:
             "post_date": "4 semanas atrás",
             "tags": ["culinária", "troca", "livros"],
             "image_path": "frontend/assets/img_placeholder.png",
+            "latitude": -23.4538,
+            "longitude": -46.5333,
         },
         {
             "author_name": "Pedro",
@@ -144,6 +177,8 @@ def get_mock_posts() -> List[Dict[str, Any]]:
             "post_date": "1 mês atrás",
             "tags": ["música", "educação", "troca"],
             "image_path": "frontend/assets/img_placeholder.png",
+            "latitude": -22.9099,
+            "longitude": -47.0626,
         },
         {
             "author_name": "Marina",
@@ -154,6 +189,8 @@ def get_mock_posts() -> List[Dict[str, Any]]:
             "post_date": "1 mês atrás",
             "tags": ["fotografia", "tecnologia", "troca"],
             "image_path": "frontend/assets/img_placeholder.png",
+            "latitude": -23.1896,
+            "longitude": -46.8845,
         },
         {
             "author_name": "Lucas",
@@ -164,6 +201,8 @@ def get_mock_posts() -> List[Dict[str, Any]]:
             "post_date": "1 mês atrás",
             "tags": ["serviços", "organização", "consultoria"],
             "image_path": "frontend/assets/img_placeholder.png",
+            "latitude": -23.5489,
+            "longitude": -46.6388,
         },
         {
             "author_name": "Joana",
@@ -174,6 +213,8 @@ def get_mock_posts() -> List[Dict[str, Any]]:
             "post_date": "2 meses atrás",
             "tags": ["entretenimento", "troca", "colecionáveis"],
             "image_path": "frontend/assets/img_placeholder.png",
+            "latitude": -22.9711,
+            "longitude": -43.1822,
         },
         {
             "author_name": "Felipe",
@@ -184,6 +225,20 @@ def get_mock_posts() -> List[Dict[str, Any]]:
             "post_date": "2 meses atrás",
             "tags": ["tecnologia", "acessórios", "troca"],
             "image_path": "frontend/assets/img_placeholder.png",
+            "latitude": -23.567,
+            "longitude": -46.692,
+        },
+        {
+            "author_name": "Marcos",
+            "avatar_bg": "#5D4037",
+            "avatar_text": "M",
+            "post_title": "Troco suporte de notebook",
+            "post_description": "Suporte de notebook ajustável em alumínio por livros de receitas ou aulas de violão para meu filho.",
+            "post_date": "2 meses atrás",
+            "tags": ["tecnologia", "escritório", "troca"],
+            "image_path": "frontend/assets/img_placeholder.png",
+            "latitude": -23.595,
+            "longitude": -46.687,
         },
         {
             "author_name": "Beatriz",
@@ -194,6 +249,8 @@ def get_mock_posts() -> List[Dict[str, Any]]:
             "post_date": "2 meses atrás",
             "tags": ["educação", "idiomas", "troca"],
             "image_path": "frontend/assets/img_placeholder.png",
+            "latitude": -19.9167,
+            "longitude": -43.9345,
         },
         {
             "author_name": "Renato",
@@ -204,6 +261,8 @@ def get_mock_posts() -> List[Dict[str, Any]]:
             "post_date": "3 meses atrás",
             "tags": ["colecionáveis", "entretenimento", "troca"],
             "image_path": "frontend/assets/img_placeholder.png",
+            "latitude": -23.699,
+            "longitude": -46.551,
         },
         {
             "author_name": "Carla",
@@ -214,6 +273,8 @@ def get_mock_posts() -> List[Dict[str, Any]]:
             "post_date": "3 meses atrás",
             "tags": ["serviços", "finanças", "consultoria"],
             "image_path": "frontend/assets/img_placeholder.png",
+            "latitude": -23.5475,
+            "longitude": -46.6361,
         },
         {
             "author_name": "Eduardo",
@@ -224,6 +285,8 @@ def get_mock_posts() -> List[Dict[str, Any]]:
             "post_date": "4 meses atrás",
             "tags": ["infantil", "troca", "brinquedos"],
             "image_path": "frontend/assets/img_placeholder.png",
+            "latitude": -23.9608,
+            "longitude": -46.3336,
         },
     ]
 
@@ -245,6 +308,15 @@ def count_user_posts(author_name: str) -> int:
     return sum(1 for post in posts if post["author_name"] == author_name)
 
 
+@lru_cache(maxsize=1)
+def _category_index() -> tuple[str, ...]:
+    """Sorted unique tags of the mock posts (scanned once)."""
+    categories = set()
+    for post in get_mock_posts():
+        categories.update(post.get("tags", []))
+    return tuple(sorted(categories))
+
+
 def get_unique_categories() -> List[str]:
     """Extract all unique categories/tags from mock posts.
 
@@ -256,11 +328,20 @@ def get_unique_categories() -> List[str]:
     Backend migration:
     - Replace with: GET /api/categories
     """
+    return list(_category_index())
+
+
+@lru_cache(maxsize=1)
+def _geo_index() -> GeoIndex:
+    """Index the mock posts' coordinates (post id = list index)."""
     posts = get_mock_posts()
-    categories = set()
-    for post in posts:
-        categories.update(post.get("tags", []))
-    return sorted(list(categories))
+    index = GeoIndex()
+    index.add_many(
+        range(len(posts)),
+        [post["latitude"] for post in posts],
+        [post["longitude"] for post in posts],
+    )
+    return index
 
 
 def get_paginated_posts(
@@ -268,8 +349,10 @@ def get_paginated_posts(
     page_size: int = 6,
     search_query: str | None = None,
     category_filter: str | None = None,
+    near: tuple[float, float] | None = None,
+    radius_km: float = DEFAULT_RADIUS_KM,
 ) -> Dict[str, Any]:
-    """Get paginated posts with optional search and category filtering.
+    """Get paginated posts with optional search, category and location filtering.
 
     Parameters
     ----------
@@ -281,6 +364,11 @@ def get_paginated_posts(
         Search term to filter by title, description, or tags (None = no search)
     category_filter : str | None
         Category to filter by (matches against tags)
+    near : tuple[float, float] | None
+        ``(latitude, longitude)``; when set, only posts within ``radius_km``
+        are returned, nearest first, each with a ``distance_km`` key
+    radius_km : float
+        Search radius around ``near``
 
     Returns
     -------
@@ -293,16 +381,17 @@ def get_paginated_posts(
         - has_more: Boolean indicating if more pages exist
 
     Backend migration:
-    - Replace with: GET /api/posts?page={page}&size={page_size}&q={search_query}&category={category_filter}
+    - Replace with: GET /api/posts?page={page}&size={page_size}&q={search_query}&category={category_filter}&lat=&lon=&radius_km=
     """
     all_posts = get_mock_posts()
+    matching = list(enumerate(all_posts))
 
     # Apply search filter
     if search_query:
         query_lower = search_query.lower()
-        all_posts = [
-            post
-            for post in all_posts
+        matching = [
+            (post_id, post)
+            for post_id, post in matching
             if query_lower in post["post_title"].lower()
             or query_lower in post["post_description"].lower()
             or any(query_lower in tag.lower() for tag in post.get("tags", []))
@@ -310,16 +399,33 @@ def get_paginated_posts(
 
     # Apply category filter
     if category_filter:
-        all_posts = [
-            post for post in all_posts if category_filter in post.get("tags", [])
+        matching = [
+            (post_id, post)
+            for post_id, post in matching
+            if category_filter in post.get("tags", [])
         ]
 
-    # Calculate pagination
-    total = len(all_posts)
     start_idx = (page - 1) * page_size
     end_idx = start_idx + page_size
 
-    paginated_posts = all_posts[start_idx:end_idx]
+    # Apply location filter: the index keeps only the nearest end_idx posts
+    if near is not None:
+        result = _geo_index().within_radius(
+            near[0],
+            near[1],
+            radius_km,
+            limit=end_idx,
+            allowed=np.array([post_id for post_id, _ in matching], dtype=np.int64),
+        )
+        total = result.total
+        paginated_posts = [
+            dict(all_posts[hit.item_id], distance_km=round(hit.distance_km, 1))
+            for hit in result.hits[start_idx:end_idx]
+        ]
+    else:
+        total = len(matching)
+        paginated_posts = [post for _, post in matching[start_idx:end_idx]]
+
     has_more = end_idx < total
 
     return {
@@ -329,3 +435,94 @@ def get_paginated_posts(
         "page_size": page_size,
         "has_more": has_more,
     }
+
+
+@lru_cache(maxsize=1)
+def _barter_index() -> BarterIndex:
+    """Index the mock posts for matching (post id = list index)."""
+    index = BarterIndex()
+    author_ids: Dict[str, int] = {}
+    for post_id, post in enumerate(get_mock_posts()):
+        author_id = author_ids.setdefault(post["author_name"], len(author_ids))
+        index.add_post(
+            post_id, author_id, post["post_title"], post["post_description"]
+        )
+    return index
+
+
+def get_barter_suggestions(author_name: str, limit: int = 3) -> List[Dict[str, Any]]:
+    """Find complementary offers for each of an author's posts.
+
+    Parameters
+    ----------
+    author_name : str
+        Author whose posts are matched
+    limit : int
+        Maximum direct matches and 3-way cycles per post
+
+    Returns
+    -------
+    List[Dict[str, Any]]
+        One dict per post that has suggestions, with keys:
+        - post: the author's post
+        - matches: posts that want what it offers and offer what it asks for
+        - cycles: (receiver, provider) post pairs; the author gives to the
+          receiver, the receiver gives to the provider, and the provider
+          gives to the author
+
+    Backend migration:
+    - Replace with: GET /api/posts/{post_id}/matches
+    """
+    posts = get_mock_posts()
+    index = _barter_index()
+    suggestions = []
+    for post_id, post in enumerate(posts):
+        if post["author_name"] != author_name:
+            continue
+        matches = [posts[m.post_id] for m in index.matches(post_id, limit)]
+        cycles = [
+            (posts[c.receiver_id], posts[c.provider_id])
+            for c in index.cycles(post_id, limit)
+        ]
+        if matches or cycles:
+            suggestions.append({"post": post, "matches": matches, "cycles": cycles})
+    return suggestions
+
+
+@lru_cache(maxsize=1)
+def _similar_index() -> tuple[SimilarPostsIndex, Dict[tuple[str, str], int]]:
+    """TF-IDF neighbors of the mock posts plus a (author, title) -> id map."""
+    posts = get_mock_posts()
+    index = SimilarPostsIndex(k=6)
+    index.add_many(
+        (post_id, post["post_title"], post["post_description"], post.get("tags", []))
+        for post_id, post in enumerate(posts)
+    )
+    ids = {(post["author_name"], post["post_title"]): i for i, post in enumerate(posts)}
+    return index, ids
+
+
+def get_similar_posts(post: Dict[str, Any], limit: int = 3) -> List[Dict[str, Any]]:
+    """Return posts similar to ``post`` (cached neighbor list, no scoring).
+
+    Parameters
+    ----------
+    post : Dict[str, Any]
+        A post dict as returned by ``get_mock_posts()``
+    limit : int
+        Maximum number of recommendations
+
+    Returns
+    -------
+    List[Dict[str, Any]]
+        Most similar first; empty for unknown posts
+
+    Backend migration:
+    - Replace with: GET /api/posts/{post_id}/similar?limit={limit}
+    """
+    index, ids = _similar_index()
+    post_id = ids.get((post.get("author_name"), post.get("post_title")))
+    if post_id is None:
+        return []
+    posts = get_mock_posts()
+    return [posts[similar.post_id] for similar in index.similar(post_id, limit)]
@@ -4,8 +4,65 @@ Replace usages of these functions with real API calls when backend is ready.
 """
 
 from __future__ import annotations
+from datetime import timedelta
+from functools import lru_cache
 from typing import Dict, Any
 
+from backend.db.base import utcnow
+from backend.services.reputation_service import ReputationAggregate, ReputationPolicy
+
+# (reviewed user, reviewer, rating, days ago)
+_MOCK_REVIEWS = [
+    ("Diego", "Bruna", 5, 3),
+    ("Diego", "Neto", 5, 12),
+    ("Diego", "Marcos", 4, 40),
+    ("Diego", "Ana", 5, 95),
+    ("Diego", "Bruna", 5, 160),
+    ("Diego", "Carla", 3, 400),
+    ("Bruna", "Diego", 5, 3),
+    ("Neto", "Diego", 4, 12),
+]
+# Completed trades per user (+1 reputation point each)
+_MOCK_COMPLETED_TRADES = {"Diego": 7, "Bruna": 3, "Neto": 2}
+
+
+@lru_cache(maxsize=1)
+def _reputation_aggregates() -> Dict[str, ReputationAggregate]:
+    """Fold the mock reviews into running aggregates, as the backend does."""
+    policy = ReputationPolicy()
+    now = utcnow()
+    aggregates: Dict[str, ReputationAggregate] = {}
+    for name, _reviewer, rating, days_ago in _MOCK_REVIEWS:
+        aggregate = aggregates.setdefault(name, ReputationAggregate())
+        policy.add_review(aggregate, rating, now - timedelta(days=days_ago))
+    for name, count in _MOCK_COMPLETED_TRADES.items():
+        aggregates.setdefault(name, ReputationAggregate()).completed_trades = count
+    return aggregates
+
+
+def get_user_reputation(name: str) -> Dict[str, Any]:
+    """Return a user's reputation aggregates (no review scan).
+
+    Returns
+    -------
+    dict
+        Keys: review_count, average, rating (Bayesian-smoothed), recent_rating
+        (older reviews decayed), completed_trades, points
+
+    Backend migration:
+    - Replace with: GET /api/users/{user_id}/reputation
+    """
+    aggregate = _reputation_aggregates().get(name, ReputationAggregate())
+    summary = ReputationPolicy().summarize(0, aggregate)
+    return {
+        "review_count": summary.review_count,
+        "average": summary.average,
+        "rating": summary.rating,
+        "recent_rating": summary.recent_rating,
+        "completed_trades": summary.completed_trades,
+        "points": summary.points,
+    }
+
 
 def get_current_user() -> Dict:
     """Return mock current user data.
@@ -13,7 +70,8 @@ def get_current_user() -> Dict:
     Returns
     -------
     dict
-        Keys: name, email, avatar_text, avatar_bg, bio, reputation
+        Keys: name, email, avatar_text, avatar_bg, bio, reputation, latitude,
+        longitude
     """
     return {
         "name": "Diego",
@@ -21,5 +79,7 @@ def get_current_user() -> Dict:
         "avatar_text": "D",
         "avatar_bg": "#4CAF50",
         "bio": "Apaixonado por música e tecnologia. Sempre em busca de trocas justas e conexões genuínas.",
-        "reputation": 4.8,
+        "reputation": get_user_reputation("Diego")["rating"],
+        "latitude": -23.5614,
+        "longitude": -46.6559,
     }
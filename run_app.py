@@ -9,8 +9,10 @@ Usage:
 """
 
 import flet as ft
+from backend.services.thumbnail_service import get_thumbnail_pipeline
 from frontend.ui.pages.index import index
 from frontend.ui.theme import get_light_theme, get_dark_theme
+from mock.posts import get_mock_posts
 
 
 def main(page: ft.Page):
@@ -18,6 +20,10 @@ def main(page: ft.Page):
     # Set theme to light mode (default)
     page.theme = get_light_theme()
 
+    # Render image variants in the background (existing listing photos first;
+    # no-op after the first session)
+    get_thumbnail_pipeline().start({post["image_path"] for post in get_mock_posts()})
+
     # Launch the app
     index(page, False)
 
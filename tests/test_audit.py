@@ -0,0 +1,83 @@
+"""Audit sink tests: batching, rotation, backpressure and service hooks."""
+
+import asyncio
+
+from backend.core.audit import AuditSink, read_events
+from backend.services.escrow_service import EscrowLedger
+
+
+def test_events_are_batched_compressed_and_rotated(tmp_path):
+    async def scenario():
+        sink = AuditSink(tmp_path, batch_size=100, segment_bytes=2048)
+        sink.start()
+        for i in range(1000):
+            assert sink.record("auth.login", actor_id=i, ip="10.0.0.1", ok=True)
+            if i % 250 == 0:
+                await asyncio.sleep(0)  # let the writer drain part of the queue
+        await sink.close()
+        return sink.metrics
+
+    metrics = asyncio.run(scenario())
+    events = list(read_events(tmp_path))
+    assert [e.actor_id for e in events] == list(range(1000))
+    assert events[0].detail == {"ok": True} and events[0].ip == "10.0.0.1"
+    assert metrics.written == 1000 and metrics.dropped == 0
+    assert metrics.batches < 1000  # events share writes
+    assert len(list(tmp_path.glob("audit-*.jsonl.gz"))) > 1
+    assert not (tmp_path / "current.jsonl.gz").exists()
+    assert 0 < metrics.latency_mean <= metrics.latency_max
+
+
+def test_full_queue_drops_or_waits(tmp_path):
+    async def scenario():
+        sink = AuditSink(tmp_path, queue_size=10)
+        # Writer not started yet: the queue fills up
+        accepted = [sink.record("x", actor_id=i) for i in range(15)]
+        sink.start()
+        await asyncio.wait_for(sink.record_wait("critical", actor_id=99), timeout=5)
+        await sink.close()
+        return accepted, sink.metrics
+
+    accepted, metrics = asyncio.run(scenario())
+    assert accepted == [True] * 10 + [False] * 5
+    assert metrics.dropped == 5
+    assert [e.actor_id for e in read_events(tmp_path)][-1] == 99
+
+
+def test_bad_events_and_write_errors_do_not_stop_the_writer(tmp_path, monkeypatch):
+    async def scenario():
+        sink = AuditSink(tmp_path)
+        sink.start()
+        sink.record("a", actor_id=1)
+        sink.record("bad", actor_id=2, payload=object())  # not JSON-encodable
+        sink.record("b", actor_id=3)
+        await asyncio.wait_for(sink.close(), timeout=5)
+
+        sink.start()
+        monkeypatch.setattr(sink, "_append", lambda payload: 1 / 0)
+        sink.record("lost", actor_id=4)
+        await asyncio.sleep(0.05)
+        monkeypatch.undo()
+        sink.record("c", actor_id=5)  # the writer survived the failed batch
+        await asyncio.wait_for(sink.close(), timeout=5)
+        return sink.metrics
+
+    metrics = asyncio.run(scenario())
+    assert [e.actor_id for e in read_events(tmp_path)] == [1, 3, 5]
+    assert metrics.unencodable == 1 and metrics.write_errors == 1
+
+
+def test_escrow_operations_are_audited(tmp_path):
+    async def scenario():
+        sink = AuditSink(tmp_path / "audit")
+        sink.start()
+        ledger = await EscrowLedger.open(tmp_path / "ledger", audit=sink)
+        await ledger.deposit(1, 10, key="d")
+        await ledger.hold(5, 1, 4, key="h")
+        await ledger.close()
+        await sink.close()
+
+    asyncio.run(scenario())
+    events = list(read_events(tmp_path / "audit"))
+    assert [e.action for e in events] == ["escrow.deposit", "escrow.hold"]
+    assert events[1].detail["trade_id"] == 5
@@ -0,0 +1,124 @@
+"""Auth service tests: pooled hashing, token cache/revocation and TOTP login."""
+
+import asyncio
+import time
+
+import pytest
+
+from backend.core.config import AuthSettings, DatabaseSettings
+from backend.db import create_engine, create_session_factory, init_models
+from backend.services.auth_service import (
+    AuthService,
+    EmailAlreadyRegisteredError,
+    HashParams,
+    InvalidCredentialsError,
+    InvalidTokenError,
+    PasswordHasherPool,
+    TokenManager,
+    totp_code,
+)
+
+# Cheap Argon2 parameters keep the suite fast; production uses HashParams()
+FAST = HashParams(time_cost=1, memory_cost=1024, parallelism=1)
+SETTINGS = AuthSettings(jwt_secret="test-secret-with-enough-length-0123456789")
+
+
+async def _service():
+    engine = create_engine(DatabaseSettings(url="sqlite+aiosqlite:///:memory:"))
+    await init_models(engine)
+    hasher = PasswordHasherPool(max_workers=1, params=FAST)
+    return engine, AuthService(create_session_factory(engine), SETTINGS, hasher)
+
+
+def test_register_login_refresh_logout():
+    async def scenario():
+        engine, auth = await _service()
+        try:
+            user = await auth.register("ana@example.com", "s3nha-forte", "Ana")
+            with pytest.raises(EmailAlreadyRegisteredError):
+                await auth.register("ana@example.com", "outra", "Ana")
+            with pytest.raises(InvalidCredentialsError):
+                await auth.login("ana@example.com", "errada")
+            with pytest.raises(InvalidCredentialsError):
+                await auth.login("nobody@example.com", "s3nha-forte")
+            result = await auth.login("ana@example.com", "s3nha-forte")
+        finally:
+            auth.close()
+            await engine.dispose()
+        return auth, user, result
+
+    auth, user, result = asyncio.run(scenario())
+    assert user.password_hash.startswith("$argon2id$")
+    tokens = result.tokens
+    assert auth.authenticate(tokens.access_token)["sub"] == str(user.id)
+
+    rotated = auth.refresh(tokens.refresh_token)
+    with pytest.raises(InvalidTokenError):
+        auth.refresh(tokens.refresh_token)  # refresh tokens are single-use
+    with pytest.raises(InvalidTokenError):
+        auth.authenticate(rotated.refresh_token)  # wrong token type
+
+    auth.logout(rotated.access_token, rotated.refresh_token)
+    with pytest.raises(InvalidTokenError):
+        auth.authenticate(rotated.access_token)
+
+
+def test_two_factor_login_requires_current_code():
+    async def scenario():
+        engine, auth = await _service()
+        try:
+            user = await auth.register("bia@example.com", "s3nha", "Bia")
+            uri = await auth.enable_2fa(user.id)
+            secret = uri.split("secret=")[1].split("&")[0]
+            # Not active until a code from the new secret is verified
+            before = await auth.login("bia@example.com", "s3nha")
+            wrong = f"{(int(totp_code(secret)) + 500_000) % 1_000_000:06d}"
+            with pytest.raises(InvalidCredentialsError):
+                await auth.verify_2fa(user.id, wrong)
+            await auth.verify_2fa(user.id, totp_code(secret, time.time() - 30))
+
+            pending = await auth.login("bia@example.com", "s3nha")
+            with pytest.raises(InvalidCredentialsError):
+                await auth.login("bia@example.com", "s3nha", totp=wrong)
+            done = await auth.login("bia@example.com", "s3nha", totp=totp_code(secret))
+            with pytest.raises(InvalidCredentialsError):  # replayed code
+                await auth.login("bia@example.com", "s3nha", totp=totp_code(secret))
+
+            # Re-enrolling needs a fresh code from the active secret
+            with pytest.raises(InvalidCredentialsError):
+                await auth.enable_2fa(user.id)
+            with pytest.raises(InvalidCredentialsError):
+                await auth.enable_2fa(user.id, totp_code(secret))  # already used
+            new_uri = await auth.enable_2fa(user.id, totp_code(secret, time.time() + 30))
+            # The old secret stays active until the new one is verified
+            new_secret = new_uri.split("secret=")[1].split("&")[0]
+            with pytest.raises(InvalidCredentialsError):
+                await auth.login("bia@example.com", "s3nha", totp=totp_code(new_secret))
+        finally:
+            auth.close()
+            await engine.dispose()
+        return uri, before, pending, done
+
+    uri, before, pending, done = asyncio.run(scenario())
+    assert uri.startswith("otpauth://totp/Scambo%3Abia%40example.com?")
+    assert before.tokens is not None and not before.mfa_required
+    assert pending.mfa_required and pending.tokens is None
+    assert done.tokens is not None
+
+
+def test_verified_token_cache_is_evicted_on_revoke():
+    manager = TokenManager(SETTINGS)
+    pair = manager.issue(7)
+
+    claims = manager.verify(pair.access_token)
+    assert manager.verify(pair.access_token) is claims  # served from cache
+
+    manager.revoke(pair.access_token)
+    with pytest.raises(InvalidTokenError):
+        manager.verify(pair.access_token)
+
+
+def test_totp_matches_rfc6238_vector():
+    # RFC 6238 appendix B, SHA-1 seed "12345678901234567890", T = 59
+    secret = "GEZDGNBVGY3TQOJQGEZDGNBVGY3TQOJQ"
+    assert totp_code(secret, 59) == "287082"
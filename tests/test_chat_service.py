@@ -0,0 +1,210 @@
+"""Trade chat tests: cursor history, WebSocket fan-out and slow consumers."""
+
+import asyncio
+import json
+import time
+
+from backend.core.config import DatabaseSettings
+from backend.db import create_engine, create_session_factory, init_models, session_scope
+from backend.models import Listing
+from backend.services.chat_service import (
+    CLOSE_POLICY_VIOLATION,
+    CLOSE_TRY_AGAIN_LATER,
+    ChatHub,
+    ChatService,
+    ChatWebSocketApp,
+    Connection,
+)
+from backend.services.db_service import ListingRepository, UserRepository
+from backend.services.trade_service import TradeService
+
+
+async def _setup(tmp_path):
+    engine = create_engine(DatabaseSettings(url=f"sqlite+aiosqlite:///{tmp_path}/c.db"))
+    await init_models(engine)
+    factory = create_session_factory(engine)
+    async with session_scope(factory) as session:
+        owner, proposer, outsider = await UserRepository(session).bulk_insert(
+            [{"name": n, "email": f"{n}@x.com"} for n in ("owner", "proposer", "out")]
+        )
+        listing = await ListingRepository(session).add(Listing(author_id=owner, title="L"))
+    trades = TradeService(factory)
+    trade = await trades.propose(listing.id, proposer)
+    return engine, ChatService(factory, trades), trade.id, (owner, proposer, outsider)
+
+
+class FakeSocket:
+    """Drives one ASGI websocket session from the test."""
+
+    def __init__(self, app, path):
+        self.incoming = asyncio.Queue()
+        self.sent = []
+        self.got_frame = asyncio.Event()
+        self.incoming.put_nowait({"type": "websocket.connect"})
+        path, _, query = path.partition("?")
+        scope = {"type": "websocket", "path": path, "query_string": query.encode()}
+        self.task = asyncio.create_task(app(scope, self.incoming.get, self._send))
+
+    async def _send(self, message):
+        self.sent.append(message)
+        if message["type"] == "websocket.send":
+            self.got_frame.set()
+
+    def frames(self):
+        return [json.loads(m["text"]) for m in self.sent if m["type"] == "websocket.send"]
+
+    async def say(self, text):
+        await self.incoming.put({"type": "websocket.receive", "text": text})
+
+    async def disconnect(self):
+        await self.incoming.put({"type": "websocket.disconnect"})
+        await self.task
+
+
+def test_history_pages_backwards_by_cursor(tmp_path):
+    async def scenario():
+        engine, chat, trade_id, (owner, proposer, _) = await _setup(tmp_path)
+        for i in range(7):
+            await chat.post_message(trade_id, (owner, proposer)[i % 2], f"msg {i}")
+        first = await chat.history(trade_id, owner, limit=3)
+        second = await chat.history(trade_id, owner, limit=3, before_id=first[-1].id)
+        await engine.dispose()
+        return first, second
+
+    first, second = asyncio.run(scenario())
+    assert [m.body for m in first] == ["msg 6", "msg 5", "msg 4"]
+    assert [m.body for m in second] == ["msg 3", "msg 2", "msg 1"]
+
+
+def test_gateway_fans_out_to_both_parties_and_rejects_outsiders(tmp_path):
+    async def scenario():
+        engine, chat, trade_id, (owner, proposer, outsider) = await _setup(tmp_path)
+        app = ChatWebSocketApp(chat, authenticate=int)  # token is the user id here
+        a = FakeSocket(app, f"/ws/trades/{trade_id}?token={owner}")
+        b = FakeSocket(app, f"/ws/trades/{trade_id}?token={proposer}")
+        intruder = FakeSocket(app, f"/ws/trades/{trade_id}?token={outsider}")
+        await intruder.task
+        await asyncio.sleep(0.05)  # both sockets accepted and joined
+
+        await a.say("Olá! Ainda tem a bicicleta?")
+        await asyncio.wait_for(b.got_frame.wait(), timeout=5)
+        late = FakeSocket(app, f"/ws/trades/{trade_id}?token={proposer}&after=0")
+        await asyncio.wait_for(late.got_frame.wait(), timeout=5)
+        for socket in (a, b, late):
+            await socket.disconnect()
+        await engine.dispose()
+        return a, b, late, intruder, chat.hub
+
+    a, b, late, intruder, hub = asyncio.run(scenario())
+    assert intruder.sent == [{"type": "websocket.close", "code": CLOSE_POLICY_VIOLATION}]
+    assert [f["body"] for f in b.frames()] == ["Olá! Ainda tem a bicicleta?"]
+    assert a.frames() == b.frames()  # the sender's other tabs see it too
+    assert late.frames() == b.frames()  # caught up from storage
+    assert hub.connections(1) == 0
+
+
+def test_catch_up_longer_than_the_buffer_is_sent_in_full(tmp_path, monkeypatch):
+    monkeypatch.setattr("backend.services.chat_service.CATCH_UP_PAGE", 3)
+
+    async def scenario():
+        engine, chat, trade_id, (owner, proposer, _) = await _setup(tmp_path)
+        for i in range(8):
+            await chat.post_message(trade_id, owner, f"msg {i}")
+        app = ChatWebSocketApp(chat, authenticate=int, buffer_size=2)
+        late = FakeSocket(app, f"/ws/trades/{trade_id}?token={proposer}&after=0")
+        while len(late.frames()) < 8:
+            await asyncio.sleep(0.01)
+        await chat.post_message(trade_id, owner, "live")
+        while len(late.frames()) < 9:
+            await asyncio.sleep(0.01)
+        await late.disconnect()
+        await engine.dispose()
+        return late
+
+    late = asyncio.run(scenario())
+    assert [f["body"] for f in late.frames()] == [f"msg {i}" for i in range(8)] + ["live"]
+    assert not any(m["type"] == "websocket.close" for m in late.sent)
+
+
+def test_slow_consumer_is_disconnected_without_blocking_others():
+    async def scenario():
+        hub = ChatHub()
+        closed, fast_frames = [], []
+        never = asyncio.Event()
+
+        async def stuck_send(frame):
+            await never.wait()  # client stopped reading
+
+        async def fast_send(frame):
+            fast_frames.append(frame)
+
+        async def record_close(code):
+            closed.append(code)
+
+        slow = Connection(1, stuck_send, record_close, buffer_size=2)
+        fast = Connection(2, fast_send, record_close, buffer_size=2)
+        for connection in (slow, fast):
+            connection.start()
+            hub.join(7, connection)
+        for i in range(6):
+            hub.publish(7, f"{i}".encode())
+            await asyncio.sleep(0)  # fast writer drains between messages
+        await asyncio.sleep(0.01)
+        await fast.aclose()
+        return hub, closed, fast_frames
+
+    hub, closed, fast_frames = asyncio.run(scenario())
+    assert closed == [CLOSE_TRY_AGAIN_LATER]
+    assert hub.metrics.slow_disconnects == 1
+    assert fast_frames == [f"{i}".encode() for i in range(6)]
+
+
+def test_stored_and_live_messages_carry_the_same_time(tmp_path, monkeypatch):
+    monkeypatch.setenv("TZ", "America/Sao_Paulo")
+    time.tzset()
+
+    async def scenario():
+        engine, chat, trade_id, (owner, _, _) = await _setup(tmp_path)
+        live = await chat.post_message(trade_id, owner, "Oi")
+        stored = await chat.history(trade_id, owner)
+        caught_up = await chat.since(trade_id, 0)
+        await engine.dispose()
+        return live, stored, caught_up
+
+    try:
+        live, stored, caught_up = asyncio.run(scenario())
+    finally:
+        monkeypatch.delenv("TZ")
+        time.tzset()
+    assert stored[0].created_at == caught_up[0].created_at == live.created_at
+
+
+def test_malformed_after_is_rejected_before_accept(tmp_path):
+    async def scenario():
+        engine, chat, trade_id, (owner, _, _) = await _setup(tmp_path)
+        app = ChatWebSocketApp(chat, authenticate=int)
+        socket = FakeSocket(app, f"/ws/trades/{trade_id}?token={owner}&after=abc")
+        await socket.task
+        await engine.dispose()
+        return socket
+
+    socket = asyncio.run(scenario())
+    assert socket.sent == [{"type": "websocket.close", "code": CLOSE_POLICY_VIOLATION}]
+
+
+def test_aclose_after_the_writer_died_on_a_gone_peer():
+    async def scenario():
+        async def broken_send(frame):
+            raise ConnectionResetError("peer gone")
+
+        async def close(code):
+            pass
+
+        connection = Connection(1, broken_send, close)
+        connection.start()
+        connection.offer(b"hello")
+        await asyncio.sleep(0.01)  # the writer dies on the send
+        await connection.aclose()
+        return connection
+
+    assert asyncio.run(scenario()).closed
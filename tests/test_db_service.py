@@ -0,0 +1,142 @@
+"""Repository layer tests against in-memory SQLite (aiosqlite)."""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import event
+
+from backend.core.config import DatabaseSettings
+from backend.db import create_engine, create_session_factory, init_models, session_scope
+from backend.services.db_service import (
+    CommentRepository,
+    ListingRepository,
+    NotificationRepository,
+    UserRepository,
+)
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+async def _seed(factory, n_listings=12, comments_per_listing=5):
+    base = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    async with session_scope(factory) as session:
+        users = UserRepository(session)
+        user_ids = await users.bulk_insert(
+            [
+                {"name": f"User {i}", "email": f"u{i}@example.com", "avatar_text": "U"}
+                for i in range(4)
+            ]
+        )
+        listing_ids = await ListingRepository(session).bulk_insert(
+            [
+                {
+                    "author_id": user_ids[i % len(user_ids)],
+                    "title": f"Listing {i}",
+                    "description": "Troco algo",
+                    "created_at": base + timedelta(hours=i),
+                }
+                for i in range(n_listings)
+            ]
+        )
+        await CommentRepository(session).bulk_insert(
+            [
+                {
+                    "listing_id": lid,
+                    "author_id": user_ids[c % len(user_ids)],
+                    "text": f"Comment {c}",
+                    "created_at": base + timedelta(minutes=c),
+                }
+                for lid in listing_ids
+                for c in range(comments_per_listing)
+            ]
+        )
+    return user_ids, listing_ids
+
+
+async def _engine():
+    engine = create_engine(DatabaseSettings(url="sqlite+aiosqlite:///:memory:"))
+    await init_models(engine)
+    return engine, create_session_factory(engine)
+
+
+def test_feed_page_loads_authors_tags_and_previews_in_three_queries():
+    async def scenario():
+        engine, factory = await _engine()
+        await _seed(factory)
+
+        statements = []
+        event.listen(
+            engine.sync_engine,
+            "before_cursor_execute",
+            lambda *args: statements.append(args[2]),
+        )
+        async with factory() as session:
+            page = await ListingRepository(session).feed_page(limit=10)
+        await engine.dispose()
+        return page, statements
+
+    page, statements = run(scenario())
+    assert len(page) == 10
+    assert len(statements) == 3
+    assert page[0].listing.title == "Listing 11"
+    assert page[0].listing.author.name.startswith("User")
+    assert [c.text for c in page[0].comment_previews] == [
+        "Comment 0",
+        "Comment 1",
+        "Comment 2",
+    ]
+    assert page[0].comment_previews[0].author.name.startswith("User")
+    assert page[0].comment_count == 5
+
+
+def test_feed_keyset_pagination_continues_after_cursor():
+    async def scenario():
+        engine, factory = await _engine()
+        await _seed(factory)
+        async with factory() as session:
+            repo = ListingRepository(session)
+            first = await repo.feed_page(limit=5)
+            last = first[-1].listing
+            second = await repo.feed_page(limit=5, before=(last.created_at, last.id))
+        await engine.dispose()
+        return first, second
+
+    first, second = run(scenario())
+    titles = [i.listing.title for i in first + second]
+    assert titles == [f"Listing {i}" for i in range(11, 1, -1)]
+
+
+def test_notifications_unread_count_and_mark_all_read():
+    async def scenario():
+        engine, factory = await _engine()
+        user_ids, _ = await _seed(factory, n_listings=1, comments_per_listing=0)
+        async with session_scope(factory) as session:
+            repo = NotificationRepository(session)
+            await repo.bulk_insert(
+                [
+                    {
+                        "user_id": user_ids[0],
+                        "sender_id": user_ids[1],
+                        "type": "comment",
+                        "message": f"n{i}",
+                        "read": i % 2 == 0,
+                    }
+                    for i in range(6)
+                ]
+            )
+        async with session_scope(factory) as session:
+            repo = NotificationRepository(session)
+            before = await repo.count_unread(user_ids[0])
+            unread = await repo.list_for_user(user_ids[0], unread_only=True)
+            changed = await repo.mark_all_read(user_ids[0])
+            after = await repo.count_unread(user_ids[0])
+        await engine.dispose()
+        return before, unread, changed, after
+
+    before, unread, changed, after = run(scenario())
+    assert before == 3
+    assert len(unread) == 3 and unread[0].sender.name == "User 1"
+    assert changed == 3
+    assert after == 0
@@ -0,0 +1,49 @@
+"""Debounced searches: bursts run once, stale results are dropped."""
+
+import asyncio
+
+from frontend.ui.debounce import Debouncer
+
+
+def test_typing_fifty_characters_runs_one_search():
+    started, completed = [], []
+
+    async def search(generation):
+        started.append(generation)
+        await asyncio.sleep(0.02)  # request latency
+        completed.append(generation)
+
+    async def main():
+        searches = Debouncer(search, delay=0.05)
+        for _ in range(50):  # one keystroke every 10ms
+            searches.schedule()
+            await asyncio.sleep(0.01)
+        await asyncio.sleep(0.2)
+        return searches.generation
+
+    last = asyncio.run(main())
+    assert started == completed == [last]
+
+
+def test_newer_query_cancels_and_outdates_the_running_search():
+    applied, cancelled = [], []
+
+    async def search(generation):
+        try:
+            await asyncio.to_thread(lambda: None)  # uncancellable part
+            await asyncio.sleep(0.05)
+        except asyncio.CancelledError:
+            cancelled.append(generation)
+            raise
+        if searches.is_current(generation):
+            applied.append(generation)
+
+    async def main():
+        first = searches.schedule(delay=0)
+        await asyncio.sleep(0.01)  # first search is in flight
+        second = searches.schedule(delay=0)
+        await asyncio.gather(first, second, return_exceptions=True)
+
+    searches = Debouncer(search)
+    asyncio.run(main())
+    assert cancelled == [1] and applied == [2]
@@ -0,0 +1,230 @@
+"""Escrow ledger tests: holds/releases, idempotency and crash recovery."""
+
+import asyncio
+import multiprocessing
+import os
+
+import pytest
+
+from backend.services.escrow_service import (
+    LOG_NAME,
+    SNAPSHOT_NAME,
+    Balance,
+    EscrowLedger,
+    HoldNotFoundError,
+    IdempotencyConflictError,
+    InsufficientFundsError,
+)
+
+
+async def _seeded(path, **kwargs):
+    ledger = await EscrowLedger.open(path, **kwargs)
+    await ledger.deposit(1, 100, key="dep-1")
+    await ledger.deposit(2, 50, key="dep-2")
+    await ledger.hold(10, 1, 30, key="hold-10")
+    await ledger.hold(11, 2, 20, key="hold-11")
+    await ledger.release(10, 2, key="rel-10")
+    return ledger
+
+
+def _balances(ledger):
+    return ledger.balance(1), ledger.balance(2)
+
+
+EXPECTED = (Balance(available=70, held=0), Balance(available=60, held=20))
+
+
+def test_hold_release_refund_and_validation(tmp_path):
+    async def scenario():
+        ledger = await _seeded(tmp_path)
+        with pytest.raises(InsufficientFundsError):
+            await ledger.hold(12, 2, 1000, key="too-much")
+        with pytest.raises(HoldNotFoundError):
+            await ledger.release(10, 2, key="rel-10-again")
+        after_release = _balances(ledger)
+        await ledger.refund(11, key="ref-11")
+        refunded = ledger.balance(2)
+        await ledger.close()
+        return after_release, refunded
+
+    after_release, refunded = asyncio.run(scenario())
+    assert after_release == EXPECTED
+    assert refunded == Balance(available=80, held=0)
+
+
+def test_idempotency_keys_survive_restart(tmp_path):
+    async def scenario():
+        ledger = await _seeded(tmp_path)
+        first = await ledger.deposit(1, 5, key="topup")
+        await ledger.close()
+
+        reopened = await EscrowLedger.open(tmp_path)
+        again = await reopened.deposit(1, 5, key="topup")
+        with pytest.raises(IdempotencyConflictError):
+            await reopened.hold(99, 1, 5, key="topup")
+        balance = reopened.balance(1)
+        await reopened.close()
+        return first, again, balance
+
+    first, again, balance = asyncio.run(scenario())
+    assert again == first
+    assert balance == Balance(available=75, held=0)
+
+
+def test_reused_keys_must_match_and_expire(tmp_path, monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr("backend.services.escrow_service.time.time", lambda: clock[0])
+
+    async def scenario():
+        ledger = await _seeded(tmp_path, key_retention=60)
+        for retry in (
+            ledger.deposit(2, 100, key="dep-1"),  # other account
+            ledger.deposit(1, 999, key="dep-1"),  # other amount
+            ledger.hold(11, 2, 25, key="hold-11"),
+            ledger.release(10, 1, key="rel-10"),  # other receiver
+        ):
+            with pytest.raises(IdempotencyConflictError):
+                await retry
+        same = await ledger.release(10, 2, key="rel-10")
+
+        clock[0] += 61
+        again = await ledger.deposit(1, 100, key="dep-1")  # forgotten: a new deposit
+        await ledger.close()
+        reopened = await EscrowLedger.open(tmp_path, key_retention=60)
+        keys = list(reopened._state.keys)
+        await reopened.close()
+        return same, again, ledger.balance(1), keys
+
+    same, again, balance, keys = asyncio.run(scenario())
+    assert same.op == "release" and same.seq == 5
+    assert again.seq == 6
+    assert balance == Balance(available=170, held=0)
+    assert keys == ["dep-1"]
+
+
+def test_failing_hold_hook_does_not_fail_the_hold(tmp_path, caplog):
+    seen = []
+
+    async def broken(entry):
+        raise RuntimeError("database is down")
+
+    async def record(entry):
+        seen.append(entry.trade_id)
+
+    async def scenario():
+        ledger = await EscrowLedger.open(tmp_path)
+        ledger.on_hold.extend([broken, record])
+        await ledger.deposit(1, 100, key="dep")
+        entry = await ledger.hold(10, 1, 30, key="hold-10")
+        balance = ledger.balance(1)
+        await ledger.close()
+        return entry, balance
+
+    entry, balance = asyncio.run(scenario())
+    assert entry.op == "hold" and balance == Balance(available=70, held=30)
+    assert seen == [10]
+    assert "hold hook failed" in caplog.text
+
+
+def test_concurrent_ops_are_group_committed(tmp_path, monkeypatch):
+    syncs = []
+    real = os.fdatasync
+    monkeypatch.setattr(os, "fdatasync", lambda fd: (syncs.append(fd), real(fd)))
+
+    async def scenario():
+        ledger = await EscrowLedger.open(tmp_path)
+        await asyncio.gather(
+            *(ledger.deposit(i, 10, key=f"d{i}") for i in range(500))
+        )
+        await ledger.close(snapshot=False)
+        reopened = await EscrowLedger.open(tmp_path)
+        total = sum(reopened.balance(i).available for i in range(500))
+        await reopened.close(snapshot=False)
+        return total
+
+    assert asyncio.run(scenario()) == 5000
+    assert 1 <= len(syncs) < 50  # batched, not one fsync per op
+
+
+def test_recovery_truncates_torn_and_corrupt_tail(tmp_path):
+    async def write():
+        ledger = await _seeded(tmp_path)
+        await ledger.close(snapshot=False)
+
+    asyncio.run(write())
+    log = tmp_path / LOG_NAME
+    intact = log.stat().st_size
+    with open(log, "ab") as f:
+        f.write(b"\x40\x00\x00\x00\x00\x00\x00\x00{\"seq\":6")  # torn frame
+
+    async def reopen():
+        ledger = await EscrowLedger.open(tmp_path)
+        balances = _balances(ledger)
+        await ledger.deposit(1, 1, key="after-crash")
+        await ledger.close(snapshot=False)
+        return balances
+
+    assert asyncio.run(reopen()) == EXPECTED
+    assert log.stat().st_size > intact
+
+    # Flip a byte inside the last frame: its checksum no longer matches
+    data = bytearray(log.read_bytes())
+    data[-3] ^= 0xFF
+    log.write_bytes(bytes(data))
+
+    async def reopen_again():
+        ledger = await EscrowLedger.open(tmp_path)
+        balances = _balances(ledger)
+        await ledger.close(snapshot=False)
+        return balances
+
+    assert asyncio.run(reopen_again()) == EXPECTED
+
+
+def test_snapshot_plus_tail_and_damaged_snapshot_fallback(tmp_path):
+    async def write():
+        ledger = await _seeded(tmp_path, snapshot_every=3)
+        await ledger.snapshot()
+        await ledger.deposit(1, 7, key="tail")  # only in the log tail
+        await ledger.close(snapshot=False)
+
+    async def read():
+        ledger = await EscrowLedger.open(tmp_path)
+        balances = _balances(ledger)
+        await ledger.close(snapshot=False)
+        return balances
+
+    asyncio.run(write())
+    expected = (Balance(available=77, held=0), EXPECTED[1])
+    assert (tmp_path / SNAPSHOT_NAME).exists()
+    assert asyncio.run(read()) == expected
+
+    (tmp_path / SNAPSHOT_NAME).write_bytes(b'{"crc": 1, "state": "garbage"}')
+    assert asyncio.run(read()) == expected  # full replay from the log
+
+
+def _crash_after_acks(path, n, conn):
+    async def run():
+        ledger = await EscrowLedger.open(path)
+        await asyncio.gather(*(ledger.deposit(1, 1, key=f"k{i}") for i in range(n)))
+        conn.send("acked")
+        os._exit(0)  # die without close(): no final flush, no snapshot
+
+    asyncio.run(run())
+
+
+def test_acknowledged_ops_survive_process_crash(tmp_path):
+    ctx = multiprocessing.get_context("spawn")
+    parent, child = ctx.Pipe()
+    proc = ctx.Process(target=_crash_after_acks, args=(tmp_path, 300, child))
+    proc.start()
+    assert parent.recv() == "acked"
+    proc.join()
+
+    async def read():
+        ledger = await EscrowLedger.open(tmp_path)
+        balance = ledger.balance(1)
+        await ledger.close()
+        return balance
+
+    assert asyncio.run(read()) == Balance(available=300, held=0)
@@ -0,0 +1,28 @@
+"""Filter chip bar: built once, restyled and extended in place."""
+
+from frontend.ui.widgets.filter_chips import FilterChipBar
+
+
+def test_selection_and_new_tags_update_chips_in_place():
+    categories = [f"tag{i:03d}" for i in range(0, 600, 2)]  # hundreds of chips
+    clicks = []
+    bar = FilterChipBar(categories, on_select=clicks.append, on_toggle_near=lambda: None)
+    chips = list(bar.view.controls)
+    assert len(chips) == 2 + 300 and bar.chip(None).border.top.color != "transparent"
+
+    bar.chip("tag010").on_click(None)
+    assert clicks == ["tag010"]
+    styles = {id(c): c.bgcolor for c in chips}
+    bar.select("tag010")
+    changed = [c for c in chips if c.bgcolor != styles[id(c)]]
+    assert changed == [bar.chip(None), bar.chip("tag010")]
+    assert bar.view.controls == chips  # no chip rebuilt
+
+    assert bar.add_categories(["tag011", "tag010", "aaa"]) == 2
+    labels = [c.content.value for c in bar.view.controls[2:]]
+    assert labels[:4] == ["Aaa", "Tag000", "Tag002", "Tag004"]
+    assert labels.index("Tag011") == labels.index("Tag010") + 1
+    assert all(c in bar.view.controls for c in chips)
+
+    bar.set_near(True)
+    assert bar.near and bar.view.controls[0].bgcolor == bar.chip("tag010").bgcolor
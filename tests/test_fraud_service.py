@@ -0,0 +1,167 @@
+"""Anti-fraud monitor: ring-buffer windows, rules, notifications and replay."""
+
+import asyncio
+import random
+
+import msgspec
+
+from backend.core.config import DatabaseSettings
+from backend.db import create_engine, create_session_factory, init_models, session_scope
+from backend.models import Listing
+from backend.services.db_service import (
+    ListingRepository,
+    NotificationRepository,
+    UserRepository,
+)
+from backend.services.escrow_service import EscrowLedger
+from backend.services.fraud_service import (
+    DAY,
+    FlagNotifier,
+    FraudEvent,
+    FraudMonitor,
+    Window,
+    account_age_lookup,
+    load_rules,
+    replay_jsonl,
+)
+from backend.services.trade_service import TradeService
+
+
+def test_windows_match_brute_force_counts():
+    rng = random.Random(7)
+    monitor = FraudMonitor({"p_1h": Window("proposal", 3600, buckets=60)}, rules=())
+    events, ts = [], 0.0
+    for _ in range(5000):
+        ts += rng.expovariate(1 / 90)  # irregular gaps, some longer than the window
+        if rng.random() < 0.02:
+            ts += 4 * 3600
+        events.append(ts)
+        monitor.observe(FraudEvent(ts, "proposal", 1))
+        exact = sum(1 for t in events if t > ts - 3600)
+        # Bucketed window: covers between 59 and 60 minutes back
+        lower = sum(1 for t in events if t > ts - 3600 + 60 + 1e-6)
+        assert lower <= monitor.count(1, "p_1h", ts) <= exact
+    assert monitor.count(1, "p_1h", ts + 2 * 3600) == 0
+
+
+def test_rules_flag_once_per_cooldown_and_skip_unknown_fields():
+    rules = load_rules(
+        [
+            {
+                "name": "no_completion",
+                "on": ["proposal"],
+                "when": [["proposals", ">=", 3], ["completed", "==", 0]],
+                "cooldown": DAY,
+            },
+            {
+                "name": "new_user_value",
+                "on": ["proposal"],
+                "when": [["account_age_days", "<", 30], ["value", ">", 200]],
+                "cooldown": 0,
+            },
+        ]
+    )
+    windows = {
+        "proposals": Window("proposal", 7 * DAY, buckets=7),
+        "completed": Window("completed", 30 * DAY, buckets=30),
+    }
+    monitor = FraudMonitor(windows, rules)
+    seen = []
+    monitor.on_flag.append(seen.append)
+
+    for hour in range(6):  # flags at the 3rd proposal, then stays quiet
+        monitor.observe(FraudEvent(hour * 3600.0, "proposal", 1, value=50))
+    monitor.observe(FraudEvent(0.0, "completed", 2))
+    for hour in range(6):  # a user with a completion is never flagged
+        monitor.observe(FraudEvent(hour * 3600.0, "proposal", 2))
+    monitor.observe(FraudEvent(10.0, "proposal", 3, value=900))  # age unknown
+    monitor.observe(FraudEvent(20.0, "proposal", 4, value=900, account_age_days=2))
+    monitor.observe(FraudEvent(30.0, "proposal", 4, value=100, account_age_days=2))
+
+    assert [(f.rule, f.user_id) for f in seen] == [
+        ("no_completion", 1),
+        ("new_user_value", 4),
+    ]
+    assert monitor.metrics.suppressed == 3
+    assert monitor.metrics.by_rule == {"no_completion": 1, "new_user_value": 1}
+
+
+def test_trade_hooks_feed_notifier_and_replay(tmp_path):
+    async def scenario():
+        engine = create_engine(DatabaseSettings(url=f"sqlite+aiosqlite:///{tmp_path}/f.db"))
+        await init_models(engine)
+        factory = create_session_factory(engine)
+        async with session_scope(factory) as session:
+            owner, proposer, moderator = await UserRepository(session).bulk_insert(
+                [{"name": n, "email": f"{n}@x.com"} for n in ("owner", "proposer", "mod")]
+            )
+            listing = await ListingRepository(session).add(
+                Listing(author_id=owner, title="Bicicleta")
+            )
+        rules = load_rules(
+            [{"name": "burst", "on": ["proposal"], "when": [["proposals", ">=", 3]]}]
+        )
+        monitor = FraudMonitor({"proposals": Window("proposal", DAY)}, rules)
+        notifier = FlagNotifier(factory, [moderator])
+        notifier.start()
+        monitor.on_flag.append(notifier.submit)
+        trades = TradeService(factory)
+        trades.on_proposed.append(monitor.trade_hook("proposal"))
+        for _ in range(4):
+            await trades.propose(listing.id, proposer)
+        await notifier.close()
+        async with factory() as session:
+            inbox = await NotificationRepository(session).list_for_user(moderator)
+        await engine.dispose()
+        return monitor, inbox, proposer
+
+    monitor, inbox, proposer = asyncio.run(scenario())
+    assert monitor.count(proposer, "proposals") == 4
+    assert len(inbox) == 1 and inbox[0].type == "system" and inbox[0].sender_id == proposer
+
+    path = tmp_path / "events.jsonl"
+    events = [FraudEvent(float(i), "proposal", i % 3) for i in range(30)]
+    path.write_bytes(msgspec.json.Encoder().encode_lines(events) + b"\n")
+    rules = load_rules(
+        [{"name": "burst", "on": ["proposal"], "when": [["proposals", ">=", 10]]}]
+    )
+    replayed = FraudMonitor({"proposals": Window("proposal", DAY)}, rules)
+    assert replay_jsonl(path, replayed) == 30
+    assert replayed.metrics.by_rule["burst"] == 3
+
+
+def test_escrow_holds_carry_value_and_cancels_count_for_the_canceller(tmp_path):
+    async def scenario():
+        engine = create_engine(DatabaseSettings(url=f"sqlite+aiosqlite:///{tmp_path}/f.db"))
+        await init_models(engine)
+        factory = create_session_factory(engine)
+        async with session_scope(factory) as session:
+            owner, proposer = await UserRepository(session).bulk_insert(
+                [{"name": n, "email": f"{n}@x.com"} for n in ("owner", "proposer")]
+            )
+            listing = await ListingRepository(session).add(
+                Listing(author_id=owner, title="Bicicleta")
+            )
+        monitor = FraudMonitor()
+        trades = TradeService(factory)
+        trades.on_cancelled.append(monitor.trade_hook("cancelled"))
+        ledger = await EscrowLedger.open(tmp_path / "ledger")
+        ledger.on_hold.append(monitor.escrow_hook(account_age_lookup(factory)))
+
+        first = await trades.propose(listing.id, proposer)
+        await trades.cancel(first.id, proposer)
+        second = await trades.propose(listing.id, proposer)
+        await trades.transition_many([second.id], "cancelled")  # system cancel
+
+        await ledger.deposit(proposer, 1000, "d1")
+        await ledger.hold(first.id, proposer, 300, "h1")
+        await ledger.hold(first.id, proposer, 300, "h1")  # retried key: no new event
+        await ledger.close()
+        await engine.dispose()
+        return monitor, owner, proposer
+
+    monitor, owner, proposer = asyncio.run(scenario())
+    assert monitor.count(proposer, "cancelled_24h") == 1
+    assert monitor.count(owner, "cancelled_24h") == 0
+    assert monitor.count(proposer, "hold_value_24h") == 300
+    assert monitor.metrics.by_rule == {"new_user_value_limit": 1}
@@ -0,0 +1,84 @@
+"""Geospatial index tests: radius/bbox queries against brute force."""
+
+import numpy as np
+
+from backend.services.geo_service import GeoIndex, encode_geohash, haversine_km
+from mock.posts import get_paginated_posts
+
+SAO_PAULO = (-23.5505, -46.6333)
+RIO = (-22.9068, -43.1729)
+
+
+def _points(n=20_000, seed=7):
+    rng = np.random.default_rng(seed)
+    lats = rng.uniform(-26.0, -20.0, n)
+    lons = rng.uniform(-50.0, -42.0, n)
+    return np.arange(n), lats, lons
+
+
+def test_encode_geohash_known_value():
+    assert encode_geohash(57.64911, 10.40744, 11) == "u4pruydqqvj"
+
+
+def test_radius_query_matches_brute_force_nearest_first():
+    ids, lats, lons = _points()
+    index = GeoIndex()
+    index.add_many(ids[:15_000], lats[:15_000], lons[:15_000])
+    for i in range(15_000, len(ids)):  # tail
+        index.add(int(ids[i]), float(lats[i]), float(lons[i]))
+    index.remove(3)
+
+    result = index.within_radius(*SAO_PAULO, 40.0, limit=10)
+    distances = haversine_km(*SAO_PAULO, lats, lons)
+    inside = (distances <= 40.0) & (ids != 3)
+    expected = ids[inside][np.argsort(distances[inside], kind="stable")][:10]
+    assert result.total == int(inside.sum())
+    assert [hit.item_id for hit in result.hits] == expected.tolist()
+    assert [h.distance_km for h in result.hits] == sorted(h.distance_km for h in result.hits)
+
+
+def test_add_moves_an_indexed_point():
+    index = GeoIndex()
+    index.add_many([1, 2], [SAO_PAULO[0]] * 2, [SAO_PAULO[1]] * 2)
+    index.add(1, *RIO)  # indexed row: marked dead, no rebuild
+    index.add(3, *SAO_PAULO)
+    index.add(3, *RIO)  # tail entry: replaced
+    assert len(index) == 3 and len(index._ids) == 2
+
+    near_sp = index.within_radius(*SAO_PAULO, 5.0)
+    near_rio = index.within_radius(*RIO, 5.0)
+    assert [hit.item_id for hit in near_sp.hits] == [2] and near_sp.total == 1
+    assert [hit.item_id for hit in near_rio.hits] == [1, 3]
+
+    index.remove(1)
+    index.add_many([2], [RIO[0]], [RIO[1]])  # bulk re-add moves it too
+    assert len(index) == 2
+    assert [hit.item_id for hit in index.within_radius(*RIO, 5.0).hits] == [2, 3]
+    assert index.within_radius(*SAO_PAULO, 5.0).total == 0
+
+    index.add_many([4, 4], [SAO_PAULO[0], RIO[0]], [SAO_PAULO[1], RIO[1]])  # last wins
+    index.add(4, *SAO_PAULO)
+    assert len(index) == 3 and index.within_radius(*SAO_PAULO, 5.0).total == 1
+
+
+def test_bbox_query_and_allowed_filter():
+    ids, lats, lons = _points()
+    index = GeoIndex()
+    index.add_many(ids, lats, lons)
+    allowed = ids[ids % 2 == 0]
+    result = index.within_bbox(-24.0, -47.0, -23.0, -46.0, limit=5, allowed=allowed)
+    inside = (lats >= -24) & (lats <= -23) & (lons >= -47) & (lons <= -46) & (ids % 2 == 0)
+    assert result.total == int(inside.sum())
+    assert all(hit.item_id % 2 == 0 for hit in result.hits)
+
+
+def test_paginated_posts_combine_location_with_text_filter():
+    near = get_paginated_posts(near=SAO_PAULO, radius_km=25, page_size=50)
+    assert near["total"] < get_paginated_posts(page_size=50)["total"]
+    distances = [post["distance_km"] for post in near["posts"]]
+    assert distances == sorted(distances) and distances[-1] <= 25
+
+    lessons = get_paginated_posts(search_query="aula", near=SAO_PAULO, radius_km=25)
+    for post in lessons["posts"]:
+        assert "aula" in (post["post_title"] + post["post_description"]).lower()
+    assert lessons["total"] <= near["total"]
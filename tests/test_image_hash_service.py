@@ -0,0 +1,96 @@
+"""Perceptual hash and Hamming index tests."""
+
+import numpy as np
+import pytest
+from PIL import Image, ImageFilter
+
+from backend.services.image_hash_service import (
+    DuplicateImageDetector,
+    HammingIndex,
+    dhash,
+    hamming,
+    phash,
+)
+
+
+def _gradient_photo(path, seed=0, size=(640, 480)):
+    rng = np.random.default_rng(seed)
+    x = np.linspace(0, 1, size[0])[None, :]
+    y = np.linspace(0, 1, size[1])[:, None]
+    base = np.sin(x * rng.uniform(2, 9)) * np.cos(y * rng.uniform(2, 9))
+    blobs = rng.normal(size=(12, 16)).repeat(size[1] // 12, 0).repeat(size[0] // 16, 1)
+    pixels = ((base + 0.3 * blobs) * 60 + 128).clip(0, 255).astype(np.uint8)
+    Image.fromarray(pixels).convert("RGB").save(path, format="JPEG", quality=90)
+    return path
+
+
+def test_hashes_survive_resize_and_recompression_but_separate_images(tmp_path):
+    original = _gradient_photo(tmp_path / "a.jpg")
+    with Image.open(original) as im:
+        im.resize((320, 240)).filter(ImageFilter.GaussianBlur(1)).save(
+            tmp_path / "a_small.jpg", quality=60
+        )
+    other = _gradient_photo(tmp_path / "b.jpg", seed=1)
+
+    assert hamming(phash(original), phash(tmp_path / "a_small.jpg")) <= 6
+    assert hamming(phash(original), phash(other)) > 12
+    assert hamming(dhash(original), dhash(tmp_path / "a_small.jpg")) <= 6
+
+
+def test_index_matches_brute_force_within_radius():
+    rng = np.random.default_rng(7)
+    hashes = rng.integers(0, 2**64, size=50_000, dtype=np.uint64)
+    index = HammingIndex(max_distance=6)
+    index.add_many(hashes, np.arange(len(hashes)))
+
+    for target in rng.integers(0, len(hashes), size=20):
+        flips = rng.choice(64, size=rng.integers(0, 7), replace=False)
+        query = int(hashes[target]) ^ sum(1 << int(b) for b in flips)
+        expected = {
+            i
+            for i, d in enumerate(np.bitwise_count(hashes ^ np.uint64(query)))
+            if d <= 6
+        }
+        found = index.query(query)
+        assert {m.item_id for m in found} == expected
+        assert found[0].item_id == target and found[0].distance == len(flips)
+
+
+def test_incremental_adds_are_searchable_before_and_after_merge():
+    index = HammingIndex()
+    for i in range(5000):  # crosses the 4096-entry tail threshold
+        index.add(i * 0x9E3779B97F4A7C15 % 2**64, i)
+    assert len(index) == 5000
+    assert index.query(4999 * 0x9E3779B97F4A7C15 % 2**64 ^ 0b11)[0].item_id == 4999
+    assert index.query(10 * 0x9E3779B97F4A7C15 % 2**64)[0].item_id == 10
+
+
+def test_detector_flags_reuploaded_photo(tmp_path):
+    detector = DuplicateImageDetector()
+    detector.register(_gradient_photo(tmp_path / "a.jpg"), item_id=1)
+    with Image.open(tmp_path / "a.jpg") as im:
+        im.save(tmp_path / "again.png")
+
+    assert [m.item_id for m in detector.find_duplicates(tmp_path / "again.png")] == [1]
+    assert detector.find_duplicates(_gradient_photo(tmp_path / "b.jpg", seed=3)) == []
+
+
+def test_register_post_is_all_or_nothing_under_one_id(tmp_path):
+    detector = DuplicateImageDetector()
+    a = _gradient_photo(tmp_path / "a.jpg")
+    b = _gradient_photo(tmp_path / "b.jpg", seed=3)
+    with Image.open(a) as im:
+        im.save(tmp_path / "a_copy.png")
+    (tmp_path / "notes.jpg").write_text("not an image")
+
+    assert detector.register_post([a, tmp_path / "a_copy.png"], item_id=1) == [
+        tmp_path / "a_copy.png"
+    ]
+    with pytest.raises(OSError):
+        detector.register_post([b, tmp_path / "notes.jpg"], item_id=1)
+    assert len(detector.index) == 0
+
+    assert detector.register_post([a, b], item_id=1) == []
+    assert [m.item_id for m in detector.find_duplicates(b)] == [1]
+    assert [m.item_id for m in detector.find_duplicates(a)] == [1]
+    assert detector.register_post([tmp_path / "a_copy.png"], item_id=2) != []
@@ -0,0 +1,48 @@
+"""Barter matching tests: term extraction, direct matches and 3-way cycles."""
+
+from backend.services.matching_service import BarterIndex, BarterTerms, extract_terms
+
+
+def _terms(have, want):
+    return BarterTerms(frozenset(have), frozenset(want))
+
+
+def test_extract_terms_splits_offer_from_request():
+    terms = extract_terms(
+        "Troco aula de violão 🎸",
+        "Ofereço aulas básicas aos sábados (iniciantes) em troca de acessórios "
+        "de informática: cabo HDMI, suporte de notebook ou teclado mecânico.",
+    )
+    assert {"aula", "aula violao", "aula basica"} == terms.have
+    assert {"cabo", "cabo hdmi", "suporte notebook", "teclado mecanico"} <= terms.want
+
+    wanted = extract_terms("Busco bicicleta urbana")
+    assert wanted.have == frozenset() and "bicicleta" in wanted.want
+
+
+def test_matches_require_both_directions_and_skip_own_posts():
+    index = BarterIndex()
+    index.add(1, 100, _terms({"notebook"}, {"bicicleta"}))
+    index.add(2, 200, _terms({"bicicleta", "bicicleta urbana"}, {"notebook"}))
+    index.add(3, 300, _terms({"bicicleta"}, {"livro"}))  # one-sided only
+    index.add(4, 100, _terms({"bicicleta"}, {"notebook"}))  # same author
+
+    assert [(m.post_id, m.score) for m in index.matches(1)] == [(2, 2)]
+    index.remove(2)
+    assert index.matches(1) == []
+    index.add(2, 200, _terms({"bicicleta"}, {"notebook"}))  # re-indexed
+    assert [m.post_id for m in index.matches(1)] == [2]
+
+
+def test_three_way_cycle():
+    index = BarterIndex()
+    # me: violão lessons for a keyboard
+    index.add(1, 1, _terms({"aula"}, {"teclado"}))
+    # receiver wants lessons, has books; provider has a keyboard, wants books
+    index.add(2, 2, _terms({"livro"}, {"aula"}))
+    index.add(3, 3, _terms({"teclado"}, {"livro"}))
+
+    assert index.matches(1) == []
+    [cycle] = index.cycles(1)
+    assert (cycle.receiver_id, cycle.provider_id) == (2, 3)
+    assert [(c.receiver_id, c.provider_id) for c in index.cycles(2)] == [(3, 1)]
@@ -0,0 +1,79 @@
+"""Photo grid: pages are appended in place, not rebuilt."""
+
+from frontend.ui.widgets.photo_grid import PhotoGrid
+
+
+def _page(start, size=6):
+    return [
+        {"post_title": f"Post {i}", "author_name": "Ana", "image_path": f"images/{i}.jpg"}
+        for i in range(start, start + size)
+    ]
+
+
+def test_load_more_appends_only_the_new_tiles():
+    loads = []
+    grid = PhotoGrid(on_click=None, on_hover=None, on_load_more=lambda: loads.append(1))
+    grid.show_loading()
+    assert grid.status.visible and not grid.grid.visible
+
+    grid.set_posts(_page(0), has_more=True)
+    view, grid_view = grid.view, grid.grid
+    assert grid_view.visible and grid.footer.visible and not grid.status.visible
+    for page_number in range(1, 20):
+        before = list(grid_view.controls)
+        grid.set_loading_more(True)
+        grid._on_footer_click(None)  # ignored while a page is loading
+        grid.append(_page(6 * page_number), has_more=page_number < 19)
+        # Same grid, old tiles untouched, one page of new tiles at the end
+        assert grid.view is view and grid.grid is grid_view
+        assert grid_view.controls[: len(before)] == before
+        assert all(a is b for a, b in zip(grid_view.controls, before))
+        assert [t.data for t in grid_view.controls[len(before):]] == list(
+            range(6 * page_number, 6 * page_number + 6)
+        )
+    assert loads == []
+    assert len(grid.tiles) == len(grid.posts) == 120
+    assert not grid.footer.visible  # no more pages
+
+    grid.set_posts([], has_more=False)
+    assert grid.status.visible and not grid.grid.visible and grid.grid.controls == []
+
+
+def test_refresh_patches_only_changed_tiles():
+    grid = PhotoGrid(on_click=None, on_hover=None, on_load_more=None)
+    grid.set_posts(_page(0, 12), has_more=True)
+    before = list(grid.grid.controls)
+
+    fresh = _page(0, 12)
+    fresh[3] = dict(fresh[3], post_title="Editado")
+    assert grid.patch(fresh, has_more=True) == 1
+    assert [a is b for a, b in zip(grid.grid.controls, before)] == [i != 3 for i in range(12)]
+    assert grid.patch(fresh, has_more=True) == 0  # nothing changed: same tiles
+
+    assert grid.patch(fresh[:10], has_more=False) == 0  # removed at the end
+    assert len(grid.grid.controls) == 10 and not grid.footer.visible
+
+
+def test_focus_restyles_two_tiles_and_survives_rebuilds():
+    grid = PhotoGrid(on_click=None, on_hover=None, on_load_more=None)
+    grid.set_posts(_page(0, 500), has_more=True)
+    focused = lambda: [t.data for t in grid.grid.controls if t.border is not None]
+
+    grid.focus(7)
+    assert focused() == [7]
+    shadows = {t.data: t.shadow for t in grid.tiles}
+    grid.focus(8)
+    assert focused() == [8]
+    assert [t.data for t in grid.tiles if t.shadow is not shadows[t.data]] == [7, 8]
+
+    fresh = _page(0, 500)
+    fresh[8] = dict(fresh[8], post_title="Editado")
+    old = grid.tile(8)
+    grid.patch(fresh, has_more=True)  # focused tile rebuilt by a refresh
+    assert grid.tile(8) is not old and focused() == [8]
+
+    grid.focus(503)  # not loaded yet: styled once it is appended
+    grid.append(_page(500), has_more=False)
+    assert focused() == [503]
+    grid.focus(-1)
+    assert focused() == []
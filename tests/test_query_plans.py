@@ -0,0 +1,218 @@
+"""EXPLAIN QUERY PLAN checks for the hot repository queries on SQLite.
+
+Each test captures the SQL a repository method actually emits and asserts
+that SQLite resolves every base-table access through an index instead of a
+full table scan (and, where the index matches the ORDER BY, without a temp
+sort).
+"""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import event
+
+from backend.core.config import DatabaseSettings
+from backend.db import create_engine, create_session_factory, init_models, session_scope
+from backend.models import Listing
+from backend.services.db_service import (
+    CommentRepository,
+    ListingRepository,
+    MessageRepository,
+    NotificationRepository,
+    TagRepository,
+    UserRepository,
+)
+
+TABLES = {
+    "users",
+    "listings",
+    "tags",
+    "listing_tags",
+    "comments",
+    "notifications",
+    "trades",
+    "messages",
+}
+
+
+async def _setup():
+    engine = create_engine(DatabaseSettings(url="sqlite+aiosqlite:///:memory:"))
+    await init_models(engine)
+    factory = create_session_factory(engine)
+    base = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    async with session_scope(factory) as session:
+        user_ids = await UserRepository(session).bulk_insert(
+            [{"name": f"U{i}", "email": f"u{i}@x.com"} for i in range(5)]
+        )
+        listings = ListingRepository(session)
+        for i in range(20):
+            listing = await listings.add(
+                Listing(
+                    author_id=user_ids[i % 5],
+                    title=f"L{i}",
+                    created_at=base + timedelta(hours=i),
+                )
+            )
+            await listings.set_tags(listing, ["troca", f"tag{i % 3}"])
+            await CommentRepository(session).bulk_insert(
+                [
+                    {"listing_id": listing.id, "author_id": user_ids[0], "text": "c"}
+                    for _ in range(4)
+                ]
+            )
+        await NotificationRepository(session).bulk_insert(
+            [{"user_id": user_ids[0], "type": "like", "message": "m"} for _ in range(10)]
+        )
+    return engine, factory, user_ids
+
+
+async def _plans(engine, factory, call):
+    """Run ``call(session)`` and return the query plan of every SELECT it emits."""
+    captured = []
+
+    def capture(_conn, _cursor, statement, parameters, _context, _many):
+        if statement.lstrip().upper().startswith("SELECT"):
+            captured.append((statement, parameters))
+
+    event.listen(engine.sync_engine, "before_cursor_execute", capture)
+    async with factory() as session:
+        await call(session)
+    event.remove(engine.sync_engine, "before_cursor_execute", capture)
+
+    plans = []
+    async with engine.connect() as conn:
+        for statement, parameters in captured:
+            rows = await conn.exec_driver_sql(
+                "EXPLAIN QUERY PLAN " + statement, tuple(parameters)
+            )
+            plans.append([row[3] for row in rows])
+    await engine.dispose()
+    return plans
+
+
+def _assert_indexed(plan):
+    for detail in plan:
+        words = detail.split()
+        if words[0] in ("SCAN", "SEARCH") and words[1] in TABLES:
+            assert "USING" in detail, f"full table scan: {detail!r} in {plan}"
+
+
+def _assert_no_sort(plan):
+    assert not any("TEMP B-TREE" in detail for detail in plan), plan
+
+
+def _run(call, main=0):
+    """Check every emitted query is indexed and ``plans[main]`` needs no sort.
+
+    Secondary queries (tag/preview loads) may sort their small, page-bounded
+    result; the main page query must stream straight from its index.
+    """
+
+    async def scenario():
+        engine, factory, user_ids = await _setup()
+        return await _plans(engine, factory, lambda s: call(s, user_ids))
+
+    plans = asyncio.run(scenario())
+    assert plans
+    for plan in plans:
+        _assert_indexed(plan)
+    _assert_no_sort(plans[main])
+    return plans
+
+
+def test_home_feed_page_uses_created_at_index():
+    plans = _run(lambda s, _u: ListingRepository(s).feed_page(limit=10))
+    assert any("ix_listings_created_at" in d for d in plans[0])
+
+
+def test_home_feed_next_page_uses_created_at_index():
+    async def call(session, _u):
+        before = (datetime(2025, 1, 1, 10, tzinfo=timezone.utc), 11)
+        await ListingRepository(session).feed_page(limit=10, before=before)
+
+    plans = _run(call)
+    assert any("ix_listings_created_at" in d for d in plans[0])
+
+
+def test_profile_feed_uses_author_created_at_index():
+    plans = _run(lambda s, u: ListingRepository(s).list_by_author(u[1], limit=10))
+    assert any("ix_listings_author_id_created_at" in d for d in plans[0])
+
+
+def test_tag_feed_uses_tag_created_at_index():
+    async def call(session, _u):
+        tag = await TagRepository(session).get_by_name("troca")
+        await ListingRepository(session).list_by_tag(tag.id, limit=10)
+
+    plans = _run(call, main=1)
+    assert any("ix_listing_tags_tag_id_created_at" in d for d in plans[1])
+
+
+def test_comment_previews_use_listing_created_at_index():
+    plans = _run(lambda s, _u: ListingRepository(s).feed_page(limit=10))
+    assert any("ix_comments_listing_id_created_at" in d for d in plans[2])
+
+
+def test_comment_thread_uses_listing_created_at_index():
+    plans = _run(lambda s, _u: CommentRepository(s).list_for_listing(1))
+    assert any("ix_comments_listing_id_created_at" in d for d in plans[0])
+
+
+def test_chat_history_uses_trade_id_index():
+    async def call(session, _u):
+        await MessageRepository(session).history(1, limit=50, before_id=100)
+
+    plans = _run(call)
+    assert any("ix_messages_trade_id_id" in d for d in plans[0])
+
+
+def test_chat_catch_up_uses_trade_id_index():
+    plans = _run(lambda s, _u: MessageRepository(s).since(1, after_id=10))
+    assert any("ix_messages_trade_id_id" in d for d in plans[0])
+
+
+def test_unread_notifications_use_user_read_created_at_index():
+    plans = _run(
+        lambda s, u: NotificationRepository(s).list_for_user(u[0], unread_only=True)
+    )
+    assert any("ix_notifications_user_id_read_created_at" in d for d in plans[0])
+
+
+def test_unread_badge_reads_counter_by_primary_key():
+    plans = _run(lambda s, u: NotificationRepository(s).count_unread(u[0]))
+    assert any("INTEGER PRIMARY KEY" in d for d in plans[0])
+
+
+def test_login_lookup_uses_unique_email_index():
+    plans = _run(lambda s, _u: UserRepository(s).get_by_email("u1@x.com"))
+    assert any("uq_users_email" in d or "autoindex_users" in d for d in plans[0])
+
+
+def test_counters_track_writes():
+    async def scenario():
+        engine, factory, user_ids = await _setup()
+        async with session_scope(factory) as session:
+            notifications = NotificationRepository(session)
+            first = (await notifications.list_for_user(user_ids[0], limit=1))[0]
+            assert await notifications.mark_read(first.id)
+            assert not await notifications.mark_read(first.id)
+            unread = await notifications.count_unread(user_ids[0])
+            comments = await CommentRepository(session).count_for_listing(1)
+        await engine.dispose()
+        return unread, comments
+
+    unread, comments = asyncio.run(scenario())
+    assert unread == 9
+    assert comments == 4
+
+
+def test_migrations_match_models(tmp_path, monkeypatch):
+    db_path = tmp_path / "migrated.db"
+    monkeypatch.setenv("SCAMBO_DB_URL", f"sqlite+aiosqlite:///{db_path}")
+    config = Config(str(Path(__file__).resolve().parents[1] / "alembic.ini"))
+    command.upgrade(config, "head")
+    command.check(config)  # raises if models and migrations diverge
+    command.downgrade(config, "base")
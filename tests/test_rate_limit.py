@@ -0,0 +1,91 @@
+"""Rate limiter tests: bucket refill, sliding window, eviction and middleware."""
+
+import asyncio
+
+import pytest
+
+from backend.core.rate_limit import (
+    RateLimitMiddleware,
+    SlidingWindowLogStore,
+    TokenBucketStore,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _hits(store, key, n):
+    return [asyncio.run(store.acquire(key)).allowed for _ in range(n)]
+
+
+@pytest.mark.parametrize("store_cls", [TokenBucketStore, SlidingWindowLogStore])
+def test_burst_then_reject_then_recover(store_cls):
+    clock = FakeClock()
+    store = store_cls(rate=1.0, capacity=3, clock=clock)
+    assert _hits(store, "a", 4) == [True, True, True, False]
+    assert _hits(store, "b", 1) == [True]  # keys are independent
+
+    rejected = asyncio.run(store.acquire("a"))
+    assert 0 < rejected.retry_after <= 3
+    clock.now += rejected.retry_after
+    assert _hits(store, "a", 1) == [True]
+
+
+def test_sliding_window_counts_exactly_within_window():
+    clock = FakeClock()
+    store = SlidingWindowLogStore(rate=1.0, capacity=3, clock=clock)
+    for t in (0.0, 1.0, 2.0):
+        clock.now = t
+        assert _hits(store, "k", 1) == [True]
+    clock.now = 2.9
+    assert _hits(store, "k", 1) == [False]
+    clock.now = 3.0  # the t=0 hit slides out
+    assert _hits(store, "k", 1) == [True]
+
+
+def test_idle_keys_are_evicted_without_changing_decisions():
+    clock = FakeClock()
+    store = TokenBucketStore(rate=10.0, capacity=5, idle_after=60.0, clock=clock)
+    for i in range(100):
+        asyncio.run(store.acquire(i))
+    clock.now = 30.0
+    asyncio.run(store.acquire("active"))
+    clock.now = 61.0
+    assert store.evict_idle() == 100
+    assert len(store) == 1
+    assert _hits(store, 0, 5) == [True] * 5  # recreated as a full bucket
+
+
+def test_middleware_returns_429_with_retry_after():
+    calls = []
+
+    async def app(scope, receive, send):
+        calls.append(scope["path"])
+
+    clock = FakeClock()
+    middleware = RateLimitMiddleware(
+        app, TokenBucketStore(rate=0.5, capacity=1, clock=clock)
+    )
+    sent = []
+
+    async def send(message):
+        sent.append(message)
+
+    async def request(path):
+        scope = {"type": "http", "path": path, "client": ("10.0.0.1", 5000)}
+        await middleware(scope, None, send)
+
+    async def scenario():
+        await request("/posts")
+        await request("/posts")
+        await request("/health")
+
+    asyncio.run(scenario())
+    assert calls == ["/posts", "/health"]
+    assert sent[0]["status"] == 429
+    assert (b"retry-after", b"2") in sent[0]["headers"]
@@ -0,0 +1,56 @@
+"""Similar-posts tests: TF-IDF neighbors, incremental adds and removal."""
+
+import numpy as np
+
+from backend.services.recommendation_service import SimilarPostsIndex, post_features
+from mock.posts import get_mock_posts
+
+
+def _index(k=5):
+    index = SimilarPostsIndex(k=k)
+    index.add_many(
+        (i, p["post_title"], p["post_description"], p["tags"])
+        for i, p in enumerate(get_mock_posts())
+    )
+    return index
+
+
+def test_rebuild_matches_brute_force_cosine():
+    index = _index()
+    posts = get_mock_posts()
+    features = [
+        post_features(p["post_title"], p["post_description"], p["tags"]) for p in posts
+    ]
+    vocab = {term: i for i, term in enumerate(sorted(set().union(*features)))}
+    tf = np.zeros((len(posts), len(vocab)))
+    for row, counts in enumerate(features):
+        for term, count in counts.items():
+            tf[row, vocab[term]] = 1 + np.log(count)
+    idf = np.log((1 + len(posts)) / (1 + (tf > 0).sum(axis=0))) + 1
+    x = tf * idf
+    x /= np.linalg.norm(x, axis=1, keepdims=True)
+    sims = x @ x.T
+    np.fill_diagonal(sims, 0)
+
+    for i in range(len(posts)):
+        expected = np.sort(sims[i])[::-1][:3]
+        assert [s.score for s in index.similar(i, 3)] == [round(v, 4) for v in expected]
+
+
+def test_added_post_joins_neighbor_lists_and_removed_posts_disappear():
+    index = _index()
+    mangas = 7  # "Troco coleção de mangás"
+    index.add(
+        100,
+        "Troco coleção de mangás raros",
+        "Coleção de mangás em troca de board game.",
+        ["colecionáveis", "troca"],
+    )
+    assert index.similar(100, 1)[0].post_id == mangas
+    assert index.similar(mangas, 1)[0].post_id == 100
+
+    index.remove(100)
+    assert 100 not in [s.post_id for s in index.similar(mangas)]
+    index.rebuild()  # compaction keeps the others intact
+    assert len(index) == len(get_mock_posts())
+    assert 100 not in [s.post_id for s in index.similar(mangas)]
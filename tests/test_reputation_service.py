@@ -0,0 +1,101 @@
+"""Reputation aggregates: incremental updates, trade hook and compaction."""
+
+import asyncio
+from datetime import timedelta
+
+import pytest
+
+from backend.core.config import DatabaseSettings
+from backend.db import create_engine, create_session_factory, init_models, session_scope
+from backend.db.base import utcnow
+from backend.models import Listing, User
+from backend.services.db_service import ListingRepository, UserRepository
+from backend.services.reputation_service import (
+    ReputationAggregate,
+    ReputationError,
+    ReputationPolicy,
+    ReputationService,
+)
+from backend.services.trade_service import TradeService
+
+
+async def _setup(tmp_path):
+    engine = create_engine(DatabaseSettings(url=f"sqlite+aiosqlite:///{tmp_path}/r.db"))
+    await init_models(engine)
+    factory = create_session_factory(engine)
+    async with session_scope(factory) as session:
+        owner, proposer, other = await UserRepository(session).bulk_insert(
+            [{"name": n, "email": f"{n}@x.com"} for n in ("owner", "proposer", "other")]
+        )
+        listing = await ListingRepository(session).add(
+            Listing(author_id=owner, title="Bicicleta")
+        )
+    trades = TradeService(factory)
+    return engine, factory, trades, ReputationService(factory, trades), listing.id, owner, proposer, other
+
+
+def test_reviews_and_completed_trades_update_aggregates(tmp_path):
+    async def scenario():
+        engine, factory, trades, reputation, listing_id, owner, proposer, other = await _setup(tmp_path)
+        trade = await trades.propose(listing_id, proposer)
+        with pytest.raises(ReputationError):
+            await reputation.add_review(owner, proposer, 5, trade_id=trade.id)  # pending
+        await trades.accept(trade.id, owner)
+        for user_id in (proposer, owner, owner):
+            await trades.confirm(trade.id, user_id)  # the third is a no-op
+
+        after_review = await reputation.add_review(owner, proposer, 5, "Ótima troca", trade.id)
+        with pytest.raises(ReputationError):
+            await reputation.add_review(owner, proposer, 1, trade_id=trade.id)  # twice
+        with pytest.raises(ReputationError):
+            await reputation.add_review(owner, other, 5, trade_id=trade.id)  # outsider
+        with pytest.raises(ReputationError):
+            await reputation.add_review(owner, owner, 5)
+        await reputation.add_review(owner, other, 3)
+
+        owner_rep, proposer_rep = await reputation.get(owner), await reputation.get(proposer)
+        async with factory() as session:
+            stored = (await session.get(User, owner)).reputation
+        await engine.dispose()
+        return after_review, owner_rep, proposer_rep, stored
+
+    after_review, owner_rep, proposer_rep, stored = asyncio.run(scenario())
+    assert after_review.review_count == 1 and after_review.completed_trades == 1
+    assert owner_rep.review_count == 2 and owner_rep.average == 4.0
+    assert owner_rep.rating == pytest.approx((5 * 4.0 + 8) / 7, abs=0.01)
+    assert owner_rep.points == proposer_rep.points == 1
+    assert proposer_rep.review_count == 0 and proposer_rep.rating == 4.0
+    assert stored == owner_rep.rating
+
+
+def test_compaction_matches_incremental_aggregates(tmp_path):
+    async def scenario():
+        engine, factory, trades, reputation, listing_id, owner, proposer, other = await _setup(tmp_path)
+        for rating in (5, 4, 2, 5, 1):
+            await reputation.add_review(owner, proposer, rating)
+        await reputation.add_review(proposer, other, 4)
+        before = await reputation.get_many([owner, proposer, other])
+        rewritten = await reputation.compact(batch_size=1)
+        after = await reputation.get_many([owner, proposer, other])
+        await engine.dispose()
+        return before, rewritten, after
+
+    before, rewritten, after = asyncio.run(scenario())
+    assert rewritten == 2
+    for user_id, summary in before.items():
+        assert after[user_id].review_count == summary.review_count
+        assert after[user_id].rating == summary.rating
+        assert after[user_id].recent_rating == pytest.approx(summary.recent_rating, abs=0.01)
+
+
+def test_recent_rating_forgets_old_reviews():
+    policy = ReputationPolicy(half_life_days=30)
+    now = utcnow()
+    aggregate = ReputationAggregate()
+    for _ in range(20):
+        policy.add_review(aggregate, 1, now - timedelta(days=365))
+    for _ in range(5):
+        policy.add_review(aggregate, 5, now - timedelta(days=1))
+    summary = policy.summarize(1, aggregate, now)
+    assert summary.average == pytest.approx(1.8)
+    assert summary.rating < 2.5 < 4.0 < summary.recent_rating
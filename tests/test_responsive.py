@@ -0,0 +1,37 @@
+"""Responsive layout: resize bursts coalesce, listeners run on change only."""
+
+import asyncio
+
+from frontend.ui.responsive import ResponsiveLayout, breakpoint_for
+
+
+def test_breakpoints_follow_the_theme_tiers():
+    assert [breakpoint_for(w).columns for w in (400, 599, 600, 899, 900, None)] == [2, 2, 3, 3, 4, 3]
+    assert breakpoint_for(1200).container_width == 800
+    assert breakpoint_for(700).dialog_size == (600, 600)
+
+
+def test_resize_burst_flushes_once_and_notifies_changed_listeners():
+    calls = []
+    flushes = []
+
+    async def main():
+        layout = ResponsiveLayout(width=1000, interval=0.05)
+        flush = layout.flush
+        layout.flush = lambda: flushes.append(flush())
+        layout.listen("grid", lambda bp: bp.columns, lambda v: calls.append(("grid", v)))
+        layout.listen("dialog", lambda bp: bp.dialog_size, lambda v: calls.append(("dialog", v)))
+        layout.listen("grid", lambda bp: bp.columns, lambda v: calls.append(("grid2", v)))  # replaces
+
+        for width in range(1000, 700, -5):  # 60 events within one interval
+            layout.handle_resize(width)
+        await asyncio.sleep(0.1)
+        for width in (710, 720, 730):  # same breakpoint: nothing to do
+            layout.handle_resize(width)
+        await asyncio.sleep(0.1)
+        return layout
+
+    layout = asyncio.run(main())
+    assert flushes == [["grid", "dialog"], []]
+    assert calls == [("grid2", 3), ("dialog", (600, 600))]
+    assert layout.current.name == "medium"
@@ -0,0 +1,47 @@
+"""Schema validation and encoding tests."""
+
+import msgspec
+import pytest
+
+from backend.schemas import (
+    CommentSchema,
+    FeedPageSchema,
+    NotificationSchema,
+    PostSchema,
+    ResponseEncoder,
+    UserSchema,
+    decode,
+    validate,
+)
+from mock.comments import get_mock_comments
+from mock.notifications import get_mock_notifications
+from mock.posts import get_mock_posts, get_paginated_posts
+from mock.user import get_current_user, get_user_reputation
+
+
+def test_mock_payloads_validate():
+    assert len(validate(get_mock_posts(), list[PostSchema])) == len(get_mock_posts())
+    assert validate(get_mock_comments(0), list[CommentSchema])[0].author_name
+    assert validate(get_mock_notifications(), list[NotificationSchema])[1].group_count == 3
+    reputation = get_user_reputation("Diego")["rating"]
+    assert validate(get_current_user(), UserSchema).reputation == reputation
+
+
+def test_invalid_fields_are_rejected():
+    post = dict(get_mock_posts()[0], avatar_bg="green")
+    with pytest.raises(msgspec.ValidationError, match="avatar_bg"):
+        validate(post, PostSchema)
+    notification = dict(get_mock_notifications()[0], type="spam")
+    with pytest.raises(msgspec.ValidationError):
+        validate(notification, NotificationSchema)
+
+
+def test_reused_buffer_round_trips_feed_page():
+    encoder = ResponseEncoder(initial_size=16)
+    page = validate(get_paginated_posts(page_size=4), FeedPageSchema)
+    with encoder.encoded(page) as view:
+        assert decode(bytes(view), FeedPageSchema) == page
+    # The buffer is free to grow again once the previous view is released
+    big = validate(get_paginated_posts(page_size=50), FeedPageSchema)
+    with encoder.encoded(big) as view:
+        assert decode(bytes(view), FeedPageSchema) == big
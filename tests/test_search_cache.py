@@ -0,0 +1,95 @@
+"""Search cache: LRU bound, invalidation on new posts, load-more interplay."""
+
+import asyncio
+
+from flet.messaging.session_store import SessionStore
+
+from frontend.ui.pages import search as search_page
+from frontend.ui.search_cache import SearchCache, SearchResults
+
+
+def test_lru_bound_and_invalidation():
+    cache = SearchCache(max_entries=3)
+    for query in "abcd":
+        cache.put((query, None, False), SearchResults([{"q": query}], False, 1))
+    assert len(cache) == 3 and cache.get(("a", None, False)) is None
+
+    cache.get(("b", None, False))  # b becomes the most recently used
+    cache.put(("e", None, False), SearchResults([], False, 0))
+    assert cache.get(("b", None, False)) is not None
+    assert cache.get(("c", None, False)) is None
+
+    version = cache.version  # a refresh starts...
+    cache.invalidate()  # ...the user creates a post...
+    assert len(cache) == 0
+    assert not cache.put(("b", None, False), SearchResults([], False, 0), version)
+    assert len(cache) == 0  # ...and the outdated refresh is not stored
+
+
+class _Page:
+    """The bits of ``ft.Page`` the search page touches."""
+
+    def __init__(self):
+        self.session = type("Session", (), {"store": SessionStore()})()
+        self.controls = []
+
+    def add(self, *controls):
+        self.controls.extend(controls)
+
+    def update(self, *controls):
+        pass
+
+    def run_task(self, handler, *args):
+        return asyncio.get_running_loop().create_task(handler(*args))
+
+
+def test_load_more_interleaved_with_cached_search(monkeypatch):
+    grids, bars = [], []
+
+    class Grid(search_page.PhotoGrid):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            grids.append(self)
+
+    class Bar(search_page.FilterChipBar):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            bars.append(self)
+
+    monkeypatch.setattr(search_page, "PhotoGrid", Grid)
+    monkeypatch.setattr(search_page, "FilterChipBar", Bar)
+    monkeypatch.setattr(search_page, "SIMULATED_LATENCY", 0.01)
+
+    async def settle():
+        # Page tasks and the debouncer's search tasks
+        pending = asyncio.all_tasks() - {asyncio.current_task()}
+        while pending:
+            await asyncio.wait(pending)
+            pending = asyncio.all_tasks() - {asyncio.current_task()}
+
+    async def scenario():
+        page = _Page()
+        search_page.search(page)
+        await settle()
+        (grid,), (chips,) = grids, bars
+        category = chips.categories[0]
+        for selected in (category, None):  # both searches are now cached
+            chips.on_select(selected)
+            await settle()
+
+        grid.on_load_more()  # page 2 of "Todos" starts loading...
+        await asyncio.sleep(0)
+        assert grid.is_loading_more
+        chips.on_select(category)  # ...and the category is served from the cache
+        await settle()
+        assert not grid.is_loading_more
+        assert grid._footer_text.value == "Carregar mais"
+
+        chips.on_select(None)
+        await settle()
+        shown = len(grid.posts)
+        grid.on_load_more()  # load-more is not blocked afterwards
+        await settle()
+        assert len(grid.posts) > shown and not grid.is_loading_more
+
+    asyncio.run(scenario())
@@ -0,0 +1,117 @@
+"""Thumbnail pipeline tests: dedup, crash recovery, variant sizes, lookup and worker."""
+
+import os
+import shutil
+import time
+
+from PIL import Image
+
+from backend.services import thumbnail_service
+from backend.services.thumbnail_service import (
+    DEVICE_SCALE,
+    VARIANTS,
+    ThumbnailPipeline,
+    resolve_variant,
+    select_variant,
+    variant_path,
+)
+
+
+def _photo(path, size=(2400, 1600), color=(200, 80, 40)):
+    Image.new("RGB", size, color).save(path, format="JPEG")
+    return path
+
+
+def test_variants_are_content_addressed_and_cover_their_box(tmp_path):
+    original = _photo(tmp_path / "a.jpg")
+    duplicate = tmp_path / "copy.jpg"
+    shutil.copy(original, duplicate)
+
+    with ThumbnailPipeline(tmp_path / "thumbs", max_workers=1) as pipeline:
+        digest = pipeline.enqueue(original)
+        assert pipeline.enqueue(duplicate) == digest
+        assert pipeline.pending() == [digest]
+        assert pipeline.process_pending() == [digest]
+        assert pipeline.pending() == []
+        pipeline.enqueue(duplicate)  # already rendered: nothing queued
+        assert pipeline.pending() == []
+
+    for variant in VARIANTS:
+        with Image.open(variant_path(tmp_path / "thumbs", digest, variant.name, "webp")) as im:
+            width, height = im.size
+        assert width >= variant.width * DEVICE_SCALE
+        assert height >= variant.height * DEVICE_SCALE
+        assert width < 2400 and abs(width / height - 1.5) < 0.01
+
+
+def test_jobs_interrupted_mid_render_are_requeued(tmp_path):
+    root = tmp_path / "thumbs"
+    pipeline = ThumbnailPipeline(root, max_workers=1)
+    digest = pipeline.enqueue(_photo(tmp_path / "a.jpg"))
+    job = root / "jobs" / "pending" / f"{digest}.json"
+    os.replace(job, root / "jobs" / "processing" / job.name)  # simulated crash
+
+    assert ThumbnailPipeline(root).pending() == [digest]
+
+
+def test_unreadable_images_move_to_failed(tmp_path):
+    bad = tmp_path / "bad.jpg"
+    bad.write_bytes(b"not an image")
+    with ThumbnailPipeline(tmp_path / "thumbs", max_workers=1) as pipeline:
+        digest = pipeline.enqueue(bad)
+        assert pipeline.process_pending() == []
+    assert (tmp_path / "thumbs" / "jobs" / "failed" / f"{digest}.json").exists()
+
+
+def test_resolve_variant_matches_render_size_and_falls_back(tmp_path):
+    root = tmp_path / "thumbs"
+    source = str(_photo(tmp_path / "a.jpg"))
+    assert resolve_variant(source, 150, 150, root=root) == source  # not rendered yet
+
+    with ThumbnailPipeline(root, max_workers=1) as pipeline:
+        digest = pipeline.enqueue(source)
+        pipeline.process_pending()
+
+    assert select_variant(150, 150) == "grid"
+    assert select_variant(420, 200) == "card"
+    assert select_variant(740, 300) == "detail"
+    assert select_variant(2000, 300) is None
+    assert resolve_variant(source, 420, 200, root=root) == str(
+        variant_path(root, digest, "card", "webp")
+    )
+    assert resolve_variant(source, 2000, 300, root=root) == source
+    assert resolve_variant("missing.png", 150, root=root) == "missing.png"
+
+
+def test_background_worker_renders_scheduled_sources(tmp_path):
+    root = tmp_path / "thumbs"
+    source = str(_photo(tmp_path / "upload.jpg"))
+    with ThumbnailPipeline(root, max_workers=1) as pipeline:
+        pipeline.start([source, tmp_path / "missing.jpg"])
+        deadline = time.monotonic() + 60
+        while resolve_variant(source, 150, 150, root=root) == source:
+            assert time.monotonic() < deadline, "variant was never rendered"
+            time.sleep(0.05)
+        late = str(_photo(tmp_path / "late.jpg", color=(0, 90, 200)))
+        pipeline.schedule([late])  # returns at once; rendered by the worker
+        while resolve_variant(late, 420, 200, root=root) == late:
+            assert time.monotonic() < deadline, "variant was never rendered"
+            time.sleep(0.05)
+    assert pipeline.pending() == [] and pipeline._worker is None
+    assert resolve_variant(source, 150, 150, root=root).endswith("grid.webp")
+
+
+def test_resolve_variant_never_reads_the_source(tmp_path, monkeypatch):
+    root = tmp_path / "thumbs"
+    source = str(_photo(tmp_path / "a.jpg"))
+    with ThumbnailPipeline(root, max_workers=1) as pipeline:
+        pipeline.enqueue(source)
+        pipeline.process_pending()
+
+    def no_hashing(path):
+        raise AssertionError("hashed on the UI path")
+
+    monkeypatch.setattr(thumbnail_service, "file_digest", no_hashing)
+    assert resolve_variant(source, 150, 150, root=root).endswith("grid.webp")
+    os.utime(source, ns=(0, 0))  # edited since it was rendered: not matched
+    assert resolve_variant(source, 150, 150, root=root) == source
@@ -0,0 +1,136 @@
+"""Trade state machine tests, including a concurrent-confirm stress test."""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from backend.core.config import DatabaseSettings
+from backend.db import create_engine, create_session_factory, init_models, session_scope
+from backend.models import Listing
+from backend.services.db_service import ListingRepository, UserRepository
+from backend.services.trade_service import (
+    InvalidTransitionError,
+    NotAParticipantError,
+    TradeService,
+)
+
+
+async def _setup(tmp_path):
+    # File database: concurrent sessions need real, separate connections
+    engine = create_engine(DatabaseSettings(url=f"sqlite+aiosqlite:///{tmp_path}/t.db"))
+    await init_models(engine)
+    factory = create_session_factory(engine)
+    async with session_scope(factory) as session:
+        owner, proposer, outsider = await UserRepository(session).bulk_insert(
+            [{"name": n, "email": f"{n}@x.com"} for n in ("owner", "proposer", "out")]
+        )
+        listing = await ListingRepository(session).add(
+            Listing(author_id=owner, title="Bicicleta")
+        )
+    return engine, TradeService(factory), listing.id, owner, proposer, outsider
+
+
+def test_lifecycle_and_idempotent_confirm(tmp_path):
+    async def scenario():
+        engine, trades, listing_id, owner, proposer, outsider = await _setup(tmp_path)
+        trade = await trades.propose(listing_id, proposer, counter_description="Violão")
+        with pytest.raises(InvalidTransitionError):
+            await trades.confirm(trade.id, proposer)  # not accepted yet
+        with pytest.raises(NotAParticipantError):
+            await trades.accept(trade.id, proposer)
+        await trades.accept(trade.id, owner)
+        with pytest.raises(NotAParticipantError):
+            await trades.confirm(trade.id, outsider)
+
+        first = await trades.confirm(trade.id, proposer)
+        again = await trades.confirm(trade.id, proposer)
+        done = await trades.confirm(trade.id, owner)
+        after = await trades.confirm(trade.id, owner)
+        with pytest.raises(InvalidTransitionError):
+            await trades.cancel(trade.id, owner)
+        await engine.dispose()
+        return first, again, done, after
+
+    first, again, done, after = asyncio.run(scenario())
+    assert first.status == "accepted" and first.proposer_confirmed_at is not None
+    assert again == first  # no write, no version bump
+    assert done.status == "completed" and done.version == 4
+    assert after == done
+
+
+def test_concurrent_confirms_complete_exactly_once(tmp_path):
+    async def scenario():
+        engine, trades, listing_id, owner, proposer, _ = await _setup(tmp_path)
+        trade = await trades.propose(listing_id, proposer)
+        await trades.accept(trade.id, owner)
+        results = await asyncio.gather(
+            *(trades.confirm(trade.id, (owner, proposer)[i % 2]) for i in range(200))
+        )
+        final = await trades.get(trade.id)
+        await engine.dispose()
+        return results, final
+
+    results, final = asyncio.run(scenario())
+    assert final.status == "completed"
+    # created (1) -> accepted (2) -> one write per side (3, 4): no lost or
+    # duplicated updates despite 200 racing requests
+    assert final.version == 4
+    assert all(r.status in ("accepted", "completed") for r in results)
+    assert sum(r.status == "completed" for r in results) >= 1
+
+
+def test_batched_expiry_and_transition_many(tmp_path):
+    async def scenario():
+        engine, trades, listing_id, owner, proposer, _ = await _setup(tmp_path)
+        events = []
+        trades.on_expired.append(lambda s: _record(events, "expired", s))
+        trades.on_cancelled.append(lambda s: _record(events, "cancelled", s))
+        trades.on_completed.append(lambda s: _record(events, "completed", s))
+        created = [(await trades.propose(listing_id, proposer)).id for _ in range(25)]
+        await trades.accept(created[0], owner)
+        cutoff = datetime.now(timezone.utc) + timedelta(seconds=1)
+        expired = await trades.expire_stale(cutoff, batch_size=10)
+        with pytest.raises(InvalidTransitionError):  # needs both confirmations
+            await trades.transition_many(created[:1], "completed")
+        moved = await trades.transition_many(created[:3], "cancelled")
+        states = [await trades.get(i) for i in created[:2]]
+        await engine.dispose()
+        return expired, moved, states, events, created
+
+    expired, moved, states, events, created = asyncio.run(scenario())
+    assert expired == 24  # the accepted trade is not stale
+    assert moved == [states[0].id]  # expired trades cannot be cancelled
+    assert states[0].status == "cancelled"
+    assert states[1].status == "expired" and states[1].version == 2
+    # Hooks ran once per trade that actually moved, with its new state
+    assert sorted(i for kind, i, _ in events if kind == "expired") == created[1:]
+    assert [(kind, i) for kind, i, _ in events if kind != "expired"] == [
+        ("cancelled", created[0])
+    ]
+    assert all(kind == status for kind, _, status in events)
+
+
+async def _record(events, kind, state):
+    events.append((kind, state.id, state.status))
+
+
+def test_failing_hook_does_not_fail_a_committed_transition(tmp_path, caplog):
+    async def broken(state):
+        raise RuntimeError("reputation write failed")
+
+    async def scenario():
+        engine, trades, listing_id, owner, proposer, _ = await _setup(tmp_path)
+        events = []
+        trades.on_completed.extend([broken, lambda s: _record(events, "completed", s)])
+        trade = await trades.propose(listing_id, proposer)
+        await trades.accept(trade.id, owner)
+        await trades.confirm(trade.id, proposer)
+        done = await trades.confirm(trade.id, owner)
+        await engine.dispose()
+        return done, events
+
+    done, events = asyncio.run(scenario())
+    assert done.status == "completed"
+    assert events == [("completed", done.id, "completed")]  # later hooks still run
+    assert "reputation write failed" in caplog.text
@@ -0,0 +1,199 @@
+"""View cache: tabs are restored instead of rebuilt, within its bounds."""
+
+import asyncio
+
+import flet as ft
+from flet.messaging.session_store import SessionStore
+
+from frontend.ui.view_cache import get_view_cache, on_view_restored, show_view
+
+
+class _Page:
+    """The bits of ``ft.Page`` the view cache touches."""
+
+    def __init__(self):
+        self.session = type("Session", (), {"store": SessionStore()})()
+        self.controls = []
+        self.title = self.bgcolor = self.vertical_alignment = None
+        self.horizontal_alignment = self.padding = None
+        self.on_keyboard_event = self.on_resize = None
+        self.updates = 0
+
+    def add(self, *controls):
+        self.controls.extend(controls)
+
+    def clean(self):
+        self.controls.clear()
+
+    def update(self, *controls):
+        self.updates += 1
+
+
+def _find(page, match):
+    """First control in the page's trees (depth first) that ``match`` accepts."""
+    stack = list(page.controls)
+    while stack:
+        control = stack.pop()
+        if match(control):
+            return control
+        for name in ("content", "controls"):
+            value = getattr(control, name, None)
+            if isinstance(value, list):
+                stack.extend(value)
+            elif isinstance(value, ft.Control):
+                stack.append(value)
+
+
+def test_tabs_are_restored_with_their_settings_and_hook():
+    page = _Page()
+    builds, restored = [], []
+
+    def tab(name, items=1):
+        def build():
+            builds.append(name)
+            page.title = name
+            page.on_keyboard_event = (lambda e: None) if name == "search" else None
+            on_view_restored(page, lambda: restored.append(name))
+            page.add(ft.Column([ft.Text(name) for _ in range(items)]))
+        return lambda: show_view(page, name, build)
+
+    dashboard, search = tab("dashboard"), tab("search")
+    assert not dashboard() and not search()
+    column = page.controls[0]
+    handler = page.on_keyboard_event
+    assert dashboard()  # restored: no rebuild
+    assert page.title == "dashboard" and page.on_keyboard_event is None
+    assert search() and page.controls[0] is column and page.on_keyboard_event is handler
+    assert builds == ["dashboard", "search"] and restored == ["dashboard", "search"]
+
+
+def test_lru_and_control_budget_never_drop_the_current_tab():
+    page = _Page()
+    cache = get_view_cache(page)
+    cache.max_views, cache.max_controls = 3, 100
+
+    def visit(name, items=1):
+        return show_view(page, name, lambda: page.add(ft.Column([ft.Text(name) for _ in range(items)])))
+
+    for name in "abc":
+        visit(name)
+    visit("a")
+    visit("d")  # 4 views: b is the least recently shown
+    assert "b" not in cache and {"a", "c", "d"} <= set(cache._views)
+
+    visit("big", items=150)  # over budget on its own: everything else goes
+    assert list(cache._views) == ["big"] and cache.current == "big"
+
+
+def test_pages_do_not_inherit_the_previous_pages_handlers():
+    from frontend.ui.pages.dashboard import dashboard
+    from frontend.ui.pages.search import search
+
+    class Page(_Page):
+        width = 800
+
+        def run_task(self, handler, *args):
+            return asyncio.get_running_loop().create_task(handler(*args))
+
+    async def scenario():
+        page = Page()
+        show_view(page, "search", lambda: search(page))
+        search_keys, search_resize = page.on_keyboard_event, page.on_resize
+        assert search_keys is not None and search_resize is not None
+
+        show_view(page, "dashboard", lambda: dashboard(page))
+        assert page.on_keyboard_event is None and page.on_resize is None
+        assert page.padding == 0  # set by the dashboard itself
+
+        assert show_view(page, "search", lambda: search(page))
+        assert page.on_keyboard_event is search_keys and page.on_resize is search_resize
+        assert show_view(page, "dashboard", lambda: dashboard(page))
+        assert page.on_keyboard_event is None and page.on_resize is None
+
+    asyncio.run(scenario())
+
+
+def test_theme_toggle_drops_the_old_themes_views():
+    from frontend.ui.pages.configurations import configurations
+
+    page = _Page()
+    cache = get_view_cache(page)
+
+    def toggle_button():
+        return _find(page, lambda c: isinstance(c, ft.Container) and c.on_click is not None)
+
+    show_view(page, ("dashboard", False), lambda: page.add(ft.Text("dashboard")))
+    show_view(page, ("configurations", False), lambda: configurations(page, False))
+    light = page.controls[0]
+    toggle_button().on_click(None)
+    assert list(cache._views) == [("configurations", True)]
+    assert cache.current == ("configurations", True)
+
+    toggle_button().on_click(None)  # back to light: rebuilt, not the old light view
+    assert list(cache._views) == [("configurations", False)]
+    assert page.controls[0] is not light
+
+
+def test_dashboard_shown_after_login_is_restored_not_rebuilt():
+    from frontend.ui.pages.dashboard import dashboard
+    from frontend.ui.pages.login import main as login
+    from frontend.ui.pages.search import search
+
+    class Page(_Page):
+        width = 800
+
+        def run_task(self, handler, *args):
+            return asyncio.get_running_loop().create_task(handler(*args))
+
+    async def scenario():
+        page = Page()
+        login(page)
+        enter = _find(page, lambda c: isinstance(c, ft.ElevatedButton) and c.content == "Entrar")
+        enter.on_click(None)
+        cache = get_view_cache(page)
+        assert cache.current == ("dashboard", False)
+        feed = page.controls[0]
+
+        show_view(page, ("search", False), lambda: search(page, False))  # Buscar
+        assert show_view(page, ("dashboard", False), lambda: dashboard(page, False))  # Início
+        assert page.controls[0] is feed
+        await asyncio.sleep(0.05)  # restore hooks (scroll, revalidation) run in the background
+
+    asyncio.run(scenario())
+
+
+def test_restored_profile_and_badge_pick_up_new_data(monkeypatch):
+    from frontend.ui.pages import perfil as perfil_page
+    from frontend.ui.widgets import nav_bar
+
+    class Page(_Page):
+        def run_task(self, handler, *args):
+            return asyncio.get_running_loop().create_task(handler(*args))
+
+    def texts(page):
+        found, stack = [], list(page.controls)
+        while stack:
+            control = stack.pop()
+            if isinstance(control, ft.Text):
+                found.append(control.value)
+            for name in ("content", "controls", "destinations", "icon"):
+                value = getattr(control, name, None)
+                if isinstance(value, list):
+                    stack.extend(value)
+                elif isinstance(value, ft.Control):
+                    stack.append(value)
+        return found
+
+    async def scenario():
+        page = Page()
+        show_view(page, "perfil", lambda: perfil_page.perfil(page))
+        show_view(page, "other", lambda: page.add(ft.Text("other")))
+        monkeypatch.setattr(perfil_page, "count_user_posts", lambda name: 99)
+        monkeypatch.setattr(nav_bar, "get_mock_notifications_count", lambda: 42)
+        assert show_view(page, "perfil", lambda: perfil_page.perfil(page))
+        assert "99" not in texts(page)
+        await asyncio.sleep(0.05)  # background revalidation
+        return texts(page)
+
+    shown = asyncio.run(scenario())
+    assert "99" in shown and "42" in shown
@@ -0,0 +1,145 @@
+"""Virtualized feed: bounded number of built cards, no content jumps."""
+
+import asyncio
+import random
+
+import flet as ft
+
+from frontend.ui.widgets.virtual_feed import PagedFeed, VirtualFeed
+
+SPACING, PADDING, VIEWPORT = 16, 16, 800
+
+
+def _layout(feed):
+    """Content height and item tops as a ListView would lay them out."""
+    y, tops = PADDING, {}
+    for control in feed.view.controls:
+        if control.data is not None:
+            tops[control.data] = y
+        y += control.height + SPACING
+    return y - SPACING + PADDING, tops
+
+
+def test_scrolling_keeps_a_bounded_window_without_jumps():
+    rng = random.Random(3)
+    heights = [rng.randint(250, 700) for _ in range(10_000)]
+    built = []
+
+    def build(i):
+        built.append(i)
+        return ft.Container(height=heights[i], data=i)
+
+    feed = VirtualFeed(len(heights), build, chunk_size=10, max_chunks=4,
+                       spacing=SPACING, padding=PADDING)
+    assert len(built) == 10  # first paint builds one chunk, not 10k cards
+    true_tops = [PADDING + sum(heights[:i]) + SPACING * (i + 1) for i in range(300)]
+
+    def scroll_through(positions):
+        for pixels in positions:
+            content, _ = _layout(feed)
+            max_extent = max(0.0, content - VIEWPORT)
+            pixels = min(pixels, max_extent)
+            feed.handle_scroll(pixels, max_extent, VIEWPORT)
+            _, tops = _layout(feed)
+            assert len(feed.built_range) <= 40
+            for i, top in tops.items():  # every built card sits where it belongs
+                if i < 300:
+                    assert top == true_tops[i]
+
+    end = true_tops[299]
+    scroll_through(range(0, end, 300))
+    assert feed.built_range.start > 0  # cards scrolled past were released
+    scroll_through(range(end, -1, -300))
+    assert feed.built_range.start == 0
+
+
+def test_paged_feed_prefetches_pages_in_the_background():
+    rng = random.Random(5)
+    heights = [rng.randint(250, 700) for _ in range(300)]
+    fetched = []
+
+    def fetch(page, size=10):
+        fetched.append(page)
+        start = (page - 1) * size
+        posts = [{"id": i, "height": heights[i]} for i in range(start, min(start + size, 300))]
+        return {"posts": posts, "has_more": start + size < 300}
+
+    def build(post, index):
+        assert post["id"] == index
+        return ft.Container(height=post["height"], data=index)
+
+    true_tops = [PADDING + sum(heights[:i]) + SPACING * (i + 1) for i in range(300)]
+
+    async def scroll_through(feed, positions):
+        stalls = 0
+        for pixels in positions:
+            content, _ = _layout(feed)
+            max_extent = max(0.0, content - VIEWPORT)
+            stalls += pixels > max_extent and feed.built_range.stop < 300
+            pixels = min(pixels, max_extent)
+            feed.handle_scroll(pixels, max_extent, VIEWPORT)
+            await asyncio.sleep(0.002)  # let background loads land
+            _, tops = _layout(feed)
+            assert len(feed.built_range) <= 40
+            assert len(feed.loaded_pages) <= 6
+            for i, top in tops.items():
+                assert top == true_tops[i]
+        return stalls
+
+    async def main():
+        feed = PagedFeed(fetch, build, page_size=10, max_chunks=4, max_pages=6,
+                         spacing=SPACING, padding=PADDING)
+        assert fetched == [1]  # only the first page up front
+        end = true_tops[-1]
+        assert await scroll_through(feed, range(0, end, 250)) == 0  # never hit a missing page
+        assert feed.built_range.stop == 300
+        assert fetched == list(range(1, 31))  # each page once, in order
+        await scroll_through(feed, range(end, -1, -250))
+        assert feed.built_range.start == 0
+        assert len(fetched) > 30  # pages dropped from the window came back
+
+    asyncio.run(main())
+
+
+def test_revalidate_shows_new_posts_at_the_top_and_leaves_scrolled_feeds_alone():
+    rng = random.Random(9)
+    source = [{"id": i, "height": rng.randint(250, 700)} for i in range(60)]
+
+    def fetch(page, size=10):
+        start = (page - 1) * size
+        return {"posts": source[start : start + size], "has_more": start + size < len(source)}
+
+    def build(post, index):
+        return ft.Container(height=post["height"], data=post["id"])
+
+    def scroll_to_end(feed):
+        pixels = 0
+        while feed.built_range.stop < len(source):
+            content, _ = _layout(feed)
+            max_extent = max(0.0, content - VIEWPORT)
+            feed.handle_scroll(min(pixels, max_extent), max_extent, VIEWPORT)
+            pixels += 300
+            yield
+
+    async def main():
+        at_top = PagedFeed(fetch, build, page_size=10, spacing=SPACING, padding=PADDING)
+        scrolled = PagedFeed(fetch, build, page_size=10, max_chunks=2,
+                             spacing=SPACING, padding=PADDING)
+        for _ in scroll_to_end(scrolled):
+            await asyncio.sleep(0.002)
+        assert not await at_top.revalidate()
+
+        source.insert(0, {"id": 100, "height": 300})  # someone published
+        shown = list(scrolled.view.controls)
+        assert await scrolled.revalidate()
+        assert all(a is b for a, b in zip(scrolled.view.controls, shown, strict=True))
+        assert await at_top.revalidate()
+        assert at_top.view.controls[1].data == 100
+
+        for _ in scroll_to_end(at_top):  # the rebuilt feed still grows and measures
+            await asyncio.sleep(0.002)
+        _, tops = _layout(at_top)
+        ids = [post["id"] for post in source]
+        assert sorted(tops, key=tops.get) == ids[at_top.built_range.start :]
+
+    asyncio.run(main())